@@ -51,6 +51,8 @@ class Channel(BaseModel):
     tvg_logo: Optional[str] = None
     group: Optional[str] = None
     resolution: Optional[str] = None
+    codec_video: Optional[str] = None
+    codec_audio: Optional[str] = None
     is_online: bool = False
     validation_status: ValidationStatus = Field(default=ValidationStatus.UNKNOWN)
     last_validated: Optional[datetime] = None
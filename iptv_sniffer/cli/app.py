@@ -2,11 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Optional
 
 import typer
 
 from iptv_sniffer import __version__
+from iptv_sniffer.web.api.channels import close_repositories
+from iptv_sniffer.web.api.scan import (
+    ScanNotFoundError,
+    ScanNotResumableError,
+    ScanSession,
+    create_scan_manager,
+)
 
 app = typer.Typer(
     name="iptv-sniffer",
@@ -61,6 +69,44 @@ def scan() -> None:
     _notify_not_implemented("scan")
 
 
+@app.command()
+def resume(
+    scan_id: str = typer.Argument(..., help="Identifier of the interrupted scan."),
+) -> None:
+    """
+    Resume an interrupted scan from its on-disk checkpoint.
+
+    Targets already recorded in the checkpoint are not probed again.
+    """
+    try:
+        session = asyncio.run(_resume_scan(scan_id))
+    except ScanNotFoundError:
+        typer.secho(f"No checkpoint found for scan {scan_id}", fg=typer.colors.RED)
+        raise typer.Exit(code=1) from None
+    except ScanNotResumableError as exc:
+        typer.secho(f"Scan {scan_id} cannot be resumed: {exc}", fg=typer.colors.RED)
+        raise typer.Exit(code=1) from None
+
+    typer.echo(
+        f"Scan {session.scan_id} {session.status.value}: "
+        f"{session.progress}/{session.total} probed, "
+        f"{session.valid} valid, {session.invalid} invalid"
+    )
+
+
+async def _resume_scan(scan_id: str) -> ScanSession:
+    # Same wiring as the web API, so resumed results are saved as they are
+    # found and cached verdicts are reused.
+    manager = create_scan_manager()
+    try:
+        session = await manager.resume_scan(scan_id)
+        if session.task is not None:
+            await session.task
+    finally:
+        await close_repositories()
+    return session
+
+
 @app.command()
 def validate() -> None:
     """
@@ -14,6 +14,8 @@ class M3UGenerator:
     Quotes within attribute values are escaped to maintain valid M3U syntax.
     """
 
+    HEADER = "#EXTM3U"
+
     def generate(self, channels: Iterable[Channel]) -> str:
         """
         Generate M3U content for the provided channels.
@@ -24,13 +26,22 @@ class M3UGenerator:
         Returns:
             A string containing the playlist in M3U format.
         """
-        lines: List[str] = ["#EXTM3U"]
+        lines: List[str] = [self.HEADER]
 
         for channel in channels:
             lines.extend(self._serialize_channel(channel))
 
         return "\n".join(lines)
 
+    def generate_entry(self, channel: Channel) -> str:
+        """
+        Serialize one channel for incremental output.
+
+        Emitting :attr:`HEADER` followed by ``"\n" + generate_entry(c)`` for
+        each channel produces exactly the output of :meth:`generate`.
+        """
+        return "\n".join(self._serialize_channel(channel))
+
     def _serialize_channel(self, channel: Channel) -> List[str]:
         extinf_parts: List[str] = ["#EXTINF:-1"]
 
@@ -1,28 +1,68 @@
 """Scanner package exports."""
 
 from .screenshot import capture_screenshot
-from .orchestrator import ScanOrchestrator, ScanProgress
+from .orchestrator import ResultOrdering, ScanOrchestrator, ScanProgress
+from .hls import HLSValidator
+from .host_failures import HostFailureCache
+from .mpegts import MPEGTSAnalyzer, TSStreamInfo
+from .multicast_probe import MulticastProbe
 from .rate_limiter import RateLimiter
+from .reachability import PrefilteringValidator, ReachabilityProbe
+from .retry import RetryBudget, RetryPolicy
+from .adaptive_limiter import AdaptiveRateLimiter, LimitAdjustment
+from .scheduler import ProbeScheduler, ScanPriority, SchedulerLane
 from .strategy import ScanMode, ScanStrategy
 from .template_strategy import TemplateScanStrategy
 from .multicast_strategy import MulticastScanStrategy
+from .multicast_sweep import MulticastSweeper
+from .m3u_batch_strategy import M3UBatchScanStrategy
 from .smart_port_scanner import SmartPortScanner
+from .token_bucket import HostRateLimiter, TokenBucket
 from .presets import PresetLoader, ScanPreset
-from .validator import ErrorCategory, StreamValidationResult, StreamValidator
+from .validation_cache import ValidationCache
+from .validator import (
+    ErrorCategory,
+    ProbeBackend,
+    ProbeProfile,
+    StreamValidationResult,
+    StreamValidator,
+)
 
 __all__ = [
     "capture_screenshot",
     "ScanMode",
     "ScanStrategy",
+    "ProbeScheduler",
+    "ScanPriority",
+    "SchedulerLane",
+    "ResultOrdering",
     "ScanOrchestrator",
     "ScanProgress",
     "RateLimiter",
+    "HLSValidator",
+    "HostFailureCache",
+    "MPEGTSAnalyzer",
+    "TSStreamInfo",
+    "MulticastProbe",
+    "PrefilteringValidator",
+    "ReachabilityProbe",
+    "RetryBudget",
+    "RetryPolicy",
+    "AdaptiveRateLimiter",
+    "LimitAdjustment",
     "TemplateScanStrategy",
     "MulticastScanStrategy",
+    "MulticastSweeper",
+    "M3UBatchScanStrategy",
     "SmartPortScanner",
+    "HostRateLimiter",
+    "TokenBucket",
     "ScanPreset",
     "PresetLoader",
+    "ValidationCache",
     "ErrorCategory",
+    "ProbeBackend",
+    "ProbeProfile",
     "StreamValidationResult",
     "StreamValidator",
 ]
@@ -0,0 +1,189 @@
+"""Adaptive concurrency control driven by observed probe outcomes."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Deque, List, Optional
+
+from .rate_limiter import RateLimiter
+from .validator import ErrorCategory
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LimitAdjustment:
+    """A change of the adaptive concurrency limit."""
+
+    limit: int
+    reason: str
+    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    """
+    Concurrency limiter that tunes its limit with AIMD control.
+
+    Completed probes are sampled in windows of roughly one limit's worth of
+    operations. A window whose timeout ratio exceeds ``timeout_threshold``
+    multiplies the limit by ``decrease_factor``. Otherwise the window's mean
+    latency is compared with the best latency observed so far: within
+    ``latency_tolerance`` times that baseline the limit grows by one, beyond it
+    the limit shrinks by one.
+
+    Probes that got no answer at all (``NO_RESPONSE``: a connect timeout to a
+    dead address or a silent multicast group) say nothing about server load
+    and are not sampled; on sparse sweeps they would otherwise dominate every
+    window and collapse the limit.
+
+    ``max_concurrency`` reports the upper bound (``max_limit``) so callers can
+    size worker pools once, while :attr:`limit` is the value currently enforced.
+    """
+
+    _CONGESTION_CATEGORIES = frozenset({ErrorCategory.TIMEOUT})
+    _IGNORED_CATEGORIES = frozenset({ErrorCategory.NO_RESPONSE})
+    _MIN_WINDOW = 10
+    _HISTORY_SIZE = 100
+    _BASELINE_DRIFT = 0.1
+
+    def __init__(
+        self,
+        *,
+        min_limit: int = 1,
+        initial_limit: int = 10,
+        max_limit: int = RateLimiter._MAX_CONCURRENCY,
+        timeout: float = 10.0,
+        window_size: Optional[int] = None,
+        timeout_threshold: float = 0.2,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+    ) -> None:
+        super().__init__(max_concurrency=max_limit, timeout=timeout)
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError(
+                "limits must satisfy 1 <= min_limit <= initial_limit <= max_limit"
+            )
+        if window_size is not None and window_size < 1:
+            raise ValueError("window_size must be positive")
+        if not 0 <= timeout_threshold <= 1:
+            raise ValueError("timeout_threshold must be between 0 and 1")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be between 0 and 1")
+        if latency_tolerance < 1:
+            raise ValueError("latency_tolerance must be at least 1")
+
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._limit = initial_limit
+        self._window_size = window_size
+        self._timeout_threshold = timeout_threshold
+        self._decrease_factor = decrease_factor
+        self._latency_tolerance = latency_tolerance
+
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future[None]] = deque()
+
+        self._samples = 0
+        self._congested = 0
+        self._latency_total = 0.0
+        self._baseline: Optional[float] = None
+        self._history: Deque[LimitAdjustment] = deque(maxlen=self._HISTORY_SIZE)
+        self._history.append(LimitAdjustment(limit=initial_limit, reason="initial"))
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def history(self) -> List[LimitAdjustment]:
+        """Most recent limit changes, oldest first."""
+        return list(self._history)
+
+    async def __aenter__(self) -> "AdaptiveRateLimiter":
+        loop = asyncio.get_running_loop()
+        while self._in_flight >= self._limit:
+            waiter: asyncio.Future[None] = loop.create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # We were woken but will not take the slot; pass it on.
+                    self._wake_waiters()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self._in_flight += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._in_flight -= 1
+        self._wake_waiters()
+
+    def observe(
+        self, latency: float, error_category: Optional[ErrorCategory] = None
+    ) -> None:
+        """Feed one completed probe into the controller."""
+        if error_category in self._IGNORED_CATEGORIES:
+            return
+        self._samples += 1
+        if error_category in self._CONGESTION_CATEGORIES:
+            self._congested += 1
+        else:
+            self._latency_total += latency
+
+        if self._samples >= (self._window_size or max(self._limit, self._MIN_WINDOW)):
+            self._adjust()
+
+    def _adjust(self) -> None:
+        samples, congested = self._samples, self._congested
+        healthy = samples - congested
+        mean_latency = self._latency_total / healthy if healthy else None
+        self._samples = self._congested = 0
+        self._latency_total = 0.0
+
+        if congested / samples > self._timeout_threshold:
+            self._set_limit(int(self._limit * self._decrease_factor), "timeouts")
+            return
+        if mean_latency is None:
+            return
+
+        if self._baseline is None or mean_latency < self._baseline:
+            self._baseline = mean_latency
+        else:
+            self._baseline += (mean_latency - self._baseline) * self._BASELINE_DRIFT
+
+        if mean_latency <= self._baseline * self._latency_tolerance:
+            self._set_limit(self._limit + 1, "latency_ok")
+        else:
+            self._set_limit(self._limit - 1, "latency_inflated")
+
+    def _set_limit(self, limit: int, reason: str) -> None:
+        bounded = max(self._min_limit, min(self._max_limit, limit))
+        if bounded == self._limit:
+            return
+        logger.debug("Adaptive limit %s -> %s (%s)", self._limit, bounded, reason)
+        self._limit = bounded
+        self._history.append(LimitAdjustment(limit=bounded, reason=reason))
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        free = self._limit - self._in_flight
+        for waiter in list(self._waiters):
+            if free <= 0:
+                break
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+
+__all__ = ["AdaptiveRateLimiter", "LimitAdjustment"]
@@ -0,0 +1,93 @@
+"""Run ffprobe as an asyncio subprocess without a thread per probe."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import signal
+from typing import Any, Dict, List, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class FFprobeError(Exception):
+    """Raised when ffprobe exits unsuccessfully; carries its stderr output."""
+
+    def __init__(self, message: str, stderr: bytes = b"") -> None:
+        super().__init__(message)
+        self.stderr = stderr
+
+
+def build_ffprobe_command(
+    url: str,
+    options: Optional[Mapping[str, str]] = None,
+    *,
+    cmd: str = "ffprobe",
+) -> List[str]:
+    """Build the same command line ``ffmpeg.probe`` would run."""
+    args = [cmd, "-show_format", "-show_streams", "-of", "json"]
+    for key, value in (options or {}).items():
+        args.extend((f"-{key}", str(value)))
+    args.append(url)
+    return args
+
+
+async def run_ffprobe(
+    url: str,
+    *,
+    timeout: float,
+    options: Optional[Mapping[str, str]] = None,
+    cmd: str = "ffprobe",
+) -> Dict[str, Any]:
+    """
+    Probe ``url`` and return ffprobe's parsed JSON output.
+
+    ffprobe runs in its own session (process group). If the probe exceeds
+    ``timeout`` or the awaiting task is cancelled (e.g. by an outer
+    ``asyncio.wait_for``), the whole group is killed and reaped before the
+    exception propagates, so no ffprobe process outlives its caller.
+
+    Raises:
+        FFprobeError: ffprobe exited non-zero or printed invalid JSON.
+        asyncio.TimeoutError: the probe did not finish within ``timeout``.
+    """
+    process = await asyncio.create_subprocess_exec(
+        *build_ffprobe_command(url, options, cmd=cmd),
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        start_new_session=True,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except BaseException:
+        await _terminate(process)
+        raise
+
+    if process.returncode != 0:
+        raise FFprobeError(
+            f"ffprobe exited with code {process.returncode}", stderr=stderr
+        )
+    try:
+        return json.loads(stdout.decode("utf-8", errors="replace"))
+    except json.JSONDecodeError as exc:
+        raise FFprobeError("ffprobe returned invalid JSON", stderr=stderr) from exc
+
+
+async def _terminate(process: asyncio.subprocess.Process) -> None:
+    if process.returncode is not None:
+        return
+    with contextlib.suppress(ProcessLookupError):
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, signal.SIGKILL)
+        else:  # pragma: no cover - Windows has no process groups
+            process.kill()
+    # Reap the child even if our task is being cancelled.
+    with contextlib.suppress(Exception):
+        await asyncio.shield(process.wait())
+
+
+__all__ = ["FFprobeError", "build_ffprobe_command", "run_ffprobe"]
@@ -0,0 +1,368 @@
+"""HLS-aware validation: playlists and segment headers over pooled HTTP."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urljoin, urlparse
+
+import httpx
+
+from iptv_sniffer.utils.http_client import get_http_client
+
+from .mpegts import TransportStreamParser
+
+logger = logging.getLogger(__name__)
+
+_MAX_PLAYLIST_BYTES = 1 << 20
+_ATTRIBUTE_PATTERN = re.compile(r'([A-Z0-9-]+)=("[^"]*"|[^,]*)')
+_FMP4_BOXES = (b"ftyp", b"styp", b"moof", b"sidx")
+_CODEC_NAMES: Dict[str, str] = {
+    "avc1": "h264",
+    "avc3": "h264",
+    "hvc1": "hevc",
+    "hev1": "hevc",
+    "av01": "av1",
+    "vp09": "vp9",
+    "mp4a": "aac",
+    "ac-3": "ac3",
+    "ec-3": "eac3",
+}
+_AUDIO_CODECS = frozenset({"aac", "ac3", "eac3"})
+
+
+def is_hls_url(url: str) -> bool:
+    """Return True for URLs whose path names an ``.m3u8`` playlist."""
+    return urlparse(url).path.lower().endswith(".m3u8")
+
+
+@dataclass(frozen=True)
+class HLSVariant:
+    """One ``#EXT-X-STREAM-INF`` entry of a master playlist."""
+
+    uri: str
+    bandwidth: int = 0
+    resolution: Optional[str] = None
+    codecs: Tuple[str, ...] = ()
+
+    @property
+    def codec_video(self) -> Optional[str]:
+        return next((c for c in self._codec_names() if c not in _AUDIO_CODECS), None)
+
+    @property
+    def codec_audio(self) -> Optional[str]:
+        return next((c for c in self._codec_names() if c in _AUDIO_CODECS), None)
+
+    @property
+    def has_video(self) -> bool:
+        """Audio-only renditions declare only audio codecs."""
+        return not self.codecs or self.codec_video is not None
+
+    def _codec_names(self) -> List[str]:
+        names = []
+        for codec in self.codecs:
+            prefix = codec.split(".", 1)[0].lower()
+            names.append(_CODEC_NAMES.get(prefix, prefix))
+        return names
+
+
+def _parse_attributes(line: str) -> Dict[str, str]:
+    attributes = line.split(":", 1)[1] if ":" in line else ""
+    return {
+        key: value.strip('"') for key, value in _ATTRIBUTE_PATTERN.findall(attributes)
+    }
+
+
+def parse_master_playlist(text: str, base_url: str) -> List[HLSVariant]:
+    """Return the variants of a master playlist (empty for media playlists)."""
+    variants: List[HLSVariant] = []
+    pending: Optional[Dict[str, str]] = None
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if line.startswith("#EXT-X-STREAM-INF"):
+            pending = _parse_attributes(line)
+        elif pending is not None and line and not line.startswith("#"):
+            try:
+                bandwidth = int(pending.get("BANDWIDTH", "0"))
+            except ValueError:
+                bandwidth = 0
+            codecs = tuple(
+                codec.strip()
+                for codec in pending.get("CODECS", "").split(",")
+                if codec.strip()
+            )
+            variants.append(
+                HLSVariant(
+                    uri=urljoin(base_url, line),
+                    bandwidth=bandwidth,
+                    resolution=pending.get("RESOLUTION") or None,
+                    codecs=codecs,
+                )
+            )
+            pending = None
+    return variants
+
+
+def parse_media_playlist(text: str, base_url: str) -> List[str]:
+    """Return absolute segment URLs of a media playlist, in playlist order."""
+    segments: List[str] = []
+    after_extinf = False
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if line.startswith("#EXTINF"):
+            after_extinf = True
+        elif after_extinf and line and not line.startswith("#"):
+            segments.append(urljoin(base_url, line))
+            after_extinf = False
+    return segments
+
+
+class HLSFailure(str, Enum):
+    """Why an HLS stream was rejected."""
+
+    TIMEOUT = "timeout"
+    UNREACHABLE = "unreachable"
+    NOT_A_STREAM = "not_a_stream"
+
+
+@dataclass(frozen=True)
+class HLSProbeResult:
+    """Verdict of :class:`HLSValidator`; metadata comes from the playlist."""
+
+    is_valid: bool
+    variant: Optional[HLSVariant] = None
+    codec_video: Optional[str] = None
+    codec_audio: Optional[str] = None
+    failure: Optional[HLSFailure] = None
+    error_message: Optional[str] = None
+
+    @property
+    def resolution(self) -> Optional[str]:
+        return self.variant.resolution if self.variant else None
+
+    @property
+    def bandwidth(self) -> Optional[int]:
+        return self.variant.bandwidth if self.variant else None
+
+
+class _Rejected(Exception):
+    def __init__(self, failure: HLSFailure, message: str) -> None:
+        super().__init__(message)
+        self.failure = failure
+
+
+class HLSValidator:
+    """
+    Validate HLS channels from their playlists and one segment header.
+
+    The master playlist is fetched and parsed; the cheapest variant carrying
+    video (or, with ``all_variants``, every variant in parallel) is followed
+    to its media playlist, and only the first ``sample_bytes`` of its first
+    segment are requested with a ``Range`` header. The segment must start
+    like MPEG-TS (codecs are read from the PMT when present) or fragmented
+    MP4. Resolution and bandwidth are reported from ``EXT-X-STREAM-INF``
+    of the variant that was probed (the highest-bandwidth one that validated
+    with ``all_variants``), so they describe a rendition known to play.
+
+    All requests go through one ``httpx.AsyncClient`` whose connection pool
+    keeps connections alive per origin, so many channels served by the same
+    CDN reuse a handful of connections: ``client`` when given, else the
+    application's shared client, else one created on first use and closed by
+    :meth:`aclose`. :meth:`check` returns ``None`` when the response is not
+    an HLS playlist so callers can fall back to ffprobe.
+    """
+
+    def __init__(
+        self,
+        *,
+        client: Optional[httpx.AsyncClient] = None,
+        sample_bytes: int = 4096,
+        all_variants: bool = False,
+        max_connections: int = 100,
+    ) -> None:
+        if sample_bytes < 188:
+            raise ValueError("sample_bytes must cover at least one TS packet")
+        self._client = client
+        self._own_client: Optional[httpx.AsyncClient] = None
+        self._sample_bytes = sample_bytes
+        self._all_variants = all_variants
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+
+    def _get_client(self) -> httpx.AsyncClient:
+        client = self._client or get_http_client()
+        if client is not None:
+            return client
+        if self._own_client is None:
+            self._own_client = httpx.AsyncClient(
+                follow_redirects=True, limits=self._limits
+            )
+        return self._own_client
+
+    async def aclose(self) -> None:
+        """Close the connection pool if this validator created it."""
+        if self._own_client is not None:
+            await self._own_client.aclose()
+            self._own_client = None
+
+    async def check(self, url: str, timeout: float) -> Optional[HLSProbeResult]:
+        try:
+            return await asyncio.wait_for(self._check(url, timeout), timeout)
+        except asyncio.TimeoutError:
+            return HLSProbeResult(
+                is_valid=False,
+                failure=HLSFailure.TIMEOUT,
+                error_message=f"HLS validation timed out after {timeout}s.",
+            )
+        except _Rejected as exc:
+            return HLSProbeResult(
+                is_valid=False, failure=exc.failure, error_message=str(exc)
+            )
+
+    async def _check(self, url: str, timeout: float) -> Optional[HLSProbeResult]:
+        playlist = await self._fetch_playlist(url, timeout)
+        if playlist is None:
+            return None
+        text, base_url = playlist
+
+        variants = parse_master_playlist(text, base_url)
+        if not variants:
+            # Already a media playlist.
+            return await self._check_media(text, base_url, None, timeout)
+
+        candidates = self._select_variants(variants)
+        outcomes = await asyncio.gather(
+            *(self._check_variant(variant, timeout) for variant in candidates),
+            return_exceptions=True,
+        )
+        valid = [
+            outcome
+            for outcome in outcomes
+            if isinstance(outcome, HLSProbeResult) and outcome.is_valid
+        ]
+        if not valid:
+            for outcome in outcomes:
+                if isinstance(outcome, BaseException):
+                    raise outcome
+            raise _Rejected(HLSFailure.NOT_A_STREAM, "No playable HLS variant.")
+
+        # Report the variant whose segment was actually probed.
+        best = max(valid, key=lambda outcome: outcome.bandwidth or 0)
+        declared = best.variant
+        return HLSProbeResult(
+            is_valid=True,
+            variant=declared,
+            codec_video=(declared and declared.codec_video) or best.codec_video,
+            codec_audio=(declared and declared.codec_audio) or best.codec_audio,
+        )
+
+    def _select_variants(self, variants: Sequence[HLSVariant]) -> List[HLSVariant]:
+        video = [variant for variant in variants if variant.has_video] or list(variants)
+        if self._all_variants:
+            return video
+        return [min(video, key=lambda variant: variant.bandwidth)]
+
+    async def _check_variant(
+        self, variant: HLSVariant, timeout: float
+    ) -> HLSProbeResult:
+        playlist = await self._fetch_playlist(variant.uri, timeout)
+        if playlist is None:
+            raise _Rejected(HLSFailure.NOT_A_STREAM, "Variant is not a playlist.")
+        return await self._check_media(*playlist, variant, timeout)
+
+    async def _check_media(
+        self,
+        text: str,
+        base_url: str,
+        variant: Optional[HLSVariant],
+        timeout: float,
+    ) -> HLSProbeResult:
+        segments = parse_media_playlist(text, base_url)
+        if not segments:
+            raise _Rejected(HLSFailure.NOT_A_STREAM, "Media playlist has no segments.")
+        head = await self._fetch_segment_head(segments[0], timeout)
+
+        if head[:1] == b"\x47":
+            parser = TransportStreamParser()
+            parser.feed(memoryview(head), aligned=True)
+            return HLSProbeResult(
+                is_valid=True,
+                variant=variant,
+                codec_video=parser.video_codec,
+                codec_audio=parser.audio_codec,
+            )
+        if head[4:8] in _FMP4_BOXES:
+            return HLSProbeResult(is_valid=True, variant=variant)
+        raise _Rejected(
+            HLSFailure.NOT_A_STREAM, "First segment is neither MPEG-TS nor fMP4."
+        )
+
+    async def _fetch_playlist(
+        self, url: str, timeout: float
+    ) -> Optional[Tuple[str, str]]:
+        body, final_url = await self._read(url, timeout, limit=_MAX_PLAYLIST_BYTES)
+        text = body.decode("utf-8", errors="replace")
+        if not text.lstrip("\ufeff \r\n\t").startswith("#EXTM3U"):
+            return None
+        return text, final_url
+
+    async def _fetch_segment_head(self, url: str, timeout: float) -> bytes:
+        # A satisfied Range request is read to the end, which keeps the
+        # connection reusable for the next channel on the same origin.
+        headers = {"Range": f"bytes=0-{self._sample_bytes - 1}"}
+        head, _ = await self._read(
+            url, timeout, limit=self._sample_bytes, headers=headers
+        )
+        return head
+
+    async def _read(
+        self,
+        url: str,
+        timeout: float,
+        *,
+        limit: int,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Tuple[bytes, str]:
+        body = b""
+        try:
+            async with self._get_client().stream(
+                "GET", url, headers=headers, timeout=timeout
+            ) as response:
+                if response.status_code >= 400:
+                    raise _Rejected(
+                        HLSFailure.NOT_A_STREAM,
+                        f"HTTP status {response.status_code} for {response.url}.",
+                    )
+                async for chunk in response.aiter_bytes():
+                    body += chunk
+                    if len(body) >= limit:
+                        break
+                final_url = str(response.url)
+        except httpx.TimeoutException as exc:
+            raise _Rejected(
+                HLSFailure.TIMEOUT, f"HLS request timed out: {url}"
+            ) from exc
+        except (httpx.HTTPError, httpx.InvalidURL) as exc:
+            # Redirect loops, undecodable bodies and malformed URLs are
+            # verdicts for this channel, not reasons to abort the scan.
+            raise _Rejected(
+                HLSFailure.UNREACHABLE, f"HLS request failed: {exc!r}"
+            ) from exc
+        return body[:limit], final_url
+
+
+__all__ = [
+    "HLSFailure",
+    "HLSProbeResult",
+    "HLSValidator",
+    "HLSVariant",
+    "is_hls_url",
+    "parse_master_playlist",
+    "parse_media_playlist",
+]
@@ -0,0 +1,141 @@
+"""Remember unreachable hosts and ports so later targets skip the probe."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from iptv_sniffer.utils.config import AppConfig
+
+from .validator import ErrorCategory, StreamValidationResult, is_connect_failure
+
+_DEFAULT_PORTS = {"http": 80, "https": 443, "rtsp": 554}
+
+
+@dataclass
+class _HostRecord:
+    # port -> (category, message, expires_at)
+    ports: Dict[int, Tuple[ErrorCategory, str, float]] = field(default_factory=dict)
+    host_expires_at: float = 0.0
+
+
+class HostFailureCache:
+    """
+    Short-circuit targets on hosts that just failed to answer.
+
+    Results that failed to connect at all (refused, no route, unresolvable;
+    see :func:`is_connect_failure`) mark their ``host:port`` as failed for
+    ``window`` seconds, so other paths on the same port are answered with a
+    synthetic ``NETWORK_UNREACHABLE`` result instead of a full probe. Once
+    ``host_threshold`` distinct ports of a host have failed, the whole host
+    is skipped for the rest of the window, which covers the remaining ports
+    of a dead address. A valid result on a host
+    clears its records. At most ``max_hosts`` hosts are tracked; the least
+    recently touched one is evicted first.
+    """
+
+    def __init__(
+        self,
+        *,
+        window: float = 60.0,
+        host_threshold: int = 2,
+        max_hosts: int = 4096,
+    ) -> None:
+        if window <= 0:
+            raise ValueError("window must be positive")
+        if host_threshold < 1:
+            raise ValueError("host_threshold must be at least 1")
+        self._window = window
+        self._host_threshold = host_threshold
+        self._max_hosts = max_hosts
+        self._hosts: "OrderedDict[str, _HostRecord]" = OrderedDict()
+        self.skipped = 0
+
+    @classmethod
+    def from_config(cls, config: AppConfig) -> Optional["HostFailureCache"]:
+        """Build the cache from settings; ``None`` when the window is 0."""
+        if config.host_failure_window <= 0:
+            return None
+        return cls(
+            window=config.host_failure_window,
+            host_threshold=config.host_failure_threshold,
+        )
+
+    def check(self, url: str) -> Optional[StreamValidationResult]:
+        """Return a synthetic failure when ``url``'s host or port is known dead."""
+        target = self._target(url)
+        if target is None:
+            return None
+        host, port = target
+        record = self._hosts.get(host)
+        if record is None:
+            return None
+
+        now = time.monotonic()
+        if record.host_expires_at > now:
+            reason = f"host {host} is unreachable"
+        else:
+            entry = record.ports.get(port)
+            if entry is None or entry[2] <= now:
+                return None
+            reason = f"{host}:{port} failed with {entry[0].value}: {entry[1]}"
+        self.skipped += 1
+        return StreamValidationResult(
+            url=url,
+            protocol=urlparse(url).scheme.lower() or "unknown",
+            is_valid=False,
+            error_category=ErrorCategory.NETWORK_UNREACHABLE,
+            error_message=f"Skipped: {reason}.",
+        )
+
+    def record(self, result: StreamValidationResult) -> None:
+        """Update the records of ``result``'s host from a final result."""
+        target = self._target(result.url)
+        if target is None:
+            return
+        host, port = target
+        if result.is_valid:
+            self._hosts.pop(host, None)
+            return
+        if not is_connect_failure(result):
+            return
+
+        now = time.monotonic()
+        record = self._hosts.get(host)
+        if record is None:
+            record = self._hosts[host] = _HostRecord()
+            if len(self._hosts) > self._max_hosts:
+                self._hosts.popitem(last=False)
+        else:
+            self._hosts.move_to_end(host)
+        record.ports = {
+            known: entry for known, entry in record.ports.items() if entry[2] > now
+        }
+        assert result.error_category is not None
+        record.ports[port] = (
+            result.error_category,
+            result.error_message or "",
+            now + self._window,
+        )
+        if len(record.ports) >= self._host_threshold:
+            record.host_expires_at = now + self._window
+
+    @staticmethod
+    def _target(url: str) -> Optional[Tuple[str, int]]:
+        parsed = urlparse(url)
+        try:
+            port = parsed.port
+        except ValueError:
+            return None
+        host = parsed.hostname
+        if not host:
+            return None
+        if port is None:
+            port = _DEFAULT_PORTS.get(parsed.scheme.lower(), 0)
+        return host.lower(), port
+
+
+__all__ = ["HostFailureCache"]
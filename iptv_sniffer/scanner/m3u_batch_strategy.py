@@ -0,0 +1,51 @@
+"""Batch re-validation of channels from a playlist or the channel repository."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Iterable, List, Optional, Union
+
+from iptv_sniffer.channel.models import ValidationStatus
+
+from .strategy import ScanStrategy
+
+if TYPE_CHECKING:
+    from iptv_sniffer.storage.base import ChannelRepository
+
+
+class M3UBatchScanStrategy(ScanStrategy):
+    """
+    Yield the stream URLs of an existing channel list.
+
+    Duplicate URLs are probed once, in order of first appearance. Use
+    :meth:`from_repository` to re-validate stored channels, optionally
+    narrowed by group or validation status.
+    """
+
+    def __init__(self, urls: Iterable[str]) -> None:
+        self._urls: List[str] = list(dict.fromkeys(url.strip() for url in urls))
+
+    @classmethod
+    async def from_repository(
+        cls,
+        repository: "ChannelRepository",
+        *,
+        group: Optional[str] = None,
+        status: Optional[ValidationStatus] = None,
+    ) -> "M3UBatchScanStrategy":
+        filters: Dict[str, Union[str, ValidationStatus]] = {}
+        if group is not None:
+            filters["group"] = group
+        if status is not None:
+            filters["validation_status"] = status
+        channels = await repository.find_all(filters)
+        return cls(channel.url for channel in channels)
+
+    def estimate_target_count(self) -> int:
+        return len(self._urls)
+
+    async def generate_targets(self) -> AsyncIterator[str]:
+        for url in self._urls:
+            yield url
+
+
+__all__ = ["M3UBatchScanStrategy"]
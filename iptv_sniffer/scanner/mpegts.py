@@ -0,0 +1,516 @@
+"""Pure-Python MPEG-TS analysis for HTTP streams, without spawning ffprobe."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from iptv_sniffer.utils.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+TS_PACKET_SIZE = 188
+_SYNC_BYTE = 0x47
+_PAT_PID = 0x0000
+_NULL_PID = 0x1FFF
+# Give up on a body that shows no TS sync pattern within this many bytes.
+_SYNC_SEARCH_LIMIT = TS_PACKET_SIZE * 10
+# Cap on the video elementary stream bytes kept while looking for headers.
+_MAX_ES_BYTES = 256 * 1024
+# Bytes of a parameter set that are always enough to read the picture size.
+_PARAMETER_SET_WINDOW = 512
+
+_VIDEO_STREAM_TYPES: Dict[int, str] = {
+    0x01: "mpeg1video",
+    0x02: "mpeg2video",
+    0x10: "mpeg4",
+    0x1B: "h264",
+    0x24: "hevc",
+    0x42: "cavs",
+    0xEA: "vc1",
+}
+_AUDIO_STREAM_TYPES: Dict[int, str] = {
+    0x03: "mp2",
+    0x04: "mp2",
+    0x0F: "aac",
+    0x11: "aac_latm",
+    0x81: "ac3",
+    0x87: "eac3",
+}
+# DVB descriptors that mark a private (0x06) stream as AC-3 / E-AC-3 audio.
+_AUDIO_DESCRIPTORS: Dict[int, str] = {0x6A: "ac3", 0x7A: "eac3"}
+_H264_HIGH_PROFILES = frozenset({100, 110, 122, 244, 44, 83, 86, 118, 128, 138, 139})
+
+
+@dataclass(frozen=True)
+class TSStreamInfo:
+    """Video/audio properties extracted from the start of a transport stream."""
+
+    codec_video: str
+    width: int
+    height: int
+    codec_audio: Optional[str] = None
+
+    @property
+    def resolution(self) -> str:
+        return f"{self.width}x{self.height}"
+
+
+class _BitReader:
+    """MSB-first bit reader with Exp-Golomb support for H.264/HEVC headers."""
+
+    def __init__(self, data: bytes) -> None:
+        self._data = data
+        self._pos = 0
+
+    def bits(self, count: int) -> int:
+        value = 0
+        for _ in range(count):
+            byte = self._data[self._pos >> 3]
+            value = (value << 1) | ((byte >> (7 - (self._pos & 7))) & 1)
+            self._pos += 1
+        return value
+
+    def skip(self, count: int) -> None:
+        self._pos += count
+
+    def ue(self) -> int:
+        zeros = 0
+        while self.bits(1) == 0:
+            zeros += 1
+            if zeros > 31:
+                raise ValueError("invalid Exp-Golomb code")
+        return (1 << zeros) - 1 + self.bits(zeros)
+
+    def se(self) -> int:
+        value = self.ue()
+        return (value + 1) // 2 if value & 1 else -(value // 2)
+
+
+def _unescape_rbsp(data: bytes) -> bytes:
+    """Remove emulation prevention bytes (``00 00 03``) from a NAL unit."""
+    return data.replace(b"\x00\x00\x03", b"\x00\x00")
+
+
+def _parse_h264_sps(nal: bytes) -> Tuple[int, int]:
+    """Return (width, height) from an H.264 SPS NAL unit, header byte included."""
+    reader = _BitReader(_unescape_rbsp(nal[1:]))
+    profile_idc = reader.bits(8)
+    reader.skip(16)  # constraint flags, level_idc
+    reader.ue()  # seq_parameter_set_id
+    chroma_format_idc = 1
+    separate_colour_plane = 0
+    if profile_idc in _H264_HIGH_PROFILES:
+        chroma_format_idc = reader.ue()
+        if chroma_format_idc == 3:
+            separate_colour_plane = reader.bits(1)
+        reader.ue()  # bit_depth_luma_minus8
+        reader.ue()  # bit_depth_chroma_minus8
+        reader.skip(1)  # qpprime_y_zero_transform_bypass_flag
+        if reader.bits(1):  # seq_scaling_matrix_present_flag
+            for index in range(8 if chroma_format_idc != 3 else 12):
+                if reader.bits(1):
+                    _skip_scaling_list(reader, 16 if index < 6 else 64)
+    reader.ue()  # log2_max_frame_num_minus4
+    pic_order_cnt_type = reader.ue()
+    if pic_order_cnt_type == 0:
+        reader.ue()
+    elif pic_order_cnt_type == 1:
+        reader.skip(1)
+        reader.se()
+        reader.se()
+        for _ in range(reader.ue()):
+            reader.se()
+    reader.ue()  # max_num_ref_frames
+    reader.skip(1)  # gaps_in_frame_num_value_allowed_flag
+    width_mbs = reader.ue() + 1
+    height_map_units = reader.ue() + 1
+    frame_mbs_only = reader.bits(1)
+    if not frame_mbs_only:
+        reader.skip(1)  # mb_adaptive_frame_field_flag
+    reader.skip(1)  # direct_8x8_inference_flag
+    width = width_mbs * 16
+    height = (2 - frame_mbs_only) * height_map_units * 16
+    if reader.bits(1):  # frame_cropping_flag
+        left, right, top, bottom = (reader.ue() for _ in range(4))
+        if separate_colour_plane or chroma_format_idc == 0:
+            crop_x, crop_y = 1, 2 - frame_mbs_only
+        else:
+            crop_x = 2 if chroma_format_idc in (1, 2) else 1
+            crop_y = (2 if chroma_format_idc == 1 else 1) * (2 - frame_mbs_only)
+        width -= (left + right) * crop_x
+        height -= (top + bottom) * crop_y
+    return width, height
+
+
+def _skip_scaling_list(reader: _BitReader, size: int) -> None:
+    last_scale = next_scale = 8
+    for _ in range(size):
+        if next_scale:
+            next_scale = (last_scale + reader.se() + 256) % 256
+        last_scale = next_scale or last_scale
+
+
+def _parse_hevc_sps(nal: bytes) -> Tuple[int, int]:
+    """Return (width, height) from an HEVC SPS NAL unit, 2-byte header included."""
+    reader = _BitReader(_unescape_rbsp(nal[2:]))
+    reader.skip(4)  # sps_video_parameter_set_id
+    max_sub_layers_minus1 = reader.bits(3)
+    reader.skip(1)  # sps_temporal_id_nesting_flag
+    # profile_tier_level: general profile (88 bits) + general_level_idc.
+    reader.skip(96)
+    sub_layer_flags = [
+        (reader.bits(1), reader.bits(1)) for _ in range(max_sub_layers_minus1)
+    ]
+    if max_sub_layers_minus1 > 0:
+        reader.skip(2 * (8 - max_sub_layers_minus1))
+    for profile_present, level_present in sub_layer_flags:
+        reader.skip(88 * profile_present + 8 * level_present)
+    reader.ue()  # sps_seq_parameter_set_id
+    chroma_format_idc = reader.ue()
+    separate_colour_plane = reader.bits(1) if chroma_format_idc == 3 else 0
+    width = reader.ue()
+    height = reader.ue()
+    if reader.bits(1):  # conformance_window_flag
+        left, right, top, bottom = (reader.ue() for _ in range(4))
+        if separate_colour_plane or chroma_format_idc == 0:
+            crop_x = crop_y = 1
+        else:
+            crop_x = 2 if chroma_format_idc in (1, 2) else 1
+            crop_y = 2 if chroma_format_idc == 1 else 1
+        width -= (left + right) * crop_x
+        height -= (top + bottom) * crop_y
+    return width, height
+
+
+class TransportStreamParser:
+    """
+    Incremental parser for the head of an MPEG-TS byte stream.
+
+    :meth:`feed` walks whole 188-byte packets through ``memoryview`` slices of
+    the caller's buffer, follows PAT -> PMT to the first video PID and
+    assembles only that PID's elementary stream until a sequence parameter
+    set (H.264/HEVC) or sequence header (MPEG-1/2) reveals the picture size.
+    """
+
+    def __init__(self) -> None:
+        self.info: Optional[TSStreamInfo] = None
+        self.failed = False
+        self._synced = False
+        self._pmt_pid: Optional[int] = None
+        self._pmt_parsed = False
+        self._video_pid: Optional[int] = None
+        self._video_codec: Optional[str] = None
+        self._audio_codec: Optional[str] = None
+        self._es = bytearray()
+        self._es_started = False
+        self._search_from = 0
+
+    @property
+    def done(self) -> bool:
+        return self.info is not None or self.failed
+
+    @property
+    def synced(self) -> bool:
+        """True once TS packet alignment has been found."""
+        return self._synced
+
+    @property
+    def has_program_map(self) -> bool:
+        """True once the PMT of the first program has been parsed."""
+        return self._pmt_parsed
+
+    @property
+    def video_codec(self) -> Optional[str]:
+        return self._video_codec
+
+    @property
+    def audio_codec(self) -> Optional[str]:
+        return self._audio_codec
+
+    def feed(self, data: memoryview, *, aligned: bool = False) -> int:
+        """
+        Parse complete packets in ``data``; return the bytes consumed.
+
+        ``aligned`` declares that ``data`` starts on a packet boundary, as a
+        datagram payload does, so no sync search over several packets is needed.
+        """
+        if aligned and len(data) and data[0] == _SYNC_BYTE:
+            self._synced = True
+        offset = 0
+        end = len(data)
+        while not self.done:
+            if not self._synced:
+                found = self._find_sync(data[offset:])
+                if found is None:
+                    if end - offset >= _SYNC_SEARCH_LIMIT:
+                        self.failed = True
+                    break
+                offset += found
+                self._synced = True
+            if end - offset < TS_PACKET_SIZE:
+                break
+            if data[offset] != _SYNC_BYTE:
+                self._synced = False
+                continue
+            try:
+                self._parse_packet(data[offset : offset + TS_PACKET_SIZE])
+            except (IndexError, ValueError) as exc:
+                logger.debug("Malformed transport stream packet: %s", exc)
+                self.failed = True
+            offset += TS_PACKET_SIZE
+        return offset
+
+    @staticmethod
+    def _find_sync(data: memoryview) -> Optional[int]:
+        limit = min(len(data), _SYNC_SEARCH_LIMIT) - 2 * TS_PACKET_SIZE
+        for index in range(max(limit, 0)):
+            if (
+                data[index] == _SYNC_BYTE
+                and data[index + TS_PACKET_SIZE] == _SYNC_BYTE
+                and data[index + 2 * TS_PACKET_SIZE] == _SYNC_BYTE
+            ):
+                return index
+        return None
+
+    def _parse_packet(self, packet: memoryview) -> None:
+        payload_start = bool(packet[1] & 0x40)
+        pid = ((packet[1] & 0x1F) << 8) | packet[2]
+        adaptation = (packet[3] >> 4) & 0x03
+        if pid == _NULL_PID or not adaptation & 0x01:
+            return
+        offset = 4
+        if adaptation & 0x02:
+            offset += 1 + packet[4]
+        if offset >= TS_PACKET_SIZE:
+            return
+        payload = packet[offset:]
+
+        if pid == _PAT_PID and payload_start and self._pmt_pid is None:
+            self._parse_pat(self._section(payload))
+        elif pid == self._pmt_pid and payload_start and self._video_pid is None:
+            self._parse_pmt(self._section(payload))
+        elif pid == self._video_pid:
+            self._append_video(payload, payload_start)
+
+    @staticmethod
+    def _section(payload: memoryview) -> memoryview:
+        start = 1 + payload[0]  # pointer_field
+        section_length = ((payload[start + 1] & 0x0F) << 8) | payload[start + 2]
+        # From table_id up to, but excluding, the trailing CRC32.
+        return payload[start : start + 3 + section_length - 4]
+
+    def _parse_pat(self, section: memoryview) -> None:
+        if section[0] != 0x00:
+            return
+        for offset in range(8, len(section) - 3, 4):
+            program_number = (section[offset] << 8) | section[offset + 1]
+            if program_number != 0:
+                self._pmt_pid = ((section[offset + 2] & 0x1F) << 8) | section[
+                    offset + 3
+                ]
+                return
+
+    def _parse_pmt(self, section: memoryview) -> None:
+        if section[0] != 0x02:
+            return
+        self._pmt_parsed = True
+        program_info_length = ((section[10] & 0x0F) << 8) | section[11]
+        offset = 12 + program_info_length
+        while offset + 5 <= len(section):
+            stream_type = section[offset]
+            pid = ((section[offset + 1] & 0x1F) << 8) | section[offset + 2]
+            es_info_length = ((section[offset + 3] & 0x0F) << 8) | section[offset + 4]
+            descriptors = section[offset + 5 : offset + 5 + es_info_length]
+            offset += 5 + es_info_length
+
+            if stream_type in _VIDEO_STREAM_TYPES and self._video_pid is None:
+                self._video_pid = pid
+                self._video_codec = _VIDEO_STREAM_TYPES[stream_type]
+            elif self._audio_codec is None:
+                self._audio_codec = _AUDIO_STREAM_TYPES.get(
+                    stream_type
+                ) or self._descriptor_audio_codec(descriptors)
+
+        if self._video_pid is None:
+            # No video in the program map; let ffprobe give the verdict.
+            self.failed = True
+
+    @staticmethod
+    def _descriptor_audio_codec(descriptors: memoryview) -> Optional[str]:
+        offset = 0
+        while offset + 2 <= len(descriptors):
+            tag = descriptors[offset]
+            if tag in _AUDIO_DESCRIPTORS:
+                return _AUDIO_DESCRIPTORS[tag]
+            offset += 2 + descriptors[offset + 1]
+        return None
+
+    def _append_video(self, payload: memoryview, payload_start: bool) -> None:
+        if payload_start:
+            if bytes(payload[:3]) != b"\x00\x00\x01":
+                return
+            payload = payload[9 + payload[8] :]  # skip the PES header
+            self._es_started = True
+        if not self._es_started:
+            return
+        self._es += payload
+        self._extract_picture_size()
+        if self.info is None and len(self._es) >= _MAX_ES_BYTES:
+            self.failed = True
+
+    def _extract_picture_size(self) -> None:
+        codec = self._video_codec
+        es = self._es
+        if codec in ("mpeg1video", "mpeg2video"):
+            start = es.find(b"\x00\x00\x01\xb3", self._search_from)
+            if start < 0:
+                self._search_from = max(len(es) - 3, 0)
+                return
+            if len(es) < start + 7:
+                self._search_from = start
+                return
+            size = es[start + 4 : start + 7]
+            width = (size[0] << 4) | (size[1] >> 4)
+            height = ((size[1] & 0x0F) << 8) | size[2]
+            self._finish(width, height)
+            return
+        if codec not in ("h264", "hevc"):
+            # Picture size is not parsed for this codec; ffprobe decides.
+            self.failed = True
+            return
+
+        while True:
+            start = es.find(b"\x00\x00\x01", self._search_from)
+            if start < 0 or start + 3 >= len(es):
+                self._search_from = max(len(es) - 3, 0)
+                return
+            header = es[start + 3]
+            is_sps = (
+                header & 0x1F == 7 if codec == "h264" else (header >> 1) & 0x3F == 33
+            )
+            if not is_sps:
+                self._search_from = start + 3
+                continue
+            end = es.find(b"\x00\x00\x01", start + 3)
+            if end < 0:
+                if len(es) - start < _PARAMETER_SET_WINDOW:
+                    self._search_from = start
+                    return  # wait for the rest of the SPS
+                end = start + _PARAMETER_SET_WINDOW
+            nal = bytes(es[start + 3 : end])
+            parse = _parse_h264_sps if codec == "h264" else _parse_hevc_sps
+            self._finish(*parse(nal))
+            return
+
+    def _finish(self, width: int, height: int) -> None:
+        if width <= 0 or height <= 0 or self._video_codec is None:
+            self.failed = True
+            return
+        self.info = TSStreamInfo(
+            codec_video=self._video_codec,
+            width=width,
+            height=height,
+            codec_audio=self._audio_codec,
+        )
+
+
+def parse_transport_stream(data: bytes) -> Optional[TSStreamInfo]:
+    """Analyse a complete buffer; ``None`` when the result is inconclusive."""
+    parser = TransportStreamParser()
+    view = memoryview(data)
+    offset = 0
+    while not parser.done and offset < len(view):
+        consumed = parser.feed(view[offset:])
+        if consumed == 0:
+            break
+        offset += consumed
+    return parser.info
+
+
+class MPEGTSAnalyzer:
+    """
+    Fetch the head of an HTTP stream and analyse it in-process.
+
+    Up to ``max_bytes`` of the response body are streamed into a pooled
+    ``bytearray`` that is reused across probes, and parsed incrementally as
+    chunks arrive. The download stops as soon as the stream is identified.
+    Requests go through ``client``, else the application's shared client
+    (see :func:`~iptv_sniffer.utils.http_client.get_http_client`), else a
+    short-lived client per probe.
+    :meth:`analyze` returns ``None`` whenever the answer is not conclusive
+    (non-TS body, HTTP error, unsupported codec, timeout) so callers can fall
+    back to ffprobe.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int = 512 * 1024,
+        client: Optional[httpx.AsyncClient] = None,
+        pool_size: int = 16,
+    ) -> None:
+        if max_bytes < TS_PACKET_SIZE * 3:
+            raise ValueError("max_bytes must hold at least three TS packets")
+        self._max_bytes = max_bytes
+        self._client = client
+        self._pool_size = pool_size
+        self._buffers: List[bytearray] = []
+
+    async def analyze(self, url: str, timeout: float) -> Optional[TSStreamInfo]:
+        buffer = self._buffers.pop() if self._buffers else bytearray(self._max_bytes)
+        try:
+            return await asyncio.wait_for(self._fetch(url, timeout, buffer), timeout)
+        except Exception as exc:  # pylint: disable=broad-except
+            # Any failure here only means ffprobe has to answer instead.
+            logger.debug("Native TS analysis inconclusive for %s: %r", url, exc)
+            return None
+        finally:
+            if len(self._buffers) < self._pool_size:
+                self._buffers.append(buffer)
+
+    async def _fetch(
+        self, url: str, timeout: float, buffer: bytearray
+    ) -> Optional[TSStreamInfo]:
+        client = self._client or get_http_client()
+        if client is not None:
+            return await self._read(client, url, timeout, buffer)
+        async with httpx.AsyncClient(timeout=timeout, follow_redirects=True) as client:
+            return await self._read(client, url, timeout, buffer)
+
+    async def _read(
+        self, client: httpx.AsyncClient, url: str, timeout: float, buffer: bytearray
+    ) -> Optional[TSStreamInfo]:
+        parser = TransportStreamParser()
+        view = memoryview(buffer)
+        filled = parsed = 0
+        try:
+            async with client.stream("GET", url, timeout=timeout) as response:
+                if response.status_code >= 400:
+                    return None
+                async for chunk in response.aiter_bytes():
+                    count = min(len(chunk), self._max_bytes - filled)
+                    view[filled : filled + count] = memoryview(chunk)[:count]
+                    filled += count
+                    while not parser.done:
+                        consumed = parser.feed(view[parsed:filled])
+                        if consumed == 0:
+                            break
+                        parsed += consumed
+                    if parser.done or filled >= self._max_bytes:
+                        break
+        finally:
+            view.release()
+        return parser.info
+
+
+__all__ = [
+    "MPEGTSAnalyzer",
+    "TSStreamInfo",
+    "TransportStreamParser",
+    "parse_transport_stream",
+]
@@ -0,0 +1,189 @@
+"""Native asyncio listener that verdicts RTP/UDP multicast streams without ffprobe."""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+import socket
+import struct
+from dataclasses import dataclass
+from typing import Optional, Tuple
+from urllib.parse import urlparse
+
+from .mpegts import TS_PACKET_SIZE, TransportStreamParser, TSStreamInfo
+
+logger = logging.getLogger(__name__)
+
+_RTP_VERSION = 2
+_RTP_HEADER_SIZE = 12
+_TS_SYNC_BYTE = 0x47
+_RECEIVE_BUFFER = 1 << 20
+
+
+def strip_rtp_header(datagram: memoryview) -> memoryview:
+    """
+    Return the payload of an RTP datagram, or the datagram itself.
+
+    Datagrams that already start with a TS sync byte are raw UDP transport
+    streams and are returned unchanged.
+    """
+    if (
+        len(datagram) <= _RTP_HEADER_SIZE
+        or datagram[0] == _TS_SYNC_BYTE
+        or datagram[0] >> 6 != _RTP_VERSION
+    ):
+        return datagram
+    first = datagram[0]
+    offset = _RTP_HEADER_SIZE + 4 * (first & 0x0F)  # CSRC identifiers
+    if first & 0x10 and len(datagram) >= offset + 4:  # header extension
+        offset += 4 + 4 * ((datagram[offset + 2] << 8) | datagram[offset + 3])
+    end = len(datagram)
+    if first & 0x20:  # padding; the last byte holds its length
+        end -= datagram[-1]
+    return datagram[offset:end] if offset < end else datagram[:0]
+
+
+@dataclass(frozen=True)
+class DatagramVerdict:
+    """What a multicast listener observed before its deadline."""
+
+    datagrams: int
+    transport_stream: bool
+    program_map: bool
+    video_codec: Optional[str] = None
+    audio_codec: Optional[str] = None
+    info: Optional[TSStreamInfo] = None
+
+
+class _ListenerProtocol(asyncio.DatagramProtocol):
+    def __init__(self, parser: TransportStreamParser, need_picture_size: bool):
+        self.parser = parser
+        self.datagrams = 0
+        self.finished = asyncio.Event()
+        self._need_picture_size = need_picture_size
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        self.datagrams += 1
+        if self.finished.is_set():
+            return
+        payload = strip_rtp_header(memoryview(data))
+        if len(payload) >= TS_PACKET_SIZE:
+            self.parser.feed(payload, aligned=True)
+        parser = self.parser
+        if parser.done or (
+            not self._need_picture_size and parser.video_codec is not None
+        ):
+            self.finished.set()
+
+    def error_received(self, exc: Exception) -> None:
+        logger.debug("Multicast listener socket error: %s", exc)
+
+
+class MulticastProbe:
+    """
+    Join a multicast group and verdict the stream from its first datagrams.
+
+    The listener binds ``group:port``, joins the group with
+    ``IP_ADD_MEMBERSHIP`` on ``interface``, strips RTP headers and feeds the
+    payload to :class:`~iptv_sniffer.scanner.mpegts.TransportStreamParser`.
+    It returns as soon as the PMT shows a video stream (or, with
+    ``need_picture_size``, once the resolution is known) and otherwise when
+    ``timeout`` expires. Each probe owns one non-blocking socket on the event
+    loop, so thousands of groups can be probed concurrently without threads
+    or subprocesses.
+
+    Unicast addresses are bound without joining a group, which lets tests use
+    a local UDP sender as a stand-in for a multicast source.
+    """
+
+    def __init__(self, *, timeout: float = 0.5, interface: str = "0.0.0.0") -> None:
+        if timeout <= 0:
+            raise ValueError("timeout must be positive")
+        self._timeout = timeout
+        self._interface = interface
+
+    @property
+    def timeout(self) -> float:
+        return self._timeout
+
+    async def listen(
+        self, url: str, *, need_picture_size: bool = False
+    ) -> Optional[DatagramVerdict]:
+        """
+        Listen on the group referenced by ``url``.
+
+        Returns ``None`` when the URL has no usable address or the socket
+        cannot be set up, so the caller can fall back to ffprobe.
+        """
+        target = self._parse_target(url)
+        if target is None:
+            return None
+        try:
+            sock = self._open_socket(*target)
+        except OSError as exc:
+            logger.debug("Cannot listen on %s: %s", url, exc)
+            return None
+
+        loop = asyncio.get_running_loop()
+        parser = TransportStreamParser()
+        transport, protocol = await loop.create_datagram_endpoint(
+            lambda: _ListenerProtocol(parser, need_picture_size), sock=sock
+        )
+        try:
+            try:
+                await asyncio.wait_for(protocol.finished.wait(), self._timeout)
+            except asyncio.TimeoutError:
+                pass
+        finally:
+            transport.close()
+
+        return DatagramVerdict(
+            datagrams=protocol.datagrams,
+            transport_stream=parser.synced,
+            program_map=parser.has_program_map,
+            video_codec=parser.video_codec,
+            audio_codec=parser.audio_codec,
+            info=parser.info,
+        )
+
+    @staticmethod
+    def _parse_target(url: str) -> Optional[Tuple[str, int]]:
+        parsed = urlparse(url)
+        try:
+            port = parsed.port
+            address = ipaddress.IPv4Address(parsed.hostname or "")
+        except ValueError:
+            return None
+        if port is None:
+            return None
+        return str(address), port
+
+    def _open_socket(self, address: str, port: int) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if hasattr(socket, "SO_REUSEPORT"):
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _RECEIVE_BUFFER)
+            if ipaddress.IPv4Address(address).is_multicast:
+                try:
+                    # Binding the group address keeps other groups on the
+                    # same port out of this socket.
+                    sock.bind((address, port))
+                except OSError:
+                    sock.bind(("", port))
+                membership = struct.pack(
+                    "4s4s", socket.inet_aton(address), socket.inet_aton(self._interface)
+                )
+                sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+            else:
+                sock.bind((address, port))
+            sock.setblocking(False)
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+
+__all__ = ["DatagramVerdict", "MulticastProbe", "strip_rtp_header"]
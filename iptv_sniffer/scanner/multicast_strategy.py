@@ -1,13 +1,19 @@
 from __future__ import annotations
 
 import ipaddress
-from typing import AsyncIterator, Iterable, List, Sequence, Tuple
+from typing import AsyncIterator, Iterable, List, Optional, Sequence, Tuple
 
+from .multicast_sweep import MulticastSweeper
 from .strategy import ScanStrategy
 
 
 class MulticastScanStrategy(ScanStrategy):
-    """Scan strategy that enumerates multicast RTP/UDP stream endpoints."""
+    """
+    Scan strategy that enumerates multicast RTP/UDP stream endpoints.
+
+    With a ``sweeper`` only groups that sent traffic during the sweep are
+    yielded, so :meth:`estimate_target_count` becomes an upper bound.
+    """
 
     _SUPPORTED_PROTOCOLS = {"udp", "rtp"}
 
@@ -17,6 +23,7 @@ class MulticastScanStrategy(ScanStrategy):
         protocol: str,
         ip_ranges: Sequence[str],
         ports: Sequence[int],
+        sweeper: Optional[MulticastSweeper] = None,
     ) -> None:
         if protocol.lower() not in self._SUPPORTED_PROTOCOLS:
             raise ValueError(
@@ -37,6 +44,7 @@ class MulticastScanStrategy(ScanStrategy):
         self._ports: Tuple[int, ...] = tuple(
             self._validate_port(port) for port in ports
         )
+        self.sweeper = sweeper
 
     @property
     def protocol(self) -> str:
@@ -50,6 +58,13 @@ class MulticastScanStrategy(ScanStrategy):
 
     async def generate_targets(self) -> AsyncIterator[str]:
         """Yield multicast targets for validation."""
+        if self.sweeper is not None:
+            addresses = (str(address) for address in self.iter_ip_addresses())
+            async for address, port in self.sweeper.sweep_targets(
+                addresses, self._ports
+            ):
+                yield f"{self._protocol}://{address}:{port}"
+            return
         for start, end in self._ranges:
             for address in self._iterate_range(start, end):
                 for port in self._ports:
@@ -0,0 +1,252 @@
+"""Sweep many multicast groups per port through one shared socket."""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+import socket
+import struct
+import sys
+from pathlib import Path
+from typing import AsyncIterator, Iterable, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+_IGMP_MAX_MEMBERSHIPS_PATH = Path("/proc/sys/net/ipv4/igmp_max_memberships")
+# Linux default for net.ipv4.igmp_max_memberships.
+_DEFAULT_MAX_MEMBERSHIPS = 20
+# Linux value of IP_MULTICAST_ALL; the socket module does not export it.
+_IP_MULTICAST_ALL = getattr(
+    socket, "IP_MULTICAST_ALL", 49 if sys.platform.startswith("linux") else None
+)
+_IP_PKTINFO = getattr(socket, "IP_PKTINFO", None)
+# Only the ancillary data matters; the payload is truncated to one byte.
+_PAYLOAD_BYTES = 1
+_ANCILLARY_BYTES = socket.CMSG_SPACE(12) if hasattr(socket, "CMSG_SPACE") else 64
+
+
+def read_igmp_max_memberships(path: Path = _IGMP_MAX_MEMBERSHIPS_PATH) -> int:
+    """Return the kernel's per-socket multicast membership limit."""
+    try:
+        return max(1, int(path.read_text().strip()))
+    except (OSError, ValueError):
+        return _DEFAULT_MAX_MEMBERSHIPS
+
+
+class MulticastSweeper:
+    """
+    Find which multicast groups carry traffic, many groups per wait window.
+
+    For every port a single UDP socket is bound to ``INADDR_ANY:port`` and
+    joined to a batch of groups at once (at most ``max_memberships``, the
+    kernel's ``igmp_max_memberships`` by default). Arriving datagrams are
+    attributed to their group by the destination address reported through
+    ``IP_PKTINFO``, so one ``window`` covers the whole batch; a batch ends
+    early once every group in it has been heard from. Ports are swept
+    concurrently.
+
+    Without ``IP_PKTINFO`` (non-Linux platforms) datagrams cannot be
+    demultiplexed and each batch holds a single group.
+
+    Unicast addresses are accepted without joining, which lets tests drive
+    the sweeper with local UDP senders on ``127.0.0.0/8``.
+    """
+
+    def __init__(
+        self,
+        *,
+        window: float = 1.0,
+        interface: str = "0.0.0.0",
+        max_memberships: Optional[int] = None,
+    ) -> None:
+        if window <= 0:
+            raise ValueError("window must be positive")
+        if max_memberships is not None and max_memberships < 1:
+            raise ValueError("max_memberships must be at least 1")
+        self._window = window
+        self._interface = interface
+        self._batch_size = (
+            max_memberships
+            if max_memberships is not None
+            else read_igmp_max_memberships()
+        )
+        if _IP_PKTINFO is None:
+            self._batch_size = 1
+
+    @property
+    def batch_size(self) -> int:
+        return self._batch_size
+
+    async def sweep_targets(
+        self, addresses: Iterable[str], ports: Sequence[int]
+    ) -> AsyncIterator[Tuple[str, int]]:
+        """
+        Yield ``(address, port)`` for every group that sent a datagram.
+
+        Hits are yielded batch by batch while the sweep continues, so their
+        validation can start early. If a port cannot be swept (e.g. the socket
+        cannot be bound) all of its groups are yielded unfiltered.
+        """
+        groups = list(addresses)
+        hits: asyncio.Queue[Optional[Tuple[str, int]]] = asyncio.Queue()
+
+        async def sweep_port(port: int) -> None:
+            try:
+                async for batch in self._sweep_port(groups, port):
+                    for group in batch:
+                        hits.put_nowait((group, port))
+            finally:
+                hits.put_nowait(None)
+
+        tasks = [asyncio.create_task(sweep_port(port)) for port in ports]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                hit = await hits.get()
+                if hit is None:
+                    remaining -= 1
+                    continue
+                yield hit
+            for task in tasks:
+                await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def sweep(self, groups: Sequence[str], port: int) -> Set[str]:
+        """Return the groups in ``groups`` that carry traffic on ``port``."""
+        responsive: Set[str] = set()
+        async for batch in self._sweep_port(list(groups), port):
+            responsive.update(batch)
+        return responsive
+
+    async def _sweep_port(
+        self, groups: List[str], port: int
+    ) -> AsyncIterator[List[str]]:
+        try:
+            sock = self._open_socket(port)
+        except OSError as exc:
+            logger.warning(
+                "Cannot sweep port %s (%s); probing its groups individually.",
+                port,
+                exc,
+            )
+            yield groups
+            return
+
+        try:
+            for start in range(0, len(groups), self._batch_size):
+                batch = groups[start : start + self._batch_size]
+                yield await self._sweep_batch(sock, batch, port)
+        finally:
+            sock.close()
+
+    async def _sweep_batch(
+        self, sock: socket.socket, batch: List[str], port: int
+    ) -> List[str]:
+        joined: List[str] = []
+        unjoinable: Set[str] = set()
+        for group in batch:
+            if not ipaddress.IPv4Address(group).is_multicast:
+                continue
+            try:
+                sock.setsockopt(
+                    socket.IPPROTO_IP,
+                    socket.IP_ADD_MEMBERSHIP,
+                    self._membership(group),
+                )
+            except OSError as exc:
+                # Leave the verdict to the full probe rather than pruning it.
+                logger.debug("Cannot join %s on port %s: %s", group, port, exc)
+                unjoinable.add(group)
+                continue
+            joined.append(group)
+
+        loop = asyncio.get_running_loop()
+        pending = set(batch) - unjoinable
+        responsive: Set[str] = set()
+        finished = asyncio.Event()
+
+        def drain() -> None:
+            while True:
+                try:
+                    _, ancdata, _, _ = sock.recvmsg(_PAYLOAD_BYTES, _ANCILLARY_BYTES)
+                except (BlockingIOError, InterruptedError):
+                    return
+                except OSError as exc:
+                    logger.debug("Sweep receive failed on port %s: %s", port, exc)
+                    return
+                group = (
+                    self._destination(ancdata) if _IP_PKTINFO is not None else batch[0]
+                )
+                if group in pending:
+                    pending.discard(group)
+                    responsive.add(group)
+                    if not pending:
+                        finished.set()
+
+        loop.add_reader(sock.fileno(), drain)
+        try:
+            if pending:
+                await asyncio.wait_for(finished.wait(), self._window)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            loop.remove_reader(sock.fileno())
+            for group in joined:
+                try:
+                    sock.setsockopt(
+                        socket.IPPROTO_IP,
+                        socket.IP_DROP_MEMBERSHIP,
+                        self._membership(group),
+                    )
+                except OSError:
+                    pass
+        logger.debug(
+            "Swept %d groups on port %s: %d responsive",
+            len(batch),
+            port,
+            len(responsive),
+        )
+        return [group for group in batch if group in responsive or group in unjoinable]
+
+    def _membership(self, group: str) -> bytes:
+        return struct.pack(
+            "4s4s", socket.inet_aton(group), socket.inet_aton(self._interface)
+        )
+
+    @staticmethod
+    def _destination(ancdata: List[Tuple[int, int, bytes]]) -> Optional[str]:
+        for level, kind, data in ancdata:
+            if level == socket.IPPROTO_IP and kind == _IP_PKTINFO and len(data) >= 12:
+                # struct in_pktinfo { int ifindex; in_addr spec_dst; in_addr addr; }
+                _, _, destination = struct.unpack("I4s4s", data[:12])
+                return socket.inet_ntoa(destination)
+        return None
+
+    @staticmethod
+    def _open_socket(port: int) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if hasattr(socket, "SO_REUSEPORT"):
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            if _IP_PKTINFO is not None:
+                sock.setsockopt(socket.IPPROTO_IP, _IP_PKTINFO, 1)
+            if _IP_MULTICAST_ALL is not None:
+                # Only deliver groups joined on this socket, not every group
+                # joined on the host for this port.
+                try:
+                    sock.setsockopt(socket.IPPROTO_IP, _IP_MULTICAST_ALL, 0)
+                except OSError:
+                    pass
+            sock.bind(("", port))
+            sock.setblocking(False)
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+
+__all__ = ["MulticastSweeper", "read_igmp_max_memberships"]
@@ -3,18 +3,95 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import logging
+import time
 from datetime import datetime, timezone
-from typing import AsyncIterator, Awaitable, Callable, List, Optional
+from enum import Enum
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+from urllib.parse import urlparse
 
+from .adaptive_limiter import LimitAdjustment
+from .host_failures import HostFailureCache
 from .rate_limiter import RateLimiter
+from .retry import RetryBudget, RetryPolicy
+from .smart_port_scanner import StreamValidatorProtocol
 from .strategy import ScanStrategy
-from .validator import StreamValidationResult, StreamValidator
+from .token_bucket import HostRateLimiter
+from .validation_cache import ValidationCache
+from .validator import ErrorCategory, ProbeProfile, StreamValidationResult
 
 from pydantic import BaseModel, Field
 
+logger = logging.getLogger(__name__)
+
 ProgressCallback = Callable[["ScanProgress"], Awaitable[None]]
 
 
+class ResultOrdering(str, Enum):
+    """Order in which scan results are yielded to the consumer."""
+
+    COMPLETION = "completion"
+    TARGET = "target"
+
+
+class _WorkerFailure:
+    """Carries an unexpected worker exception back to the consumer."""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+_Target = Optional[Tuple[int, str, int]]
+_QueueItem = Union[Tuple[int, StreamValidationResult], _WorkerFailure, None]
+
+
+class _Dispatch:
+    """
+    Per-scan state shared by the producer, the workers and pending retries.
+
+    ``pending`` counts targets that have been dispatched but have not produced
+    a final result yet, including those waiting for a retry. Workers are only
+    told to stop once the producer is exhausted and nothing is pending, so
+    retries scheduled late in a scan still find a worker.
+    """
+
+    def __init__(self, worker_count: int, budget: Optional[RetryBudget]) -> None:
+        self.targets: asyncio.Queue[_Target] = asyncio.Queue(maxsize=worker_count)
+        self.worker_count = worker_count
+        self.budget = budget
+        self.pending = 0
+        self.producer_done = False
+        self.retry_tasks: Set[asyncio.Task[None]] = set()
+        self.retries = 0
+        self.retries_denied = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.host_skips = 0
+
+    def target_done(self) -> None:
+        self.pending -= 1
+        self.stop_if_drained()
+
+    def stop_if_drained(self) -> None:
+        if self.producer_done and self.pending == 0:
+            # Nothing is queued at this point, so the sentinels always fit.
+            for _ in range(self.worker_count):
+                self.targets.put_nowait(None)
+
+
 class ScanProgress(BaseModel):
     """Represents incremental scan statistics."""
 
@@ -23,24 +100,89 @@ class ScanProgress(BaseModel):
     valid: int = 0
     invalid: int = 0
     started_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    ordering: ResultOrdering = ResultOrdering.COMPLETION
+    retries: int = 0
+    retries_denied: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    host_skips: int = 0
+    reorder_buffer_size: int = 0
+    reorder_buffer_peak: int = 0
+    head_of_line_stall_seconds: float = 0.0
+    concurrency_limit: Optional[int] = None
+    concurrency_history: List[LimitAdjustment] = Field(default_factory=list)
 
     model_config = dict(arbitrary_types_allowed=True)
 
 
+class _ReorderBuffer:
+    """Hold out-of-order results until the next expected index arrives."""
+
+    def __init__(self) -> None:
+        self._pending: Dict[int, StreamValidationResult] = {}
+        self._next_index = 0
+        self._stall_started: Optional[float] = None
+        self.peak = 0
+        self.stall_seconds = 0.0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def push(
+        self, index: int, result: StreamValidationResult
+    ) -> List[StreamValidationResult]:
+        """Store a result and return every result now releasable in order."""
+        now = time.monotonic()
+        self._pending[index] = result
+        released: List[StreamValidationResult] = []
+        while self._next_index in self._pending:
+            released.append(self._pending.pop(self._next_index))
+            self._next_index += 1
+
+        if self._pending:
+            self.peak = max(self.peak, len(self._pending))
+            if self._stall_started is None:
+                self._stall_started = now
+        elif self._stall_started is not None:
+            self.stall_seconds += now - self._stall_started
+            self._stall_started = None
+        return released
+
+
 class ScanOrchestrator:
     """Coordinates scanning strategy execution with rate limiting and validation."""
 
     def __init__(
         self,
-        validator: StreamValidator,
+        validator: StreamValidatorProtocol,
         *,
         max_concurrency: int = 10,
         rate_limiter: Optional[RateLimiter] = None,
+        reorder_window: Optional[int] = None,
+        host_limiter: Optional[HostRateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        probe_profile: Optional[ProbeProfile] = None,
+        reprobe_profile: Optional[ProbeProfile] = None,
+        validation_cache: Optional[ValidationCache] = None,
+        force_refresh: bool = False,
+        host_failures: Optional[HostFailureCache] = None,
+        ordering: ResultOrdering = ResultOrdering.COMPLETION,
     ) -> None:
         self._validator = validator
+        self._ordering = ordering
+        self._probe_profile = probe_profile
+        self._reprobe_profile = reprobe_profile
+        self._validation_cache = validation_cache
+        self._force_refresh = force_refresh
+        self._host_failures = host_failures
+        self._host_limiter = host_limiter
+        self._retry_policy = retry_policy
         self._rate_limiter = rate_limiter or RateLimiter(
             max_concurrency=max_concurrency
         )
+        if reorder_window is not None and reorder_window < 1:
+            raise ValueError("reorder_window must be at least 1")
+        self._reorder_window = reorder_window
         self._callbacks: List[ProgressCallback] = []
 
     def on_progress(self, callback: ProgressCallback) -> None:
@@ -49,24 +191,268 @@ class ScanOrchestrator:
         self._callbacks.append(callback)
 
     async def execute_scan(
-        self, strategy: ScanStrategy
+        self,
+        strategy: ScanStrategy,
+        *,
+        ordering: Optional[ResultOrdering] = None,
     ) -> AsyncIterator[StreamValidationResult]:
-        """Run scan strategy and yield validation results as they arrive."""
+        """
+        Run scan strategy and yield validation results.
+
+        Targets flow through a bounded producer/consumer pipeline: one producer
+        drains ``strategy.generate_targets()`` into a queue sized to the worker
+        count, so the generator never runs more than one batch ahead of the
+        workers. Finished results go through a queue of the same size, so
+        workers block on a slow consumer instead of piling results up.
+
+        ``ordering`` defaults to the one the orchestrator was created with.
+        With ``ResultOrdering.COMPLETION`` results are yielded as soon as each
+        validation finishes. With ``ResultOrdering.TARGET`` results are yielded
+        in generation order; out-of-order completions wait in a reorder buffer
+        whose size is capped by ``reorder_window`` (default: four times the
+        worker count). When the buffer is full the producer stops dispatching
+        until the slowest outstanding target completes.
+
+        ``probe_profile`` selects how deeply each target is probed. When a
+        ``reprobe_profile`` is also given, targets found valid are probed again
+        with it (e.g. a cheap liveness sweep followed by a metadata probe of
+        the hits only).
 
+        With a ``retry_policy`` transient failures are put back into the target
+        queue after their backoff delay instead of being yielded; the delay is
+        spent outside any concurrency slot. Only the final attempt of each
+        target is yielded.
+
+        With a ``validation_cache`` targets with a fresh cached verdict are
+        answered from it without waiting for a rate-limit token or a
+        concurrency slot, and final results are stored back. Entries are keyed
+        by the profile that decides the verdict (``reprobe_profile`` when set).
+        ``force_refresh`` skips lookups but still refreshes the cache.
+
+        With ``host_failures`` targets on hosts or ports that recently proved
+        unreachable get a synthetic ``NETWORK_UNREACHABLE`` result instead of
+        a probe; every probe result updates the host records.
+        """
+
+        ordering = ordering or self._ordering
         total = strategy.estimate_target_count()
-        progress = ScanProgress(total=total)
+        progress = ScanProgress(total=total, ordering=ordering)
+        worker_count = self._rate_limiter.max_concurrency
+
+        window: Optional[asyncio.Semaphore] = None
+        reorder: Optional[_ReorderBuffer] = None
+        if ordering == ResultOrdering.TARGET:
+            window = asyncio.Semaphore(self._reorder_window or worker_count * 4)
+            reorder = _ReorderBuffer()
+
+        dispatch = _Dispatch(
+            worker_count,
+            self._retry_policy.new_budget() if self._retry_policy else None,
+        )
+        results: asyncio.Queue[_QueueItem] = asyncio.Queue(maxsize=worker_count)
+
+        tasks = [asyncio.create_task(self._produce(strategy, dispatch, window))]
+        tasks.extend(
+            asyncio.create_task(self._work(dispatch, results))
+            for _ in range(worker_count)
+        )
+
+        try:
+            remaining_workers = worker_count
+            while remaining_workers:
+                item = await results.get()
+                if item is None:
+                    remaining_workers -= 1
+                    continue
+                if isinstance(item, _WorkerFailure):
+                    raise item.error
+
+                index, result = item
+                if reorder is None:
+                    released = [result]
+                else:
+                    released = reorder.push(index, result)
+                    progress.reorder_buffer_size = len(reorder)
+                    progress.reorder_buffer_peak = reorder.peak
+                    progress.head_of_line_stall_seconds = reorder.stall_seconds
+
+                self._update_concurrency(progress)
+                progress.retries = dispatch.retries
+                progress.retries_denied = dispatch.retries_denied
+                progress.cache_hits = dispatch.cache_hits
+                progress.cache_misses = dispatch.cache_misses
+                progress.host_skips = dispatch.host_skips
+                for ready in released:
+                    progress.completed += 1
+                    if ready.is_valid:
+                        progress.valid += 1
+                    else:
+                        progress.invalid += 1
+
+                    await self._dispatch_progress(progress)
+                    yield ready
+                    if window is not None:
+                        window.release()
+
+            # Surface producer failures (e.g. strategy generator errors).
+            await tasks[0]
+        finally:
+            tasks.extend(dispatch.retry_tasks)
+            for task in tasks:
+                task.cancel()
+            for task in tasks:
+                with contextlib.suppress(asyncio.CancelledError, Exception):
+                    await task
+
+    async def _produce(
+        self,
+        strategy: ScanStrategy,
+        dispatch: _Dispatch,
+        window: Optional[asyncio.Semaphore],
+    ) -> None:
+        try:
+            index = 0
+            async for url in strategy.generate_targets():
+                if window is not None:
+                    await window.acquire()
+                dispatch.pending += 1
+                await dispatch.targets.put((index, url, 0))
+                index += 1
+        finally:
+            dispatch.producer_done = True
+            dispatch.stop_if_drained()
+
+    async def _work(
+        self,
+        dispatch: _Dispatch,
+        results: asyncio.Queue[_QueueItem],
+    ) -> None:
+        try:
+            while True:
+                target = await dispatch.targets.get()
+                if target is None:
+                    break
+                index, url, attempt = target
+                cached = self._cached(dispatch, url) if attempt == 0 else None
+                if cached is None and self._host_failures is not None:
+                    cached = self._host_failures.check(url)
+                    if cached is not None:
+                        dispatch.host_skips += 1
+                if cached is not None:
+                    await results.put((index, cached))
+                    dispatch.target_done()
+                    continue
+                if attempt == 0 and dispatch.budget is not None:
+                    dispatch.budget.record_attempt()
+                result = await self._validate(url)
+                if self._host_failures is not None:
+                    # Before the retry decision, so other paths on a dead
+                    # host are skipped while this one backs off.
+                    self._host_failures.record(result)
+                if self._schedule_retry(dispatch, index, url, attempt, result):
+                    continue
+                if self._validation_cache is not None:
+                    self._validation_cache.put(result, self._cache_profile)
+                await results.put((index, result))
+                dispatch.target_done()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # pylint: disable=broad-except
+            await results.put(_WorkerFailure(exc))
+            return
+        await results.put(None)
+
+    @property
+    def _cache_profile(self) -> Optional[ProbeProfile]:
+        return self._reprobe_profile or self._probe_profile
+
+    def _cached(
+        self, dispatch: _Dispatch, url: str
+    ) -> Optional[StreamValidationResult]:
+        if self._validation_cache is None or self._force_refresh:
+            return None
+        cached = self._validation_cache.get(url, self._cache_profile)
+        if cached is None:
+            dispatch.cache_misses += 1
+        else:
+            dispatch.cache_hits += 1
+        return cached
+
+    def _schedule_retry(
+        self,
+        dispatch: _Dispatch,
+        index: int,
+        url: str,
+        attempt: int,
+        result: StreamValidationResult,
+    ) -> bool:
+        policy = self._retry_policy
+        if policy is None or not policy.should_retry(result, attempt):
+            return False
+        assert dispatch.budget is not None
+        if not dispatch.budget.try_spend():
+            dispatch.retries_denied += 1
+            return False
+
+        dispatch.retries += 1
+        delay = policy.delay(attempt + 1)
+        logger.debug("Retrying %s in %.2fs (%s)", url, delay, result.error_category)
+        task = asyncio.create_task(
+            self._requeue(dispatch, (index, url, attempt + 1), delay)
+        )
+        dispatch.retry_tasks.add(task)
+        task.add_done_callback(dispatch.retry_tasks.discard)
+        return True
+
+    @staticmethod
+    async def _requeue(dispatch: _Dispatch, target: _Target, delay: float) -> None:
+        await asyncio.sleep(delay)
+        await dispatch.targets.put(target)
 
-        async for url in strategy.generate_targets():
-            result = await self._rate_limiter.execute(self._validator.validate(url))
+    async def _validate(self, url: str) -> StreamValidationResult:
+        if self._host_limiter is not None:
+            # Wait for a start token before taking a concurrency slot.
+            await self._host_limiter.acquire(url)
+        async with self._rate_limiter:
+            started = time.monotonic()
+            result = await self._probe(url, self._probe_profile)
+            self._rate_limiter.observe(
+                time.monotonic() - started, result.error_category
+            )
+            if result.is_valid and self._reprobe_profile is not None:
+                detailed = await self._probe(url, self._reprobe_profile)
+                # The target answered moments ago; keep the hit even if the
+                # longer probe fails.
+                if detailed.is_valid:
+                    result = detailed
+        return result
 
-            progress.completed += 1
-            if result.is_valid:
-                progress.valid += 1
-            else:
-                progress.invalid += 1
+    async def _probe(
+        self, url: str, profile: Optional[ProbeProfile]
+    ) -> StreamValidationResult:
+        if profile is None:
+            probe = self._validator.validate(url)
+        else:
+            probe = self._validator.validate(url, profile=profile)
+        try:
+            return await asyncio.wait_for(probe, timeout=self._rate_limiter.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Validation exceeded %ss for %s", self._rate_limiter.timeout, url
+            )
+            return StreamValidationResult(
+                url=url,
+                protocol=urlparse(url).scheme.lower() or "unknown",
+                is_valid=False,
+                error_category=ErrorCategory.TIMEOUT,
+                error_message="Validation timed out.",
+            )
 
-            await self._dispatch_progress(progress)
-            yield result
+    def _update_concurrency(self, progress: ScanProgress) -> None:
+        progress.concurrency_limit = self._rate_limiter.limit
+        history = getattr(self._rate_limiter, "history", None)
+        if history is not None:
+            progress.concurrency_history = history
 
     async def _dispatch_progress(self, progress: ScanProgress) -> None:
         if not self._callbacks:
@@ -74,4 +460,4 @@ class ScanOrchestrator:
         await asyncio.gather(*(callback(progress) for callback in self._callbacks))
 
 
-__all__ = ["ScanOrchestrator", "ScanProgress"]
+__all__ = ["ResultOrdering", "ScanOrchestrator", "ScanProgress"]
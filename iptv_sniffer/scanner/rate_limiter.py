@@ -5,6 +5,8 @@ from __future__ import annotations
 import asyncio
 from typing import Awaitable, Optional, TypeVar
 
+from .validator import ErrorCategory
+
 T = TypeVar("T")
 
 
@@ -33,6 +35,16 @@ class RateLimiter:
     def max_concurrency(self) -> int:
         return self._capacity
 
+    @property
+    def limit(self) -> int:
+        """Concurrency currently enforced; fixed for the base limiter."""
+        return self._capacity
+
+    def observe(
+        self, latency: float, error_category: Optional[ErrorCategory] = None
+    ) -> None:
+        """Record the outcome of a completed operation (no-op for fixed limits)."""
+
     async def __aenter__(self) -> "RateLimiter":
         await self._semaphore.acquire()
         return self
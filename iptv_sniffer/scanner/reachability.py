@@ -0,0 +1,258 @@
+"""Cheap reachability checks that prune dead targets before ffmpeg probing."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+from iptv_sniffer.utils.http_client import get_http_client
+
+from .smart_port_scanner import StreamValidatorProtocol
+from .validator import ErrorCategory, ProbeProfile, StreamValidationResult
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_PORTS = {"http": 80, "https": 443, "rtsp": 554}
+_TS_SYNC_BYTE = 0x47
+_REJECTED_CONTENT_TYPES = (
+    "text/html",
+    "application/json",
+    "application/xml",
+    "text/xml",
+)
+_HTML_PREFIXES = (b"<!doctype", b"<html", b"<?xml")
+
+
+class ReachabilityProbe:
+    """
+    First scan phase: decide quickly whether a target can possibly be a stream.
+
+    HTTP(S) targets get a TCP connect followed by a GET that reads only the
+    first bytes of the body; obvious non-streams (error statuses, HTML or JSON
+    pages) are rejected. RTSP targets get an ``OPTIONS`` request. Targets that
+    accept the connection but are slow to answer are never rejected. Other
+    protocols (UDP/RTP multicast) are not pre-filtered. :meth:`check` returns a
+    failed :class:`StreamValidationResult` for pruned targets and ``None`` for
+    targets that should go on to the full probe.
+
+    The GET uses ``client`` when given, else the application's shared client,
+    else a client created for the check.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float = 1.0,
+        sniff_bytes: int = 1024,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        if timeout <= 0:
+            raise ValueError("timeout must be positive")
+        if sniff_bytes < 1:
+            raise ValueError("sniff_bytes must be positive")
+        self._timeout = timeout
+        self._sniff_bytes = sniff_bytes
+        self._client = client
+
+    async def check(self, url: str) -> Optional[StreamValidationResult]:
+        parsed = urlparse(url)
+        protocol = parsed.scheme.lower()
+        if protocol not in _DEFAULT_PORTS or not parsed.hostname:
+            return None
+
+        port = parsed.port or _DEFAULT_PORTS[protocol]
+        try:
+            if protocol == "rtsp":
+                return await self._check_rtsp(url, parsed.hostname, port)
+            failure = await self._check_connect(url, protocol, parsed.hostname, port)
+            return failure or await self._check_http(url, protocol)
+        except Exception as exc:  # pylint: disable=broad-except
+            # The pre-filter must never hide a stream: on unexpected errors,
+            # let the full probe decide.
+            logger.debug("Reachability check failed for %s: %s", url, exc)
+            return None
+
+    async def _check_connect(
+        self, url: str, protocol: str, host: str, port: int
+    ) -> Optional[StreamValidationResult]:
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port), timeout=self._timeout
+            )
+        except asyncio.TimeoutError:
+            return self._reject(
+                url, protocol, ErrorCategory.NO_RESPONSE, "TCP connect timed out."
+            )
+        except OSError as exc:
+            return self._reject(
+                url,
+                protocol,
+                ErrorCategory.NETWORK_UNREACHABLE,
+                f"TCP connect failed: {exc}",
+            )
+        writer.close()
+        return None
+
+    async def _check_http(
+        self, url: str, protocol: str
+    ) -> Optional[StreamValidationResult]:
+        try:
+            head = await self._fetch_head(url)
+        except httpx.ConnectError as exc:
+            return self._reject(
+                url,
+                protocol,
+                ErrorCategory.NETWORK_UNREACHABLE,
+                f"HTTP request failed: {exc}",
+            )
+        except httpx.TransportError:
+            # Relays and on-demand transcoders can be slow to send the first
+            # byte (or answer in a dialect httpx rejects); only the full probe
+            # can tell.
+            return None
+
+        status_code, content_type, body = head
+        if status_code >= 400:
+            return self._reject(
+                url,
+                protocol,
+                ErrorCategory.NO_VIDEO_STREAM,
+                f"HTTP status {status_code}.",
+            )
+        if self._looks_like_stream(body):
+            return None
+        if content_type.startswith(_REJECTED_CONTENT_TYPES) or self._looks_like_html(
+            body
+        ):
+            return self._reject(
+                url,
+                protocol,
+                ErrorCategory.NO_VIDEO_STREAM,
+                f"Response is not a stream ({content_type or 'unknown type'}).",
+            )
+        return None
+
+    async def _fetch_head(self, url: str) -> Tuple[int, str, bytes]:
+        client = self._client or get_http_client()
+        if client is None:
+            async with httpx.AsyncClient(
+                timeout=self._timeout, follow_redirects=True
+            ) as own_client:
+                return await self._stream_head(own_client, url)
+        return await self._stream_head(client, url)
+
+    async def _stream_head(
+        self, client: httpx.AsyncClient, url: str
+    ) -> Tuple[int, str, bytes]:
+        async with client.stream("GET", url, timeout=self._timeout) as response:
+            return await self._read_head(response)
+
+    async def _read_head(self, response: httpx.Response) -> Tuple[int, str, bytes]:
+        content_type = response.headers.get("content-type", "").lower()
+        body = b""
+        if response.status_code < 400:
+            async for chunk in response.aiter_raw():
+                body += chunk
+                if len(body) >= self._sniff_bytes:
+                    break
+        return response.status_code, content_type, body[: self._sniff_bytes]
+
+    @staticmethod
+    def _looks_like_stream(body: bytes) -> bool:
+        if body[:1] == bytes([_TS_SYNC_BYTE]):
+            return True
+        return body.lstrip().startswith(b"#EXTM3U")
+
+    @staticmethod
+    def _looks_like_html(body: bytes) -> bool:
+        return body.lstrip()[:16].lower().startswith(_HTML_PREFIXES)
+
+    async def _check_rtsp(
+        self, url: str, host: str, port: int
+    ) -> Optional[StreamValidationResult]:
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(host, port), timeout=self._timeout
+            )
+        except asyncio.TimeoutError:
+            return self._reject(
+                url, "rtsp", ErrorCategory.NO_RESPONSE, "TCP connect timed out."
+            )
+        except OSError as exc:
+            return self._reject(
+                url,
+                "rtsp",
+                ErrorCategory.NETWORK_UNREACHABLE,
+                f"TCP connect failed: {exc}",
+            )
+
+        try:
+            writer.write(f"OPTIONS {url} RTSP/1.0\r\nCSeq: 1\r\n\r\n".encode("utf-8"))
+            await writer.drain()
+            status_line = await asyncio.wait_for(
+                reader.readline(), timeout=self._timeout
+            )
+        except asyncio.TimeoutError:
+            # Connected but slow to answer: leave the verdict to the full probe.
+            return None
+        finally:
+            writer.close()
+
+        if not status_line.startswith(b"RTSP/"):
+            return self._reject(
+                url,
+                "rtsp",
+                ErrorCategory.NO_VIDEO_STREAM,
+                "Service did not answer RTSP OPTIONS.",
+            )
+        return None
+
+    @staticmethod
+    def _reject(
+        url: str, protocol: str, category: ErrorCategory, message: str
+    ) -> StreamValidationResult:
+        return StreamValidationResult(
+            url=url,
+            protocol=protocol,
+            is_valid=False,
+            error_category=category,
+            error_message=message,
+        )
+
+
+class PrefilteringValidator:
+    """
+    Run :class:`ReachabilityProbe` before delegating to a full validator.
+
+    Only targets that survive the cheap first phase pay for the ffmpeg probe.
+    """
+
+    def __init__(
+        self, validator: StreamValidatorProtocol, probe: ReachabilityProbe
+    ) -> None:
+        self._validator = validator
+        self._probe = probe
+        self.pruned = 0
+        self.probed = 0
+
+    async def validate(
+        self,
+        url: str,
+        timeout: int = 10,
+        profile: Optional[ProbeProfile] = None,
+    ) -> StreamValidationResult:
+        rejected = await self._probe.check(url)
+        if rejected is not None:
+            self.pruned += 1
+            return rejected
+        self.probed += 1
+        if profile is None:
+            return await self._validator.validate(url, timeout)
+        return await self._validator.validate(url, timeout, profile)
+
+
+__all__ = ["PrefilteringValidator", "ReachabilityProbe"]
@@ -0,0 +1,36 @@
+"""Strategy decorator that skips targets completed before an interruption."""
+
+from __future__ import annotations
+
+from typing import AbstractSet, AsyncIterator
+
+from .strategy import ScanStrategy
+
+
+class ResumedScanStrategy(ScanStrategy):
+    """
+    Replay a deterministic strategy while skipping already-probed targets.
+
+    Target generation is cheap compared with probing, so resuming re-runs the
+    wrapped generator from the start and filters out every URL recorded as
+    completed in the checkpoint.
+    """
+
+    def __init__(self, strategy: ScanStrategy, completed: AbstractSet[str]) -> None:
+        self._strategy = strategy
+        self._completed = completed
+
+    @property
+    def inner(self) -> ScanStrategy:
+        return self._strategy
+
+    async def generate_targets(self) -> AsyncIterator[str]:
+        async for url in self._strategy.generate_targets():
+            if url not in self._completed:
+                yield url
+
+    def estimate_target_count(self) -> int:
+        return max(self._strategy.estimate_target_count() - len(self._completed), 0)
+
+
+__all__ = ["ResumedScanStrategy"]
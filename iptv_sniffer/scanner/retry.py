@@ -0,0 +1,99 @@
+"""Retry policy for transient probe failures."""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from typing import FrozenSet, Optional
+
+from iptv_sniffer.utils.config import AppConfig
+
+from .validator import ErrorCategory, StreamValidationResult, is_connect_failure
+
+TRANSIENT_CATEGORIES: FrozenSet[ErrorCategory] = frozenset(
+    {ErrorCategory.TIMEOUT, ErrorCategory.NETWORK_UNREACHABLE}
+)
+
+
+class RetryBudget:
+    """
+    Cap the number of retries relative to first attempts within one scan.
+
+    At any point at most ``minimum + ratio * first_attempts`` retries may have
+    been spent. When a whole subnet is dead nearly every probe fails, and the
+    budget keeps retries from multiplying the scan's duration.
+    """
+
+    def __init__(self, ratio: float, minimum: int) -> None:
+        self._ratio = ratio
+        self._minimum = minimum
+        self._attempts = 0
+        self._spent = 0
+
+    @property
+    def spent(self) -> int:
+        return self._spent
+
+    def record_attempt(self) -> None:
+        self._attempts += 1
+
+    def try_spend(self) -> bool:
+        if self._spent >= self._minimum + self._ratio * self._attempts:
+            return False
+        self._spent += 1
+        return True
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Decide whether and when a failed probe is attempted again.
+
+    Only :data:`TRANSIENT_CATEGORIES` are retried, at most ``retry_attempts``
+    times per target. ``NO_RESPONSE`` (nothing at the address) is final, and so
+    are refused or unroutable connections even though they are reported as
+    ``NETWORK_UNREACHABLE``. The n-th retry waits
+    ``base_delay * backoff ** (n - 1)`` seconds (capped at ``max_delay``) with
+    equal jitter, i.e. a random delay between half and all of that value.
+    """
+
+    retry_attempts: int = 3
+    backoff: float = 1.5
+    base_delay: float = 0.5
+    max_delay: float = 30.0
+    budget_ratio: float = 0.1
+    budget_minimum: int = 10
+
+    def __post_init__(self) -> None:
+        if self.retry_attempts < 0:
+            raise ValueError("retry_attempts must not be negative")
+        if self.backoff < 1:
+            raise ValueError("backoff must be at least 1")
+        if self.base_delay < 0 or self.max_delay < self.base_delay:
+            raise ValueError("delays must satisfy 0 <= base_delay <= max_delay")
+        if self.budget_ratio < 0 or self.budget_minimum < 0:
+            raise ValueError("retry budget must not be negative")
+
+    @classmethod
+    def from_config(cls, config: AppConfig) -> "RetryPolicy":
+        return cls(retry_attempts=config.retry_attempts, backoff=config.retry_backoff)
+
+    def new_budget(self) -> RetryBudget:
+        return RetryBudget(self.budget_ratio, self.budget_minimum)
+
+    def should_retry(self, result: StreamValidationResult, attempt: int) -> bool:
+        """Return whether ``result`` of retry number ``attempt`` warrants another."""
+        return (
+            not result.is_valid
+            and result.error_category in TRANSIENT_CATEGORIES
+            and not is_connect_failure(result)
+            and attempt < self.retry_attempts
+        )
+
+    def delay(self, retry: int, rng: Optional[random.Random] = None) -> float:
+        """Seconds to wait before retry number ``retry`` (starting at 1)."""
+        ceiling = min(self.max_delay, self.base_delay * self.backoff ** (retry - 1))
+        return (rng or random).uniform(ceiling / 2, ceiling)
+
+
+__all__ = ["RetryBudget", "RetryPolicy", "TRANSIENT_CATEGORIES"]
@@ -0,0 +1,195 @@
+"""Process-wide probe scheduling shared by concurrent scans."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from enum import Enum
+from typing import Deque, List, Optional
+
+from .adaptive_limiter import LimitAdjustment
+from .rate_limiter import RateLimiter
+from .validator import ErrorCategory
+
+
+class ScanPriority(str, Enum):
+    """Share of the probe pool a scan receives while others compete."""
+
+    INTERACTIVE = "interactive"
+    NORMAL = "normal"
+    BACKGROUND = "background"
+
+    @property
+    def weight(self) -> int:
+        return _PRIORITY_WEIGHTS[self]
+
+
+_PRIORITY_WEIGHTS = {
+    ScanPriority.INTERACTIVE: 16,
+    ScanPriority.NORMAL: 4,
+    ScanPriority.BACKGROUND: 1,
+}
+
+
+class ProbeScheduler:
+    """
+    Fixed pool of probe slots shared by every running scan.
+
+    Each scan acquires slots through its own :class:`SchedulerLane`. While
+    slots are free they are handed out immediately; once the pool is
+    saturated, each released slot goes to the next waiting lane chosen by
+    smooth weighted round-robin over the lanes' priority weights. A lane with
+    weight 16 therefore receives 16 slots for every one granted to a weight-1
+    lane, and no waiting lane is starved.
+    """
+
+    def __init__(self, max_concurrency: int = 10) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self._capacity = max_concurrency
+        self._in_use = 0
+        self._lanes: List[SchedulerLane] = []
+
+    @property
+    def max_concurrency(self) -> int:
+        return self._capacity
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    def lane(
+        self,
+        priority: ScanPriority = ScanPriority.NORMAL,
+        *,
+        timeout: float = 10.0,
+        inner: Optional[RateLimiter] = None,
+    ) -> "SchedulerLane":
+        """Create the slot source for one scan."""
+        lane = SchedulerLane(self, priority, timeout=timeout, inner=inner)
+        self._lanes.append(lane)
+        return lane
+
+    def _remove(self, lane: "SchedulerLane") -> None:
+        if lane in self._lanes:
+            self._lanes.remove(lane)
+
+    async def _acquire(self, lane: "SchedulerLane") -> None:
+        if self._in_use < self._capacity and not self._has_waiters():
+            self._in_use += 1
+            return
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        lane._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was granted to us; hand it to the next lane.
+                self._release()
+            raise
+        finally:
+            if waiter in lane._waiters:
+                lane._waiters.remove(waiter)
+
+    def _release(self) -> None:
+        self._in_use -= 1
+        while self._in_use < self._capacity:
+            lane = self._next_lane()
+            if lane is None:
+                return
+            waiter = lane._waiters.popleft()
+            if not waiter.done():
+                self._in_use += 1
+                waiter.set_result(None)
+
+    def _has_waiters(self) -> bool:
+        return any(lane._waiters for lane in self._lanes)
+
+    def _next_lane(self) -> Optional["SchedulerLane"]:
+        candidates = [lane for lane in self._lanes if lane._waiters]
+        if not candidates:
+            return None
+        total = 0
+        selected = candidates[0]
+        for lane in candidates:
+            lane._current_weight += lane.priority.weight
+            total += lane.priority.weight
+            if lane._current_weight > selected._current_weight:
+                selected = lane
+        selected._current_weight -= total
+        return selected
+
+
+class SchedulerLane(RateLimiter):
+    """
+    Per-scan limiter drawing slots from a shared :class:`ProbeScheduler`.
+
+    An optional ``inner`` limiter (typically an adaptive one) caps the scan's
+    own concurrency first; the lane then waits for a global slot. Outcomes
+    passed to :meth:`observe` are forwarded to the inner limiter.
+    """
+
+    def __init__(
+        self,
+        scheduler: ProbeScheduler,
+        priority: ScanPriority,
+        *,
+        timeout: float = 10.0,
+        inner: Optional[RateLimiter] = None,
+    ) -> None:
+        super().__init__(
+            max_concurrency=(
+                inner.max_concurrency
+                if inner is not None
+                else min(scheduler.max_concurrency, RateLimiter._MAX_CONCURRENCY)
+            ),
+            timeout=timeout,
+        )
+        self._scheduler = scheduler
+        self._inner = inner
+        self.priority = priority
+        self._waiters: Deque[asyncio.Future[None]] = deque()
+        self._current_weight = 0
+
+    @property
+    def limit(self) -> int:
+        if self._inner is not None:
+            return min(self._inner.limit, self._scheduler.max_concurrency)
+        return self._scheduler.max_concurrency
+
+    @property
+    def history(self) -> List[LimitAdjustment]:
+        return list(getattr(self._inner, "history", []))
+
+    def observe(
+        self, latency: float, error_category: Optional[ErrorCategory] = None
+    ) -> None:
+        if self._inner is not None:
+            self._inner.observe(latency, error_category)
+
+    async def __aenter__(self) -> "SchedulerLane":
+        if self._inner is not None:
+            await self._inner.__aenter__()
+        try:
+            await self._scheduler._acquire(self)
+        except BaseException:
+            if self._inner is not None:
+                await self._inner.__aexit__(None, None, None)
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._scheduler._release()
+        if self._inner is not None:
+            await self._inner.__aexit__(exc_type, exc_val, exc_tb)
+
+    def close(self) -> None:
+        """Detach the lane from the scheduler once its scan has finished."""
+        for waiter in self._waiters:
+            waiter.cancel()
+        self._waiters.clear()
+        self._scheduler._remove(self)
+
+
+__all__ = ["ProbeScheduler", "ScanPriority", "SchedulerLane"]
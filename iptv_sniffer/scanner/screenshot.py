@@ -11,7 +11,10 @@ from typing import Dict, Optional
 
 import ffmpeg  # type: ignore[import]
 
-from iptv_sniffer.utils.ffmpeg import FFmpegNotFoundError, check_ffmpeg_installed
+from iptv_sniffer.utils.ffmpeg import (
+    FFmpegNotFoundError,
+    get_ffmpeg_capabilities_async,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -121,7 +124,7 @@ async def capture_screenshot(
     if timeout <= 0 or timeout > _MAX_TIMEOUT:
         raise ValueError(f"timeout must be between 1 and {_MAX_TIMEOUT} seconds.")
 
-    if not check_ffmpeg_installed():
+    if not (await get_ffmpeg_capabilities_async()).available:
         raise FFmpegNotFoundError("FFmpeg is required for screenshot capture.")
 
     safe_path = _sanitize_output_path(output_path)
@@ -1,10 +1,12 @@
 from __future__ import annotations
 
 import logging
-from typing import AsyncIterator, List, Protocol, Sequence, Set, Tuple
+from typing import AsyncIterator, List, Optional, Protocol, Sequence, Set, Tuple
 
+from .host_failures import HostFailureCache
 from .multicast_strategy import MulticastScanStrategy
-from .validator import StreamValidationResult
+from .token_bucket import HostRateLimiter
+from .validator import ProbeProfile, StreamValidationResult
 
 logger = logging.getLogger(__name__)
 
@@ -12,7 +14,12 @@ logger = logging.getLogger(__name__)
 class StreamValidatorProtocol(Protocol):
     """Protocol for stream validators used by scanner."""
 
-    async def validate(self, url: str, timeout: int = 10) -> StreamValidationResult: ...
+    async def validate(
+        self,
+        url: str,
+        timeout: int = 10,
+        profile: Optional[ProbeProfile] = None,
+    ) -> StreamValidationResult: ...
 
 
 class SmartPortScanner:
@@ -21,7 +28,9 @@ class SmartPortScanner:
 
     The scanner first probes the full port list on the initial multicast IP to
     identify active services. Discovered ports are then reused for the remainder
-    of the IP range to avoid redundant validations.
+    of the IP range to avoid redundant validations. With ``host_failures``,
+    addresses that proved unreachable are answered without probing their
+    remaining ports.
     """
 
     def __init__(
@@ -31,9 +40,13 @@ class SmartPortScanner:
         *,
         enable_smart_scan: bool = True,
         discovery_timeout: int | None = 20,
+        host_limiter: Optional[HostRateLimiter] = None,
+        host_failures: Optional[HostFailureCache] = None,
     ) -> None:
         self._strategy = strategy
         self._validator = validator
+        self._host_limiter = host_limiter
+        self._host_failures = host_failures
         self._enable_smart_scan = enable_smart_scan
         self._discovery_timeout = discovery_timeout
 
@@ -86,10 +99,7 @@ class SmartPortScanner:
         for port in self._strategy.ports:
             url = self._build_url(ip_address, port)
             timeout = self._discovery_timeout if self._discovery_timeout else None
-            if timeout is None:
-                result = await self._validator.validate(url)
-            else:
-                result = await self._validator.validate(url, timeout=timeout)
+            result = await self._validate(url, timeout)
             results.append(result)
             if result.is_valid:
                 discovered_ports.add(port)
@@ -107,7 +117,27 @@ class SmartPortScanner:
         for ip_address in ip_addresses:
             for port in ports:
                 url = self._build_url(ip_address, port)
-                yield await self._validator.validate(url)
+                yield await self._validate(url)
+
+    async def _validate(
+        self, url: str, timeout: Optional[int] = None
+    ) -> StreamValidationResult:
+        if self._host_failures is not None:
+            skipped = self._host_failures.check(url)
+            if skipped is not None:
+                return skipped
+        await self._throttle(url)
+        if timeout is None:
+            result = await self._validator.validate(url)
+        else:
+            result = await self._validator.validate(url, timeout=timeout)
+        if self._host_failures is not None:
+            self._host_failures.record(result)
+        return result
+
+    async def _throttle(self, url: str) -> None:
+        if self._host_limiter is not None:
+            await self._host_limiter.acquire(url)
 
     def _build_url(self, ip_address: str, port: int) -> str:
         return f"{self._strategy.protocol}://{ip_address}:{port}"
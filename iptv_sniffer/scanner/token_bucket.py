@@ -0,0 +1,148 @@
+"""Token-bucket request-rate limiting keyed by destination host and subnet."""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import time
+from collections import OrderedDict
+from typing import Optional
+from urllib.parse import urlparse
+
+from iptv_sniffer.utils.config import AppConfig
+
+
+class TokenBucket:
+    """
+    Classic token bucket refilled at ``rate`` tokens per second.
+
+    Callers reserve tokens up front, letting the balance go negative; the
+    returned delay tells them when their token becomes available. Waiters are
+    therefore served in arrival order without a lock or polling loop.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def capacity(self) -> float:
+        return self._capacity
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take ``tokens`` and return the seconds to wait before using them."""
+        now = time.monotonic()
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+        self._tokens -= tokens
+        return 0.0 if self._tokens >= 0 else -self._tokens / self._rate
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class HostRateLimiter:
+    """
+    Limit how many probes start per second against each host and each /24.
+
+    IPv4 destinations are charged against both their own bucket and the
+    bucket of their /24 network; hostnames only against their own bucket.
+    A rate of ``0`` disables that dimension. Idle buckets are evicted in LRU
+    order once ``max_buckets`` is exceeded.
+    """
+
+    _SUBNET_PREFIX = 24
+
+    def __init__(
+        self,
+        *,
+        host_rate: float = 0.0,
+        host_burst: int = 1,
+        subnet_rate: float = 0.0,
+        subnet_burst: int = 1,
+        max_buckets: int = 4096,
+    ) -> None:
+        if host_rate < 0 or subnet_rate < 0:
+            raise ValueError("rates must not be negative")
+        if host_burst < 1 or subnet_burst < 1:
+            raise ValueError("burst sizes must be at least 1")
+        self._host_rate = host_rate
+        self._host_burst = host_burst
+        self._subnet_rate = subnet_rate
+        self._subnet_burst = subnet_burst
+        self._max_buckets = max_buckets
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+    @classmethod
+    def from_config(cls, config: AppConfig) -> "HostRateLimiter":
+        return cls(
+            host_rate=config.host_rate_limit,
+            host_burst=config.host_burst,
+            subnet_rate=config.subnet_rate_limit,
+            subnet_burst=config.subnet_burst,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self._host_rate > 0 or self._subnet_rate > 0
+
+    async def acquire(self, url: str) -> None:
+        """Wait until a probe against ``url`` may start."""
+        delay = self.reserve(url)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def reserve(self, url: str) -> float:
+        """Reserve a start slot for ``url`` and return the required delay."""
+        host = urlparse(url).hostname
+        if not host or not self.enabled:
+            return 0.0
+
+        delay = 0.0
+        if self._host_rate > 0:
+            bucket = self._bucket(f"host:{host}", self._host_rate, self._host_burst)
+            delay = bucket.reserve()
+        subnet = self._subnet_of(host)
+        if subnet is not None and self._subnet_rate > 0:
+            bucket = self._bucket(
+                f"subnet:{subnet}", self._subnet_rate, self._subnet_burst
+            )
+            delay = max(delay, bucket.reserve())
+        return delay
+
+    def _bucket(self, key: str, rate: float, burst: int) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(rate, burst)
+            self._buckets[key] = bucket
+            if len(self._buckets) > self._max_buckets:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    @classmethod
+    def _subnet_of(cls, host: str) -> Optional[str]:
+        try:
+            address = ipaddress.IPv4Address(host)
+        except ipaddress.AddressValueError:
+            return None
+        network = ipaddress.IPv4Network(f"{address}/{cls._SUBNET_PREFIX}", strict=False)
+        return str(network)
+
+
+__all__ = ["HostRateLimiter", "TokenBucket"]
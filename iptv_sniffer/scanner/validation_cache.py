@@ -0,0 +1,251 @@
+"""LRU cache of validation verdicts keyed by normalized URL and probe profile."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+from .validator import ErrorCategory, ProbeProfile, StreamValidationResult
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_PORTS = {"http": 80, "https": 443, "rtsp": 554}
+_DEFAULT_PROFILE = "default"
+_FORMAT_VERSION = 1
+
+_CacheKey = Tuple[str, str]
+_Entry = Tuple[_CacheKey, Tuple[StreamValidationResult, float]]
+
+
+def normalize_url(url: str) -> str:
+    """
+    Return the cache key form of ``url``.
+
+    Scheme and host are case-insensitive and default ports are implied, so
+    ``HTTP://Host:80/live`` and ``http://host/live`` share an entry. Path and
+    query are kept verbatim because servers may treat them case-sensitively;
+    fragments never reach the server and are dropped.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    try:
+        port = parts.port
+    except ValueError:
+        return url.strip()
+    host = (parts.hostname or "").lower()
+    if ":" in host:
+        host = f"[{host}]"
+    netloc = host
+    if port is not None and port != _DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{port}"
+    if parts.username or parts.password:
+        credentials = parts.username or ""
+        if parts.password:
+            credentials += f":{parts.password}"
+        netloc = f"{credentials}@{netloc}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+class ValidationCache:
+    """
+    Remember recent validation verdicts so repeat scans skip the probe.
+
+    Entries are keyed by :func:`normalize_url` plus the probe profile that
+    produced them. Valid results live for ``positive_ttl`` seconds and failed
+    ones for ``negative_ttl`` seconds (a TTL of ``0`` disables caching for
+    that kind of result). At most ``max_entries`` results are held; the least
+    recently used entry is evicted first.
+
+    With a ``path`` the cache can be persisted with :meth:`save` and restored
+    with :meth:`load`, so verdicts survive restarts. Expiry uses wall-clock
+    time for that reason. Both do blocking file I/O; on an event loop use
+    :meth:`save_async` and :meth:`load_async`, which touch the entries only
+    on the loop and do the file work in a worker thread.
+    """
+
+    def __init__(
+        self,
+        *,
+        positive_ttl: float = 600.0,
+        negative_ttl: float = 120.0,
+        max_entries: int = 50_000,
+        path: Optional[Path] = None,
+    ) -> None:
+        if positive_ttl < 0 or negative_ttl < 0:
+            raise ValueError("TTLs must not be negative")
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self._positive_ttl = positive_ttl
+        self._negative_ttl = negative_ttl
+        self._max_entries = max_entries
+        self._path = path
+        self._entries: OrderedDict[_CacheKey, Tuple[StreamValidationResult, float]] = (
+            OrderedDict()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def path(self) -> Optional[Path]:
+        return self._path
+
+    def get(
+        self, url: str, profile: Optional[ProbeProfile] = None
+    ) -> Optional[StreamValidationResult]:
+        """Return the cached verdict for ``url`` (reported under ``url``)."""
+        key = self._key(url, profile)
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] <= time.time():
+            del self._entries[key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        result = entry[0]
+        return result if result.url == url else replace(result, url=url)
+
+    def put(
+        self, result: StreamValidationResult, profile: Optional[ProbeProfile] = None
+    ) -> None:
+        ttl = self._positive_ttl if result.is_valid else self._negative_ttl
+        if ttl <= 0:
+            return
+        self._store(self._key(result.url, profile), result, time.time() + ttl)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def load(self) -> int:
+        """Restore unexpired entries from ``path``; returns how many were read."""
+        return self._restore(self._read_entries())
+
+    async def load_async(self) -> int:
+        """Like :meth:`load`, reading and parsing the file in a worker thread."""
+        return self._restore(await asyncio.to_thread(self._read_entries))
+
+    def save(self) -> None:
+        """Write unexpired entries to ``path`` atomically."""
+        self._write_entries(list(self._entries.items()))
+
+    async def save_async(self) -> None:
+        """Like :meth:`save`, serializing and writing in a worker thread."""
+        await asyncio.to_thread(self._write_entries, list(self._entries.items()))
+
+    def _restore(self, entries: List[_Entry]) -> int:
+        for key, (result, expires_at) in entries:
+            self._store(key, result, expires_at)
+        return len(entries)
+
+    def _read_entries(self) -> List[_Entry]:
+        if self._path is None or not self._path.exists():
+            return []
+        try:
+            payload = json.loads(self._path.read_text("utf-8"))
+        except (OSError, ValueError) as exc:
+            logger.warning(
+                "Ignoring unreadable validation cache %s: %s", self._path, exc
+            )
+            return []
+        if not isinstance(payload, dict) or payload.get("version") != _FORMAT_VERSION:
+            return []
+
+        now = time.time()
+        entries: List[_Entry] = []
+        for record in payload.get("entries", []):
+            try:
+                expires_at = float(record["expires_at"])
+                if expires_at <= now:
+                    continue
+                result = self._deserialize(record["result"])
+                key = (record["key"], record["profile"])
+            except (KeyError, TypeError, ValueError) as exc:
+                logger.debug("Skipping invalid validation cache entry: %s", exc)
+                continue
+            entries.append((key, (result, expires_at)))
+        return entries
+
+    def _write_entries(self, entries: List[_Entry]) -> None:
+        if self._path is None:
+            return
+        now = time.time()
+        records = [
+            {
+                "key": key,
+                "profile": profile,
+                "expires_at": expires_at,
+                "result": self._serialize(result),
+            }
+            for (key, profile), (result, expires_at) in entries
+            if expires_at > now
+        ]
+        payload = json.dumps(
+            {"version": _FORMAT_VERSION, "entries": records}, ensure_ascii=False
+        )
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with NamedTemporaryFile(
+            "w", delete=False, encoding="utf-8", dir=str(self._path.parent)
+        ) as tmp_file:
+            tmp_file.write(payload)
+            tmp_file.flush()
+            temp_name = tmp_file.name
+        Path(temp_name).replace(self._path)
+
+    def _store(
+        self, key: _CacheKey, result: StreamValidationResult, expires_at: float
+    ) -> None:
+        self._entries[key] = (result, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _key(url: str, profile: Optional[ProbeProfile]) -> _CacheKey:
+        return normalize_url(url), profile.value if profile else _DEFAULT_PROFILE
+
+    @staticmethod
+    def _serialize(result: StreamValidationResult) -> Dict[str, Any]:
+        return {
+            "url": result.url,
+            "is_valid": result.is_valid,
+            "protocol": result.protocol,
+            "resolution": result.resolution,
+            "codec_video": result.codec_video,
+            "codec_audio": result.codec_audio,
+            "error_category": (
+                result.error_category.value if result.error_category else None
+            ),
+            "error_message": result.error_message,
+            "timestamp": result.timestamp.isoformat(),
+        }
+
+    @staticmethod
+    def _deserialize(data: Dict[str, Any]) -> StreamValidationResult:
+        category = data.get("error_category")
+        return StreamValidationResult(
+            url=data["url"],
+            is_valid=bool(data["is_valid"]),
+            protocol=data["protocol"],
+            resolution=data.get("resolution"),
+            codec_video=data.get("codec_video"),
+            codec_audio=data.get("codec_audio"),
+            error_category=ErrorCategory(category) if category else None,
+            error_message=data.get("error_message"),
+            timestamp=datetime.fromisoformat(data["timestamp"]),
+        )
+
+
+__all__ = ["ValidationCache", "normalize_url"]
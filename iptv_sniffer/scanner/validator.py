@@ -5,30 +5,89 @@ from __future__ import annotations
 import asyncio
 import logging
 from concurrent.futures import ThreadPoolExecutor
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, Optional, Tuple
 from urllib.parse import urlparse
 
 import ffmpeg  # type: ignore[import]
 
-from iptv_sniffer.utils.ffmpeg import check_ffmpeg_installed
+from iptv_sniffer.utils.ffmpeg import (
+    FFmpegCapabilities,
+    get_ffmpeg_capabilities_async,
+)
+
+from .ffprobe import FFprobeError, run_ffprobe
+from .hls import HLSFailure, HLSValidator, is_hls_url
+from .mpegts import MPEGTSAnalyzer
+from .multicast_probe import MulticastProbe
 
 logger = logging.getLogger(__name__)
 
 
+class ProbeBackend(str, Enum):
+    """How ffprobe is executed."""
+
+    THREAD = "thread"
+    ASYNC = "async"
+
+
+class ProbeProfile(str, Enum):
+    """
+    How much of a stream ffprobe reads before returning a verdict.
+
+    ``LIVENESS`` stops as soon as a video stream has been identified and is
+    meant for bulk discovery; resolution may be missing. ``METADATA`` reads
+    enough to report resolution and codecs. ``DEEP`` analyses a long window
+    for troubleshooting difficult streams.
+    """
+
+    LIVENESS = "liveness"
+    METADATA = "metadata"
+    DEEP = "deep"
+
+
 class ErrorCategory(str, Enum):
     """Categorization of validation failures."""
 
     NETWORK_UNREACHABLE = "network_unreachable"
     TIMEOUT = "timeout"
+    NO_RESPONSE = "no_response"
     NO_VIDEO_STREAM = "no_video_stream"
     UNSUPPORTED_CODEC = "unsupported_codec"
     UNSUPPORTED_PROTOCOL = "unsupported_protocol"
     MULTICAST_NOT_SUPPORTED = "multicast_not_supported"
 
 
+_HLS_FAILURE_CATEGORIES = {
+    HLSFailure.TIMEOUT: ErrorCategory.TIMEOUT,
+    HLSFailure.UNREACHABLE: ErrorCategory.NETWORK_UNREACHABLE,
+    HLSFailure.NOT_A_STREAM: ErrorCategory.NO_VIDEO_STREAM,
+}
+
+#: FFmpeg protocol each URL scheme is read through (RTSP is a demuxer on TCP).
+_FFMPEG_PROTOCOLS = {
+    "http": "http",
+    "https": "https",
+    "rtsp": "tcp",
+    "rtp": "rtp",
+    "udp": "udp",
+}
+
+#: Error text that means the connection itself failed. Such results are
+#: reported as ``NETWORK_UNREACHABLE``, which is also ffmpeg's fallback for
+#: errors it does not recognise (e.g. a 404 on a single path).
+_CONNECT_FAILURE_MARKERS = (
+    "connection refused",
+    "no route",
+    "failed to resolve",
+    "network unreachable",
+    "network is unreachable",
+    "tcp connect failed",
+)
+
+
 @dataclass
 class StreamValidationResult:
     """Structured result returned by stream validator."""
@@ -44,15 +103,61 @@ class StreamValidationResult:
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
 
+def is_connect_failure(result: StreamValidationResult) -> bool:
+    """Return whether ``result`` failed because nothing accepted the connection."""
+    if result.error_category != ErrorCategory.NETWORK_UNREACHABLE:
+        return False
+    message = (result.error_message or "").lower()
+    return any(marker in message for marker in _CONNECT_FAILURE_MARKERS)
+
+
 class StreamValidator:
-    """Validate IPTV streams using ffmpeg probe in a thread pool."""
+    """
+    Validate IPTV streams using ffprobe.
+
+    The default ``ProbeBackend.THREAD`` runs ``ffmpeg.probe`` in a thread pool
+    of ``max_workers`` threads. ``ProbeBackend.ASYNC`` spawns ffprobe as an
+    asyncio subprocess instead, so concurrency is not bounded by threads and
+    cancelled probes kill their ffprobe process.
+
+    With an ``hls_validator``, ``.m3u8`` URLs are validated from their
+    playlists and one segment header; with a ``ts_analyzer``, other HTTP(S)
+    streams are first analysed in-process as raw MPEG-TS; with a
+    ``multicast_probe``, RTP/UDP groups are joined and verdicted from their
+    first datagrams. ffprobe only runs when that native analysis is
+    inconclusive.
+    """
 
     _DEFAULT_TIMEOUT = 10
     _RTP_TIMEOUT = 20
+    _DEEP_TIMEOUT = 30
+    _LIVENESS_OPTIONS = {"analyzeduration": "500000", "probesize": "131072"}
+    _DEEP_OPTIONS = {"analyzeduration": "30M", "probesize": "50M"}
+    _NATIVE_TS_TIMEOUT = 5.0
 
-    def __init__(self, max_workers: int = 10) -> None:
-        self._executor = ThreadPoolExecutor(max_workers=max_workers)
-        self._validators: Dict[str, Callable[[str, int], StreamValidationResult]] = {
+    def __init__(
+        self,
+        max_workers: int = 10,
+        *,
+        backend: ProbeBackend = ProbeBackend.THREAD,
+        profile: ProbeProfile = ProbeProfile.METADATA,
+        ts_analyzer: Optional[MPEGTSAnalyzer] = None,
+        multicast_probe: Optional[MulticastProbe] = None,
+        hls_validator: Optional[HLSValidator] = None,
+    ) -> None:
+        self._backend = backend
+        self._profile = profile
+        self._ts_analyzer = ts_analyzer
+        self._multicast_probe = multicast_probe
+        self._hls_validator = hls_validator
+        self._executor: Optional[ThreadPoolExecutor] = (
+            ThreadPoolExecutor(max_workers=max_workers)
+            if backend == ProbeBackend.THREAD
+            else None
+        )
+        self._validators: Dict[
+            str, Callable[[str, int, ProbeProfile], StreamValidationResult]
+        ] = {
             "http": self._validate_http,
             "https": self._validate_http,
             "rtsp": self._validate_rtsp,
@@ -61,13 +166,20 @@ class StreamValidator:
         }
 
     async def validate(
-        self, url: str, timeout: int = _DEFAULT_TIMEOUT
+        self,
+        url: str,
+        timeout: int = _DEFAULT_TIMEOUT,
+        profile: Optional[ProbeProfile] = None,
     ) -> StreamValidationResult:
         """
         Validate IPTV stream referenced by URL.
 
-        Detection is based on URL scheme and runs ffmpeg probe in a worker thread.
+        Detection is based on URL scheme. Unless ``profile`` is ``DEEP``, the
+        configured native checks run first; ffprobe then runs as an asyncio
+        subprocess or in the worker thread pool, depending on the backend.
+        ``profile`` overrides the validator's default probe profile.
         """
+        profile = profile or self._profile
         protocol = self._detect_protocol(url)
 
         if not protocol or protocol not in self._validators:
@@ -80,7 +192,26 @@ class StreamValidator:
                 error_message="Protocol not supported by stream validator.",
             )
 
-        if not check_ffmpeg_installed():
+        if protocol in ("http", "https") and profile != ProbeProfile.DEEP:
+            native: Optional[StreamValidationResult] = None
+            if is_hls_url(url):
+                if self._hls_validator is not None:
+                    native = await self._validate_hls(url, protocol, timeout)
+            elif self._ts_analyzer is not None:
+                native = await self._analyze_transport_stream(url, protocol, timeout)
+            if native is not None:
+                return native
+        if (
+            self._multicast_probe is not None
+            and protocol in ("rtp", "udp")
+            and profile != ProbeProfile.DEEP
+        ):
+            multicast = await self._listen_multicast(url, protocol, profile)
+            if multicast is not None:
+                return multicast
+
+        capabilities = await get_ffmpeg_capabilities_async()
+        if not capabilities.available:
             logger.error("FFmpeg must be installed for stream validation.")
             return StreamValidationResult(
                 url=url,
@@ -90,49 +221,234 @@ class StreamValidator:
                 error_message="FFmpeg is not installed.",
             )
 
-        validator = self._validators[protocol]
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(self._executor, validator, url, timeout)
+        ffmpeg_protocol = _FFMPEG_PROTOCOLS[protocol]
+        if not capabilities.supports_protocol(ffmpeg_protocol):
+            return StreamValidationResult(
+                url=url,
+                protocol=protocol,
+                is_valid=False,
+                error_category=ErrorCategory.UNSUPPORTED_PROTOCOL,
+                error_message=(
+                    f"FFmpeg was built without the {ffmpeg_protocol} protocol."
+                ),
+            )
+
+        if self._executor is None:
+            probe_timeout, options = self._probe_options(protocol, timeout, profile)
+            result = await self._probe_async(
+                url,
+                protocol,
+                probe_timeout,
+                options,
+                cmd=capabilities.ffprobe_path or "ffprobe",
+            )
+        else:
+            validator = self._validators[protocol]
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._executor, validator, url, timeout, profile
+            )
+        return self._require_decoder(result, capabilities)
+
+    @staticmethod
+    def _require_decoder(
+        result: StreamValidationResult, capabilities: FFmpegCapabilities
+    ) -> StreamValidationResult:
+        codec = result.codec_video
+        if not result.is_valid or not codec or capabilities.supports_decoder(codec):
+            return result
+        return replace(
+            result,
+            is_valid=False,
+            error_category=ErrorCategory.UNSUPPORTED_CODEC,
+            error_message=f"FFmpeg has no decoder for {codec}.",
+        )
+
+    async def _validate_hls(
+        self, url: str, protocol: str, timeout: int
+    ) -> Optional[StreamValidationResult]:
+        assert self._hls_validator is not None
+        verdict = await self._hls_validator.check(url, float(timeout))
+        if verdict is None:
+            return None
+        if not verdict.is_valid:
+            return StreamValidationResult(
+                url=url,
+                protocol=protocol,
+                is_valid=False,
+                error_category=_HLS_FAILURE_CATEGORIES.get(
+                    verdict.failure, ErrorCategory.NO_VIDEO_STREAM
+                ),
+                error_message=verdict.error_message,
+            )
+        return StreamValidationResult(
+            url=url,
+            protocol=protocol,
+            is_valid=True,
+            resolution=verdict.resolution,
+            codec_video=verdict.codec_video,
+            codec_audio=verdict.codec_audio,
+        )
+
+    async def _analyze_transport_stream(
+        self, url: str, protocol: str, timeout: int
+    ) -> Optional[StreamValidationResult]:
+        assert self._ts_analyzer is not None
+        info = await self._ts_analyzer.analyze(
+            url, min(float(timeout), self._NATIVE_TS_TIMEOUT)
+        )
+        if info is None:
+            return None
+        logger.debug("Native TS analysis identified %s: %s", url, info)
+        return StreamValidationResult(
+            url=url,
+            protocol=protocol,
+            is_valid=True,
+            resolution=info.resolution,
+            codec_video=info.codec_video,
+            codec_audio=info.codec_audio,
+        )
+
+    async def _listen_multicast(
+        self, url: str, protocol: str, profile: ProbeProfile
+    ) -> Optional[StreamValidationResult]:
+        assert self._multicast_probe is not None
+        verdict = await self._multicast_probe.listen(
+            url, need_picture_size=profile != ProbeProfile.LIVENESS
+        )
+        if verdict is None:
+            return None
+        if verdict.info is not None or (
+            profile == ProbeProfile.LIVENESS and verdict.video_codec is not None
+        ):
+            info = verdict.info
+            return StreamValidationResult(
+                url=url,
+                protocol=protocol,
+                is_valid=True,
+                resolution=info.resolution if info is not None else None,
+                codec_video=verdict.video_codec,
+                codec_audio=verdict.audio_codec,
+            )
+        if verdict.datagrams == 0:
+            return StreamValidationResult(
+                url=url,
+                protocol=protocol,
+                is_valid=False,
+                error_category=ErrorCategory.NO_RESPONSE,
+                error_message=(
+                    f"No datagrams received within {self._multicast_probe.timeout}s."
+                ),
+            )
+        if verdict.program_map and verdict.video_codec is None:
+            return StreamValidationResult(
+                url=url,
+                protocol=protocol,
+                is_valid=False,
+                error_category=ErrorCategory.NO_VIDEO_STREAM,
+                error_message="Program map lists no video stream.",
+            )
+        return None
 
     @staticmethod
     def _detect_protocol(url: str) -> Optional[str]:
         parsed = urlparse(url)
         return parsed.scheme.lower() if parsed.scheme else None
 
-    def _validate_http(self, url: str, timeout: int) -> StreamValidationResult:
-        return self._probe_with_ffmpeg(url, "http", timeout)
+    def _validate_http(
+        self, url: str, timeout: int, profile: ProbeProfile = ProbeProfile.METADATA
+    ) -> StreamValidationResult:
+        return self._probe_with_ffmpeg(
+            url, "http", *self._probe_options("http", timeout, profile)
+        )
 
-    def _validate_rtsp(self, url: str, timeout: int) -> StreamValidationResult:
+    def _validate_rtsp(
+        self, url: str, timeout: int, profile: ProbeProfile = ProbeProfile.METADATA
+    ) -> StreamValidationResult:
         return self._probe_with_ffmpeg(
-            url,
-            "rtsp",
-            timeout,
-            options={"rtsp_transport": "tcp"},
+            url, "rtsp", *self._probe_options("rtsp", timeout, profile)
         )
 
-    def _validate_rtp(self, url: str, timeout: int) -> StreamValidationResult:
-        probe_timeout = max(timeout, self._RTP_TIMEOUT)
+    def _validate_rtp(
+        self, url: str, timeout: int, profile: ProbeProfile = ProbeProfile.METADATA
+    ) -> StreamValidationResult:
         return self._probe_with_ffmpeg(
-            url,
-            "rtp",
-            probe_timeout,
-            options={
-                "analyzeduration": "10M",
-                "probesize": "10M",
-                "rtbufsize": "2048k",
-            },
+            url, "rtp", *self._probe_options("rtp", timeout, profile)
         )
 
-    def _validate_udp(self, url: str, timeout: int) -> StreamValidationResult:
+    def _validate_udp(
+        self, url: str, timeout: int, profile: ProbeProfile = ProbeProfile.METADATA
+    ) -> StreamValidationResult:
         return self._probe_with_ffmpeg(
-            url,
-            "udp",
-            timeout,
-            options={
+            url, "udp", *self._probe_options("udp", timeout, profile)
+        )
+
+    @classmethod
+    def probe_timeout(
+        cls, profile: ProbeProfile, timeout: int = _DEFAULT_TIMEOUT
+    ) -> int:
+        """Longest ffprobe timeout ``profile`` uses for any protocol."""
+        if profile == ProbeProfile.DEEP:
+            return max(timeout, cls._DEEP_TIMEOUT)
+        if profile == ProbeProfile.METADATA:
+            return max(timeout, cls._RTP_TIMEOUT)
+        return timeout
+
+    def _probe_options(
+        self,
+        protocol: str,
+        timeout: int,
+        profile: ProbeProfile = ProbeProfile.METADATA,
+    ) -> Tuple[int, Dict[str, str]]:
+        """Return the probe timeout and ffprobe options for a protocol."""
+        options: Dict[str, str] = {}
+        if protocol == "rtsp":
+            options["rtsp_transport"] = "tcp"
+
+        if profile == ProbeProfile.LIVENESS:
+            return timeout, {**options, **self._LIVENESS_OPTIONS}
+        if profile == ProbeProfile.DEEP:
+            if protocol == "rtp":
+                options["rtbufsize"] = "2048k"
+            return max(timeout, self._DEEP_TIMEOUT), {**options, **self._DEEP_OPTIONS}
+
+        if protocol == "rtp":
+            return max(timeout, self._RTP_TIMEOUT), {
+                "analyzeduration": "10M",
+                "probesize": "10M",
+                "rtbufsize": "2048k",
+            }
+        if protocol == "udp":
+            return timeout, {
                 "analyzeduration": "5M",
                 "probesize": "5M",
-            },
-        )
+            }
+        return timeout, options
+
+    async def _probe_async(
+        self,
+        url: str,
+        protocol: str,
+        timeout: int,
+        options: Dict[str, str],
+        cmd: str = "ffprobe",
+    ) -> StreamValidationResult:
+        logger.debug("Running async ffprobe for %s (%s)", url, protocol)
+        try:
+            probe_result = await run_ffprobe(
+                url, timeout=timeout, options=options, cmd=cmd
+            )
+        except asyncio.TimeoutError:
+            logger.warning("FFprobe timed out after %ss for %s", timeout, url)
+            return self._handle_ffmpeg_error(
+                url, protocol, f"Probe timed out after {timeout}s."
+            )
+        except (FFprobeError, OSError) as exc:
+            raw_stderr = getattr(exc, "stderr", b"")
+            stderr = raw_stderr.decode("utf-8", errors="ignore") or str(exc)
+            logger.warning("FFmpeg error for %s: %s", url, stderr.strip())
+            return self._handle_ffmpeg_error(url, protocol, stderr)
+        return self._parse_probe_result(url, protocol, probe_result)
 
     def _probe_with_ffmpeg(
         self,
@@ -1,5 +1,18 @@
 """Storage backends for channel persistence."""
 
-from .json_repository import JSONChannelRepository
+from .base import ChannelRepository, UpsertOutcome, UpsertResult
+from .json_repository import JSONChannelRepository, StreamingJSONChannelRepository
+from .result_writer import ScanResultWriter
+from .scan_checkpoint import ScanCheckpointStore
+from .sqlite_repository import SQLiteChannelRepository
 
-__all__ = ["JSONChannelRepository"]
+__all__ = [
+    "ChannelRepository",
+    "JSONChannelRepository",
+    "SQLiteChannelRepository",
+    "ScanCheckpointStore",
+    "ScanResultWriter",
+    "StreamingJSONChannelRepository",
+    "UpsertOutcome",
+    "UpsertResult",
+]
@@ -0,0 +1,156 @@
+"""Channel repository interface and the merge rules shared by all backends."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import (
+    Any,
+    AsyncIterator,
+    Collection,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+)
+
+from iptv_sniffer.channel.models import Channel
+
+#: Keys understood by :meth:`ChannelRepository.find_all`.
+FILTER_FIELDS = (
+    "group",
+    "is_online",
+    "validation_status",
+    "manually_edited",
+    "resolution",
+)
+
+
+class UpsertOutcome(str, Enum):
+    """What :meth:`ChannelRepository.upsert_many` did with one channel."""
+
+    CREATED = "created"
+    UPDATED = "updated"
+    FAILED = "failed"
+
+
+@dataclass(frozen=True)
+class UpsertResult:
+    """Per-item result of a bulk upsert; ``channel`` is the stored record."""
+
+    outcome: UpsertOutcome
+    channel: Optional[Channel] = None
+    error: Optional[str] = None
+
+
+class ChannelRepository(Protocol):
+    """Async channel storage used by the API, scans and imports."""
+
+    async def add(self, channel: Channel) -> Channel: ...
+
+    async def add_many(
+        self,
+        channels: Sequence[Channel],
+        *,
+        merge_fields: Optional[Collection[str]] = None,
+    ) -> List[Channel]: ...
+
+    async def upsert_many(
+        self,
+        channels: Sequence[Channel],
+        *,
+        merge_fields: Optional[Collection[str]] = None,
+    ) -> List[UpsertResult]: ...
+
+    async def update_where(
+        self, filters: Dict[str, Any], changes: Dict[str, Any]
+    ) -> int: ...
+
+    async def reassign_group(
+        self, sources: Collection[Optional[str]], target: Optional[str]
+    ) -> int: ...
+
+    async def get_by_id(self, channel_id: str) -> Optional[Channel]: ...
+
+    async def get_by_url(self, url: str) -> Optional[Channel]: ...
+
+    async def find_all(
+        self, filters: Optional[Dict[str, Any]] = None
+    ) -> List[Channel]: ...
+
+    def iter_all(
+        self, filters: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Channel]: ...
+
+    async def delete(self, channel_id: str) -> bool: ...
+
+    async def flush(self) -> None: ...
+
+
+def normalize_channel_url(url: str) -> str:
+    """Key under which channels are deduplicated."""
+    return url.strip().lower()
+
+
+def merge_channels(original: Channel, incoming: Channel) -> Channel:
+    """
+    Apply ``incoming`` on top of the stored ``original``.
+
+    Deduplication follows Design.md Section 7: the first channel discovered
+    for a URL keeps its primary key and creation time, and the
+    ``manually_edited`` flag is never cleared by an update.
+    """
+    merged_data = original.model_dump()
+    merged_data.update(incoming.model_dump())
+    merged_data["id"] = original.id
+    merged_data["created_at"] = original.created_at
+    merged_data["manually_edited"] = (
+        original.manually_edited or incoming.manually_edited
+    )
+    return Channel(**merged_data)
+
+
+def update_channel_fields(
+    original: Channel, incoming: Channel, fields: Collection[str]
+) -> Channel:
+    """Copy only ``fields`` from ``incoming`` onto ``original``."""
+    return original.model_copy(
+        update={name: getattr(incoming, name) for name in fields}
+    )
+
+
+def matches_filters(channel: Channel, filters: Dict[str, Any]) -> bool:
+    """Return whether ``channel`` satisfies every non-``None`` filter."""
+    for key, expected in filters.items():
+        if expected is None or key not in FILTER_FIELDS:
+            continue
+        if getattr(channel, key) != expected:
+            return False
+    return True
+
+
+def validate_changes(changes: Dict[str, Any]) -> None:
+    """Reject bulk changes to unknown fields or to the id and URL keys."""
+    for name in changes:
+        if name in ("id", "url"):
+            raise ValueError(f"Bulk updates cannot change '{name}'")
+        if name not in Channel.model_fields:
+            raise ValueError(f"Unknown channel field '{name}'")
+
+
+def id_conflict_error(channel: Channel) -> str:
+    return f"Channel id {channel.id} is already used by another URL"
+
+
+__all__ = [
+    "ChannelRepository",
+    "FILTER_FIELDS",
+    "UpsertOutcome",
+    "UpsertResult",
+    "matches_filters",
+    "merge_channels",
+    "normalize_channel_url",
+    "update_channel_fields",
+    "validate_changes",
+]
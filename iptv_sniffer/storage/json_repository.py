@@ -5,26 +5,99 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+from collections import Counter
+from itertools import islice
 from pathlib import Path
 from tempfile import NamedTemporaryFile
-from typing import Any, Dict, List, Optional, Sequence
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Collection,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+)
 
 from iptv_sniffer.channel.models import Channel
 
+from .base import (
+    UpsertOutcome,
+    UpsertResult,
+    id_conflict_error,
+    matches_filters,
+    merge_channels,
+    normalize_channel_url,
+    update_channel_fields,
+    validate_changes,
+)
+from .json_stream import iter_json_array, write_json_array
+
 logger = logging.getLogger(__name__)
 
+# Filter keys answered from a secondary index instead of a full scan.
+_INDEXED_FIELDS = ("group", "validation_status", "is_online")
+# Channels decoded per worker-thread hop by StreamingJSONChannelRepository.
+_STREAM_BATCH_SIZE = 256
+
 
 class JSONChannelRepository:
-    """Persist channels to a JSON file while exposing an async API."""
+    """
+    Persist channels to a JSON file while exposing an async API.
 
-    def __init__(self, file_path: Path, *, encoding: str = "utf-8") -> None:
+    The file is read once, on first use, into memory. Channels are kept in
+    file order and indexed by id, normalized URL, group, validation status
+    and online flag, so lookups and filtered listings never re-parse the
+    file. Returned channels are the stored instances. Callers copy them
+    (``model_copy``) before changing anything.
+
+    Mutations are written behind: the first change schedules a write
+    ``flush_delay`` seconds later, and every change made in the meantime
+    goes out with it as one atomic file replace. With ``flush_delay=0``
+    each mutation writes before it returns. Call :meth:`flush` or
+    :meth:`close` to persist pending changes on demand. The repository
+    assumes it is the only writer of its file.
+    """
+
+    def __init__(
+        self,
+        file_path: Path,
+        *,
+        encoding: str = "utf-8",
+        flush_delay: float = 1.0,
+    ) -> None:
+        if flush_delay < 0:
+            raise ValueError("flush_delay must not be negative")
         self._file_path = file_path
         self._encoding = encoding
+        self._flush_delay = flush_delay
         self._lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+        self._loaded = False
+        self._channels: Dict[str, Channel] = {}
+        # id -> insertion sequence, to return indexed matches in file order
+        self._positions: Dict[str, int] = {}
+        self._next_position = 0
+        self._ids_by_url: Dict[str, str] = {}
+        self._indexes: Dict[str, Dict[Any, Dict[str, None]]] = {
+            field: {} for field in _INDEXED_FIELDS
+        }
+        self._version = 0
+        self._written_version = 0
+        self._flush_task: Optional[asyncio.Task[None]] = None
         self._file_path.parent.mkdir(parents=True, exist_ok=True)
         if not self._file_path.exists():
             self._file_path.write_text("[]\n", encoding=self._encoding)
 
+    @property
+    def has_pending_writes(self) -> bool:
+        return self._version != self._written_version
+
     async def add(self, channel: Channel) -> Channel:
         """
         Add a channel or update an existing entry matched by URL.
@@ -33,53 +106,81 @@ class JSONChannelRepository:
         for a URL controls the primary key and timestamps. Subsequent updates
         preserve the `manually_edited` flag to avoid erasing user changes.
         """
-        async with self._lock:
-            channels = await self._read_channels()
-            normalized_url = self._normalize_url(channel.url)
-
-            for index, existing in enumerate(channels):
-                if self._normalize_url(existing.url) == normalized_url:
-                    merged = self._merge_channels(existing, channel)
-                    channels[index] = merged
-                    await self._write_channels(channels)
-                    logger.info(
-                        "Channel updated",
-                        extra={
-                            "channel_id": merged.id,
-                            "url": merged.url,
-                            "repository": str(self._file_path),
-                        },
-                    )
-                    return merged
+        results = await self._upsert([channel], None)
+        result = results[0]
+        if result.channel is None:
+            raise ValueError(result.error)
+        stored = result.channel
 
-            channels.append(channel)
-            await self._write_channels(channels)
-            logger.info(
-                "Channel added",
-                extra={
-                    "channel_id": channel.id,
-                    "url": channel.url,
-                    "repository": str(self._file_path),
-                },
-            )
-            return channel
+        logger.info(
+            "Channel added"
+            if result.outcome is UpsertOutcome.CREATED
+            else "Channel updated",
+            extra={
+                "channel_id": stored.id,
+                "url": stored.url,
+                "repository": str(self._file_path),
+            },
+        )
+        return stored
+
+    async def add_many(
+        self,
+        channels: Sequence[Channel],
+        *,
+        merge_fields: Optional[Collection[str]] = None,
+    ) -> List[Channel]:
+        """
+        Add or update several channels with a single write.
+
+        Matching follows :meth:`add`. When ``merge_fields`` is given, an
+        incoming channel that matches an existing URL only updates those
+        fields, leaving names, groups and other user-facing metadata intact;
+        unmatched channels are inserted whole. Returns the stored channels in
+        input order, leaving out any that :meth:`upsert_many` reports as
+        failed.
+        """
+        results = await self.upsert_many(channels, merge_fields=merge_fields)
+        return [result.channel for result in results if result.channel is not None]
+
+    async def upsert_many(
+        self,
+        channels: Sequence[Channel],
+        *,
+        merge_fields: Optional[Collection[str]] = None,
+    ) -> List[UpsertResult]:
+        """
+        Merge ``channels`` by normalized URL in one pass and one write.
+
+        Behaves like :meth:`add_many` but reports, per input channel, whether
+        it was created, updated or failed. A channel fails when its id is
+        already used by a different URL. Later duplicates of a URL within
+        the batch update the entry created by the first one.
+        """
+        if not channels:
+            return []
+        results = await self._upsert(channels, merge_fields)
+        counts = Counter(result.outcome for result in results)
+        logger.info(
+            "Channels saved in batch",
+            extra={
+                "created": counts[UpsertOutcome.CREATED],
+                "updated": counts[UpsertOutcome.UPDATED],
+                "failed": counts[UpsertOutcome.FAILED],
+                "repository": str(self._file_path),
+            },
+        )
+        return results
 
     async def get_by_id(self, channel_id: str) -> Optional[Channel]:
         """Return a channel by its UUID identifier."""
-        channels = await self._read_channels()
-        for channel in channels:
-            if channel.id == channel_id:
-                return channel
-        return None
+        await self._ensure_loaded()
+        return self._channels.get(channel_id)
 
     async def get_by_url(self, url: str) -> Optional[Channel]:
         """Return a channel using normalized URL matching."""
-        channels = await self._read_channels()
-        normalized = self._normalize_url(url)
-        for channel in channels:
-            if self._normalize_url(channel.url) == normalized:
-                return channel
-        return None
+        await self._ensure_loaded()
+        return self._get_by_url(url)
 
     async def find_all(self, filters: Optional[Dict[str, Any]] = None) -> List[Channel]:
         """
@@ -90,56 +191,253 @@ class JSONChannelRepository:
             * is_online (bool)
             * validation_status (str)
             * manually_edited (bool)
+            * resolution (str)
         """
-        channels = await self._read_channels()
-        if not filters:
-            return channels
-
-        filters_copy = dict(filters)
-        return [
-            channel
-            for channel in channels
-            if self._matches_filters(channel, filters_copy)
-        ]
+        await self._ensure_loaded()
+        return self._select(filters or {})
+
+    async def iter_all(
+        self, filters: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Channel]:
+        """Yield the channels :meth:`find_all` would return, one at a time."""
+        for channel in await self.find_all(filters):
+            yield channel
 
     async def delete(self, channel_id: str) -> bool:
         """Delete a channel by ID. Returns True if a record was removed."""
+        await self._ensure_loaded()
         async with self._lock:
-            channels = await self._read_channels()
-            remaining = [channel for channel in channels if channel.id != channel_id]
-            if len(remaining) == len(channels):
+            channel = self._channels.get(channel_id)
+            if channel is None:
                 return False
-            await self._write_channels(remaining)
-            logger.info(
-                "Channel deleted",
-                extra={
-                    "channel_id": channel_id,
-                    "repository": str(self._file_path),
-                },
-            )
-            return True
+            self._remove(channel)
+            await self._changed()
 
-    async def _read_channels(self) -> List[Channel]:
-        return await asyncio.to_thread(self._read_channels_sync)
+        logger.info(
+            "Channel deleted",
+            extra={
+                "channel_id": channel_id,
+                "repository": str(self._file_path),
+            },
+        )
+        return True
 
-    async def _write_channels(self, channels: Sequence[Channel]) -> None:
-        await asyncio.to_thread(self._write_channels_sync, list(channels))
+    async def update_where(
+        self, filters: Dict[str, Any], changes: Dict[str, Any]
+    ) -> int:
+        """
+        Apply ``changes`` to every channel matching ``filters`` in one write.
 
-    def _read_channels_sync(self) -> List[Channel]:
-        try:
-            raw = self._file_path.read_text(encoding=self._encoding)
-        except FileNotFoundError:
-            logger.warning(
-                "Channel repository missing file; initializing empty list",
-                extra={"repository": str(self._file_path)},
+        ``filters`` follow :meth:`find_all`; ``None`` values are ignored, so
+        an empty filter matches every channel. ``changes`` may not touch
+        ``id`` or ``url``. Returns the number of channels updated.
+        """
+        validate_changes(changes)
+        await self._ensure_loaded()
+        async with self._lock:
+            updated = self._apply(self._select(filters), changes)
+            if updated:
+                await self._changed()
+        logger.info(
+            "Channels updated in bulk",
+            extra={
+                "filters": filters,
+                "changes": list(changes),
+                "updated": updated,
+                "repository": str(self._file_path),
+            },
+        )
+        return updated
+
+    async def reassign_group(
+        self, sources: Collection[Optional[str]], target: Optional[str]
+    ) -> int:
+        """
+        Move every channel of the ``sources`` groups into ``target``.
+
+        ``None`` stands for uncategorized channels. All groups move in one
+        write, and readers never see a partially moved group. Returns the
+        number of channels moved.
+        """
+        await self._ensure_loaded()
+        async with self._lock:
+            groups = self._indexes["group"]
+            ids = [
+                channel_id
+                for source in set(sources)
+                for channel_id in groups.get(source, {})
+            ]
+            ids.sort(key=self._positions.__getitem__)
+            moved = self._apply(
+                [self._channels[channel_id] for channel_id in ids], {"group": target}
             )
-            return []
+            if moved:
+                await self._changed()
+        logger.info(
+            "Channel groups reassigned",
+            extra={
+                "sources": list(sources),
+                "target": target,
+                "moved": moved,
+                "repository": str(self._file_path),
+            },
+        )
+        return moved
 
-        if not raw.strip():
-            return []
+    async def flush(self) -> None:
+        """Write pending changes to the file now."""
+        async with self._write_lock:
+            version = self._version
+            if version == self._written_version:
+                return
+            snapshot = list(self._channels.values())
+            await asyncio.to_thread(self._write_channels_sync, snapshot)
+            self._written_version = version
+
+    async def close(self) -> None:
+        """Cancel the scheduled write and flush pending changes."""
+        task, self._flush_task = self._flush_task, None
+        if task is not None and not task.done():
+            if task.get_loop() is asyncio.get_running_loop():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        await self.flush()
+
+    async def _upsert(
+        self,
+        channels: Sequence[Channel],
+        merge_fields: Optional[Collection[str]],
+    ) -> List[UpsertResult]:
+        await self._ensure_loaded()
+        async with self._lock:
+            results: List[UpsertResult] = []
+            for channel in channels:
+                existing = self._get_by_url(channel.url)
+                try:
+                    if existing is None:
+                        if channel.id in self._channels:
+                            raise ValueError(id_conflict_error(channel))
+                        stored = channel
+                    elif merge_fields is None:
+                        stored = merge_channels(existing, channel)
+                    else:
+                        stored = update_channel_fields(existing, channel, merge_fields)
+                except ValueError as exc:
+                    results.append(UpsertResult(UpsertOutcome.FAILED, error=str(exc)))
+                    continue
+                self._store(stored, replaces=existing)
+                outcome = (
+                    UpsertOutcome.CREATED if existing is None else UpsertOutcome.UPDATED
+                )
+                results.append(UpsertResult(outcome, stored))
+            if any(result.channel is not None for result in results):
+                await self._changed()
+        return results
+
+    async def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        async with self._lock:
+            if self._loaded:
+                return
+            for channel in await asyncio.to_thread(self._read_channels_sync):
+                existing = self._channels.get(channel.id)
+                self._store(channel, replaces=existing)
+            self._loaded = True
+
+    async def _changed(self) -> None:
+        self._version += 1
+        if self._flush_delay == 0:
+            await self.flush()
+            return
+        loop = asyncio.get_running_loop()
+        task = self._flush_task
+        if task is None or task.done() or task.get_loop() is not loop:
+            self._flush_task = loop.create_task(self._flush_later())
 
+    async def _flush_later(self) -> None:
+        # Changes made while a write is running are not covered by it and
+        # find this task still running, so keep going until nothing is left.
+        while self.has_pending_writes:
+            await asyncio.sleep(self._flush_delay)
+            try:
+                await self.flush()
+            except OSError as exc:
+                logger.error(
+                    "Failed to write channel repository",
+                    extra={"repository": str(self._file_path), "error": str(exc)},
+                )
+                return
+
+    def _select(self, filters: Dict[str, Any]) -> List[Channel]:
+        active = {key: value for key, value in filters.items() if value is not None}
+        if not active:
+            return list(self._channels.values())
+
+        candidates: Optional[Dict[str, None]] = None
+        for field in _INDEXED_FIELDS:
+            if field in active:
+                ids = self._indexes[field].get(active[field], {})
+                if candidates is None or len(ids) < len(candidates):
+                    candidates = ids
+        if candidates is None:
+            return [
+                channel
+                for channel in self._channels.values()
+                if matches_filters(channel, active)
+            ]
+        matches = [
+            channel_id
+            for channel_id in candidates
+            if matches_filters(self._channels[channel_id], active)
+        ]
+        matches.sort(key=self._positions.__getitem__)
+        return [self._channels[channel_id] for channel_id in matches]
+
+    def _apply(self, channels: List[Channel], changes: Dict[str, Any]) -> int:
+        # Runs without awaiting, so readers see either none or all changes.
+        for channel in channels:
+            self._store(channel.model_copy(update=changes), replaces=channel)
+        return len(channels)
+
+    def _get_by_url(self, url: str) -> Optional[Channel]:
+        channel_id = self._ids_by_url.get(normalize_channel_url(url))
+        return self._channels.get(channel_id) if channel_id is not None else None
+
+    def _store(self, channel: Channel, *, replaces: Optional[Channel] = None) -> None:
+        if replaces is not None:
+            self._unindex(replaces)
+        if channel.id not in self._positions:
+            self._positions[channel.id] = self._next_position
+            self._next_position += 1
+        self._channels[channel.id] = channel
+        self._ids_by_url[normalize_channel_url(channel.url)] = channel.id
+        for field in _INDEXED_FIELDS:
+            bucket = self._indexes[field].setdefault(getattr(channel, field), {})
+            bucket[channel.id] = None
+
+    def _remove(self, channel: Channel) -> None:
+        self._unindex(channel)
+        del self._channels[channel.id]
+        del self._positions[channel.id]
+
+    def _unindex(self, channel: Channel) -> None:
+        url_key = normalize_channel_url(channel.url)
+        if self._ids_by_url.get(url_key) == channel.id:
+            del self._ids_by_url[url_key]
+        for field in _INDEXED_FIELDS:
+            index = self._indexes[field]
+            value = getattr(channel, field)
+            bucket = index.get(value)
+            if bucket is not None:
+                bucket.pop(channel.id, None)
+                if not bucket:
+                    del index[value]
+
+    def _read_channels_sync(self) -> List[Channel]:
+        # All or nothing: a corrupted file loads as an empty repository.
         try:
-            payload = json.loads(raw)
+            return list(self._iter_file_sync())
         except json.JSONDecodeError as exc:
             logger.error(
                 "Corrupted channel repository JSON",
@@ -147,76 +445,280 @@ class JSONChannelRepository:
             )
             return []
 
-        if not isinstance(payload, list):
-            logger.error(
-                "Unexpected JSON payload type",
-                extra={
-                    "repository": str(self._file_path),
-                    "payload_type": type(payload).__name__,
-                },
+    def _iter_file_sync(self) -> Iterator[Channel]:
+        try:
+            handle = self._file_path.open(encoding=self._encoding)
+        except FileNotFoundError:
+            logger.warning(
+                "Channel repository missing file; initializing empty list",
+                extra={"repository": str(self._file_path)},
             )
-            return []
+            return
 
-        channels: List[Channel] = []
-        for item in payload:
-            if not isinstance(item, dict):
-                logger.warning(
-                    "Skipping malformed channel entry",
-                    extra={"repository": str(self._file_path), "entry": item},
-                )
-                continue
-            try:
-                channels.append(Channel(**item))
-            except ValueError as exc:
-                logger.warning(
-                    "Invalid channel entry encountered",
-                    extra={"repository": str(self._file_path), "error": str(exc)},
-                )
-        return channels
-
-    def _write_channels_sync(self, channels: Sequence[Channel]) -> None:
-        serialized = [channel.model_dump(mode="json") for channel in channels]
-        json_payload = json.dumps(serialized, ensure_ascii=False, indent=2)
+        with handle:
+            for item in iter_json_array(handle):
+                if not isinstance(item, dict):
+                    logger.warning(
+                        "Skipping malformed channel entry",
+                        extra={"repository": str(self._file_path), "entry": item},
+                    )
+                    continue
+                try:
+                    yield Channel(**item)
+                except ValueError as exc:
+                    logger.warning(
+                        "Invalid channel entry encountered",
+                        extra={"repository": str(self._file_path), "error": str(exc)},
+                    )
 
+    def _write_channels_sync(
+        self,
+        channels: Iterable[Channel],
+        keep: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        # Channels are encoded one at a time; ``keep`` may veto the replace
+        # once the iterable is exhausted.
         with NamedTemporaryFile(
             "w",
             delete=False,
             encoding=self._encoding,
             dir=str(self._file_path.parent),
         ) as tmp_file:
-            tmp_file.write(json_payload)
-            tmp_file.flush()
-            temp_name = tmp_file.name
-
-        Path(temp_name).replace(self._file_path)
-
-    @staticmethod
-    def _normalize_url(url: str) -> str:
-        return url.strip().lower()
-
-    @staticmethod
-    def _merge_channels(original: Channel, incoming: Channel) -> Channel:
-        merged_data = original.model_dump()
-        incoming_data = incoming.model_dump()
-        merged_data.update(incoming_data)
-        merged_data["id"] = original.id
-        merged_data["created_at"] = original.created_at
-        merged_data["manually_edited"] = (
-            original.manually_edited or incoming.manually_edited
+            temp_path = Path(tmp_file.name)
+            try:
+                write_json_array(
+                    tmp_file, (channel.model_dump(mode="json") for channel in channels)
+                )
+                tmp_file.flush()
+            except BaseException:
+                tmp_file.close()
+                temp_path.unlink(missing_ok=True)
+                raise
+
+        if keep is not None and not keep():
+            temp_path.unlink(missing_ok=True)
+            return
+        temp_path.replace(self._file_path)
+
+
+class StreamingJSONChannelRepository(JSONChannelRepository):
+    """
+    JSON repository that decodes the file incrementally on every call.
+
+    Nothing is kept in memory between calls. Reads walk the array one
+    element at a time and keep only the matching channels, so filtered
+    listings, exports and statistics run in memory bounded by their result
+    rather than by the file. Every mutation streams the file through a
+    transform into a temporary file, which then atomically replaces the
+    original. Each call costs one pass over the file. This trades the
+    in-memory indexes for a flat footprint on very large repositories.
+
+    If the file becomes corrupted part-way, reads stop at the damaged
+    element, and the next mutation rewrites the channels read before it.
+    """
+
+    def __init__(self, file_path: Path, *, encoding: str = "utf-8") -> None:
+        super().__init__(file_path, encoding=encoding, flush_delay=0)
+
+    async def get_by_id(self, channel_id: str) -> Optional[Channel]:
+        """Return a channel by its UUID identifier."""
+        return await asyncio.to_thread(
+            self._first_sync, lambda channel: channel.id == channel_id
         )
-        return Channel(**merged_data)
-
-    @staticmethod
-    def _matches_filters(channel: Channel, filters: Dict[str, Any]) -> bool:
-        for key, expected in filters.items():
-            if expected is None:
-                continue
-            if key == "group" and channel.group != expected:
-                return False
-            if key == "is_online" and channel.is_online != expected:
-                return False
-            if key == "validation_status" and channel.validation_status != expected:
-                return False
-            if key == "manually_edited" and channel.manually_edited != expected:
-                return False
-        return True
+
+    async def get_by_url(self, url: str) -> Optional[Channel]:
+        """Return a channel using normalized URL matching."""
+        url_key = normalize_channel_url(url)
+        return await asyncio.to_thread(
+            self._first_sync,
+            lambda channel: normalize_channel_url(channel.url) == url_key,
+        )
+
+    async def find_all(self, filters: Optional[Dict[str, Any]] = None) -> List[Channel]:
+        """Return matching channels; see :meth:`JSONChannelRepository.find_all`."""
+        active = filters or {}
+        return await asyncio.to_thread(
+            lambda: [
+                channel
+                for channel in self._stream_sync()
+                if matches_filters(channel, active)
+            ]
+        )
+
+    async def iter_all(
+        self, filters: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Channel]:
+        """Yield matching channels while the file is being decoded."""
+        active = filters or {}
+        channels = self._stream_sync()
+        try:
+            while True:
+                batch = await asyncio.to_thread(
+                    lambda: list(islice(channels, _STREAM_BATCH_SIZE))
+                )
+                if not batch:
+                    return
+                for channel in batch:
+                    if matches_filters(channel, active):
+                        yield channel
+        finally:
+            channels.close()
+
+    async def delete(self, channel_id: str) -> bool:
+        """Delete a channel by ID. Returns True if a record was removed."""
+        removed = 0
+
+        def transform(channels: Iterator[Channel]) -> Iterator[Channel]:
+            nonlocal removed
+            for channel in channels:
+                if channel.id == channel_id:
+                    removed += 1
+                    continue
+                yield channel
+
+        await self._rewrite(transform, lambda: removed > 0)
+        if removed:
+            logger.info(
+                "Channel deleted",
+                extra={"channel_id": channel_id, "repository": str(self._file_path)},
+            )
+        return removed > 0
+
+    async def update_where(
+        self, filters: Dict[str, Any], changes: Dict[str, Any]
+    ) -> int:
+        """Apply ``changes`` to matching channels in one pass over the file."""
+        validate_changes(changes)
+        updated = await self._rewrite_matching(
+            lambda channel: matches_filters(channel, filters), changes
+        )
+        logger.info(
+            "Channels updated in bulk",
+            extra={
+                "filters": filters,
+                "changes": list(changes),
+                "updated": updated,
+                "repository": str(self._file_path),
+            },
+        )
+        return updated
+
+    async def reassign_group(
+        self, sources: Collection[Optional[str]], target: Optional[str]
+    ) -> int:
+        """Move the channels of ``sources`` into ``target`` in one pass."""
+        groups = set(sources)
+        moved = await self._rewrite_matching(
+            lambda channel: channel.group in groups, {"group": target}
+        )
+        logger.info(
+            "Channel groups reassigned",
+            extra={
+                "sources": list(sources),
+                "target": target,
+                "moved": moved,
+                "repository": str(self._file_path),
+            },
+        )
+        return moved
+
+    async def _upsert(
+        self,
+        channels: Sequence[Channel],
+        merge_fields: Optional[Collection[str]],
+    ) -> List[UpsertResult]:
+        results: List[Optional[UpsertResult]] = [None] * len(channels)
+        # normalized URL -> positions of the incoming channels, in input order
+        pending: Dict[str, List[int]] = {}
+        for position, channel in enumerate(channels):
+            pending.setdefault(normalize_channel_url(channel.url), []).append(position)
+        known_ids: Set[str] = set()
+
+        def apply(
+            current: Optional[Channel], positions: List[int]
+        ) -> Optional[Channel]:
+            for position in positions:
+                channel = channels[position]
+                try:
+                    if current is None:
+                        if channel.id in known_ids:
+                            raise ValueError(id_conflict_error(channel))
+                        current = channel
+                        known_ids.add(channel.id)
+                        outcome = UpsertOutcome.CREATED
+                    else:
+                        if merge_fields is None:
+                            current = merge_channels(current, channel)
+                        else:
+                            current = update_channel_fields(
+                                current, channel, merge_fields
+                            )
+                        outcome = UpsertOutcome.UPDATED
+                except ValueError as exc:
+                    results[position] = UpsertResult(
+                        UpsertOutcome.FAILED, error=str(exc)
+                    )
+                    continue
+                results[position] = UpsertResult(outcome, current)
+            return current
+
+        def transform(stored: Iterator[Channel]) -> Iterator[Channel]:
+            for channel in stored:
+                known_ids.add(channel.id)
+                positions = pending.pop(normalize_channel_url(channel.url), None)
+                yield channel if positions is None else apply(channel, positions)
+            # New URLs are appended once every stored id is known.
+            for positions in pending.values():
+                created = apply(None, positions)
+                if created is not None:
+                    yield created
+
+        await self._rewrite(
+            transform,
+            lambda: any(
+                result is not None and result.channel is not None for result in results
+            ),
+        )
+        return [result for result in results if result is not None]
+
+    async def _rewrite_matching(
+        self, predicate: Callable[[Channel], bool], changes: Dict[str, Any]
+    ) -> int:
+        updated = 0
+
+        def transform(channels: Iterator[Channel]) -> Iterator[Channel]:
+            nonlocal updated
+            for channel in channels:
+                if predicate(channel):
+                    updated += 1
+                    channel = channel.model_copy(update=changes)
+                yield channel
+
+        await self._rewrite(transform, lambda: updated > 0)
+        return updated
+
+    async def _rewrite(
+        self,
+        transform: Callable[[Iterator[Channel]], Iterator[Channel]],
+        keep: Callable[[], bool],
+    ) -> None:
+        async with self._lock:
+            await asyncio.to_thread(
+                self._write_channels_sync, transform(self._stream_sync()), keep
+            )
+
+    def _first_sync(self, predicate: Callable[[Channel], bool]) -> Optional[Channel]:
+        channels = self._stream_sync()
+        try:
+            return next((channel for channel in channels if predicate(channel)), None)
+        finally:
+            channels.close()
+
+    def _stream_sync(self) -> Generator[Channel, None, None]:
+        try:
+            yield from self._iter_file_sync()
+        except json.JSONDecodeError as exc:
+            logger.error(
+                "Corrupted channel repository JSON",
+                extra={"repository": str(self._file_path), "error": str(exc)},
+            )
@@ -0,0 +1,125 @@
+"""Incremental reading and writing of top-level JSON arrays."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Iterable, Iterator, TextIO
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789+-.eE"
+# A token cut off by the chunk boundary fails at most this far from the end
+# of the buffer ("fals", "\\u12").
+_TRUNCATION_SLACK = 6
+
+
+def _may_be_truncated(error: json.JSONDecodeError, buffer: str) -> bool:
+    """Whether ``error`` could be caused by the buffer ending mid-element."""
+    if error.msg.startswith("Unterminated string"):
+        return True
+    return len(buffer) - error.pos <= _TRUNCATION_SLACK
+
+
+def _runs_to_end(buffer: str, end: int) -> bool:
+    """Whether the characters from ``end`` could continue a decoded number."""
+    if end == len(buffer):
+        return True
+    return buffer[end] in _NUMBER_CHARS and not buffer[end:].lstrip(_NUMBER_CHARS)
+
+
+def iter_json_array(stream: TextIO, *, chunk_size: int = 1 << 16) -> Iterator[Any]:
+    """
+    Yield the elements of the JSON array in ``stream`` one at a time.
+
+    Only the element being decoded and one read chunk are held in memory,
+    so arbitrarily large arrays can be walked in bounded memory. An empty
+    stream yields nothing. Anything other than a well-formed array raises
+    :class:`json.JSONDecodeError` when the parser reaches it, after the
+    elements before the error have been yielded.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, pos, eof
+        if eof:
+            return False
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def next_char() -> str:
+        # Skip whitespace and return the next significant character ("" at EOF).
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill():
+                return ""
+
+    first = next_char()
+    if not first:
+        return
+    if first != "[":
+        raise json.JSONDecodeError("Expecting JSON array", buffer, pos)
+    pos += 1
+    if next_char() == "]":
+        pos += 1
+    else:
+        while True:
+            if not next_char():
+                raise json.JSONDecodeError("Unterminated array", buffer, pos)
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError as exc:
+                    # The element may continue in the next chunk; errors
+                    # well inside the buffer are genuine and raised at once.
+                    if _may_be_truncated(exc, buffer) and fill():
+                        continue
+                    raise
+                # A number cut off by the chunk boundary ("1." of "1.5")
+                # decodes short; read on while its tail reaches the end.
+                if _runs_to_end(buffer, end) and fill():
+                    continue
+                break
+            pos = end
+            yield value
+
+            separator = next_char()
+            if separator == ",":
+                pos += 1
+            elif separator == "]":
+                pos += 1
+                break
+            else:
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, pos)
+    if next_char():
+        raise json.JSONDecodeError("Extra data", buffer, pos)
+
+
+def write_json_array(stream: TextIO, items: Iterable[Any]) -> int:
+    """
+    Write ``items`` to ``stream`` as an indented JSON array, one at a time.
+
+    The output matches ``json.dumps(list(items), ensure_ascii=False,
+    indent=2)``. Returns the number of items written.
+    """
+    count = 0
+    for item in items:
+        encoded = json.dumps(item, ensure_ascii=False, indent=2)
+        stream.write("[\n  " if count == 0 else ",\n  ")
+        stream.write(encoded.replace("\n", "\n  "))
+        count += 1
+    stream.write("\n]" if count else "[]")
+    return count
+
+
+__all__ = ["iter_json_array", "write_json_array"]
@@ -0,0 +1,152 @@
+"""Batched persistence of scan results into the channel repository."""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import List, Optional
+from urllib.parse import urlparse
+
+from iptv_sniffer.channel.models import Channel, ValidationStatus
+from iptv_sniffer.scanner.validator import ErrorCategory, StreamValidationResult
+
+from .base import ChannelRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ScanResultWriter:
+    """
+    Convert validation results into channels and save them in batches.
+
+    Pending channels are written with one :meth:`ChannelRepository.add_many`
+    call once ``batch_size`` results have accumulated or the oldest pending
+    result is ``max_age`` seconds old, whichever comes first; the age is checked
+    on every result, including ones that are not saved. Existing channels
+    only receive the validation fields so user-edited names and groups survive
+    a rescan. With ``include_invalid`` failed probes are saved too, but only
+    update the status fields so the last known resolution and codecs are kept.
+    Callers must :meth:`flush` once the scan ends, with ``durable=True``
+    before recording progress that assumes the results are on disk.
+    """
+
+    VALIDATION_FIELDS = (
+        "resolution",
+        "codec_video",
+        "codec_audio",
+        "is_online",
+        "validation_status",
+        "last_validated",
+        "updated_at",
+    )
+    STATUS_FIELDS = (
+        "is_online",
+        "validation_status",
+        "last_validated",
+        "updated_at",
+    )
+
+    def __init__(
+        self,
+        repository: ChannelRepository,
+        *,
+        batch_size: int = 500,
+        max_age: float = 5.0,
+        include_invalid: bool = False,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+        if max_age < 0:
+            raise ValueError("max_age must not be negative")
+        self._repository = repository
+        self._batch_size = batch_size
+        self._max_age = max_age
+        self._include_invalid = include_invalid
+        self._pending: List[Channel] = []
+        self._pending_failed: List[Channel] = []
+        self._oldest: Optional[float] = None
+        self._written = 0
+        self._batches = 0
+
+    @property
+    def written(self) -> int:
+        """Number of channels persisted so far."""
+        return self._written
+
+    @property
+    def batches(self) -> int:
+        """Number of repository writes performed so far."""
+        return self._batches
+
+    async def add(self, result: StreamValidationResult) -> None:
+        now = time.monotonic()
+        channel = None
+        if result.is_valid or self._include_invalid:
+            channel = self.to_channel(result)
+        if channel is not None:
+            if self._oldest is None:
+                self._oldest = now
+            if result.is_valid:
+                self._pending.append(channel)
+            else:
+                self._pending_failed.append(channel)
+        # Checked for every result so that on a sparse sweep, where most
+        # results are dropped, found channels are not held until the end.
+        if self._oldest is not None and (
+            len(self._pending) + len(self._pending_failed) >= self._batch_size
+            or now - self._oldest >= self._max_age
+        ):
+            await self.flush()
+
+    async def flush(self, *, durable: bool = False) -> None:
+        """
+        Write pending channels to the repository.
+
+        With ``durable`` the repository is also flushed, so a write-behind
+        backend has the results on disk when this returns.
+        """
+        if self._pending or self._pending_failed:
+            await self._write_pending()
+        if durable:
+            await self._repository.flush()
+
+    async def _write_pending(self) -> None:
+        valid, self._pending = self._pending, []
+        failed, self._pending_failed = self._pending_failed, []
+        self._oldest = None
+        if valid:
+            await self._repository.add_many(valid, merge_fields=self.VALIDATION_FIELDS)
+        if failed:
+            await self._repository.add_many(failed, merge_fields=self.STATUS_FIELDS)
+        self._written += len(valid) + len(failed)
+        self._batches += 1
+
+    @staticmethod
+    def to_channel(result: StreamValidationResult) -> Optional[Channel]:
+        """Build a channel record carrying the result's validation data."""
+        if result.is_valid:
+            status = ValidationStatus.ONLINE
+        elif result.error_category == ErrorCategory.UNSUPPORTED_PROTOCOL:
+            status = ValidationStatus.ERROR
+        else:
+            status = ValidationStatus.OFFLINE
+
+        parsed = urlparse(result.url)
+        try:
+            return Channel(
+                name=f"{parsed.netloc}{parsed.path}" or result.url,
+                url=result.url,
+                resolution=result.resolution,
+                codec_video=result.codec_video,
+                codec_audio=result.codec_audio,
+                is_online=result.is_valid,
+                validation_status=status,
+                last_validated=result.timestamp,
+                updated_at=result.timestamp,
+            )
+        except ValueError as exc:
+            logger.warning("Skipping unpersistable result for %s: %s", result.url, exc)
+            return None
+
+
+__all__ = ["ScanResultWriter"]
@@ -0,0 +1,247 @@
+"""Append-only scan checkpoints that allow interrupted scans to resume."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from iptv_sniffer.scanner.validator import StreamValidationResult
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointNotFoundError(Exception):
+    """Raised when no checkpoint exists for a scan identifier."""
+
+
+@dataclass
+class ScanCheckpoint:
+    """State reconstructed from a scan checkpoint file."""
+
+    scan_id: str
+    request: Dict[str, Any]
+    total: int
+    started_at: datetime
+    status: Optional[str] = None
+    completed_urls: Set[str] = field(default_factory=set)
+    valid: int = 0
+    invalid: int = 0
+
+    @property
+    def completed(self) -> int:
+        return len(self.completed_urls)
+
+
+class ScanCheckpointWriter:
+    """
+    Buffer per-target records and append them to the checkpoint file.
+
+    Records are only written by :meth:`flush`, which appends everything
+    buffered since the previous flush in a single write. Callers use
+    :meth:`flush_if_due` (or :attr:`is_due`, to persist results first) after
+    each result so the file is touched at most once per ``interval`` seconds.
+    """
+
+    def __init__(self, path: Path, *, interval: float) -> None:
+        self._path = path
+        self._interval = interval
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+        self._tail_checked = False
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def record(self, result: StreamValidationResult) -> None:
+        self._append(
+            {
+                "type": "result",
+                "url": result.url,
+                "is_valid": result.is_valid,
+                "protocol": result.protocol,
+                "resolution": result.resolution,
+                "codec_video": result.codec_video,
+                "codec_audio": result.codec_audio,
+                "error_category": (
+                    result.error_category.value if result.error_category else None
+                ),
+            }
+        )
+
+    def mark(self, status: str) -> None:
+        self._append({"type": "status", "status": status})
+
+    def mark_resumed(self) -> None:
+        self._append({"type": "resume", "at": datetime.now(timezone.utc).isoformat()})
+
+    @property
+    def is_due(self) -> bool:
+        """True when buffered records are older than the flush interval."""
+        return (
+            bool(self._buffer) and time.monotonic() - self._last_flush >= self._interval
+        )
+
+    async def flush_if_due(self) -> None:
+        if self.is_due:
+            await self.flush()
+
+    async def flush(self) -> None:
+        if self._buffer:
+            lines, self._buffer = self._buffer, []
+            await asyncio.to_thread(self._write_lines, lines)
+
+    def flush_sync(self) -> None:
+        """Flush without yielding to the event loop (used on cancellation)."""
+        if self._buffer:
+            lines, self._buffer = self._buffer, []
+            self._write_lines(lines)
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        self._buffer.append(json.dumps(record, ensure_ascii=False))
+
+    def _write_lines(self, lines: List[str]) -> None:
+        payload = "\n".join(lines) + "\n"
+        with self._path.open("a+b") as handle:
+            if not self._tail_checked:
+                # A crash mid-append may have left a partial line; terminate it
+                # so the next record starts on its own line.
+                self._tail_checked = True
+                if handle.seek(0, 2) > 0:
+                    handle.seek(-1, 2)
+                    if handle.read(1) != b"\n":
+                        payload = "\n" + payload
+            handle.write(payload.encode("utf-8"))
+        self._last_flush = time.monotonic()
+
+
+class ScanCheckpointStore:
+    """
+    Manage one JSON-lines checkpoint file per scan under ``directory``.
+
+    Checkpoints of completed scans are removed with :meth:`discard`. Those of
+    cancelled or failed scans stay resumable, but only the ``keep`` most
+    recently written files are retained; older ones are pruned whenever a
+    new checkpoint is created.
+    """
+
+    def __init__(
+        self, directory: Path, *, interval: float = 5.0, keep: int = 20
+    ) -> None:
+        if interval < 0:
+            raise ValueError("interval must not be negative")
+        if keep < 1:
+            raise ValueError("keep must be positive")
+        self._directory = directory
+        self._interval = interval
+        self._keep = keep
+
+    def create(
+        self, scan_id: str, request: Dict[str, Any], total: int
+    ) -> ScanCheckpointWriter:
+        """Start a new checkpoint file with a header describing the scan."""
+        self._directory.mkdir(parents=True, exist_ok=True)
+        header = {
+            "type": "start",
+            "scan_id": scan_id,
+            "request": request,
+            "total": total,
+            "started_at": datetime.now(timezone.utc).isoformat(),
+        }
+        path = self._path_for(scan_id)
+        path.write_text(json.dumps(header, ensure_ascii=False) + "\n", "utf-8")
+        self._prune()
+        return ScanCheckpointWriter(path, interval=self._interval)
+
+    def discard(self, scan_id: str) -> None:
+        """Delete the checkpoint for ``scan_id`` if there is one."""
+        self._path_for(scan_id).unlink(missing_ok=True)
+
+    def _prune(self) -> None:
+        paths = []
+        for path in self._directory.glob("*.jsonl"):
+            try:
+                paths.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+        paths.sort(reverse=True)
+        for _, path in paths[self._keep :]:
+            path.unlink(missing_ok=True)
+            logger.debug("Pruned old scan checkpoint", extra={"checkpoint": str(path)})
+
+    def reopen(self, scan_id: str) -> ScanCheckpointWriter:
+        """Continue appending to an existing checkpoint file."""
+        path = self._path_for(scan_id)
+        if not path.exists():
+            raise CheckpointNotFoundError(scan_id)
+        writer = ScanCheckpointWriter(path, interval=self._interval)
+        writer.mark_resumed()
+        return writer
+
+    def load(self, scan_id: str) -> ScanCheckpoint:
+        """Replay the checkpoint records for ``scan_id``."""
+        path = self._path_for(scan_id)
+        try:
+            lines = path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError as exc:
+            raise CheckpointNotFoundError(scan_id) from exc
+
+        checkpoint: Optional[ScanCheckpoint] = None
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # A crash mid-append can leave a truncated final line.
+                logger.warning(
+                    "Skipping unreadable checkpoint record",
+                    extra={"checkpoint": str(path)},
+                )
+                continue
+            kind = record.get("type")
+            if kind == "start":
+                checkpoint = ScanCheckpoint(
+                    scan_id=record["scan_id"],
+                    request=record["request"],
+                    total=int(record.get("total", 0)),
+                    started_at=datetime.fromisoformat(record["started_at"]),
+                )
+            elif checkpoint is None:
+                continue
+            elif kind == "result":
+                url = record["url"]
+                if url in checkpoint.completed_urls:
+                    continue
+                checkpoint.completed_urls.add(url)
+                if record.get("is_valid"):
+                    checkpoint.valid += 1
+                else:
+                    checkpoint.invalid += 1
+            elif kind == "status":
+                checkpoint.status = record.get("status")
+            elif kind == "resume":
+                checkpoint.status = None
+
+        if checkpoint is None:
+            raise CheckpointNotFoundError(scan_id)
+        return checkpoint
+
+    def _path_for(self, scan_id: str) -> Path:
+        if not scan_id or any(sep in scan_id for sep in ("/", "\\", "..")):
+            raise CheckpointNotFoundError(scan_id)
+        return self._directory / f"{scan_id}.jsonl"
+
+
+__all__ = [
+    "CheckpointNotFoundError",
+    "ScanCheckpoint",
+    "ScanCheckpointStore",
+    "ScanCheckpointWriter",
+]
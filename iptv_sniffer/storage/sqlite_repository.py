@@ -0,0 +1,460 @@
+"""SQLite-backed channel repository with indexed lookups."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterator,
+    Collection,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from pydantic_core import to_jsonable_python
+
+from iptv_sniffer.channel.models import Channel
+
+from .base import (
+    FILTER_FIELDS,
+    UpsertOutcome,
+    UpsertResult,
+    id_conflict_error,
+    merge_channels,
+    normalize_channel_url,
+    update_channel_fields,
+    validate_changes,
+)
+from .json_repository import JSONChannelRepository
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA_VERSION = 1
+# Rows fetched per query by iter_all.
+_PAGE_SIZE = 500
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS channels (
+    id TEXT PRIMARY KEY,
+    url_key TEXT NOT NULL UNIQUE,
+    group_name TEXT,
+    is_online INTEGER NOT NULL,
+    validation_status TEXT NOT NULL,
+    manually_edited INTEGER NOT NULL,
+    resolution TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_channels_group ON channels (group_name);
+CREATE INDEX IF NOT EXISTS idx_channels_online ON channels (is_online);
+CREATE INDEX IF NOT EXISTS idx_channels_status ON channels (validation_status);
+CREATE INDEX IF NOT EXISTS idx_channels_resolution ON channels (resolution);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+# find_all filter key -> indexed column
+_FILTER_COLUMNS = {
+    "group": "group_name",
+    "is_online": "is_online",
+    "validation_status": "validation_status",
+    "manually_edited": "manually_edited",
+    "resolution": "resolution",
+}
+_UPSERT = """
+INSERT INTO channels (
+    id, url_key, group_name, is_online, validation_status,
+    manually_edited, resolution, data
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (url_key) DO UPDATE SET
+    id = excluded.id,
+    group_name = excluded.group_name,
+    is_online = excluded.is_online,
+    validation_status = excluded.validation_status,
+    manually_edited = excluded.manually_edited,
+    resolution = excluded.resolution,
+    data = excluded.data
+"""
+
+
+class SQLiteChannelRepository:
+    """
+    Persist channels in SQLite while exposing the repository async API.
+
+    Each channel is stored as its JSON document plus indexed columns for the
+    normalized URL, id, group, online flag, validation status and resolution,
+    so lookups and filtered listings never scan the whole table. The database
+    runs in WAL mode: readers do not block the writer, and every worker
+    thread reads through its own connection. Writes are serialized by an
+    asyncio lock and each call commits one transaction. Rows keep insertion
+    order, like the JSON file.
+
+    When ``migrate_from`` names an existing JSON repository file, its
+    channels are imported once, on first use, into an empty database.
+    """
+
+    def __init__(self, db_path: Path, *, migrate_from: Optional[Path] = None) -> None:
+        self._db_path = db_path
+        self._migrate_from = migrate_from
+        self._lock = asyncio.Lock()
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._ready = False
+        self._db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def path(self) -> Path:
+        return self._db_path
+
+    async def add(self, channel: Channel) -> Channel:
+        """Add a channel or update an existing entry matched by URL."""
+        result = (await self.upsert_many([channel]))[0]
+        if result.channel is None:
+            raise ValueError(result.error)
+        return result.channel
+
+    async def add_many(
+        self,
+        channels: Sequence[Channel],
+        *,
+        merge_fields: Optional[Collection[str]] = None,
+    ) -> List[Channel]:
+        """
+        Add or update several channels in one transaction.
+
+        Matching and ``merge_fields`` follow
+        :meth:`JSONChannelRepository.add_many`.
+        """
+        results = await self.upsert_many(channels, merge_fields=merge_fields)
+        return [result.channel for result in results if result.channel is not None]
+
+    async def upsert_many(
+        self,
+        channels: Sequence[Channel],
+        *,
+        merge_fields: Optional[Collection[str]] = None,
+    ) -> List[UpsertResult]:
+        """
+        Add or update several channels in one transaction, reporting outcomes.
+
+        Outcomes follow :meth:`JSONChannelRepository.upsert_many`; a failed
+        item does not roll back the others.
+        """
+        if not channels:
+            return []
+        await self._ensure_ready()
+        async with self._lock:
+            results = await asyncio.to_thread(
+                self._save_many_sync, list(channels), merge_fields
+            )
+        counts = Counter(result.outcome for result in results)
+        logger.info(
+            "Channels saved in batch",
+            extra={
+                "created": counts[UpsertOutcome.CREATED],
+                "updated": counts[UpsertOutcome.UPDATED],
+                "failed": counts[UpsertOutcome.FAILED],
+                "repository": str(self._db_path),
+            },
+        )
+        return results
+
+    async def get_by_id(self, channel_id: str) -> Optional[Channel]:
+        """Return a channel by its UUID identifier."""
+        rows = await self._query(
+            "SELECT data FROM channels WHERE id = ?", (channel_id,)
+        )
+        return rows[0] if rows else None
+
+    async def get_by_url(self, url: str) -> Optional[Channel]:
+        """Return a channel using normalized URL matching."""
+        rows = await self._query(
+            "SELECT data FROM channels WHERE url_key = ?",
+            (normalize_channel_url(url),),
+        )
+        return rows[0] if rows else None
+
+    async def find_all(self, filters: Optional[Dict[str, Any]] = None) -> List[Channel]:
+        """
+        Return all channels optionally filtered by attributes.
+
+        Supports the same filters as :meth:`JSONChannelRepository.find_all`;
+        each one is answered from an index.
+        """
+        where, params = self._where(filters or {})
+        return await self._query(
+            f"SELECT data FROM channels{where} ORDER BY rowid", params
+        )
+
+    async def iter_all(
+        self, filters: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Channel]:
+        """Yield matching channels, fetched in rowid-ordered pages."""
+        where, params = self._where(filters or {})
+        where = f"{where} AND rowid > ?" if where else " WHERE rowid > ?"
+        sql = (
+            f"SELECT rowid, data FROM channels{where} ORDER BY rowid LIMIT {_PAGE_SIZE}"
+        )
+        await self._ensure_ready()
+        last_rowid = 0
+        while True:
+            rows = await asyncio.to_thread(
+                lambda: (
+                    self._connection().execute(sql, params + (last_rowid,)).fetchall()
+                )
+            )
+            for _, data in rows:
+                yield Channel.model_validate_json(data)
+            if len(rows) < _PAGE_SIZE:
+                return
+            last_rowid = rows[-1][0]
+
+    async def update_where(
+        self, filters: Dict[str, Any], changes: Dict[str, Any]
+    ) -> int:
+        """
+        Apply ``changes`` to every channel matching ``filters``.
+
+        Runs as a single ``UPDATE`` statement; see
+        :meth:`JSONChannelRepository.update_where` for the arguments.
+        """
+        validate_changes(changes)
+        where, params = self._where(filters)
+        return await self._update(where, params, changes)
+
+    async def reassign_group(
+        self, sources: Collection[Optional[str]], target: Optional[str]
+    ) -> int:
+        """Move the channels of ``sources`` into ``target`` in one ``UPDATE``."""
+        groups = list(set(sources))
+        if not groups:
+            return 0
+        where = " WHERE " + " OR ".join("group_name IS ?" for _ in groups)
+        return await self._update(where, tuple(groups), {"group": target})
+
+    async def delete(self, channel_id: str) -> bool:
+        """Delete a channel by ID. Returns True if a record was removed."""
+        await self._ensure_ready()
+        async with self._lock:
+            deleted = await asyncio.to_thread(self._delete_sync, channel_id)
+        if deleted:
+            logger.info(
+                "Channel deleted",
+                extra={"channel_id": channel_id, "repository": str(self._db_path)},
+            )
+        return deleted
+
+    async def flush(self) -> None:
+        """Nothing to do: every write is committed before it returns."""
+
+    def close(self) -> None:
+        """Close every connection opened by this repository."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+    async def _query(self, sql: str, params: Tuple[Any, ...]) -> List[Channel]:
+        await self._ensure_ready()
+        return await asyncio.to_thread(self._query_sync, sql, params)
+
+    async def _ensure_ready(self) -> None:
+        if self._ready:
+            return
+        async with self._lock:
+            if not self._ready:
+                await asyncio.to_thread(self._initialize_sync)
+                self._ready = True
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self._db_path, timeout=30.0, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._connections_lock:
+                self._connections.append(connection)
+        return connection
+
+    def _initialize_sync(self) -> None:
+        connection = self._connection()
+        with connection:
+            connection.executescript(_SCHEMA)
+            connection.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES ('schema_version', ?)",
+                (str(_SCHEMA_VERSION),),
+            )
+        self._migrate_sync()
+
+    def _migrate_sync(self) -> None:
+        source = self._migrate_from
+        if source is None or not source.exists():
+            return
+        connection = self._connection()
+        migrated = connection.execute(
+            "SELECT value FROM meta WHERE key = 'migrated_from'"
+        ).fetchone()
+        has_rows = connection.execute("SELECT 1 FROM channels LIMIT 1").fetchone()
+        if migrated is not None or has_rows is not None:
+            return
+
+        # The JSON reader already skips corrupt files and invalid entries;
+        # the source file is left in place.
+        reader = JSONChannelRepository(source)
+        channels = reader._read_channels_sync()  # pylint: disable=protected-access
+        results = self._save_many_sync(channels, None, marker=str(source))
+        logger.info(
+            "Migrated JSON channel repository to SQLite",
+            extra={
+                "source": str(source),
+                "channels": sum(1 for result in results if result.channel),
+                "repository": str(self._db_path),
+            },
+        )
+
+    def _save_many_sync(
+        self,
+        channels: List[Channel],
+        merge_fields: Optional[Collection[str]],
+        *,
+        marker: Optional[str] = None,
+    ) -> List[UpsertResult]:
+        connection = self._connection()
+        results: List[UpsertResult] = []
+        with connection:
+            for channel in channels:
+                url_key = normalize_channel_url(channel.url)
+                row = connection.execute(
+                    "SELECT data FROM channels WHERE url_key = ?", (url_key,)
+                ).fetchone()
+                try:
+                    if row is None:
+                        stored = channel
+                    else:
+                        existing = Channel.model_validate_json(row[0])
+                        if merge_fields is None:
+                            stored = merge_channels(existing, channel)
+                        else:
+                            stored = update_channel_fields(
+                                existing, channel, merge_fields
+                            )
+                    connection.execute(_UPSERT, self._row(stored, url_key))
+                except sqlite3.IntegrityError:
+                    error = id_conflict_error(channel)
+                    results.append(UpsertResult(UpsertOutcome.FAILED, error=error))
+                    continue
+                except ValueError as exc:
+                    results.append(UpsertResult(UpsertOutcome.FAILED, error=str(exc)))
+                    continue
+                outcome = (
+                    UpsertOutcome.CREATED if row is None else UpsertOutcome.UPDATED
+                )
+                results.append(UpsertResult(outcome, stored))
+            if marker is not None:
+                connection.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) "
+                    "VALUES ('migrated_from', ?)",
+                    (marker,),
+                )
+        return results
+
+    def _delete_sync(self, channel_id: str) -> bool:
+        connection = self._connection()
+        with connection:
+            cursor = connection.execute(
+                "DELETE FROM channels WHERE id = ?", (channel_id,)
+            )
+        return cursor.rowcount > 0
+
+    def _query_sync(self, sql: str, params: Tuple[Any, ...]) -> List[Channel]:
+        rows = self._connection().execute(sql, params).fetchall()
+        return [Channel.model_validate_json(row[0]) for row in rows]
+
+    @classmethod
+    def _row(cls, channel: Channel, url_key: str) -> Tuple[Any, ...]:
+        return (
+            channel.id,
+            url_key,
+            channel.group,
+            int(channel.is_online),
+            channel.validation_status.value,
+            int(channel.manually_edited),
+            channel.resolution,
+            channel.model_dump_json(),
+        )
+
+    async def _update(
+        self, where: str, params: Tuple[Any, ...], changes: Dict[str, Any]
+    ) -> int:
+        if not changes:
+            return 0
+        # Indexed columns and the stored document change in one statement.
+        assignments: List[str] = []
+        values: List[Any] = []
+        paths: List[str] = []
+        documents: List[Any] = []
+        for name, value in changes.items():
+            column = _FILTER_COLUMNS.get(name)
+            if column is not None:
+                assignments.append(f"{column} = ?")
+                values.append(self._column_value(value))
+            paths.append(f"'$.{name}', json(?)")
+            documents.append(json.dumps(to_jsonable_python(value)))
+        assignments.append(f"data = json_set(data, {', '.join(paths)})")
+        values.extend(documents)
+        sql = f"UPDATE channels SET {', '.join(assignments)}{where}"
+
+        await self._ensure_ready()
+        async with self._lock:
+            updated = await asyncio.to_thread(
+                self._execute_sync, sql, tuple(values) + params
+            )
+        logger.info(
+            "Channels updated in bulk",
+            extra={
+                "changes": list(changes),
+                "updated": updated,
+                "repository": str(self._db_path),
+            },
+        )
+        return updated
+
+    def _execute_sync(self, sql: str, params: Tuple[Any, ...]) -> int:
+        connection = self._connection()
+        with connection:
+            return connection.execute(sql, params).rowcount
+
+    @classmethod
+    def _where(cls, filters: Dict[str, Any]) -> Tuple[str, Tuple[Any, ...]]:
+        clauses: List[str] = []
+        params: List[Any] = []
+        for key, expected in filters.items():
+            if expected is None or key not in FILTER_FIELDS:
+                continue
+            clauses.append(f"{_FILTER_COLUMNS[key]} = ?")
+            params.append(cls._column_value(expected))
+        if not clauses:
+            return "", ()
+        return " WHERE " + " AND ".join(clauses), tuple(params)
+
+    @staticmethod
+    def _column_value(value: Any) -> Any:
+        if isinstance(value, bool):
+            return int(value)
+        return getattr(value, "value", value)
+
+
+__all__ = ["SQLiteChannelRepository"]
@@ -1,6 +1,6 @@
 """Utility helpers for iptv-sniffer."""
 
 from .config import AppConfig
-from . import ffmpeg
+from . import ffmpeg, http_client
 
-__all__ = ["AppConfig", "ffmpeg"]
+__all__ = ["AppConfig", "ffmpeg", "http_client"]
@@ -20,10 +20,27 @@ MAX_TIMEOUT = 60
 MAX_RETRY_ATTEMPTS = 5
 MIN_RETRY_BACKOFF = 1.0
 MAX_RETRY_BACKOFF = 3.0
+MAX_REQUEST_RATE = 1000.0
+MAX_BURST = 1000
+MAX_CHECKPOINT_INTERVAL = 300.0
+MAX_CHECKPOINTS_KEPT = 1000
+MAX_PREFILTER_TIMEOUT = 10.0
+MAX_HOST_FAILURE_WINDOW = 3600.0
+MAX_MULTICAST_PROBE_TIMEOUT = 10.0
+MAX_HTTP_CONNECTIONS = 1000
+MAX_HTTP_KEEPALIVE_EXPIRY = 300.0
+MAX_HTTP_DNS_TTL = 3600.0
+MAX_VALIDATION_CACHE_TTL = 86_400.0
+MAX_VALIDATION_CACHE_ENTRIES = 1_000_000
+MAX_PERSIST_BATCH_SIZE = 10_000
+MAX_PERSIST_BATCH_AGE = 300.0
+MAX_CHANNEL_FLUSH_DELAY = 60.0
 
 LogLevel = Literal["DEBUG", "INFO", "WARNING", "ERROR"]
 LogFormat = Literal["json", "text"]
 HwAccel = Literal["vaapi", "cuda"]
+ProbeBackendName = Literal["thread", "async"]
+StorageBackendName = Literal["json", "sqlite"]
 
 
 class AppConfig(BaseSettings):
@@ -49,6 +66,13 @@ class AppConfig(BaseSettings):
         le=MAX_CONCURRENCY,
         description="Maximum simultaneous network requests during scanning.",
     )
+    probe_pool_size: int = Field(
+        default=MAX_CONCURRENCY,
+        ge=MIN_CONCURRENCY,
+        le=MAX_CONCURRENCY,
+        description="Probe slots shared by all running scans; adaptive scans "
+        "may grow up to it.",
+    )
     timeout: int = Field(
         default=10,
         ge=MIN_TIMEOUT,
@@ -67,6 +91,107 @@ class AppConfig(BaseSettings):
         le=MAX_RETRY_BACKOFF,
         description="Exponential backoff factor between retries.",
     )
+    host_rate_limit: float = Field(
+        default=20.0,
+        ge=0,
+        le=MAX_REQUEST_RATE,
+        description="Maximum probes started per second against one host (0 disables).",
+    )
+    host_burst: int = Field(
+        default=10,
+        ge=1,
+        le=MAX_BURST,
+        description="Probes allowed back-to-back against one host before rate limiting.",
+    )
+    subnet_rate_limit: float = Field(
+        default=50.0,
+        ge=0,
+        le=MAX_REQUEST_RATE,
+        description="Maximum probes started per second against one /24 (0 disables).",
+    )
+    subnet_burst: int = Field(
+        default=20,
+        ge=1,
+        le=MAX_BURST,
+        description="Probes allowed back-to-back against one /24 before rate limiting.",
+    )
+
+    prefilter_enabled: bool = Field(
+        default=True,
+        description="Prune unreachable HTTP/RTSP targets before probing with FFmpeg.",
+    )
+    prefilter_timeout: float = Field(
+        default=1.0,
+        gt=0,
+        le=MAX_PREFILTER_TIMEOUT,
+        description="Seconds allowed for each reachability pre-filter step.",
+    )
+    host_failure_window: float = Field(
+        default=60.0,
+        ge=0,
+        le=MAX_HOST_FAILURE_WINDOW,
+        description="Seconds unreachable hosts and ports are skipped; 0 disables it.",
+    )
+    host_failure_threshold: int = Field(
+        default=2,
+        ge=1,
+        le=MAX_PORT,
+        description="Unreachable ports after which a whole host is skipped.",
+    )
+    http_max_connections: int = Field(
+        default=100,
+        ge=1,
+        le=MAX_HTTP_CONNECTIONS,
+        description="Connections the shared HTTP client keeps open across all hosts.",
+    )
+    http_max_keepalive_connections: int = Field(
+        default=50,
+        ge=0,
+        le=MAX_HTTP_CONNECTIONS,
+        description="Idle connections kept alive for reuse by later probes.",
+    )
+    http_keepalive_expiry: float = Field(
+        default=30.0,
+        ge=0,
+        le=MAX_HTTP_KEEPALIVE_EXPIRY,
+        description="Seconds an idle pooled HTTP connection is kept before closing.",
+    )
+    http2_enabled: bool = Field(
+        default=True,
+        description="Negotiate HTTP/2 when the optional h2 package is installed.",
+    )
+    http_dns_ttl: float = Field(
+        default=300.0,
+        ge=0,
+        le=MAX_HTTP_DNS_TTL,
+        description="Seconds resolved host names are cached; 0 disables the cache.",
+    )
+    validation_cache_enabled: bool = Field(
+        default=True,
+        description="Answer repeat probes of a URL from recent validation results.",
+    )
+    validation_cache_positive_ttl: float = Field(
+        default=600.0,
+        ge=0,
+        le=MAX_VALIDATION_CACHE_TTL,
+        description="Seconds a valid result is reused; 0 disables caching them.",
+    )
+    validation_cache_negative_ttl: float = Field(
+        default=120.0,
+        ge=0,
+        le=MAX_VALIDATION_CACHE_TTL,
+        description="Seconds a failed result is reused; 0 disables caching them.",
+    )
+    validation_cache_max_entries: int = Field(
+        default=50_000,
+        ge=1,
+        le=MAX_VALIDATION_CACHE_ENTRIES,
+        description="Cached results kept in memory before the least recent is evicted.",
+    )
+    validation_cache_persist: bool = Field(
+        default=True,
+        description="Save the validation cache in the data directory across restarts.",
+    )
 
     # FFmpeg
     ffmpeg_timeout: int = Field(
@@ -83,6 +208,46 @@ class AppConfig(BaseSettings):
         default_factory=list,
         description="Additional arguments appended to FFmpeg invocation.",
     )
+    ffprobe_backend: ProbeBackendName = Field(
+        default="async",
+        description="Run scan probes as asyncio subprocesses or in a thread pool.",
+    )
+    native_ts_analysis: bool = Field(
+        default=True,
+        description="Identify raw MPEG-TS HTTP streams in-process before using FFmpeg.",
+    )
+    native_hls_validation: bool = Field(
+        default=True,
+        description="Validate .m3u8 channels from playlists and one segment header.",
+    )
+    hls_probe_all_variants: bool = Field(
+        default=False,
+        description="Check every HLS variant in parallel instead of the cheapest one.",
+    )
+    native_multicast_probe: bool = Field(
+        default=True,
+        description="Verdict RTP/UDP groups from their first datagrams before using FFmpeg.",
+    )
+    multicast_probe_timeout: float = Field(
+        default=0.5,
+        gt=0,
+        le=MAX_MULTICAST_PROBE_TIMEOUT,
+        description="Seconds to wait for multicast datagrams before a group is considered silent.",
+    )
+    multicast_sweep_enabled: bool = Field(
+        default=True,
+        description="Sweep multicast ranges per port and only probe groups that sent traffic.",
+    )
+    multicast_sweep_window: float = Field(
+        default=1.0,
+        gt=0,
+        le=MAX_MULTICAST_PROBE_TIMEOUT,
+        description="Seconds each batch of joined groups is listened to during a sweep.",
+    )
+    multicast_interface: str = Field(
+        default="0.0.0.0",
+        description="Local IPv4 address of the interface used to join multicast groups.",
+    )
 
     # Storage
     data_dir: Path = Field(
@@ -93,6 +258,47 @@ class AppConfig(BaseSettings):
         default=Path("./screenshots"),
         description="Directory where channel screenshots are stored.",
     )
+    storage_backend: StorageBackendName = Field(
+        default="json",
+        description="Store channels in data_dir/channels.json or an indexed "
+        "SQLite database (channels.db, migrated once from channels.json).",
+    )
+    channel_streaming_reads: bool = Field(
+        default=False,
+        description="Decode channels.json incrementally on every call instead "
+        "of keeping it in memory (bounded memory for very large files).",
+    )
+    channel_flush_delay: float = Field(
+        default=1.0,
+        ge=0,
+        le=MAX_CHANNEL_FLUSH_DELAY,
+        description="Seconds JSON channel changes are coalesced before the file "
+        "is rewritten (0 writes on every change).",
+    )
+    checkpoint_interval: float = Field(
+        default=5.0,
+        ge=0,
+        le=MAX_CHECKPOINT_INTERVAL,
+        description="Seconds between appends to a running scan's checkpoint file.",
+    )
+    checkpoints_kept: int = Field(
+        default=20,
+        ge=1,
+        le=MAX_CHECKPOINTS_KEPT,
+        description="Checkpoints of unfinished scans kept for resuming.",
+    )
+    persist_batch_size: int = Field(
+        default=500,
+        ge=1,
+        le=MAX_PERSIST_BATCH_SIZE,
+        description="Scan results buffered before they are saved as channels.",
+    )
+    persist_batch_age: float = Field(
+        default=5.0,
+        ge=0,
+        le=MAX_PERSIST_BATCH_AGE,
+        description="Maximum seconds a scan result waits before being saved.",
+    )
 
     # Web server
     host: str = Field(
@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import shutil
 import subprocess
 import sys
-from typing import Optional
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import FrozenSet, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -84,6 +88,207 @@ def get_ffmpeg_version() -> Optional[str]:
     return first_line.strip()
 
 
+#: Seconds a detected capability set is trusted before it is re-detected.
+CAPABILITY_TTL = 300.0
+
+
+@dataclass(frozen=True)
+class FFmpegCapabilities:
+    """
+    Snapshot of the FFmpeg installation.
+
+    Attributes:
+        ffmpeg_path: Resolved path of the ``ffmpeg`` executable, if found.
+        ffprobe_path: Resolved path of the ``ffprobe`` executable, if found.
+        version: First line of ``ffmpeg -version`` output.
+        protocols: Input protocols FFmpeg was built with.
+        decoders: Decoder names FFmpeg was built with.
+        detected_at: ``time.monotonic()`` timestamp of the detection.
+    """
+
+    ffmpeg_path: Optional[str] = None
+    ffprobe_path: Optional[str] = None
+    version: Optional[str] = None
+    protocols: FrozenSet[str] = field(default_factory=frozenset)
+    decoders: FrozenSet[str] = field(default_factory=frozenset)
+    detected_at: float = 0.0
+
+    @property
+    def available(self) -> bool:
+        """True when the ffmpeg executable was found."""
+        return self.ffmpeg_path is not None
+
+    def supports_protocol(self, protocol: str) -> bool:
+        """
+        Return whether FFmpeg can read ``protocol``.
+
+        An empty protocol list (detection failed) is treated as permissive.
+        """
+        return not self.protocols or protocol.lower() in self.protocols
+
+    def supports_decoder(self, decoder: str) -> bool:
+        """Return whether FFmpeg has a decoder named ``decoder``."""
+        return not self.decoders or decoder.lower() in self.decoders
+
+
+def _run_ffmpeg_query(ffmpeg_path: str, *args: str) -> List[str]:
+    try:
+        result = subprocess.run(
+            [ffmpeg_path, "-hide_banner", *args],
+            capture_output=True,
+            text=True,
+            check=False,
+            timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError, ValueError) as exc:
+        logger.error("Failed to execute 'ffmpeg %s': %s", " ".join(args), exc)
+        return []
+    if result.returncode != 0:
+        logger.error("ffmpeg %s exited with code %s", " ".join(args), result.returncode)
+        return []
+    return result.stdout.splitlines()
+
+
+def _parse_protocols(lines: List[str]) -> FrozenSet[str]:
+    """Parse the ``Input:`` section of ``ffmpeg -protocols``."""
+    protocols = set()
+    in_input = False
+    for line in lines:
+        stripped = line.strip()
+        if stripped.endswith(":"):
+            in_input = stripped == "Input:"
+            continue
+        if in_input and stripped:
+            protocols.add(stripped.lower())
+    return frozenset(protocols)
+
+
+def _parse_decoders(lines: List[str]) -> FrozenSet[str]:
+    """Parse the table following the ``------`` separator of ``ffmpeg -decoders``."""
+    decoders = set()
+    in_table = False
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith("---"):
+            in_table = True
+            continue
+        parts = stripped.split()
+        if in_table and len(parts) >= 2:
+            decoders.add(parts[1].lower())
+    return frozenset(decoders)
+
+
+def detect_ffmpeg_capabilities() -> FFmpegCapabilities:
+    """
+    Probe the system for FFmpeg, bypassing the cache.
+
+    Resolves the ffmpeg/ffprobe paths and queries the version, input
+    protocols and decoders. Blocks for up to a few seconds; prefer
+    :func:`get_ffmpeg_capabilities` from threads and
+    :func:`get_ffmpeg_capabilities_async` from the event loop.
+    """
+    ffmpeg_path = shutil.which("ffmpeg")
+    ffprobe_path = shutil.which("ffprobe")
+    if ffmpeg_path is None:
+        logger.warning("FFmpeg executable not found on system PATH.")
+        return FFmpegCapabilities(
+            ffprobe_path=ffprobe_path, detected_at=time.monotonic()
+        )
+
+    version_lines = _run_ffmpeg_query(ffmpeg_path, "-version")
+    capabilities = FFmpegCapabilities(
+        ffmpeg_path=ffmpeg_path,
+        ffprobe_path=ffprobe_path,
+        version=version_lines[0].strip() if version_lines else None,
+        protocols=_parse_protocols(_run_ffmpeg_query(ffmpeg_path, "-protocols")),
+        decoders=_parse_decoders(_run_ffmpeg_query(ffmpeg_path, "-decoders")),
+        detected_at=time.monotonic(),
+    )
+    logger.debug(
+        "FFmpeg detected at %s (%s, %d protocols, %d decoders)",
+        ffmpeg_path,
+        capabilities.version,
+        len(capabilities.protocols),
+        len(capabilities.decoders),
+    )
+    return capabilities
+
+
+_capabilities: Optional[FFmpegCapabilities] = None
+_capabilities_lock = threading.Lock()
+_refresh_lock = threading.Lock()
+_refreshing = False
+
+
+def _is_stale(capabilities: Optional[FFmpegCapabilities], max_age: float) -> bool:
+    return capabilities is None or time.monotonic() - capabilities.detected_at > max_age
+
+
+def get_ffmpeg_capabilities(
+    *, refresh: bool = False, max_age: float = CAPABILITY_TTL
+) -> FFmpegCapabilities:
+    """
+    Return the cached FFmpeg capabilities, detecting them when needed.
+
+    Detection runs on first use, when the cached snapshot is older than
+    ``max_age`` seconds, when ``refresh`` is True, or after
+    :func:`invalidate_ffmpeg_capabilities`. Detection blocks, so call this
+    from worker threads only; coroutines use
+    :func:`get_ffmpeg_capabilities_async`.
+    """
+    global _capabilities
+    with _capabilities_lock:
+        cached = _capabilities
+        if refresh or _is_stale(cached, max_age):
+            cached = _capabilities = detect_ffmpeg_capabilities()
+        return cached
+
+
+async def get_ffmpeg_capabilities_async(
+    *, max_age: float = CAPABILITY_TTL
+) -> FFmpegCapabilities:
+    """
+    Return the cached FFmpeg capabilities without blocking the event loop.
+
+    The first detection runs in a worker thread and is awaited. Afterwards an
+    expired snapshot is returned as is while one background thread
+    re-detects, so scans and health checks never wait on ``ffmpeg``.
+    """
+    cached = _capabilities
+    if cached is None:
+        return await asyncio.to_thread(get_ffmpeg_capabilities, max_age=max_age)
+    if _is_stale(cached, max_age):
+        _start_background_refresh(max_age)
+    return cached
+
+
+def _start_background_refresh(max_age: float) -> None:
+    global _refreshing
+    with _refresh_lock:
+        if _refreshing:
+            return
+        _refreshing = True
+
+    def refresh() -> None:
+        global _refreshing
+        try:
+            get_ffmpeg_capabilities(max_age=max_age)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Background FFmpeg detection failed")
+        finally:
+            with _refresh_lock:
+                _refreshing = False
+
+    threading.Thread(target=refresh, name="ffmpeg-capabilities", daemon=True).start()
+
+
+def invalidate_ffmpeg_capabilities() -> None:
+    """Drop the cached capabilities so the next lookup re-detects FFmpeg."""
+    global _capabilities
+    with _capabilities_lock:
+        _capabilities = None
+
+
 def get_install_instructions() -> str:
     """
     Provide platform-specific instructions for installing FFmpeg.
@@ -102,8 +307,14 @@ def get_install_instructions() -> str:
 
 
 __all__ = [
+    "CAPABILITY_TTL",
+    "FFmpegCapabilities",
     "FFmpegNotFoundError",
     "check_ffmpeg_installed",
+    "detect_ffmpeg_capabilities",
+    "get_ffmpeg_capabilities",
+    "get_ffmpeg_capabilities_async",
     "get_ffmpeg_version",
     "get_install_instructions",
+    "invalidate_ffmpeg_capabilities",
 ]
@@ -0,0 +1,203 @@
+"""Application-wide pooled HTTP client used by the native stream probes."""
+
+from __future__ import annotations
+
+import asyncio
+import ipaddress
+import logging
+import socket
+import time
+from importlib.util import find_spec
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+from .config import AppConfig
+
+logger = logging.getLogger(__name__)
+
+#: Upper bound on cached host names; the oldest entry is evicted first.
+DNS_CACHE_SIZE = 4096
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class DNSCache:
+    """
+    Resolve host names through ``getaddrinfo`` and remember the answer.
+
+    Template scans send thousands of requests to a handful of head-ends, so
+    every lookup after the first is served from memory for ``ttl`` seconds.
+    Concurrent lookups of the same name share one resolver call. IP literals
+    are returned unchanged and failures are not cached.
+    """
+
+    def __init__(self, *, ttl: float = 300.0, max_entries: int = DNS_CACHE_SIZE):
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._entries: Dict[str, Tuple[str, float]] = {}
+        self._pending: Dict[str, asyncio.Future[str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def resolve(self, host: str, port: int) -> str:
+        """Return an address for ``host``; raises ``OSError`` on failure."""
+        try:
+            ipaddress.ip_address(host)
+        except ValueError:
+            pass
+        else:
+            return host
+
+        entry = self._entries.get(host)
+        if entry is not None and entry[1] > time.monotonic():
+            self.hits += 1
+            return entry[0]
+
+        pending = self._pending.get(host)
+        if pending is not None:
+            self.hits += 1
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._pending[host] = future
+        try:
+            address = await self._lookup(host, port)
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Waiters re-raise it; nobody else needs to retrieve it.
+            future.exception()
+            raise
+        else:
+            future.set_result(address)
+            self._store(host, address)
+            return address
+        finally:
+            del self._pending[host]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    async def _lookup(self, host: str, port: int) -> str:
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, port, type=socket.SOCK_STREAM
+        )
+        if not infos:
+            raise socket.gaierror(f"No address found for {host}")
+        return str(infos[0][4][0])
+
+    def _store(self, host: str, address: str) -> None:
+        self._entries.pop(host, None)
+        if len(self._entries) >= self._max_entries:
+            del self._entries[next(iter(self._entries))]
+        self._entries[host] = (address, time.monotonic() + self._ttl)
+
+
+class CachingDNSTransport(httpx.AsyncBaseTransport):
+    """
+    Send requests through ``transport`` to addresses resolved by :class:`DNSCache`.
+
+    Only the connection target changes: the ``Host`` header and the TLS server
+    name keep the host name, so virtual hosts and certificate checks behave as
+    without the cache. Pooling, TLS and proxy settings are those of the
+    wrapped transport.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, dns_cache: DNSCache):
+        self._transport = transport
+        self.dns_cache = dns_cache
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        port = request.url.port or _DEFAULT_PORTS.get(request.url.scheme, 80)
+        timeout = request.extensions.get("timeout", {}).get("connect")
+        try:
+            address = await asyncio.wait_for(
+                self.dns_cache.resolve(host, port), timeout
+            )
+        except asyncio.TimeoutError as exc:
+            raise httpx.ConnectTimeout(
+                f"DNS lookup timed out: {host}", request=request
+            ) from exc
+        except OSError as exc:
+            raise httpx.ConnectError(str(exc), request=request) from exc
+        if address == host:
+            return await self._transport.handle_async_request(request)
+
+        extensions = dict(request.extensions)
+        if request.url.scheme == "https":
+            extensions.setdefault("sni_hostname", host)
+        resolved = httpx.Request(
+            request.method,
+            request.url.copy_with(host=address),
+            headers=request.headers,
+            stream=request.stream,
+            extensions=extensions,
+        )
+        return await self._transport.handle_async_request(resolved)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def http2_available() -> bool:
+    """Return whether the optional ``h2`` package is installed."""
+    return find_spec("h2") is not None
+
+
+def create_http_client(config: Optional[AppConfig] = None) -> httpx.AsyncClient:
+    """
+    Build the pooled client shared by HTTP probes.
+
+    Pool limits, keep-alive expiry and the DNS cache TTL come from
+    ``config``. HTTP/2 is negotiated when enabled and ``h2`` is installed
+    (``pip install httpx[http2]``); otherwise the client speaks HTTP/1.1.
+    """
+    config = config or AppConfig()
+    limits = httpx.Limits(
+        max_connections=config.http_max_connections,
+        max_keepalive_connections=config.http_max_keepalive_connections,
+        keepalive_expiry=config.http_keepalive_expiry,
+    )
+    http2 = config.http2_enabled and http2_available()
+    transport: httpx.AsyncBaseTransport = httpx.AsyncHTTPTransport(
+        limits=limits, http2=http2
+    )
+    if config.http_dns_ttl > 0:
+        transport = CachingDNSTransport(transport, DNSCache(ttl=config.http_dns_ttl))
+    logger.debug(
+        "HTTP client pool: %d connections, %d keep-alive, HTTP/2 %s",
+        config.http_max_connections,
+        config.http_max_keepalive_connections,
+        "on" if http2 else "off",
+    )
+    return httpx.AsyncClient(transport=transport, follow_redirects=True)
+
+
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> Optional[httpx.AsyncClient]:
+    """Return the application's shared client, if one is installed."""
+    return _shared_client
+
+
+def set_http_client(client: Optional[httpx.AsyncClient]) -> None:
+    """Install (or with ``None``, remove) the application's shared client."""
+    global _shared_client
+    _shared_client = client
+
+
+__all__ = [
+    "CachingDNSTransport",
+    "DNSCache",
+    "create_http_client",
+    "get_http_client",
+    "http2_available",
+    "set_http_client",
+]
@@ -5,13 +5,19 @@ from __future__ import annotations
 import logging
 from datetime import datetime, timezone
 from math import ceil
-from typing import List, Optional
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
 
 from iptv_sniffer.channel.models import Channel
-from iptv_sniffer.storage.json_repository import JSONChannelRepository
+from iptv_sniffer.storage.base import ChannelRepository
+from iptv_sniffer.storage.json_repository import (
+    JSONChannelRepository,
+    StreamingJSONChannelRepository,
+)
+from iptv_sniffer.storage.sqlite_repository import SQLiteChannelRepository
 from iptv_sniffer.utils.config import AppConfig
 
 logger = logging.getLogger(__name__)
@@ -19,10 +25,43 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/channels", tags=["channels"])
 
 
-def get_repository() -> JSONChannelRepository:
+# One instance per store keeps its in-memory state, connections and write
+# lock shared by every request.
+_repositories: Dict[Tuple[str, Path], ChannelRepository] = {}
+
+
+def get_repository() -> ChannelRepository:
     """Factory for the channel repository (overridable in tests)."""
     config = AppConfig()
-    return JSONChannelRepository(config.data_dir / "channels.json")
+    data_dir = config.data_dir.resolve()
+    backend = config.storage_backend
+    if backend == "json" and config.channel_streaming_reads:
+        backend = "json-streaming"
+    key = (backend, data_dir)
+    repository = _repositories.get(key)
+    if repository is None:
+        if backend == "sqlite":
+            repository = SQLiteChannelRepository(
+                data_dir / "channels.db", migrate_from=data_dir / "channels.json"
+            )
+        elif backend == "json-streaming":
+            repository = StreamingJSONChannelRepository(data_dir / "channels.json")
+        else:
+            repository = JSONChannelRepository(
+                data_dir / "channels.json", flush_delay=config.channel_flush_delay
+            )
+        _repositories[key] = repository
+    return repository
+
+
+async def close_repositories() -> None:
+    """Persist pending changes and release every shared repository."""
+    while _repositories:
+        _, repository = _repositories.popitem()
+        if isinstance(repository, JSONChannelRepository):
+            await repository.close()
+        elif isinstance(repository, SQLiteChannelRepository):
+            repository.close()
 
 
 class ChannelListResponse(BaseModel):
@@ -52,7 +91,7 @@ async def list_channels(
         None, pattern="^(online|offline)?$", description="Filter by availability"
     ),
     search: Optional[str] = Query(None, description="Search in channel name or URL"),
-    repository: JSONChannelRepository = Depends(get_repository),
+    repository: ChannelRepository = Depends(get_repository),
 ) -> ChannelListResponse:
     """Return paginated list of channels with optional filters."""
     filters: dict[str, str | bool] = {}
@@ -62,12 +101,11 @@ async def list_channels(
         filters["is_online"] = True
     elif status == "offline":
         filters["is_online"] = False
+    if resolution:
+        filters["resolution"] = resolution
 
     channels = await repository.find_all(filters)
 
-    if resolution:
-        channels = [channel for channel in channels if channel.resolution == resolution]
-
     if search:
         lowered = search.lower()
         channels = [
@@ -106,7 +144,7 @@ async def list_channels(
 
 @router.get("/{channel_id}", response_model=Channel)
 async def get_channel(
-    channel_id: str, repository: JSONChannelRepository = Depends(get_repository)
+    channel_id: str, repository: ChannelRepository = Depends(get_repository)
 ) -> Channel:
     """Return channel details by ID."""
     channel = await repository.get_by_id(channel_id)
@@ -121,7 +159,7 @@ async def get_channel(
 async def update_channel(
     channel_id: str,
     payload: ChannelUpdateRequest,
-    repository: JSONChannelRepository = Depends(get_repository),
+    repository: ChannelRepository = Depends(get_repository),
 ) -> Channel:
     """Update channel metadata and mark entry as manually edited."""
     channel = await repository.get_by_id(channel_id)
@@ -146,7 +184,7 @@ async def update_channel(
 
 @router.delete("/{channel_id}")
 async def delete_channel(
-    channel_id: str, repository: JSONChannelRepository = Depends(get_repository)
+    channel_id: str, repository: ChannelRepository = Depends(get_repository)
 ) -> dict:
     """Remove channel entry."""
     deleted = await repository.delete(channel_id)
@@ -159,4 +197,4 @@ async def delete_channel(
     return {"deleted": True}
 
 
-__all__ = ["router", "get_repository"]
+__all__ = ["router", "close_repositories", "get_repository"]
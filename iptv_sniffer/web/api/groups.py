@@ -5,13 +5,13 @@ from __future__ import annotations
 import logging
 from collections import defaultdict
 from math import ceil
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, Field
 
 from iptv_sniffer.channel.models import Channel
-from iptv_sniffer.storage.json_repository import JSONChannelRepository
+from iptv_sniffer.storage.base import ChannelRepository
 from iptv_sniffer.web.api.channels import get_repository
 
 logger = logging.getLogger(__name__)
@@ -70,29 +70,25 @@ def _display_name(group: Optional[str]) -> str:
 
 @router.get("", response_model=GroupListResponse)
 async def list_groups(
-    repository: JSONChannelRepository = Depends(get_repository),
+    repository: ChannelRepository = Depends(get_repository),
 ) -> GroupListResponse:
     """Return all groups with summary statistics."""
-    all_channels = await repository.find_all()
-    grouped: Dict[Optional[str], List[Channel]] = defaultdict(list)
-
-    for channel in all_channels:
-        grouped[channel.group].append(channel)
+    # group -> [total, online]; channels are counted as they stream in.
+    counts: Dict[Optional[str], List[int]] = defaultdict(lambda: [0, 0])
+    async for channel in repository.iter_all():
+        entry = counts[channel.group]
+        entry[0] += 1
+        entry[1] += int(channel.is_online)
 
     stats: List[GroupStatistics] = []
-    for raw_group, members in grouped.items():
-        if not members:
-            continue
-        online = sum(1 for ch in members if ch.is_online)
-        offline = len(members) - online
-        percentage = round((online / len(members)) * 100, 1) if members else 0.0
+    for raw_group, (total, online) in counts.items():
         stats.append(
             GroupStatistics(
                 name=_display_name(raw_group),
-                total=len(members),
+                total=total,
                 online=online,
-                offline=offline,
-                online_percentage=percentage,
+                offline=total - online,
+                online_percentage=round((online / total) * 100, 1),
             )
         )
 
@@ -106,19 +102,24 @@ async def get_group_channels(
     group_name: str,
     page: int = Query(1, ge=1, description="Page number (1-indexed)"),
     page_size: int = Query(50, ge=1, le=200, description="Items per page"),
-    repository: JSONChannelRepository = Depends(get_repository),
+    repository: ChannelRepository = Depends(get_repository),
 ) -> GroupChannelsResponse:
     """Return paginated list of channels in a given group."""
     target_group = _canonical_group(group_name)
-    channels = await repository.find_all()
-
-    filtered = [channel for channel in channels if channel.group == target_group]
-
-    total = len(filtered)
-    pages = max(ceil(total / page_size), 1)
     start = (page - 1) * page_size
     end = start + page_size
 
+    # Only the requested page is kept while the group is counted.
+    page_channels: List[Channel] = []
+    total = 0
+    async for channel in repository.iter_all({"group": target_group}):
+        if channel.group != target_group:
+            continue
+        if start <= total < end:
+            page_channels.append(channel)
+        total += 1
+    pages = max(ceil(total / page_size), 1)
+
     logger.info(
         "Retrieved channels for group",
         extra={
@@ -130,31 +131,17 @@ async def get_group_channels(
     )
 
     return GroupChannelsResponse(
-        channels=filtered[start:end],
+        channels=page_channels,
         total=total,
         page=page,
         pages=pages,
     )
 
 
-async def _update_channels_group(
-    repository: JSONChannelRepository,
-    channels: Iterable[Channel],
-    new_group: Optional[str],
-) -> int:
-    """Internal helper to persist group updates."""
-    updated_count = 0
-    for channel in channels:
-        updated = channel.model_copy(update={"group": new_group})
-        await repository.add(updated)
-        updated_count += 1
-    return updated_count
-
-
 @router.post("/merge")
 async def merge_groups(
     request: MergeGroupsRequest,
-    repository: JSONChannelRepository = Depends(get_repository),
+    repository: ChannelRepository = Depends(get_repository),
 ) -> dict:
     """Merge multiple groups into a single target group."""
     target = _canonical_group(request.target_group)
@@ -166,19 +153,14 @@ async def merge_groups(
             "Target group must be different from source groups.",
         )
 
-    all_channels = await repository.find_all()
-    channels_to_merge = [
-        channel for channel in all_channels if channel.group in source_groups
-    ]
-
-    if not channels_to_merge:
+    merged_count = await repository.reassign_group(source_groups, target)
+    if not merged_count:
         logger.info(
             "Merge requested but no channels matched sources",
             extra={"sources": request.source_groups},
         )
         return {"merged": 0, "target_group": request.target_group}
 
-    merged_count = await _update_channels_group(repository, channels_to_merge, target)
     logger.info(
         "Merged %s channels into %s",
         merged_count,
@@ -191,7 +173,7 @@ async def merge_groups(
 async def rename_group(
     group_name: str,
     request: RenameGroupRequest,
-    repository: JSONChannelRepository = Depends(get_repository),
+    repository: ChannelRepository = Depends(get_repository),
 ) -> dict:
     """Rename a group by updating all associated channels."""
     current_group = _canonical_group(group_name)
@@ -208,16 +190,13 @@ async def rename_group(
             "New group name cannot be 'Uncategorized'.",
         )
 
-    all_channels = await repository.find_all()
-    affected = [channel for channel in all_channels if channel.group == current_group]
-
-    if not affected:
+    renamed = await repository.reassign_group([current_group], new_group)
+    if not renamed:
         raise HTTPException(
             status.HTTP_404_NOT_FOUND,
             f"Group '{group_name}' not found.",
         )
 
-    renamed = await _update_channels_group(repository, affected, new_group)
     logger.info("Renamed group %s -> %s", group_name, request.new_name)
     return {"renamed": renamed, "new_name": request.new_name}
 
@@ -225,7 +204,7 @@ async def rename_group(
 @router.delete("/{group_name}")
 async def delete_group(
     group_name: str,
-    repository: JSONChannelRepository = Depends(get_repository),
+    repository: ChannelRepository = Depends(get_repository),
 ) -> dict:
     """Delete a group by moving members to the uncategorized pool."""
     current_group = _canonical_group(group_name)
@@ -235,16 +214,13 @@ async def delete_group(
             "The 'Uncategorized' group cannot be deleted.",
         )
 
-    all_channels = await repository.find_all()
-    affected = [channel for channel in all_channels if channel.group == current_group]
-
-    if not affected:
+    updated = await repository.reassign_group([current_group], None)
+    if not updated:
         raise HTTPException(
             status.HTTP_404_NOT_FOUND,
             f"Group '{group_name}' not found.",
         )
 
-    updated = await _update_channels_group(repository, affected, None)
     logger.info(
         "Deleted group %s (%s channels moved to Uncategorized)", group_name, updated
     )
@@ -4,8 +4,7 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime, timezone
-from io import StringIO
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 
 from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
 from fastapi.responses import StreamingResponse
@@ -15,7 +14,7 @@ from iptv_sniffer.channel.models import Channel
 from iptv_sniffer.m3u.encoding import decode_m3u_bytes
 from iptv_sniffer.m3u.generator import M3UGenerator
 from iptv_sniffer.m3u.parser import M3UParser
-from iptv_sniffer.storage.json_repository import JSONChannelRepository
+from iptv_sniffer.storage.base import ChannelRepository, UpsertOutcome
 from iptv_sniffer.web.api.channels import get_repository
 
 logger = logging.getLogger(__name__)
@@ -25,6 +24,8 @@ router = APIRouter(prefix="/api/m3u", tags=["m3u"])
 
 class ImportResult(BaseModel):
     imported: int
+    created: int = 0
+    updated: int = 0
     failed: int
     channels: List[Channel]
     errors: List[str] = []
@@ -33,7 +34,7 @@ class ImportResult(BaseModel):
 @router.post("/import", response_model=ImportResult)
 async def import_m3u(
     file: UploadFile = File(...),
-    repository: JSONChannelRepository = Depends(get_repository),
+    repository: ChannelRepository = Depends(get_repository),
 ) -> ImportResult:
     if not file.filename or not file.filename.lower().endswith((".m3u", ".m3u8")):
         raise HTTPException(
@@ -49,21 +50,21 @@ async def import_m3u(
     parser = M3UParser()
     playlist = parser.parse(decoded)
 
-    imported_channels: List[Channel] = []
+    channels: List[Channel] = []
     failed = 0
     errors: List[str] = []
 
     for item in playlist.channels:
         try:
-            channel = Channel(
-                name=item.name,
-                url=item.url,
-                tvg_id=item.tvg_id,
-                tvg_logo=item.tvg_logo,
-                group=item.group_title,
+            channels.append(
+                Channel(
+                    name=item.name,
+                    url=item.url,
+                    tvg_id=item.tvg_id,
+                    tvg_logo=item.tvg_logo,
+                    group=item.group_title,
+                )
             )
-            saved = await repository.add(channel)
-            imported_channels.append(saved)
         except Exception as exc:  # pylint: disable=broad-except
             failed += 1
             logger.warning(
@@ -71,6 +72,26 @@ async def import_m3u(
             )
             errors.append(f"{item.name or item.url}: {exc}")
 
+    # One pass over the URL index and one write for the whole playlist.
+    imported_channels: List[Channel] = []
+    created = updated = 0
+    for channel, result in zip(channels, await repository.upsert_many(channels)):
+        if result.channel is None:
+            failed += 1
+            logger.warning(
+                "Failed importing channel '%s' (%s): %s",
+                channel.name,
+                channel.url,
+                result.error,
+            )
+            errors.append(f"{channel.name or channel.url}: {result.error}")
+            continue
+        imported_channels.append(result.channel)
+        if result.outcome is UpsertOutcome.CREATED:
+            created += 1
+        else:
+            updated += 1
+
     logger.info(
         "Imported playlist %s: %s success, %s failed",
         file.filename,
@@ -80,6 +101,8 @@ async def import_m3u(
 
     return ImportResult(
         imported=len(imported_channels),
+        created=created,
+        updated=updated,
         failed=failed,
         channels=imported_channels,
         errors=errors[:20],
@@ -98,7 +121,7 @@ async def export_m3u(
         pattern=r"^(online|offline)?$",
         description="Filter by online status",
     ),
-    repository: JSONChannelRepository = Depends(get_repository),
+    repository: ChannelRepository = Depends(get_repository),
 ) -> StreamingResponse:
     filters: dict[str, str | bool] = {}
     if group:
@@ -107,25 +130,30 @@ async def export_m3u(
         filters["is_online"] = True
     elif status_filter == "offline":
         filters["is_online"] = False
-
-    channels = await repository.find_all(filters)
     if resolution:
-        channels = [channel for channel in channels if channel.resolution == resolution]
+        filters["resolution"] = resolution
 
     generator = M3UGenerator()
-    output = generator.generate(channels)
     filename = (
         f"iptv_channels_{datetime.now(timezone.utc).strftime('%Y%m%d_%H%M%S')}.m3u"
     )
 
-    logger.info(
-        "Exported M3U playlist with %s channels (filters=%s)",
-        len(channels),
-        {"group": group, "resolution": resolution, "status": status_filter},
-    )
+    async def playlist() -> AsyncIterator[str]:
+        # Channels are serialized as the repository yields them, so the
+        # export never holds the whole playlist in memory.
+        exported = 0
+        yield generator.HEADER
+        async for channel in repository.iter_all(filters):
+            exported += 1
+            yield "\n" + generator.generate_entry(channel)
+        logger.info(
+            "Exported M3U playlist with %s channels (filters=%s)",
+            exported,
+            {"group": group, "resolution": resolution, "status": status_filter},
+        )
 
     return StreamingResponse(
-        StringIO(output),
+        playlist(),
         media_type="audio/x-mpegurl",
         headers={
             "Content-Disposition": f'attachment; filename="{filename}"',
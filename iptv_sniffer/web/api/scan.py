@@ -11,20 +11,69 @@ from uuid import uuid4
 import contextlib
 from enum import Enum
 
-from fastapi import APIRouter, BackgroundTasks, HTTPException, status
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    Form,
+    HTTPException,
+    UploadFile,
+    status,
+)
 from pydantic import BaseModel, Field, field_validator
 
+from iptv_sniffer.channel.models import Channel, ValidationStatus
+from iptv_sniffer.m3u.encoding import decode_m3u_bytes
+from iptv_sniffer.m3u.parser import M3UParser
+from iptv_sniffer.scanner.adaptive_limiter import AdaptiveRateLimiter, LimitAdjustment
+from iptv_sniffer.scanner.hls import HLSValidator
+from iptv_sniffer.scanner.host_failures import HostFailureCache
+from iptv_sniffer.scanner.m3u_batch_strategy import M3UBatchScanStrategy
+from iptv_sniffer.scanner.mpegts import MPEGTSAnalyzer
+from iptv_sniffer.scanner.multicast_probe import MulticastProbe
 from iptv_sniffer.scanner.multicast_strategy import MulticastScanStrategy
-from iptv_sniffer.scanner.orchestrator import ScanOrchestrator
+from iptv_sniffer.scanner.multicast_sweep import MulticastSweeper
+from iptv_sniffer.scanner.orchestrator import (
+    ResultOrdering,
+    ScanOrchestrator,
+    ScanProgress,
+)
 from iptv_sniffer.scanner.presets import PresetLoader, ScanPreset
+from iptv_sniffer.scanner.reachability import PrefilteringValidator, ReachabilityProbe
+from iptv_sniffer.scanner.retry import RetryPolicy
+from iptv_sniffer.scanner.resumed_strategy import ResumedScanStrategy
+from iptv_sniffer.scanner.scheduler import ProbeScheduler, ScanPriority, SchedulerLane
+from iptv_sniffer.scanner.smart_port_scanner import StreamValidatorProtocol
 from iptv_sniffer.scanner.strategy import ScanMode, ScanStrategy
 from iptv_sniffer.scanner.template_strategy import TemplateScanStrategy
-from iptv_sniffer.scanner.validator import StreamValidationResult, StreamValidator
+from iptv_sniffer.scanner.token_bucket import HostRateLimiter
+from iptv_sniffer.scanner.validation_cache import ValidationCache
+from iptv_sniffer.scanner.validator import (
+    ProbeBackend,
+    ProbeProfile,
+    StreamValidationResult,
+    StreamValidator,
+)
+from iptv_sniffer.storage.base import ChannelRepository
+from iptv_sniffer.storage.result_writer import ScanResultWriter
+from iptv_sniffer.storage.scan_checkpoint import (
+    CheckpointNotFoundError,
+    ScanCheckpointStore,
+    ScanCheckpointWriter,
+)
+from iptv_sniffer.utils.config import MAX_CONCURRENCY, AppConfig
+from iptv_sniffer.web.api.channels import get_repository
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/scan", tags=["scan"])
 
+# Slack on top of the validator's own ffprobe timeout before a probe is
+# abandoned; covers the pre-filter and native checks that run first, so the
+# deadline only catches probes that hang.
+_PROBE_DEADLINE_MARGIN = 10.0
+
 
 class ScanOrchestratorProtocol(Protocol):
     """Protocol for scan orchestrator interface."""
@@ -59,6 +108,15 @@ class ScanSession:
     cancel_event: asyncio.Event = field(default_factory=asyncio.Event)
     task: Optional[asyncio.Task[Any]] = None
     timeout: int = 10
+    metrics: Optional[ScanProgress] = None
+    checkpoint: Optional[ScanCheckpointWriter] = None
+    writer: Optional[ScanResultWriter] = None
+    persist_invalid: bool = False
+    priority: ScanPriority = ScanPriority.NORMAL
+    probe_profile: ProbeProfile = ProbeProfile.LIVENESS
+    reprobe_profile: Optional[ProbeProfile] = ProbeProfile.METADATA
+    ordering: ResultOrdering = ResultOrdering.COMPLETION
+    force: bool = False
 
 
 class ScanStartRequest(BaseModel):
@@ -70,6 +128,14 @@ class ScanStartRequest(BaseModel):
     ip_ranges: Optional[List[str]] = None
     ports: Optional[List[int]] = None
     preset: Optional[str] = None
+    urls: Optional[List[str]] = None
+    group: Optional[str] = None
+    validation_status: Optional[ValidationStatus] = None
+    priority: ScanPriority = ScanPriority.NORMAL
+    probe_profile: ProbeProfile = ProbeProfile.LIVENESS
+    reprobe_profile: Optional[ProbeProfile] = ProbeProfile.METADATA
+    ordering: ResultOrdering = ResultOrdering.COMPLETION
+    force: bool = False
     timeout: int = Field(default=10, ge=1, le=60)
 
     @field_validator("ports", mode="before")
@@ -96,6 +162,8 @@ class ScanStartResponse(BaseModel):
 class ScanStatusResponse(BaseModel):
     scan_id: str
     status: ScanStatus
+    priority: ScanPriority = ScanPriority.NORMAL
+    ordering: ResultOrdering = ResultOrdering.COMPLETION
     progress: int
     total: int
     valid: int
@@ -103,6 +171,16 @@ class ScanStatusResponse(BaseModel):
     started_at: datetime
     completed_at: Optional[datetime] = None
     error: Optional[str] = None
+    concurrency_limit: Optional[int] = None
+    concurrency_history: List[LimitAdjustment] = Field(default_factory=list)
+    retries: int = 0
+    retries_denied: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    host_skips: int = 0
+    reorder_buffer_size: int = 0
+    reorder_buffer_peak: int = 0
+    head_of_line_stall_seconds: float = 0.0
 
 
 class ScanCancelResponse(BaseModel):
@@ -115,6 +193,10 @@ class ScanNotFoundError(Exception):
     """Raised when a scan identifier does not correspond to active session."""
 
 
+class ScanNotResumableError(Exception):
+    """Raised when a scan is still running or already completed."""
+
+
 DEFAULT_PRESET_PATH = (
     Path(__file__).resolve().parents[4] / "config" / "multicast_presets.json"
 )
@@ -127,13 +209,33 @@ class ScanManager:
         self,
         preset_loader: Optional[PresetLoader] = None,
         orchestrator_factory: Optional[Callable[[], ScanOrchestratorProtocol]] = None,
+        checkpoint_store: Optional[ScanCheckpointStore] = None,
+        result_writer_factory: Optional[Callable[..., ScanResultWriter]] = None,
+        repository_factory: Optional[Callable[[], ChannelRepository]] = None,
+        scheduler: Optional[ProbeScheduler] = None,
+        validator: Optional[StreamValidatorProtocol] = None,
+        multicast_sweeper: Optional[MulticastSweeper] = None,
+        validation_cache: Optional[ValidationCache] = None,
     ) -> None:
         self._sessions: Dict[str, ScanSession] = {}
+        self._checkpoint_store = checkpoint_store
+        self._result_writer_factory = result_writer_factory
+        self._repository_factory = repository_factory or get_repository
         self._lock = asyncio.Lock()
         self._preset_loader = preset_loader or PresetLoader(DEFAULT_PRESET_PATH)
-        self._orchestrator_factory = (
-            orchestrator_factory or self._default_orchestrator_factory
-        )
+        self._orchestrator_factory = orchestrator_factory
+        self._scheduler = scheduler or ProbeScheduler(AppConfig().probe_pool_size)
+        self._validator = validator
+        self._multicast_sweeper = multicast_sweeper
+        self._validation_cache = validation_cache
+        self._validation_cache_loaded = False
+        self._host_limiter: Optional[HostRateLimiter] = None
+        self._host_failures: Optional[HostFailureCache] = None
+
+    @property
+    def scheduler(self) -> ProbeScheduler:
+        """Probe pool shared by all scans started through this manager."""
+        return self._scheduler
 
     async def start_scan(
         self,
@@ -141,15 +243,90 @@ class ScanManager:
         timeout: int,
         background_tasks: Optional[BackgroundTasks] = None,
     ) -> ScanSession:
-        strategy = self._build_strategy_from_request(request)
+        strategy = await self._create_strategy(request)
         total = _safe_estimate_total(strategy)
         session = ScanSession(
             scan_id=str(uuid4()),
             strategy=strategy,
             total=total,
             timeout=timeout,
+            persist_invalid=request.mode == ScanMode.M3U_BATCH,
+            priority=request.priority,
+            probe_profile=request.probe_profile,
+            reprobe_profile=request.reprobe_profile,
+            ordering=request.ordering,
+            force=request.force,
         )
+        if self._checkpoint_store is not None:
+            session.checkpoint = self._checkpoint_store.create(
+                session.scan_id, request.model_dump(mode="json"), total
+            )
+
+        await self._launch(session, background_tasks)
+        logger.info(
+            "Started scan %s using mode %s", session.scan_id, request.mode.value
+        )
+        return session
 
+    async def resume_scan(
+        self,
+        scan_id: str,
+        background_tasks: Optional[BackgroundTasks] = None,
+    ) -> ScanSession:
+        """Continue a scan from its checkpoint, skipping completed targets."""
+        if self._checkpoint_store is None:
+            raise ScanNotFoundError
+        async with self._lock:
+            existing = self._sessions.get(scan_id)
+            if existing is not None and existing.status in (
+                ScanStatus.PENDING,
+                ScanStatus.RUNNING,
+            ):
+                raise ScanNotResumableError("Scan is still running.")
+            if existing is not None and existing.status == ScanStatus.COMPLETED:
+                raise ScanNotResumableError("Scan already completed.")
+
+        try:
+            checkpoint = self._checkpoint_store.load(scan_id)
+        except CheckpointNotFoundError as exc:
+            raise ScanNotFoundError from exc
+        if checkpoint.status == ScanStatus.COMPLETED.value:
+            raise ScanNotResumableError("Scan already completed.")
+
+        request = ScanStartRequest.model_validate(checkpoint.request)
+        strategy = ResumedScanStrategy(
+            await self._create_strategy(request), checkpoint.completed_urls
+        )
+        session = ScanSession(
+            scan_id=scan_id,
+            strategy=strategy,
+            progress=checkpoint.completed,
+            total=checkpoint.total,
+            valid=checkpoint.valid,
+            invalid=checkpoint.invalid,
+            started_at=checkpoint.started_at,
+            timeout=request.timeout,
+            checkpoint=self._checkpoint_store.reopen(scan_id),
+            persist_invalid=request.mode == ScanMode.M3U_BATCH,
+            priority=request.priority,
+            probe_profile=request.probe_profile,
+            reprobe_profile=request.reprobe_profile,
+            ordering=request.ordering,
+            force=request.force,
+        )
+
+        await self._launch(session, background_tasks)
+        logger.info(
+            "Resumed scan %s with %s of %s targets already completed",
+            scan_id,
+            checkpoint.completed,
+            checkpoint.total,
+        )
+        return session
+
+    async def _launch(
+        self, session: ScanSession, background_tasks: Optional[BackgroundTasks]
+    ) -> None:
         async with self._lock:
             self._sessions[session.scan_id] = session
 
@@ -159,11 +336,6 @@ class ScanManager:
         if background_tasks is not None:
             background_tasks.add_task(self._finalize_task, task)
 
-        logger.info(
-            "Started scan %s using mode %s", session.scan_id, request.mode.value
-        )
-        return session
-
     async def get_scan(self, scan_id: str) -> ScanSession:
         async with self._lock:
             try:
@@ -187,26 +359,112 @@ class ScanManager:
         return session
 
     async def _run_scan(self, session: ScanSession) -> None:
-        orchestrator = self._orchestrator_factory()
+        lane: Optional[SchedulerLane] = None
+        if self._orchestrator_factory is not None:
+            orchestrator = self._orchestrator_factory()
+        else:
+            # Each scan starts at the configured concurrency and may grow
+            # into whatever part of the shared pool the other scans leave.
+            pool_size = min(self._scheduler.max_concurrency, MAX_CONCURRENCY)
+            lane = self._scheduler.lane(
+                session.priority,
+                timeout=_probe_deadline(session),
+                inner=AdaptiveRateLimiter(
+                    initial_limit=min(AppConfig().max_concurrency, pool_size),
+                    max_limit=pool_size,
+                ),
+            )
+            await self._load_validation_cache()
+            orchestrator = self._create_orchestrator(lane, session)
+        try:
+            await self._execute(session, orchestrator)
+        finally:
+            if lane is not None:
+                lane.close()
+                await self._save_validation_cache()
+
+    async def _load_validation_cache(self) -> None:
+        cache = self._validation_cache
+        if cache is None or self._validation_cache_loaded:
+            return
+        self._validation_cache_loaded = True
+        loaded = await cache.load_async()
+        if loaded:
+            logger.info("Restored %d cached validation results", loaded)
+
+    async def _save_validation_cache(self) -> None:
+        cache = self._validation_cache
+        if cache is None or cache.path is None:
+            return
+        try:
+            await asyncio.shield(cache.save_async())
+        except OSError:
+            logger.exception("Failed to save validation cache to %s", cache.path)
+
+    async def _execute(
+        self, session: ScanSession, orchestrator: ScanOrchestratorProtocol
+    ) -> None:
+        register = getattr(orchestrator, "on_progress", None)
+        if callable(register):
+
+            async def record_metrics(progress: ScanProgress) -> None:
+                session.metrics = progress
+
+            register(record_metrics)
+        if self._result_writer_factory is not None:
+            session.writer = self._result_writer_factory(
+                include_invalid=session.persist_invalid
+            )
         session.status = ScanStatus.RUNNING
         try:
             async for result in orchestrator.execute_scan(session.strategy):
                 await self._handle_result(session, result)
                 if session.cancel_event.is_set():
-                    session.status = ScanStatus.CANCELLED
-                    session.completed_at = datetime.now(timezone.utc)
+                    await self._flush_results(session)
+                    self._finish(session, ScanStatus.CANCELLED)
                     return
-            session.status = ScanStatus.COMPLETED
-            session.completed_at = datetime.now(timezone.utc)
+            await self._flush_results(session)
+            self._finish(session, ScanStatus.COMPLETED)
         except asyncio.CancelledError:
-            session.status = ScanStatus.CANCELLED
-            session.completed_at = datetime.now(timezone.utc)
+            # Keep what was validated so far; shield the write from the
+            # cancellation that is already propagating.
+            with contextlib.suppress(Exception):
+                await asyncio.shield(self._flush_results(session))
+            self._finish(session, ScanStatus.CANCELLED)
             raise
         except Exception as exc:  # pylint: disable=broad-except
             logger.exception("Scan %s failed", session.scan_id)
-            session.status = ScanStatus.FAILED
             session.error = str(exc)
-            session.completed_at = datetime.now(timezone.utc)
+            with contextlib.suppress(Exception):
+                await self._flush_results(session)
+            self._finish(session, ScanStatus.FAILED)
+
+    async def _flush_results(self, session: ScanSession) -> None:
+        if session.writer is None:
+            return
+        try:
+            await session.writer.flush(durable=True)
+        except Exception:  # pylint: disable=broad-except
+            logger.exception("Failed to save results of scan %s", session.scan_id)
+            raise
+
+    def _finish(self, session: ScanSession, final_status: ScanStatus) -> None:
+        session.status = final_status
+        session.completed_at = datetime.now(timezone.utc)
+        if session.checkpoint is None:
+            return
+        try:
+            if (
+                final_status == ScanStatus.COMPLETED
+                and self._checkpoint_store is not None
+            ):
+                # Nothing is left to resume.
+                self._checkpoint_store.discard(session.scan_id)
+            else:
+                session.checkpoint.mark(final_status.value)
+                session.checkpoint.flush_sync()
+        except OSError:
+            logger.exception("Failed to write checkpoint for %s", session.scan_id)
 
     async def _handle_result(
         self, session: ScanSession, result: StreamValidationResult
@@ -216,6 +474,15 @@ class ScanManager:
             session.valid += 1
         else:
             session.invalid += 1
+        if session.writer is not None:
+            await session.writer.add(result)
+        if session.checkpoint is not None:
+            session.checkpoint.record(result)
+            if session.checkpoint.is_due:
+                # A resume skips every URL the checkpoint lists, so their
+                # results must be on disk before the checkpoint says so.
+                await self._flush_results(session)
+                await session.checkpoint.flush()
 
     async def _finalize_task(self, task: asyncio.Task[Any]) -> None:
         try:
@@ -223,6 +490,21 @@ class ScanManager:
         except asyncio.CancelledError:
             pass
 
+    async def _create_strategy(self, request: ScanStartRequest) -> ScanStrategy:
+        if request.mode == ScanMode.M3U_BATCH and request.urls is None:
+            return await M3UBatchScanStrategy.from_repository(
+                self._repository_factory(),
+                group=request.group,
+                status=request.validation_status,
+            )
+        strategy = self._build_strategy_from_request(request)
+        if (
+            isinstance(strategy, MulticastScanStrategy)
+            and self._multicast_sweeper is not None
+        ):
+            strategy.sweeper = self._multicast_sweeper
+        return strategy
+
     def _build_strategy_from_request(self, request: ScanStartRequest) -> ScanStrategy:
         if request.mode == ScanMode.TEMPLATE:
             base_url = request.base_url
@@ -257,6 +539,9 @@ class ScanManager:
                 ports=ports,
             )
 
+        if request.mode == ScanMode.M3U_BATCH and request.urls is not None:
+            return M3UBatchScanStrategy(request.urls)
+
         raise HTTPException(
             status.HTTP_400_BAD_REQUEST, detail=f"Unsupported scan mode: {request.mode}"
         )
@@ -270,10 +555,65 @@ class ScanManager:
             )
         return preset
 
-    @staticmethod
-    def _default_orchestrator_factory() -> ScanOrchestrator:
-        validator = StreamValidator(max_workers=10)
-        return ScanOrchestrator(validator, max_concurrency=10)
+    def _create_orchestrator(
+        self, lane: SchedulerLane, session: ScanSession
+    ) -> ScanOrchestrator:
+        config = AppConfig()
+        if self._validator is None:
+            # One validator (and thread pool) serves every scan; the scheduler
+            # bounds how many probes run at once across all of them.
+            validator: StreamValidatorProtocol = StreamValidator(
+                max_workers=self._scheduler.max_concurrency,
+                backend=ProbeBackend(config.ffprobe_backend),
+                ts_analyzer=MPEGTSAnalyzer() if config.native_ts_analysis else None,
+                hls_validator=(
+                    HLSValidator(all_variants=config.hls_probe_all_variants)
+                    if config.native_hls_validation
+                    else None
+                ),
+                multicast_probe=(
+                    MulticastProbe(
+                        timeout=config.multicast_probe_timeout,
+                        interface=config.multicast_interface,
+                    )
+                    if config.native_multicast_probe
+                    else None
+                ),
+            )
+            if config.prefilter_enabled:
+                validator = PrefilteringValidator(
+                    validator, ReachabilityProbe(timeout=config.prefilter_timeout)
+                )
+            self._validator = validator
+        if self._host_limiter is None:
+            # Both are shared by every scan, like the validator.
+            self._host_limiter = HostRateLimiter.from_config(config)
+            self._host_failures = HostFailureCache.from_config(config)
+        return ScanOrchestrator(
+            self._validator,
+            rate_limiter=lane,
+            host_limiter=self._host_limiter,
+            retry_policy=RetryPolicy.from_config(config),
+            probe_profile=session.probe_profile,
+            reprobe_profile=session.reprobe_profile,
+            ordering=session.ordering,
+            validation_cache=self._validation_cache,
+            force_refresh=session.force,
+            host_failures=self._host_failures,
+        )
+
+
+def _probe_deadline(session: ScanSession) -> float:
+    """Per-probe deadline covering the slowest profile the scan uses."""
+    profiles = [session.probe_profile, session.reprobe_profile]
+    return (
+        max(
+            StreamValidator.probe_timeout(profile, session.timeout)
+            for profile in profiles
+            if profile is not None
+        )
+        + _PROBE_DEADLINE_MARGIN
+    )
 
 
 def _safe_estimate_total(strategy: ScanStrategy) -> int:
@@ -284,7 +624,66 @@ def _safe_estimate_total(strategy: ScanStrategy) -> int:
         return 0
 
 
-scan_manager = ScanManager()
+def default_checkpoint_store() -> ScanCheckpointStore:
+    """Checkpoint store rooted at ``<data_dir>/scans``."""
+    config = AppConfig()
+    return ScanCheckpointStore(
+        config.data_dir / "scans",
+        interval=config.checkpoint_interval,
+        keep=config.checkpoints_kept,
+    )
+
+
+def default_result_writer(*, include_invalid: bool = False) -> ScanResultWriter:
+    """Writer saving scan results into the channel repository."""
+    config = AppConfig()
+    return ScanResultWriter(
+        get_repository(),
+        batch_size=config.persist_batch_size,
+        max_age=config.persist_batch_age,
+        include_invalid=include_invalid,
+    )
+
+
+def default_validation_cache() -> Optional[ValidationCache]:
+    """Validation cache persisted in the data dir, or None when disabled."""
+    config = AppConfig()
+    if not config.validation_cache_enabled:
+        return None
+    return ValidationCache(
+        positive_ttl=config.validation_cache_positive_ttl,
+        negative_ttl=config.validation_cache_negative_ttl,
+        max_entries=config.validation_cache_max_entries,
+        path=(
+            config.data_dir / "validation_cache.json"
+            if config.validation_cache_persist
+            else None
+        ),
+    )
+
+
+def default_multicast_sweeper() -> Optional[MulticastSweeper]:
+    """Sweeper for multicast scans, or None when sweeping is disabled."""
+    config = AppConfig()
+    if not config.multicast_sweep_enabled:
+        return None
+    return MulticastSweeper(
+        window=config.multicast_sweep_window,
+        interface=config.multicast_interface,
+    )
+
+
+def create_scan_manager() -> ScanManager:
+    """Scan manager wired with the configured persistence and caches."""
+    return ScanManager(
+        checkpoint_store=default_checkpoint_store(),
+        result_writer_factory=default_result_writer,
+        multicast_sweeper=default_multicast_sweeper(),
+        validation_cache=default_validation_cache(),
+    )
+
+
+scan_manager = create_scan_manager()
 
 
 @router.post(
@@ -304,6 +703,82 @@ async def start_scan(
     )
 
 
+@router.post(
+    "/m3u",
+    response_model=ScanStartResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def start_m3u_scan(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    timeout: int = Form(default=10, ge=1, le=60),
+    priority: ScanPriority = Form(default=ScanPriority.BACKGROUND),
+    repository: ChannelRepository = Depends(get_repository),
+) -> ScanStartResponse:
+    """Import an uploaded playlist and re-validate every channel in it."""
+    content = await file.read()
+    if not content:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Uploaded file is empty")
+
+    playlist = M3UParser().parse(decode_m3u_bytes(content))
+    channels: List[Channel] = []
+    for item in playlist.channels:
+        try:
+            channels.append(
+                Channel(
+                    name=item.name,
+                    url=item.url,
+                    tvg_id=item.tvg_id,
+                    tvg_logo=item.tvg_logo,
+                    group=item.group_title,
+                )
+            )
+        except ValueError as exc:
+            logger.warning("Skipping playlist entry %s: %s", item.url, exc)
+    if not channels:
+        raise HTTPException(
+            status.HTTP_400_BAD_REQUEST, "Playlist contains no valid channels"
+        )
+
+    await repository.add_many(channels)
+    request = ScanStartRequest(
+        mode=ScanMode.M3U_BATCH,
+        urls=[channel.url for channel in channels],
+        priority=priority,
+        timeout=timeout,
+    )
+    session = await scan_manager.start_scan(
+        request, timeout=timeout, background_tasks=background_tasks
+    )
+    return ScanStartResponse(
+        scan_id=session.scan_id, status=session.status, total=session.total
+    )
+
+
+@router.post(
+    "/{scan_id}/resume",
+    response_model=ScanStartResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def resume_scan(
+    scan_id: str,
+    background_tasks: BackgroundTasks,
+) -> ScanStartResponse:
+    try:
+        session = await scan_manager.resume_scan(
+            scan_id, background_tasks=background_tasks
+        )
+    except ScanNotFoundError:
+        raise HTTPException(
+            status.HTTP_404_NOT_FOUND, detail="Scan checkpoint not found"
+        ) from None
+    except ScanNotResumableError as exc:
+        raise HTTPException(status.HTTP_409_CONFLICT, detail=str(exc)) from None
+    return ScanStartResponse(
+        scan_id=session.scan_id, status=session.status, total=session.total
+    )
+
+
 @router.get(
     "/{scan_id}",
     response_model=ScanStatusResponse,
@@ -315,9 +790,12 @@ async def get_scan(scan_id: str) -> ScanStatusResponse:
         raise HTTPException(
             status.HTTP_404_NOT_FOUND, detail="Scan not found"
         ) from None
+    metrics = session.metrics
     return ScanStatusResponse(
         scan_id=session.scan_id,
         status=session.status,
+        priority=session.priority,
+        ordering=session.ordering,
         progress=session.progress,
         total=session.total,
         valid=session.valid,
@@ -325,6 +803,18 @@ async def get_scan(scan_id: str) -> ScanStatusResponse:
         started_at=session.started_at,
         completed_at=session.completed_at,
         error=session.error,
+        concurrency_limit=metrics.concurrency_limit if metrics else None,
+        concurrency_history=metrics.concurrency_history if metrics else [],
+        retries=metrics.retries if metrics else 0,
+        retries_denied=metrics.retries_denied if metrics else 0,
+        cache_hits=metrics.cache_hits if metrics else 0,
+        cache_misses=metrics.cache_misses if metrics else 0,
+        host_skips=metrics.host_skips if metrics else 0,
+        reorder_buffer_size=metrics.reorder_buffer_size if metrics else 0,
+        reorder_buffer_peak=metrics.reorder_buffer_peak if metrics else 0,
+        head_of_line_stall_seconds=(
+            metrics.head_of_line_stall_seconds if metrics else 0.0
+        ),
     )
 
 
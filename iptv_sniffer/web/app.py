@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from pathlib import Path
@@ -10,7 +11,11 @@ from fastapi.responses import FileResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 
 from iptv_sniffer import __version__
-from iptv_sniffer.utils.ffmpeg import check_ffmpeg_installed
+from iptv_sniffer.utils.ffmpeg import (
+    get_ffmpeg_capabilities,
+    get_ffmpeg_capabilities_async,
+)
+from iptv_sniffer.utils.http_client import create_http_client, set_http_client
 from iptv_sniffer.web.api import (
     channels_router,
     groups_router,
@@ -18,6 +23,7 @@ from iptv_sniffer.web.api import (
     scan_router,
     screenshots_router,
 )
+from iptv_sniffer.web.api.channels import close_repositories
 
 logger = logging.getLogger(__name__)
 
@@ -25,9 +31,21 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(_: FastAPI):
     logger.info("Starting iptv-sniffer v%s", __version__)
-    if not check_ffmpeg_installed():
+    capabilities = await asyncio.to_thread(get_ffmpeg_capabilities, refresh=True)
+    if capabilities.available:
+        logger.info("Using %s", capabilities.version or capabilities.ffmpeg_path)
+    else:
         logger.warning("FFmpeg not detected. Stream validation will be unavailable.")
-    yield
+    # One connection pool for every HTTP probe, so scans reuse connections
+    # to the same head-end instead of handshaking per channel.
+    http_client = create_http_client()
+    set_http_client(http_client)
+    try:
+        yield
+    finally:
+        set_http_client(None)
+        await http_client.aclose()
+        await close_repositories()
 
 
 app = FastAPI(
@@ -67,13 +85,14 @@ app.include_router(m3u_router)
 @app.get("/health")
 async def health_check() -> dict[str, object]:
     """Return service health information."""
-    ffmpeg_available = check_ffmpeg_installed()
-    status = "ok" if ffmpeg_available else "degraded"
+    capabilities = await get_ffmpeg_capabilities_async()
+    status = "ok" if capabilities.available else "degraded"
     return {
         "status": status,
         "version": __version__,
         "checks": {
-            "ffmpeg": ffmpeg_available,
+            "ffmpeg": capabilities.available,
+            "ffprobe": capabilities.ffprobe_path is not None,
         },
     }
 
@@ -1,11 +1,33 @@
 from __future__ import annotations
 
+import json
+import os
 import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
 
 from typer.testing import CliRunner
 
 from iptv_sniffer import __version__
 from iptv_sniffer.cli.app import app
+from iptv_sniffer.scanner.strategy import ScanMode
+from iptv_sniffer.scanner.validator import StreamValidationResult, StreamValidator
+from iptv_sniffer.storage.scan_checkpoint import (
+    CheckpointNotFoundError,
+    ScanCheckpointStore,
+)
+from iptv_sniffer.web.api.scan import ScanStartRequest
+
+
+class _ValidStreamValidator(StreamValidator):  # type: ignore[misc]
+    """Stands in for StreamValidator; every multicast group answers."""
+
+    def __init__(self, **_kwargs) -> None:
+        pass
+
+    async def validate(self, url: str, timeout: int = 10, profile=None):  # type: ignore[override]
+        return StreamValidationResult(url=url, protocol="udp", is_valid=True)
 
 
 class TestCliApp(unittest.TestCase):
@@ -48,3 +70,58 @@ class TestCliApp(unittest.TestCase):
                 result = self.runner.invoke(app, [command])
                 self.assertEqual(result.exit_code, 1)
                 self.assertIn(message, result.stdout)
+
+
+class TestCliResume(unittest.TestCase):
+    """The resume command continues a checkpointed scan and saves its results."""
+
+    def setUp(self) -> None:
+        self.runner = CliRunner()
+        self._temp_dir = TemporaryDirectory()
+        self.data_dir = Path(self._temp_dir.name)
+        self.addCleanup(self._temp_dir.cleanup)
+        environment = patch.dict(
+            os.environ,
+            {
+                "IPTV_SNIFFER_DATA_DIR": str(self.data_dir),
+                "IPTV_SNIFFER_VALIDATION_CACHE_ENABLED": "false",
+                "IPTV_SNIFFER_MULTICAST_SWEEP_ENABLED": "false",
+                "IPTV_SNIFFER_PREFILTER_ENABLED": "false",
+            },
+        )
+        environment.start()
+        self.addCleanup(environment.stop)
+
+    def test_resume_probes_remaining_targets_and_saves_them(self) -> None:
+        request = ScanStartRequest(
+            mode=ScanMode.MULTICAST,
+            protocol="udp",
+            ip_ranges=["239.1.1.1-239.1.1.2"],
+            ports=[8000],
+        )
+        store = ScanCheckpointStore(self.data_dir / "scans")
+        checkpoint = store.create("interrupted", request.model_dump(mode="json"), 2)
+        checkpoint.record(
+            StreamValidationResult(
+                url="udp://239.1.1.1:8000", protocol="udp", is_valid=True
+            )
+        )
+        checkpoint.flush_sync()
+
+        with patch("iptv_sniffer.web.api.scan.StreamValidator", _ValidStreamValidator):
+            result = self.runner.invoke(app, ["resume", "interrupted"])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn("completed: 2/2 probed, 2 valid", result.stdout)
+        saved = json.loads((self.data_dir / "channels.json").read_text("utf-8"))
+        self.assertEqual(
+            [channel["url"] for channel in saved], ["udp://239.1.1.2:8000"]
+        )
+        with self.assertRaises(CheckpointNotFoundError):
+            store.load("interrupted")
+
+    def test_resume_unknown_scan_fails(self) -> None:
+        result = self.runner.invoke(app, ["resume", "missing"])
+
+        self.assertEqual(result.exit_code, 1)
+        self.assertIn("No checkpoint found for scan missing", result.stdout)
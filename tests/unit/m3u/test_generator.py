@@ -80,6 +80,18 @@ class TestM3UGenerator(unittest.TestCase):
         self.assertIn('tvg-name="Movie \\"Premiere\\""', extinf_line)
         self.assertIn(',Movie \\"Premiere\\"', extinf_line)
 
+    def test_generate_entry_matches_full_playlist(self) -> None:
+        channels = [
+            self._base_channel(),
+            self._base_channel(name="Sports", url="http://example.com/s", group=None),
+        ]
+
+        streamed = self.generator.HEADER + "".join(
+            "\n" + self.generator.generate_entry(channel) for channel in channels
+        )
+
+        self.assertEqual(streamed, self.generator.generate(channels))
+
 
 if __name__ == "__main__":
     unittest.main()
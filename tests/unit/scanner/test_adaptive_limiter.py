@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import asyncio
+import unittest
+
+from iptv_sniffer.scanner.adaptive_limiter import AdaptiveRateLimiter
+from iptv_sniffer.scanner.validator import ErrorCategory
+
+
+class AdaptiveRateLimiterTestCase(unittest.IsolatedAsyncioTestCase):
+    def test_rejects_inconsistent_limits(self) -> None:
+        with self.assertRaises(ValueError):
+            AdaptiveRateLimiter(min_limit=5, initial_limit=2)
+        with self.assertRaises(ValueError):
+            AdaptiveRateLimiter(initial_limit=10, max_limit=51)
+        with self.assertRaises(ValueError):
+            AdaptiveRateLimiter(decrease_factor=1.0)
+
+    def test_fast_healthy_windows_increase_limit(self) -> None:
+        limiter = AdaptiveRateLimiter(initial_limit=4, max_limit=6, window_size=5)
+
+        for _ in range(5 * 4):
+            limiter.observe(0.05)
+
+        self.assertEqual(limiter.limit, 6)
+        self.assertEqual(limiter.max_concurrency, 6)
+        self.assertEqual([entry.limit for entry in limiter.history], [4, 5, 6])
+        self.assertEqual(limiter.history[-1].reason, "latency_ok")
+
+    def test_timeout_spike_halves_limit(self) -> None:
+        limiter = AdaptiveRateLimiter(initial_limit=20, min_limit=2, window_size=10)
+
+        for index in range(10):
+            category = ErrorCategory.TIMEOUT if index % 2 else None
+            limiter.observe(0.1, category)
+
+        self.assertEqual(limiter.limit, 10)
+        self.assertEqual(limiter.history[-1].reason, "timeouts")
+
+        for _ in range(10 * 5):
+            limiter.observe(10.0, ErrorCategory.TIMEOUT)
+        self.assertEqual(limiter.limit, 2)
+
+    def test_unreachable_hosts_are_not_treated_as_congestion(self) -> None:
+        limiter = AdaptiveRateLimiter(initial_limit=4, window_size=5)
+
+        for _ in range(5):
+            limiter.observe(0.01, ErrorCategory.NETWORK_UNREACHABLE)
+
+        self.assertEqual(limiter.limit, 5)
+
+    def test_unanswered_probes_are_not_sampled(self) -> None:
+        limiter = AdaptiveRateLimiter(initial_limit=4, window_size=5)
+
+        for _ in range(50):
+            limiter.observe(1.0, ErrorCategory.NO_RESPONSE)
+        self.assertEqual(limiter.limit, 4)
+
+        for _ in range(5):
+            limiter.observe(0.01)
+        self.assertEqual(limiter.limit, 5)
+
+    def test_latency_inflation_backs_off(self) -> None:
+        limiter = AdaptiveRateLimiter(
+            initial_limit=5, window_size=5, latency_tolerance=2.0
+        )
+        for _ in range(5):
+            limiter.observe(0.1)
+        self.assertEqual(limiter.limit, 6)
+
+        for _ in range(6):
+            limiter.observe(1.0)
+        self.assertEqual(limiter.limit, 5)
+        self.assertEqual(limiter.history[-1].reason, "latency_inflated")
+
+    async def test_enforces_current_limit(self) -> None:
+        limiter = AdaptiveRateLimiter(initial_limit=2, max_limit=10)
+        active = 0
+        peak = 0
+
+        async def task() -> None:
+            nonlocal active, peak
+            async with limiter:
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(task() for _ in range(8)))
+
+        self.assertEqual(peak, 2)
+        self.assertEqual(limiter.in_flight, 0)
+
+    async def test_raising_limit_releases_waiters(self) -> None:
+        limiter = AdaptiveRateLimiter(initial_limit=1, max_limit=4, window_size=1)
+        release = asyncio.Event()
+        entered = 0
+
+        async def holder() -> None:
+            nonlocal entered
+            async with limiter:
+                entered += 1
+                await release.wait()
+
+        tasks = [asyncio.create_task(holder()) for _ in range(3)]
+        await asyncio.sleep(0)
+        self.assertEqual(entered, 1)
+
+        limiter.observe(0.01)
+        limiter.observe(0.01)
+        await asyncio.sleep(0)
+        self.assertEqual(entered, 3)
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+
+if __name__ == "__main__":
+    unittest.main()
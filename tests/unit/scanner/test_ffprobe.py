@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import stat
+import sys
+import tempfile
+import textwrap
+import time
+import unittest
+from pathlib import Path
+
+from iptv_sniffer.scanner.ffprobe import (
+    FFprobeError,
+    build_ffprobe_command,
+    run_ffprobe,
+)
+
+
+@unittest.skipIf(sys.platform.startswith("win"), "requires POSIX process groups")
+class RunFFprobeTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._temp_dir.cleanup)
+        self.directory = Path(self._temp_dir.name)
+
+    def _fake_ffprobe(self, body: str) -> str:
+        script = self.directory / "ffprobe"
+        script.write_text(
+            f"#!{sys.executable}\n" + textwrap.dedent(body), encoding="utf-8"
+        )
+        script.chmod(script.stat().st_mode | stat.S_IXUSR)
+        return str(script)
+
+    async def test_returns_parsed_json_and_passes_options(self) -> None:
+        cmd = self._fake_ffprobe(
+            """
+            import json, sys
+            print(json.dumps({"streams": [], "argv": sys.argv[1:]}))
+            """
+        )
+
+        result = await run_ffprobe(
+            "udp://239.0.0.1:1234",
+            timeout=5,
+            options={"probesize": "5M"},
+            cmd=cmd,
+        )
+
+        self.assertEqual(
+            result["argv"],
+            build_ffprobe_command("udp://239.0.0.1:1234", {"probesize": "5M"}, cmd=cmd)[
+                1:
+            ],
+        )
+
+    async def test_nonzero_exit_raises_with_stderr(self) -> None:
+        cmd = self._fake_ffprobe(
+            """
+            import sys
+            sys.stderr.write("Connection refused\\n")
+            sys.exit(1)
+            """
+        )
+
+        with self.assertRaises(FFprobeError) as ctx:
+            await run_ffprobe("http://127.0.0.1:1/live", timeout=5, cmd=cmd)
+
+        self.assertIn(b"Connection refused", ctx.exception.stderr)
+
+    async def test_timeout_kills_process_group(self) -> None:
+        pid_file = self.directory / "child.pid"
+        cmd = self._fake_ffprobe(
+            f"""
+            import subprocess, sys, time
+            child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+            open({str(pid_file)!r}, "w").write(str(child.pid))
+            time.sleep(60)
+            """
+        )
+
+        started = time.monotonic()
+        with self.assertRaises(asyncio.TimeoutError):
+            await run_ffprobe("http://example/live", timeout=1.0, cmd=cmd)
+
+        self.assertLess(time.monotonic() - started, 5)
+        self._assert_process_gone(int(pid_file.read_text()))
+
+    async def test_outer_cancellation_kills_probe(self) -> None:
+        pid_file = self.directory / "probe.pid"
+        cmd = self._fake_ffprobe(
+            f"""
+            import os, time
+            open({str(pid_file)!r}, "w").write(str(os.getpid()))
+            time.sleep(60)
+            """
+        )
+
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(
+                run_ffprobe("http://example/live", timeout=30, cmd=cmd), timeout=1.0
+            )
+
+        self._assert_process_gone(int(pid_file.read_text()))
+
+    def _assert_process_gone(self, pid: int) -> None:
+        deadline = time.monotonic() + 2
+        while time.monotonic() < deadline:
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                return
+            if _is_zombie(pid):
+                return
+            time.sleep(0.05)
+        self.fail(f"process {pid} is still running")
+
+
+def _is_zombie(pid: int) -> bool:
+    try:
+        status = Path(f"/proc/{pid}/status").read_text()
+    except OSError:
+        return False
+    return "State:\tZ" in status
+
+
+class BuildCommandTestCase(unittest.TestCase):
+    def test_command_matches_ffmpeg_python_layout(self) -> None:
+        self.assertEqual(
+            build_ffprobe_command("rtsp://cam/1", {"rtsp_transport": "tcp"}),
+            [
+                "ffprobe",
+                "-show_format",
+                "-show_streams",
+                "-of",
+                "json",
+                "-rtsp_transport",
+                "tcp",
+                "rtsp://cam/1",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import unittest
+from typing import Dict, List
+
+import httpx
+
+from iptv_sniffer.scanner.hls import (
+    HLSFailure,
+    HLSValidator,
+    is_hls_url,
+    parse_master_playlist,
+    parse_media_playlist,
+)
+
+_MASTER = """#EXTM3U
+#EXT-X-STREAM-INF:BANDWIDTH=64000,CODECS="mp4a.40.2"
+audio/index.m3u8
+#EXT-X-STREAM-INF:BANDWIDTH=5000000,RESOLUTION=1920x1080,CODECS="avc1.640028,mp4a.40.2"
+hd/index.m3u8
+#EXT-X-STREAM-INF:BANDWIDTH=800000,RESOLUTION=640x360,CODECS="avc1.4d401e,mp4a.40.2"
+sd/index.m3u8
+"""
+
+_MEDIA = """#EXTM3U
+#EXT-X-TARGETDURATION:6
+#EXTINF:6.0,
+segment-100.ts
+#EXTINF:6.0,
+segment-101.ts
+"""
+
+_TS_HEAD = b"\x47\x40\x00\x10" + b"\xff" * 184
+
+
+class PlaylistParsingTestCase(unittest.TestCase):
+    def test_master_playlist_variants(self) -> None:
+        variants = parse_master_playlist(_MASTER, "http://cdn.example/live/master.m3u8")
+
+        self.assertEqual(len(variants), 3)
+        hd = variants[1]
+        self.assertEqual(hd.uri, "http://cdn.example/live/hd/index.m3u8")
+        self.assertEqual(hd.bandwidth, 5_000_000)
+        self.assertEqual(hd.resolution, "1920x1080")
+        self.assertEqual((hd.codec_video, hd.codec_audio), ("h264", "aac"))
+        self.assertFalse(variants[0].has_video)
+
+    def test_media_playlist_segments(self) -> None:
+        segments = parse_media_playlist(_MEDIA, "http://cdn.example/live/sd/index.m3u8")
+
+        self.assertEqual(
+            segments,
+            [
+                "http://cdn.example/live/sd/segment-100.ts",
+                "http://cdn.example/live/sd/segment-101.ts",
+            ],
+        )
+        self.assertEqual(parse_master_playlist(_MEDIA, "http://cdn.example/"), [])
+
+    def test_is_hls_url(self) -> None:
+        self.assertTrue(is_hls_url("http://cdn.example/live/INDEX.M3U8?token=1"))
+        self.assertFalse(is_hls_url("http://cdn.example/live.ts"))
+
+
+class HLSValidatorTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.requests: List[httpx.Request] = []
+        self.responses: Dict[str, httpx.Response] = {
+            "/live/master.m3u8": httpx.Response(200, text=_MASTER),
+            "/live/sd/index.m3u8": httpx.Response(200, text=_MEDIA),
+            "/live/hd/index.m3u8": httpx.Response(200, text=_MEDIA),
+            "/live/sd/segment-100.ts": httpx.Response(206, content=_TS_HEAD),
+            "/live/hd/segment-100.ts": httpx.Response(206, content=_TS_HEAD),
+        }
+
+    def _handler(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        return self.responses.get(request.url.path, httpx.Response(404))
+
+    async def _check(self, url: str, **kwargs):
+        transport = httpx.MockTransport(self._handler)
+        async with httpx.AsyncClient(transport=transport) as client:
+            validator = HLSValidator(client=client, **kwargs)
+            return await validator.check(url, 5)
+
+    async def test_cheapest_video_variant_and_first_segment_head(self) -> None:
+        result = await self._check("http://cdn.example/live/master.m3u8")
+
+        assert result is not None
+        self.assertTrue(result.is_valid)
+        self.assertEqual(result.resolution, "640x360")
+        self.assertEqual(result.bandwidth, 800_000)
+        self.assertEqual(result.codec_video, "h264")
+        self.assertEqual(
+            [request.url.path for request in self.requests],
+            [
+                "/live/master.m3u8",
+                "/live/sd/index.m3u8",
+                "/live/sd/segment-100.ts",
+            ],
+        )
+        self.assertEqual(self.requests[-1].headers["range"], "bytes=0-4095")
+
+    async def test_all_variants_are_checked_in_parallel(self) -> None:
+        result = await self._check(
+            "http://cdn.example/live/master.m3u8", all_variants=True
+        )
+
+        assert result is not None
+        self.assertTrue(result.is_valid)
+        self.assertEqual(result.resolution, "1920x1080")
+        paths = {request.url.path for request in self.requests}
+        self.assertIn("/live/hd/segment-100.ts", paths)
+        self.assertIn("/live/sd/segment-100.ts", paths)
+        self.assertNotIn("/live/audio/index.m3u8", paths)
+
+    async def test_missing_segment_is_not_a_stream(self) -> None:
+        del self.responses["/live/sd/segment-100.ts"]
+
+        result = await self._check("http://cdn.example/live/master.m3u8")
+
+        assert result is not None
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.failure, HLSFailure.NOT_A_STREAM)
+
+    async def test_redirect_loop_is_unreachable(self) -> None:
+        self.responses["/live/master.m3u8"] = httpx.Response(
+            302, headers={"Location": "/live/master.m3u8"}
+        )
+        transport = httpx.MockTransport(self._handler)
+        async with httpx.AsyncClient(
+            transport=transport, follow_redirects=True, max_redirects=3
+        ) as client:
+            result = await HLSValidator(client=client).check(
+                "http://cdn.example/live/master.m3u8", 5
+            )
+
+        assert result is not None
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.failure, HLSFailure.UNREACHABLE)
+
+    async def test_non_playlist_response_is_inconclusive(self) -> None:
+        self.responses["/live/master.m3u8"] = httpx.Response(200, content=_TS_HEAD)
+
+        self.assertIsNone(await self._check("http://cdn.example/live/master.m3u8"))
+
+    async def test_media_playlist_is_validated_directly(self) -> None:
+        result = await self._check("http://cdn.example/live/sd/index.m3u8")
+
+        assert result is not None
+        self.assertTrue(result.is_valid)
+        self.assertIsNone(result.resolution)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import unittest
+from unittest import mock
+
+from iptv_sniffer.scanner.host_failures import HostFailureCache
+from iptv_sniffer.scanner.validator import ErrorCategory, StreamValidationResult
+from iptv_sniffer.utils.config import AppConfig
+
+
+def _unreachable(url: str) -> StreamValidationResult:
+    return StreamValidationResult(
+        url=url,
+        is_valid=False,
+        protocol="http",
+        error_category=ErrorCategory.NETWORK_UNREACHABLE,
+        error_message="TCP connect failed: [Errno 111] Connection refused",
+    )
+
+
+class HostFailureCacheTestCase(unittest.TestCase):
+    def test_failed_port_short_circuits_other_paths(self) -> None:
+        cache = HostFailureCache(window=60)
+        cache.record(_unreachable("http://10.0.0.5:8080/live/1.ts"))
+
+        skipped = cache.check("http://10.0.0.5:8080/live/2.ts")
+
+        assert skipped is not None
+        self.assertFalse(skipped.is_valid)
+        self.assertEqual(skipped.url, "http://10.0.0.5:8080/live/2.ts")
+        self.assertEqual(skipped.error_category, ErrorCategory.NETWORK_UNREACHABLE)
+        self.assertIn("Connection refused", skipped.error_message or "")
+        self.assertIsNone(cache.check("http://10.0.0.5:9000/live/1.ts"))
+        self.assertIsNone(cache.check("http://10.0.0.6:8080/live/1.ts"))
+        self.assertEqual(cache.skipped, 1)
+
+    def test_host_is_skipped_after_threshold_ports_fail(self) -> None:
+        cache = HostFailureCache(window=60, host_threshold=2)
+        cache.record(_unreachable("http://10.0.0.5/a"))
+        cache.record(_unreachable("rtsp://10.0.0.5/b"))
+
+        self.assertIsNotNone(cache.check("http://10.0.0.5:8080/c"))
+
+    def test_other_categories_and_valid_results(self) -> None:
+        cache = HostFailureCache(window=60, host_threshold=1)
+        cache.record(
+            StreamValidationResult(
+                url="http://10.0.0.5/a",
+                is_valid=False,
+                protocol="http",
+                error_category=ErrorCategory.NO_VIDEO_STREAM,
+            )
+        )
+        # ffmpeg's fallback category also covers per-path errors such as 404s.
+        cache.record(
+            StreamValidationResult(
+                url="http://10.0.0.5/a",
+                is_valid=False,
+                protocol="http",
+                error_category=ErrorCategory.NETWORK_UNREACHABLE,
+                error_message="Server returned 404 Not Found",
+            )
+        )
+        self.assertIsNone(cache.check("http://10.0.0.5/b"))
+
+        cache.record(_unreachable("http://10.0.0.5/a"))
+        cache.record(
+            StreamValidationResult(
+                url="http://10.0.0.5/b", is_valid=True, protocol="http"
+            )
+        )
+        self.assertIsNone(cache.check("http://10.0.0.5/c"))
+
+    def test_records_expire_after_window(self) -> None:
+        cache = HostFailureCache(window=60, host_threshold=1)
+        with mock.patch(
+            "iptv_sniffer.scanner.host_failures.time.monotonic", return_value=100.0
+        ):
+            cache.record(_unreachable("http://10.0.0.5/a"))
+        with mock.patch(
+            "iptv_sniffer.scanner.host_failures.time.monotonic", return_value=161.0
+        ):
+            self.assertIsNone(cache.check("http://10.0.0.5/b"))
+
+    def test_zero_window_disables_cache(self) -> None:
+        self.assertIsNone(
+            HostFailureCache.from_config(AppConfig(host_failure_window=0))
+        )
+        self.assertIsNotNone(HostFailureCache.from_config(AppConfig()))
+
+
+if __name__ == "__main__":
+    unittest.main()
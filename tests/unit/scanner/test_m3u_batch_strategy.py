@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import List
+
+from iptv_sniffer.channel.models import Channel, ValidationStatus
+from iptv_sniffer.scanner.m3u_batch_strategy import M3UBatchScanStrategy
+from iptv_sniffer.storage.json_repository import JSONChannelRepository
+
+
+async def _collect(strategy: M3UBatchScanStrategy) -> List[str]:
+    return [url async for url in strategy.generate_targets()]
+
+
+class M3UBatchScanStrategyTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_duplicate_urls_are_probed_once(self) -> None:
+        strategy = M3UBatchScanStrategy(
+            ["http://a/1", "http://b/2", " http://a/1 ", "http://c/3"]
+        )
+
+        self.assertEqual(strategy.estimate_target_count(), 3)
+        self.assertEqual(
+            await _collect(strategy), ["http://a/1", "http://b/2", "http://c/3"]
+        )
+
+    async def test_from_repository_applies_filters(self) -> None:
+        with TemporaryDirectory() as directory:
+            repository = JSONChannelRepository(Path(directory) / "channels.json")
+            await repository.add_many(
+                [
+                    Channel(
+                        name="News Online",
+                        url="http://10.0.0.1/news",
+                        group="News",
+                        validation_status=ValidationStatus.ONLINE,
+                    ),
+                    Channel(
+                        name="News Offline",
+                        url="http://10.0.0.2/news",
+                        group="News",
+                        validation_status=ValidationStatus.OFFLINE,
+                    ),
+                    Channel(
+                        name="Sports",
+                        url="http://10.0.0.3/sports",
+                        group="Sports",
+                        validation_status=ValidationStatus.OFFLINE,
+                    ),
+                ]
+            )
+
+            by_group = await M3UBatchScanStrategy.from_repository(
+                repository, group="News"
+            )
+            by_both = await M3UBatchScanStrategy.from_repository(
+                repository, group="News", status=ValidationStatus.OFFLINE
+            )
+            everything = await M3UBatchScanStrategy.from_repository(repository)
+
+        self.assertEqual(
+            await _collect(by_group), ["http://10.0.0.1/news", "http://10.0.0.2/news"]
+        )
+        self.assertEqual(await _collect(by_both), ["http://10.0.0.2/news"])
+        self.assertEqual(everything.estimate_target_count(), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
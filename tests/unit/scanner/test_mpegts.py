@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import unittest
+from typing import List
+
+import httpx
+
+from iptv_sniffer.scanner.mpegts import (
+    TS_PACKET_SIZE,
+    MPEGTSAnalyzer,
+    TSStreamInfo,
+    parse_transport_stream,
+)
+from iptv_sniffer.utils.http_client import set_http_client
+
+# x264 1920x1080 High profile SPS (1088 coded lines, cropped to 1080).
+_H264_SPS = bytes.fromhex("67640028ACD940780227E5C044000003000400000300F03C60C658")
+# x265 1920x1080 Main profile SPS.
+_HEVC_SPS = bytes.fromhex(
+    "420101016000000300900000030000030078A003C08010E58DAE49324BB2A0C04040000003004000000650"
+)
+_PMT_PID = 0x1000
+_VIDEO_PID = 0x100
+
+
+def _packet(pid: int, payload: bytes, *, start: bool) -> bytes:
+    header = bytes([0x47, (0x40 if start else 0x00) | (pid >> 8), pid & 0xFF, 0x10])
+    return (header + payload).ljust(TS_PACKET_SIZE, b"\xff")
+
+
+def _section(table_id: int, body: bytes) -> bytes:
+    length = len(body) + 5 + 4  # header remainder + CRC32
+    header = bytes([table_id, 0xB0 | (length >> 8), length & 0xFF, 0, 1, 0xC1, 0, 0])
+    return b"\x00" + header + body + b"\x00\x00\x00\x00"
+
+
+def _transport_stream(video_type: int, es: bytes, audio_type: int = 0x0F) -> bytes:
+    pat = _section(0x00, bytes([0, 1, 0xE0 | (_PMT_PID >> 8), _PMT_PID & 0xFF]))
+    pmt = _section(
+        0x02,
+        bytes([0xE1, 0x00, 0xF0, 0x00])
+        + bytes([video_type, 0xE1, 0x00, 0xF0, 0x00])
+        + bytes([audio_type, 0xE1, 0x01, 0xF0, 0x00]),
+    )
+    pes = b"\x00\x00\x01\xe0\x00\x00\x80\x00\x00" + es
+    packets: List[bytes] = [
+        _packet(0, pat, start=True),
+        _packet(_PMT_PID, pmt, start=True),
+    ]
+    chunk = TS_PACKET_SIZE - 4
+    for offset in range(0, len(pes), chunk):
+        packets.append(
+            _packet(_VIDEO_PID, pes[offset : offset + chunk], start=offset == 0)
+        )
+    return b"".join(packets)
+
+
+class TransportStreamParserTestCase(unittest.TestCase):
+    def test_h264_resolution_and_codecs(self) -> None:
+        data = _transport_stream(
+            0x1B, b"\x00\x00\x00\x01" + _H264_SPS + b"\x00\x00\x01\x68"
+        )
+
+        info = parse_transport_stream(b"\x00" * 50 + data)
+
+        self.assertEqual(info, TSStreamInfo("h264", 1920, 1080, codec_audio="aac"))
+
+    def test_sps_split_across_packets(self) -> None:
+        padding = b"\x00\x00\x01\x09\xf0" + b"\xaa" * 170
+        data = _transport_stream(
+            0x1B, padding + b"\x00\x00\x01" + _H264_SPS + b"\x00\x00\x01\x68"
+        )
+
+        info = parse_transport_stream(data)
+
+        self.assertIsNotNone(info)
+        assert info is not None
+        self.assertEqual(info.resolution, "1920x1080")
+
+    def test_hevc_resolution(self) -> None:
+        data = _transport_stream(
+            0x24, b"\x00\x00\x01" + _HEVC_SPS + b"\x00\x00\x01\x44"
+        )
+
+        info = parse_transport_stream(data)
+
+        self.assertEqual(info, TSStreamInfo("hevc", 1920, 1080, codec_audio="aac"))
+
+    def test_mpeg2_sequence_header(self) -> None:
+        sequence_header = b"\x00\x00\x01\xb3\x2d\x02\x40\x33"
+        data = _transport_stream(0x02, sequence_header, audio_type=0x03)
+
+        info = parse_transport_stream(data)
+
+        self.assertEqual(info, TSStreamInfo("mpeg2video", 720, 576, codec_audio="mp2"))
+
+    def test_non_transport_stream_is_inconclusive(self) -> None:
+        self.assertIsNone(parse_transport_stream(b"<html>" + b" " * 4096))
+
+    def test_unparsed_codec_is_inconclusive(self) -> None:
+        data = _transport_stream(0x42, b"\x00\x00\x01\xb0" + b"\x00" * 32)
+
+        self.assertIsNone(parse_transport_stream(data))
+
+
+class MPEGTSAnalyzerTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_streams_until_stream_is_identified(self) -> None:
+        data = _transport_stream(
+            0x1B, b"\x00\x00\x01" + _H264_SPS + b"\x00\x00\x01\x68"
+        )
+        chunks_sent = []
+
+        async def body():
+            for offset in range(0, len(data), 100):
+                chunks_sent.append(offset)
+                yield data[offset : offset + 100]
+            for _ in range(1000):
+                chunks_sent.append(None)
+                yield b"\x47" + b"\xff" * 187
+
+        transport = httpx.MockTransport(
+            lambda request: httpx.Response(200, content=body())
+        )
+        async with httpx.AsyncClient(transport=transport) as client:
+            analyzer = MPEGTSAnalyzer(client=client)
+            info = await analyzer.analyze("http://example.com/live.ts", 5)
+
+        self.assertEqual(info, TSStreamInfo("h264", 1920, 1080, codec_audio="aac"))
+        self.assertLess(len(chunks_sent), 100)
+
+    async def test_http_error_is_inconclusive(self) -> None:
+        transport = httpx.MockTransport(lambda request: httpx.Response(404))
+        async with httpx.AsyncClient(transport=transport) as client:
+            analyzer = MPEGTSAnalyzer(client=client)
+            self.assertIsNone(await analyzer.analyze("http://example.com/missing", 5))
+
+    async def test_shared_client_is_used_without_injected_client(self) -> None:
+        requests: List[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(404)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            set_http_client(client)
+            self.addCleanup(set_http_client, None)
+            self.assertIsNone(
+                await MPEGTSAnalyzer().analyze("http://example.com/live.ts", 5)
+            )
+
+        self.assertEqual(len(requests), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import socket
+import time
+import unittest
+from typing import List
+from unittest.mock import patch
+
+from iptv_sniffer.scanner.multicast_probe import MulticastProbe, strip_rtp_header
+from iptv_sniffer.scanner.validator import (
+    ErrorCategory,
+    ProbeProfile,
+    StreamValidator,
+)
+
+_H264_SPS = bytes.fromhex("67640028ACD940780227E5C044000003000400000300F03C60C658")
+
+
+def _packet(pid: int, payload: bytes, *, start: bool) -> bytes:
+    header = bytes([0x47, (0x40 if start else 0x00) | (pid >> 8), pid & 0xFF, 0x10])
+    return (header + payload).ljust(188, b"\xff")
+
+
+def _section(table_id: int, body: bytes) -> bytes:
+    length = len(body) + 9
+    header = bytes([table_id, 0xB0 | (length >> 8), length & 0xFF, 0, 1, 0xC1, 0, 0])
+    return b"\x00" + header + body + b"\x00\x00\x00\x00"
+
+
+def _ts_packets() -> List[bytes]:
+    pat = _section(0x00, bytes([0, 1, 0xF0, 0x00]))
+    pmt = _section(
+        0x02,
+        bytes([0xE1, 0x00, 0xF0, 0x00, 0x1B, 0xE1, 0x00, 0xF0, 0x00]),
+    )
+    pes = b"\x00\x00\x01\xe0\x00\x00\x80\x00\x00\x00\x00\x01" + _H264_SPS
+    return [
+        _packet(0, pat, start=True),
+        _packet(0x1000, pmt, start=True),
+        _packet(0x100, pes + b"\x00\x00\x01\x68", start=True),
+    ]
+
+
+def _rtp(payload: bytes, sequence: int) -> bytes:
+    return bytes([0x80, 33]) + sequence.to_bytes(2, "big") + b"\x00" * 8 + payload
+
+
+def _free_udp_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class StripRtpHeaderTestCase(unittest.TestCase):
+    def test_raw_transport_stream_is_unchanged(self) -> None:
+        datagram = memoryview(b"\x47" + b"\x00" * 187)
+        self.assertIs(strip_rtp_header(datagram), datagram)
+
+    def test_csrc_extension_and_padding_are_removed(self) -> None:
+        header = bytes([0xB1, 33, 0, 1]) + b"\x00" * 8  # padding, ext, 1 CSRC
+        csrc = b"\x00" * 4
+        extension = b"\xbe\xde\x00\x01" + b"\x00" * 4
+        payload = b"\x47" + b"\x11" * 187
+        datagram = header + csrc + extension + payload + b"\x00\x00\x03"
+
+        self.assertEqual(bytes(strip_rtp_header(memoryview(datagram))), payload)
+
+
+class MulticastProbeTestCase(unittest.IsolatedAsyncioTestCase):
+    """A local unicast UDP sender stands in for a multicast source."""
+
+    async def asyncSetUp(self) -> None:
+        self.port = _free_udp_port()
+        self.sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.addCleanup(self.sender.close)
+
+    async def _send_forever(self, *, rtp: bool) -> None:
+        payload = b"".join(_ts_packets())
+        sequence = 0
+        while True:
+            datagram = _rtp(payload, sequence) if rtp else payload
+            self.sender.sendto(datagram, ("127.0.0.1", self.port))
+            sequence += 1
+            await asyncio.sleep(0.005)
+
+    async def _listen(self, **kwargs):
+        probe = MulticastProbe(timeout=2.0)
+        sender = asyncio.create_task(self._send_forever(rtp=True))
+        try:
+            return await probe.listen(f"rtp://127.0.0.1:{self.port}", **kwargs)
+        finally:
+            sender.cancel()
+
+    async def test_rtp_transport_stream_is_identified_quickly(self) -> None:
+        started = time.perf_counter()
+        verdict = await self._listen()
+
+        assert verdict is not None
+        self.assertGreater(verdict.datagrams, 0)
+        self.assertTrue(verdict.transport_stream)
+        self.assertEqual(verdict.video_codec, "h264")
+        self.assertLess(time.perf_counter() - started, 1.0)
+
+    async def test_picture_size_is_read_when_requested(self) -> None:
+        verdict = await self._listen(need_picture_size=True)
+
+        assert verdict is not None and verdict.info is not None
+        self.assertEqual(verdict.info.resolution, "1920x1080")
+
+    async def test_silent_group_reports_no_datagrams(self) -> None:
+        probe = MulticastProbe(timeout=0.1)
+
+        verdict = await probe.listen(f"udp://127.0.0.1:{self.port}")
+
+        assert verdict is not None
+        self.assertEqual(verdict.datagrams, 0)
+
+    async def test_validator_skips_ffprobe_for_identified_streams(self) -> None:
+        validator = StreamValidator(
+            max_workers=1,
+            profile=ProbeProfile.LIVENESS,
+            multicast_probe=MulticastProbe(timeout=2.0),
+        )
+        sender = asyncio.create_task(self._send_forever(rtp=False))
+        try:
+            with patch("iptv_sniffer.scanner.validator.ffmpeg.probe") as mock_probe:
+                result = await validator.validate(f"udp://127.0.0.1:{self.port}")
+        finally:
+            sender.cancel()
+
+        mock_probe.assert_not_called()
+        self.assertTrue(result.is_valid)
+        self.assertEqual(result.codec_video, "h264")
+
+    async def test_validator_reports_silent_group_as_no_response(self) -> None:
+        validator = StreamValidator(
+            max_workers=1, multicast_probe=MulticastProbe(timeout=0.1)
+        )
+
+        with patch("iptv_sniffer.scanner.validator.ffmpeg.probe") as mock_probe:
+            result = await validator.validate(f"rtp://127.0.0.1:{self.port}")
+
+        mock_probe.assert_not_called()
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.error_category, ErrorCategory.NO_RESPONSE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import unittest
+from typing import AsyncIterator, Iterable, List, Sequence, Tuple
 
 from iptv_sniffer.scanner.multicast_strategy import MulticastScanStrategy
 
@@ -46,6 +47,34 @@ class MulticastScanStrategyTestCase(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(targets, ["rtp://239.3.5.10:9000"])
         self.assertEqual(strategy.estimate_target_count(), 1)
 
+    async def test_sweeper_limits_targets_to_responsive_groups(self) -> None:
+        class FakeSweeper:
+            def __init__(self) -> None:
+                self.calls: List[Tuple[List[str], Tuple[int, ...]]] = []
+
+            async def sweep_targets(
+                self, addresses: Iterable[str], ports: Sequence[int]
+            ) -> AsyncIterator[Tuple[str, int]]:
+                self.calls.append((list(addresses), tuple(ports)))
+                yield "239.3.1.2", 8004
+
+        sweeper = FakeSweeper()
+        strategy = MulticastScanStrategy(
+            protocol="udp",
+            ip_ranges=["239.3.1.1-239.3.1.3"],
+            ports=[8000, 8004],
+            sweeper=sweeper,  # type: ignore[arg-type]
+        )
+
+        targets = [url async for url in strategy.generate_targets()]
+
+        self.assertEqual(targets, ["udp://239.3.1.2:8004"])
+        self.assertEqual(
+            sweeper.calls,
+            [(["239.3.1.1", "239.3.1.2", "239.3.1.3"], (8000, 8004))],
+        )
+        self.assertEqual(strategy.estimate_target_count(), 6)
+
     def test_rejects_invalid_protocol(self) -> None:
         with self.assertRaises(ValueError):
             MulticastScanStrategy(
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import asyncio
+import socket
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import List, Sequence
+
+from iptv_sniffer.scanner.multicast_sweep import (
+    MulticastSweeper,
+    read_igmp_max_memberships,
+)
+
+
+def _free_udp_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class MulticastSweeperTestCase(unittest.IsolatedAsyncioTestCase):
+    """Local unicast senders on 127.0.0.0/8 stand in for multicast sources."""
+
+    async def asyncSetUp(self) -> None:
+        self.port = _free_udp_port()
+        self.sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.addCleanup(self.sender.close)
+
+    def _start_senders(self, addresses: Sequence[str], ports: Sequence[int]) -> None:
+        async def send_forever() -> None:
+            while True:
+                for address in addresses:
+                    for port in ports:
+                        self.sender.sendto(b"\x47" + b"\xff" * 187, (address, port))
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(send_forever())
+        self.addCleanup(task.cancel)
+
+    async def test_datagrams_are_demultiplexed_by_destination(self) -> None:
+        self._start_senders(["127.0.0.2", "127.0.0.4"], [self.port])
+        sweeper = MulticastSweeper(window=0.3, max_memberships=10)
+
+        responsive = await sweeper.sweep(
+            ["127.0.0.2", "127.0.0.3", "127.0.0.4"], self.port
+        )
+
+        self.assertEqual(responsive, {"127.0.0.2", "127.0.0.4"})
+
+    async def test_groups_are_swept_in_membership_sized_batches(self) -> None:
+        groups = [f"127.0.0.{host}" for host in range(2, 8)]
+        self._start_senders(groups, [self.port])
+        sweeper = MulticastSweeper(window=2.0, max_memberships=2)
+
+        started = time.perf_counter()
+        responsive = await sweeper.sweep(groups, self.port)
+
+        self.assertEqual(responsive, set(groups))
+        # Every batch ends as soon as all of its groups were heard from.
+        self.assertLess(time.perf_counter() - started, 2.0)
+
+    async def test_sweep_targets_covers_ports_concurrently(self) -> None:
+        other_port = _free_udp_port()
+        self._start_senders(["127.0.0.2"], [self.port])
+        self._start_senders(["127.0.0.3"], [other_port])
+        sweeper = MulticastSweeper(window=0.3)
+
+        started = time.perf_counter()
+        hits: List[tuple] = [
+            hit
+            async for hit in sweeper.sweep_targets(
+                ["127.0.0.2", "127.0.0.3"], [self.port, other_port]
+            )
+        ]
+
+        self.assertEqual(
+            sorted(hits), sorted([("127.0.0.2", self.port), ("127.0.0.3", other_port)])
+        )
+        self.assertLess(time.perf_counter() - started, 0.55)
+
+    def test_membership_limit_is_read_from_kernel_setting(self) -> None:
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "igmp_max_memberships"
+            path.write_text("200\n")
+            self.assertEqual(read_igmp_max_memberships(path), 200)
+            self.assertEqual(read_igmp_max_memberships(Path(tmp) / "missing"), 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
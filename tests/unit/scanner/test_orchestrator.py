@@ -1,13 +1,25 @@
 from __future__ import annotations
 
 import asyncio
-from typing import AsyncIterator, List
+from typing import AsyncIterator, Dict, List, Optional
 import unittest
 
-from iptv_sniffer.scanner.orchestrator import ScanOrchestrator, ScanProgress
+from iptv_sniffer.scanner.host_failures import HostFailureCache
+from iptv_sniffer.scanner.orchestrator import (
+    ResultOrdering,
+    ScanOrchestrator,
+    ScanProgress,
+)
 from iptv_sniffer.scanner.rate_limiter import RateLimiter
+from iptv_sniffer.scanner.retry import RetryPolicy
 from iptv_sniffer.scanner.strategy import ScanStrategy
-from iptv_sniffer.scanner.validator import StreamValidationResult, StreamValidator
+from iptv_sniffer.scanner.validation_cache import ValidationCache
+from iptv_sniffer.scanner.validator import (
+    ErrorCategory,
+    ProbeProfile,
+    StreamValidationResult,
+    StreamValidator,
+)
 
 
 class DummyStrategy(ScanStrategy):
@@ -34,6 +46,86 @@ class DummyValidator(StreamValidator):  # type: ignore[misc]
         return self._results.pop(0)
 
 
+class SlowValidator(StreamValidator):  # type: ignore[misc]
+    def __init__(self, delay: float) -> None:
+        self._delay = delay
+        self.active = 0
+        self.peak = 0
+
+    async def validate(self, url: str) -> StreamValidationResult:  # type: ignore[override]
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self._delay)
+        finally:
+            self.active -= 1
+        return StreamValidationResult(url=url, is_valid=True, protocol="http")
+
+
+class DelayByUrlValidator(StreamValidator):  # type: ignore[misc]
+    def __init__(self, delays: Dict[str, float]) -> None:
+        self._delays = delays
+
+    async def validate(self, url: str) -> StreamValidationResult:  # type: ignore[override]
+        await asyncio.sleep(self._delays.get(url, 0))
+        return StreamValidationResult(url=url, is_valid=True, protocol="http")
+
+
+class FlakyValidator(StreamValidator):  # type: ignore[misc]
+    """Fail each URL with a category a given number of times, then succeed."""
+
+    def __init__(
+        self,
+        failures: Dict[str, int],
+        category: ErrorCategory,
+        message: Optional[str] = None,
+    ) -> None:
+        self._failures = dict(failures)
+        self._category = category
+        self._message = message
+        self.calls: List[str] = []
+
+    async def validate(self, url: str) -> StreamValidationResult:  # type: ignore[override]
+        await asyncio.sleep(0)
+        self.calls.append(url)
+        if self._failures.get(url, 0) > 0:
+            self._failures[url] -= 1
+            return StreamValidationResult(
+                url=url,
+                is_valid=False,
+                protocol="http",
+                error_category=self._category,
+                error_message=self._message,
+            )
+        return StreamValidationResult(url=url, is_valid=True, protocol="http")
+
+
+class ProfileRecordingValidator(StreamValidator):  # type: ignore[misc]
+    def __init__(self, valid: List[str]) -> None:
+        self._valid = valid
+        self.calls: List[tuple] = []
+
+    async def validate(  # type: ignore[override]
+        self, url: str, timeout: int = 10, profile: Optional[ProbeProfile] = None
+    ) -> StreamValidationResult:
+        self.calls.append((url, profile))
+        resolution = "1920x1080" if profile == ProbeProfile.METADATA else None
+        return StreamValidationResult(
+            url=url, is_valid=url in self._valid, protocol="udp", resolution=resolution
+        )
+
+
+class CountingStrategy(DummyStrategy):
+    def __init__(self, targets: List[str]):
+        super().__init__(targets)
+        self.generated = 0
+
+    async def generate_targets(self) -> AsyncIterator[str]:
+        for target in self._targets:
+            self.generated += 1
+            yield target
+
+
 class ScanOrchestratorTestCase(unittest.IsolatedAsyncioTestCase):
     async def test_execute_scan_yields_results(self) -> None:
         targets = ["http://example.com/a", "http://example.com/b"]
@@ -127,6 +219,373 @@ class ScanOrchestratorTestCase(unittest.IsolatedAsyncioTestCase):
 
         self.assertCountEqual(order, ["cb1", "cb2"])
 
+    async def test_validations_run_concurrently(self) -> None:
+        targets = [f"http://example.com/{index}" for index in range(8)]
+        validator = SlowValidator(delay=0.05)
+        orchestrator = ScanOrchestrator(validator, max_concurrency=4)
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        collected = [
+            result async for result in orchestrator.execute_scan(DummyStrategy(targets))
+        ]
+        elapsed = loop.time() - start
+
+        self.assertCountEqual([r.url for r in collected], targets)
+        self.assertEqual(validator.peak, 4)
+        self.assertLess(elapsed, 0.05 * len(targets))
+
+    async def test_producer_backpressure_bounds_generation(self) -> None:
+        targets = [f"http://example.com/{index}" for index in range(50)]
+        validator = SlowValidator(delay=0.01)
+        orchestrator = ScanOrchestrator(validator, max_concurrency=2)
+        strategy = CountingStrategy(targets)
+
+        scan = orchestrator.execute_scan(strategy)
+        await scan.__anext__()
+        # Two in-flight workers plus a queue sized to the worker count.
+        self.assertLessEqual(strategy.generated, 2 * 2 + 1)
+        await scan.aclose()
+
+    async def test_slow_consumer_bounds_pending_results(self) -> None:
+        targets = [f"http://example.com/{index}" for index in range(50)]
+        validator = DummyValidator(
+            [
+                StreamValidationResult(url=url, is_valid=True, protocol="http")
+                for url in targets
+            ]
+        )
+        orchestrator = ScanOrchestrator(validator, max_concurrency=2)
+
+        scan = orchestrator.execute_scan(DummyStrategy(targets))
+        await scan.__anext__()
+        await asyncio.sleep(0.05)
+        # One yielded result, a results queue sized to the worker count and
+        # one result held by each worker blocked on it.
+        self.assertLessEqual(len(validator.calls), 1 + 2 + 2)
+        await scan.aclose()
+
+    async def test_rate_limiter_timeout_yields_timeout_result(self) -> None:
+        validator = SlowValidator(delay=0.2)
+        limiter = RateLimiter(max_concurrency=1, timeout=0.01)
+        orchestrator = ScanOrchestrator(validator, rate_limiter=limiter)
+
+        collected = [
+            result
+            async for result in orchestrator.execute_scan(
+                DummyStrategy(["rtp://239.0.0.1:1234"])
+            )
+        ]
+
+        self.assertEqual(len(collected), 1)
+        self.assertFalse(collected[0].is_valid)
+        self.assertEqual(collected[0].protocol, "rtp")
+        self.assertEqual(collected[0].error_category, ErrorCategory.TIMEOUT)
+
+    async def test_completion_ordering_yields_fastest_first(self) -> None:
+        targets = ["http://example.com/slow", "http://example.com/fast"]
+        validator = DelayByUrlValidator({targets[0]: 0.05})
+        orchestrator = ScanOrchestrator(validator, max_concurrency=2)
+
+        collected = [
+            result.url
+            async for result in orchestrator.execute_scan(
+                DummyStrategy(targets), ordering=ResultOrdering.COMPLETION
+            )
+        ]
+
+        self.assertEqual(collected, list(reversed(targets)))
+
+    async def test_target_ordering_preserves_generation_order(self) -> None:
+        targets = [f"http://example.com/{index}" for index in range(6)]
+        delays = {targets[0]: 0.05, targets[3]: 0.03}
+        validator = DelayByUrlValidator(delays)
+        orchestrator = ScanOrchestrator(validator, max_concurrency=3)
+
+        seen: List[ScanProgress] = []
+
+        async def callback(progress: ScanProgress) -> None:
+            seen.append(progress.model_copy())
+
+        orchestrator.on_progress(callback)
+        collected = [
+            result.url
+            async for result in orchestrator.execute_scan(
+                DummyStrategy(targets), ordering=ResultOrdering.TARGET
+            )
+        ]
+
+        self.assertEqual(collected, targets)
+        self.assertGreater(seen[-1].reorder_buffer_peak, 0)
+        self.assertGreater(seen[-1].head_of_line_stall_seconds, 0)
+        self.assertEqual(seen[-1].reorder_buffer_size, 0)
+        self.assertEqual(seen[-1].ordering, ResultOrdering.TARGET)
+
+    async def test_default_ordering_comes_from_the_constructor(self) -> None:
+        targets = [f"http://example.com/{index}" for index in range(4)]
+        validator = DelayByUrlValidator({targets[0]: 0.03})
+        orchestrator = ScanOrchestrator(
+            validator, max_concurrency=2, ordering=ResultOrdering.TARGET
+        )
+
+        collected = [
+            result.url
+            async for result in orchestrator.execute_scan(DummyStrategy(targets))
+        ]
+
+        self.assertEqual(collected, targets)
+
+    async def test_reorder_window_bounds_buffer(self) -> None:
+        targets = [f"http://example.com/{index}" for index in range(20)]
+        validator = DelayByUrlValidator({targets[0]: 0.05})
+        orchestrator = ScanOrchestrator(validator, max_concurrency=4, reorder_window=5)
+
+        peaks: List[int] = []
+
+        async def callback(progress: ScanProgress) -> None:
+            peaks.append(progress.reorder_buffer_peak)
+
+        orchestrator.on_progress(callback)
+        collected = [
+            result.url
+            async for result in orchestrator.execute_scan(
+                DummyStrategy(targets), ordering=ResultOrdering.TARGET
+            )
+        ]
+
+        self.assertEqual(collected, targets)
+        self.assertLessEqual(max(peaks), 4)
+
+    async def test_transient_failures_are_retried(self) -> None:
+        validator = FlakyValidator(
+            {"http://a": 2, "http://b": 0}, ErrorCategory.NETWORK_UNREACHABLE
+        )
+        orchestrator = ScanOrchestrator(
+            validator,
+            max_concurrency=2,
+            retry_policy=RetryPolicy(retry_attempts=3, base_delay=0.001),
+        )
+        progress_updates: List[ScanProgress] = []
+
+        async def capture(progress: ScanProgress) -> None:
+            progress_updates.append(progress.model_copy())
+
+        orchestrator.on_progress(capture)
+        results = [
+            result
+            async for result in orchestrator.execute_scan(
+                DummyStrategy(["http://a", "http://b"])
+            )
+        ]
+
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(result.is_valid for result in results))
+        self.assertEqual(validator.calls.count("http://a"), 3)
+        self.assertEqual(progress_updates[-1].retries, 2)
+
+    async def test_permanent_failures_are_not_retried(self) -> None:
+        validator = FlakyValidator({"http://a": 5}, ErrorCategory.NO_VIDEO_STREAM)
+        orchestrator = ScanOrchestrator(
+            validator, retry_policy=RetryPolicy(base_delay=0.001)
+        )
+
+        results = [
+            result
+            async for result in orchestrator.execute_scan(DummyStrategy(["http://a"]))
+        ]
+
+        self.assertEqual(validator.calls, ["http://a"])
+        self.assertFalse(results[0].is_valid)
+
+    async def test_retry_attempts_bound_each_target(self) -> None:
+        validator = FlakyValidator({"http://a": 10}, ErrorCategory.TIMEOUT)
+        orchestrator = ScanOrchestrator(
+            validator, retry_policy=RetryPolicy(retry_attempts=2, base_delay=0.001)
+        )
+
+        results = [
+            result
+            async for result in orchestrator.execute_scan(DummyStrategy(["http://a"]))
+        ]
+
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].error_category, ErrorCategory.TIMEOUT)
+        self.assertEqual(len(validator.calls), 3)
+
+    async def test_retry_budget_limits_retry_storms(self) -> None:
+        targets = [f"http://dead/{index}" for index in range(20)]
+        validator = FlakyValidator(
+            {url: 10 for url in targets}, ErrorCategory.NETWORK_UNREACHABLE
+        )
+        orchestrator = ScanOrchestrator(
+            validator,
+            max_concurrency=4,
+            retry_policy=RetryPolicy(
+                retry_attempts=3,
+                base_delay=0.001,
+                budget_ratio=0.1,
+                budget_minimum=2,
+            ),
+        )
+        progress_updates: List[ScanProgress] = []
+
+        async def capture(progress: ScanProgress) -> None:
+            progress_updates.append(progress.model_copy())
+
+        orchestrator.on_progress(capture)
+        results = [
+            result async for result in orchestrator.execute_scan(DummyStrategy(targets))
+        ]
+
+        self.assertEqual(len(results), 20)
+        retries = len(validator.calls) - len(targets)
+        self.assertLessEqual(retries, 2 + 0.1 * len(targets))
+        self.assertEqual(progress_updates[-1].retries, retries)
+        self.assertGreater(progress_updates[-1].retries_denied, 0)
+
+    async def test_retry_backoff_does_not_hold_concurrency_slot(self) -> None:
+        validator = FlakyValidator({"http://a": 1}, ErrorCategory.TIMEOUT)
+        limiter = RateLimiter(max_concurrency=1)
+        orchestrator = ScanOrchestrator(
+            validator,
+            rate_limiter=limiter,
+            retry_policy=RetryPolicy(base_delay=0.2, max_delay=0.2),
+        )
+        order: List[str] = []
+
+        async for result in orchestrator.execute_scan(
+            DummyStrategy(["http://a", "http://b"])
+        ):
+            order.append(result.url)
+
+        # "b" completes while "a" waits for its retry.
+        self.assertEqual(order, ["http://b", "http://a"])
+
+    async def test_only_hits_are_reprobed_with_detailed_profile(self) -> None:
+        validator = ProfileRecordingValidator(valid=["udp://live"])
+        orchestrator = ScanOrchestrator(
+            validator,
+            probe_profile=ProbeProfile.LIVENESS,
+            reprobe_profile=ProbeProfile.METADATA,
+        )
+
+        results = {
+            result.url: result
+            async for result in orchestrator.execute_scan(
+                DummyStrategy(["udp://live", "udp://dead"])
+            )
+        }
+
+        self.assertEqual(
+            sorted(validator.calls, key=str),
+            sorted(
+                [
+                    ("udp://live", ProbeProfile.LIVENESS),
+                    ("udp://dead", ProbeProfile.LIVENESS),
+                    ("udp://live", ProbeProfile.METADATA),
+                ],
+                key=str,
+            ),
+        )
+        self.assertEqual(results["udp://live"].resolution, "1920x1080")
+        self.assertFalse(results["udp://dead"].is_valid)
+
+    async def test_cached_results_skip_the_validator(self) -> None:
+        cache = ValidationCache()
+        validator = ProfileRecordingValidator(valid=["udp://live"])
+        targets = ["udp://live", "udp://dead"]
+
+        async def scan(force: bool = False) -> List[ScanProgress]:
+            orchestrator = ScanOrchestrator(
+                validator,
+                probe_profile=ProbeProfile.LIVENESS,
+                reprobe_profile=ProbeProfile.METADATA,
+                validation_cache=cache,
+                force_refresh=force,
+            )
+            updates: List[ScanProgress] = []
+
+            async def capture(progress: ScanProgress) -> None:
+                updates.append(progress.model_copy())
+
+            orchestrator.on_progress(capture)
+            async for _ in orchestrator.execute_scan(DummyStrategy(targets)):
+                pass
+            return updates
+
+        first = await scan()
+        probes = len(validator.calls)
+        second = await scan()
+
+        self.assertEqual(len(validator.calls), probes)
+        self.assertEqual((first[-1].cache_hits, first[-1].cache_misses), (0, 2))
+        self.assertEqual((second[-1].cache_hits, second[-1].cache_misses), (2, 0))
+        cached = cache.get("udp://live", ProbeProfile.METADATA)
+        assert cached is not None
+        self.assertEqual(cached.resolution, "1920x1080")
+
+        forced = await scan(force=True)
+        self.assertEqual(len(validator.calls), probes * 2)
+        self.assertEqual((forced[-1].cache_hits, forced[-1].cache_misses), (0, 0))
+
+    async def test_only_final_attempts_are_cached(self) -> None:
+        cache = ValidationCache()
+        validator = FlakyValidator({"http://a": 1}, ErrorCategory.TIMEOUT)
+        orchestrator = ScanOrchestrator(
+            validator,
+            retry_policy=RetryPolicy(base_delay=0.001),
+            validation_cache=cache,
+        )
+
+        results = [
+            result
+            async for result in orchestrator.execute_scan(DummyStrategy(["http://a"]))
+        ]
+
+        self.assertTrue(results[0].is_valid)
+        self.assertEqual(validator.calls, ["http://a", "http://a"])
+        cached = cache.get("http://a")
+        assert cached is not None
+        self.assertTrue(cached.is_valid)
+
+    async def test_unreachable_hosts_are_not_probed_again(self) -> None:
+        targets = [f"http://10.0.0.5:8080/ch{index}" for index in range(5)]
+        validator = FlakyValidator(
+            {url: 1 for url in targets},
+            ErrorCategory.NETWORK_UNREACHABLE,
+            "Connection refused",
+        )
+        orchestrator = ScanOrchestrator(
+            validator,
+            max_concurrency=1,
+            retry_policy=RetryPolicy(retry_attempts=3, base_delay=0),
+            host_failures=HostFailureCache(window=60),
+        )
+        progress_updates: List[ScanProgress] = []
+
+        async def capture(progress: ScanProgress) -> None:
+            progress_updates.append(progress.model_copy())
+
+        orchestrator.on_progress(capture)
+        results = [
+            result async for result in orchestrator.execute_scan(DummyStrategy(targets))
+        ]
+
+        self.assertEqual(validator.calls, targets[:1])
+        self.assertEqual(len(results), 5)
+        self.assertTrue(
+            all(
+                result.error_category == ErrorCategory.NETWORK_UNREACHABLE
+                and not result.is_valid
+                for result in results
+            )
+        )
+        self.assertEqual(progress_updates[-1].host_skips, 4)
+
+    def test_reorder_window_must_be_positive(self) -> None:
+        with self.assertRaises(ValueError):
+            ScanOrchestrator(DummyValidator([]), reorder_window=0)
+
 
 if __name__ == "__main__":
     unittest.main()
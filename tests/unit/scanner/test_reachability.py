@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import socket
+import unittest
+from typing import List
+
+from iptv_sniffer.scanner.reachability import PrefilteringValidator, ReachabilityProbe
+from iptv_sniffer.scanner.validator import (
+    ErrorCategory,
+    StreamValidationResult,
+    is_connect_failure,
+)
+
+
+def _closed_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class RecordingValidator:
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+
+    async def validate(self, url: str, timeout: int = 10) -> StreamValidationResult:
+        self.calls.append(url)
+        return StreamValidationResult(url=url, protocol="http", is_valid=True)
+
+
+class ReachabilityProbeTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.probe = ReachabilityProbe(timeout=1.0)
+
+    async def _serve(self, response: bytes) -> int:
+        async def handle(
+            reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+        ) -> None:
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(response)
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        self.addAsyncCleanup(server.wait_closed)
+        self.addCleanup(server.close)
+        return server.sockets[0].getsockname()[1]
+
+    async def test_closed_port_is_pruned(self) -> None:
+        result = await self.probe.check(f"http://127.0.0.1:{_closed_port()}/live")
+
+        assert result is not None
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.error_category, ErrorCategory.NETWORK_UNREACHABLE)
+        self.assertTrue(is_connect_failure(result))
+
+    async def _serve_silently(self) -> int:
+        async def handle(
+            reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+        ) -> None:
+            await asyncio.sleep(0.3)
+            writer.close()
+
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        self.addAsyncCleanup(server.wait_closed)
+        self.addCleanup(server.close)
+        return server.sockets[0].getsockname()[1]
+
+    async def test_slow_first_byte_goes_to_full_probe(self) -> None:
+        probe = ReachabilityProbe(timeout=0.05)
+        port = await self._serve_silently()
+
+        self.assertIsNone(await probe.check(f"http://127.0.0.1:{port}/udp/239.1.1.1"))
+        self.assertIsNone(await probe.check(f"rtsp://127.0.0.1:{port}/ch1"))
+
+    async def test_transport_stream_survives(self) -> None:
+        body = bytes([0x47]) + bytes(187)
+        port = await self._serve(
+            b"HTTP/1.1 200 OK\r\nContent-Type: application/octet-stream\r\n"
+            b"Content-Length: 188\r\n\r\n" + body
+        )
+
+        self.assertIsNone(await self.probe.check(f"http://127.0.0.1:{port}/live"))
+
+    async def test_html_page_is_pruned(self) -> None:
+        body = b"<!DOCTYPE html><html><body>router login</body></html>"
+        port = await self._serve(
+            b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\n"
+            + f"Content-Length: {len(body)}\r\n\r\n".encode()
+            + body
+        )
+
+        result = await self.probe.check(f"http://127.0.0.1:{port}/")
+
+        assert result is not None
+        self.assertEqual(result.error_category, ErrorCategory.NO_VIDEO_STREAM)
+
+    async def test_http_error_status_is_pruned(self) -> None:
+        port = await self._serve(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+
+        result = await self.probe.check(f"http://127.0.0.1:{port}/missing")
+
+        assert result is not None
+        self.assertIn("404", result.error_message or "")
+
+    async def test_rtsp_options_answer_survives(self) -> None:
+        port = await self._serve(b"RTSP/1.0 200 OK\r\nCSeq: 1\r\n\r\n")
+
+        self.assertIsNone(await self.probe.check(f"rtsp://127.0.0.1:{port}/ch1"))
+
+    async def test_non_rtsp_service_is_pruned(self) -> None:
+        port = await self._serve(b"HTTP/1.1 400 Bad Request\r\n\r\n")
+
+        result = await self.probe.check(f"rtsp://127.0.0.1:{port}/ch1")
+
+        assert result is not None
+        self.assertEqual(result.protocol, "rtsp")
+        self.assertEqual(result.error_category, ErrorCategory.NO_VIDEO_STREAM)
+
+    async def test_multicast_targets_are_not_prefiltered(self) -> None:
+        self.assertIsNone(await self.probe.check("udp://239.1.1.1:5000"))
+
+
+class PrefilteringValidatorTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_only_survivors_reach_the_full_validator(self) -> None:
+        inner = RecordingValidator()
+        validator = PrefilteringValidator(inner, ReachabilityProbe(timeout=1.0))
+        dead = f"http://127.0.0.1:{_closed_port()}/live"
+
+        dead_result = await validator.validate(dead)
+        live_result = await validator.validate("udp://239.1.1.1:5000")
+
+        self.assertFalse(dead_result.is_valid)
+        self.assertTrue(live_result.is_valid)
+        self.assertEqual(inner.calls, ["udp://239.1.1.1:5000"])
+        self.assertEqual((validator.pruned, validator.probed), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
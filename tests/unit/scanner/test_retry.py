@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import random
+import unittest
+
+from iptv_sniffer.scanner.retry import RetryBudget, RetryPolicy
+from iptv_sniffer.scanner.validator import ErrorCategory, StreamValidationResult
+from iptv_sniffer.utils.config import AppConfig
+
+
+def _failure(category: ErrorCategory) -> StreamValidationResult:
+    return StreamValidationResult(
+        url="http://a", is_valid=False, protocol="http", error_category=category
+    )
+
+
+class RetryPolicyTestCase(unittest.TestCase):
+    def test_only_transient_categories_are_retried(self) -> None:
+        policy = RetryPolicy(retry_attempts=2)
+
+        self.assertTrue(policy.should_retry(_failure(ErrorCategory.TIMEOUT), 0))
+        self.assertTrue(
+            policy.should_retry(_failure(ErrorCategory.NETWORK_UNREACHABLE), 1)
+        )
+        self.assertFalse(policy.should_retry(_failure(ErrorCategory.TIMEOUT), 2))
+        self.assertFalse(
+            policy.should_retry(_failure(ErrorCategory.NO_VIDEO_STREAM), 0)
+        )
+        self.assertFalse(policy.should_retry(_failure(ErrorCategory.NO_RESPONSE), 0))
+        refused = _failure(ErrorCategory.NETWORK_UNREACHABLE)
+        refused.error_message = "TCP connect failed: [Errno 111] Connection refused"
+        self.assertFalse(policy.should_retry(refused, 0))
+        self.assertFalse(
+            policy.should_retry(
+                StreamValidationResult(url="http://a", is_valid=True, protocol="http"),
+                0,
+            )
+        )
+
+    def test_delay_grows_exponentially_with_jitter(self) -> None:
+        policy = RetryPolicy(backoff=2.0, base_delay=1.0, max_delay=5.0)
+        rng = random.Random(7)
+
+        for retry, ceiling in ((1, 1.0), (2, 2.0), (3, 4.0), (4, 5.0), (6, 5.0)):
+            delay = policy.delay(retry, rng)
+            self.assertGreaterEqual(delay, ceiling / 2)
+            self.assertLessEqual(delay, ceiling)
+
+    def test_from_config_reads_retry_settings(self) -> None:
+        config = AppConfig(retry_attempts=1, retry_backoff=2.5)
+
+        policy = RetryPolicy.from_config(config)
+
+        self.assertEqual(policy.retry_attempts, 1)
+        self.assertEqual(policy.backoff, 2.5)
+
+    def test_invalid_settings_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            RetryPolicy(backoff=0.5)
+        with self.assertRaises(ValueError):
+            RetryPolicy(base_delay=2.0, max_delay=1.0)
+
+
+class RetryBudgetTestCase(unittest.TestCase):
+    def test_budget_scales_with_first_attempts(self) -> None:
+        budget = RetryBudget(ratio=0.5, minimum=1)
+
+        self.assertTrue(budget.try_spend())
+        self.assertFalse(budget.try_spend())
+
+        for _ in range(4):
+            budget.record_attempt()
+        self.assertTrue(budget.try_spend())
+        self.assertTrue(budget.try_spend())
+        self.assertFalse(budget.try_spend())
+        self.assertEqual(budget.spent, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
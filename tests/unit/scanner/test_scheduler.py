@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import asyncio
+import unittest
+from typing import List
+
+from iptv_sniffer.scanner.adaptive_limiter import AdaptiveRateLimiter
+from iptv_sniffer.scanner.scheduler import ProbeScheduler, ScanPriority
+from iptv_sniffer.scanner.validator import ErrorCategory
+
+
+class ProbeSchedulerTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_pool_size_bounds_all_lanes(self) -> None:
+        scheduler = ProbeScheduler(max_concurrency=3)
+        lanes = [scheduler.lane() for _ in range(3)]
+        active = 0
+        peak = 0
+
+        async def probe(lane) -> None:
+            nonlocal active, peak
+            async with lane:
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(probe(lane) for lane in lanes for _ in range(5)))
+
+        self.assertEqual(peak, 3)
+        self.assertEqual(scheduler.in_use, 0)
+
+    async def test_slots_are_shared_by_priority_weight(self) -> None:
+        scheduler = ProbeScheduler(max_concurrency=1)
+        interactive = scheduler.lane(ScanPriority.INTERACTIVE)
+        background = scheduler.lane(ScanPriority.BACKGROUND)
+        order: List[str] = []
+        gate = asyncio.Event()
+
+        async def hold() -> None:
+            async with background:
+                await gate.wait()
+
+        async def probe(lane, name: str) -> None:
+            async with lane:
+                order.append(name)
+                await asyncio.sleep(0)
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(probe(background, "background")) for _ in range(4)
+        ]
+        await asyncio.sleep(0)
+        waiters += [
+            asyncio.create_task(probe(interactive, "interactive")) for _ in range(16)
+        ]
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(holder, *waiters)
+
+        # The background scan queued first, yet the interactive scan gets
+        # sixteen slots for each one granted to the background scan.
+        self.assertEqual(order[:16].count("interactive"), 15)
+        self.assertEqual(order.count("background"), 4)
+
+    async def test_cancelled_waiter_passes_slot_on(self) -> None:
+        scheduler = ProbeScheduler(max_concurrency=1)
+        lane = scheduler.lane()
+        await lane.__aenter__()
+
+        waiter = asyncio.create_task(lane.__aenter__())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        await lane.__aexit__(None, None, None)
+
+        self.assertEqual(scheduler.in_use, 0)
+        async with lane:
+            self.assertEqual(scheduler.in_use, 1)
+
+    async def test_lane_forwards_to_inner_limiter(self) -> None:
+        scheduler = ProbeScheduler(max_concurrency=8)
+        inner = AdaptiveRateLimiter(initial_limit=2, max_limit=8, window_size=1)
+        lane = scheduler.lane(inner=inner)
+
+        self.assertEqual(lane.limit, 2)
+        async with lane:
+            self.assertEqual(inner.in_flight, 1)
+        lane.observe(0.1, None)
+        lane.observe(0.1, ErrorCategory.TIMEOUT)
+
+        self.assertEqual(
+            [entry.reason for entry in lane.history],
+            ["initial", "latency_ok", "timeouts"],
+        )
+
+    async def test_closed_lane_no_longer_receives_slots(self) -> None:
+        scheduler = ProbeScheduler(max_concurrency=1)
+        first = scheduler.lane()
+        second = scheduler.lane()
+        await first.__aenter__()
+
+        pending = asyncio.create_task(second.__aenter__())
+        await asyncio.sleep(0)
+        second.close()
+        with self.assertRaises(asyncio.CancelledError):
+            await pending
+        await first.__aexit__(None, None, None)
+
+        self.assertEqual(scheduler.in_use, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
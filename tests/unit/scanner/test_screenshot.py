@@ -5,9 +5,12 @@ import tempfile
 import time
 import unittest
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 from iptv_sniffer.scanner.screenshot import capture_screenshot
+from iptv_sniffer.utils.ffmpeg import FFmpegCapabilities
+
+_FFMPEG = FFmpegCapabilities(ffmpeg_path="/usr/bin/ffmpeg")
 
 
 class DummyGraph:
@@ -29,7 +32,9 @@ class ScreenshotCaptureTestCase(unittest.IsolatedAsyncioTestCase):
 
     def setUp(self) -> None:
         patcher = patch(
-            "iptv_sniffer.scanner.screenshot.check_ffmpeg_installed", return_value=True
+            "iptv_sniffer.scanner.screenshot.get_ffmpeg_capabilities_async",
+            new_callable=AsyncMock,
+            return_value=_FFMPEG,
         )
         self.addCleanup(patcher.stop)
         patcher.start()
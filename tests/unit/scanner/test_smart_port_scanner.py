@@ -3,9 +3,10 @@ from __future__ import annotations
 import unittest
 from typing import Dict, List, Tuple
 
+from iptv_sniffer.scanner.host_failures import HostFailureCache
 from iptv_sniffer.scanner.multicast_strategy import MulticastScanStrategy
 from iptv_sniffer.scanner.smart_port_scanner import SmartPortScanner
-from iptv_sniffer.scanner.validator import StreamValidationResult
+from iptv_sniffer.scanner.validator import ErrorCategory, StreamValidationResult
 
 
 class FakeValidator:
@@ -22,6 +23,18 @@ class FakeValidator:
         return StreamValidationResult(url=url, protocol=protocol, is_valid=is_valid)
 
 
+class UnreachableValidator(FakeValidator):
+    async def validate(self, url: str, timeout: int = 10) -> StreamValidationResult:
+        self.calls.append((url, timeout))
+        return StreamValidationResult(
+            url=url,
+            protocol="udp",
+            is_valid=False,
+            error_category=ErrorCategory.NETWORK_UNREACHABLE,
+            error_message="Connection refused",
+        )
+
+
 class SmartPortScannerTestCase(unittest.IsolatedAsyncioTestCase):
     async def test_discovered_ports_reduce_follow_up_scan(self) -> None:
         strategy = MulticastScanStrategy(
@@ -117,6 +130,33 @@ class SmartPortScannerTestCase(unittest.IsolatedAsyncioTestCase):
         }
         self.assertSetEqual({call[0] for call in validator.calls}, expected_urls)
 
+    async def test_unreachable_addresses_skip_remaining_ports(self) -> None:
+        strategy = MulticastScanStrategy(
+            protocol="udp",
+            ip_ranges=["239.3.1.1-239.3.1.2"],
+            ports=[8000, 8004, 8008],
+        )
+        validator = UnreachableValidator({})
+
+        scanner = SmartPortScanner(
+            strategy,
+            validator,
+            enable_smart_scan=False,
+            host_failures=HostFailureCache(window=60, host_threshold=2),
+        )
+        results = [result async for result in scanner.scan()]
+
+        self.assertEqual(len(results), 6)
+        self.assertEqual(
+            [call[0] for call in validator.calls],
+            [
+                "udp://239.3.1.1:8000",
+                "udp://239.3.1.1:8004",
+                "udp://239.3.1.2:8000",
+                "udp://239.3.1.2:8004",
+            ],
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
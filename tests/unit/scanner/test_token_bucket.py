@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import unittest
+from typing import AsyncIterator, List
+from unittest.mock import patch
+
+from iptv_sniffer.scanner.multicast_strategy import MulticastScanStrategy
+from iptv_sniffer.scanner.orchestrator import ScanOrchestrator
+from iptv_sniffer.scanner.smart_port_scanner import SmartPortScanner
+from iptv_sniffer.scanner.strategy import ScanStrategy
+from iptv_sniffer.scanner.token_bucket import HostRateLimiter, TokenBucket
+from iptv_sniffer.scanner.validator import StreamValidationResult, StreamValidator
+from iptv_sniffer.utils.config import AppConfig
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class RecordingValidator(StreamValidator):  # type: ignore[misc]
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+
+    async def validate(self, url: str, timeout: int = 10) -> StreamValidationResult:  # type: ignore[override]
+        self.calls.append(url)
+        protocol = url.split("://", 1)[0]
+        return StreamValidationResult(url=url, protocol=protocol, is_valid=False)
+
+
+class ListStrategy(ScanStrategy):
+    def __init__(self, targets: List[str]) -> None:
+        self._targets = targets
+
+    def estimate_target_count(self) -> int:
+        return len(self._targets)
+
+    async def generate_targets(self) -> AsyncIterator[str]:
+        for target in self._targets:
+            yield target
+
+
+class TokenBucketTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        self.clock = FakeClock()
+        patcher = patch(
+            "iptv_sniffer.scanner.token_bucket.time.monotonic", new=self.clock
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_burst_is_free_then_requests_are_spaced(self) -> None:
+        bucket = TokenBucket(rate=10, capacity=2)
+
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertAlmostEqual(bucket.reserve(), 0.1)
+        self.assertAlmostEqual(bucket.reserve(), 0.2)
+
+    def test_bucket_refills_over_time(self) -> None:
+        bucket = TokenBucket(rate=10, capacity=2)
+        bucket.reserve()
+        bucket.reserve()
+
+        self.clock.now += 1.0
+
+        self.assertEqual(bucket.reserve(), 0.0)
+        self.assertEqual(bucket.reserve(), 0.0)
+
+    def test_rejects_invalid_parameters(self) -> None:
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0, capacity=1)
+        with self.assertRaises(ValueError):
+            HostRateLimiter(host_rate=-1)
+
+    def test_hosts_are_limited_independently(self) -> None:
+        limiter = HostRateLimiter(host_rate=1, host_burst=1)
+
+        self.assertEqual(limiter.reserve("http://192.168.1.10/a"), 0.0)
+        self.assertEqual(limiter.reserve("http://192.168.1.11/a"), 0.0)
+        self.assertAlmostEqual(limiter.reserve("http://192.168.1.10/b"), 1.0)
+
+    def test_subnet_bucket_spans_hosts_in_same_slash_24(self) -> None:
+        limiter = HostRateLimiter(subnet_rate=2, subnet_burst=1)
+
+        self.assertEqual(limiter.reserve("udp://239.3.1.1:8000"), 0.0)
+        self.assertAlmostEqual(limiter.reserve("udp://239.3.1.2:8000"), 0.5)
+        self.assertEqual(limiter.reserve("udp://239.3.2.1:8000"), 0.0)
+        # Hostnames have no subnet and are not throttled by subnet buckets.
+        self.assertEqual(limiter.reserve("http://head-end.local/a"), 0.0)
+        self.assertEqual(limiter.reserve("http://head-end.local/b"), 0.0)
+
+    def test_disabled_limiter_never_delays(self) -> None:
+        limiter = HostRateLimiter()
+        self.assertFalse(limiter.enabled)
+        for _ in range(5):
+            self.assertEqual(limiter.reserve("http://192.168.1.10/a"), 0.0)
+
+    def test_from_config_uses_app_config_values(self) -> None:
+        config = AppConfig(host_rate_limit=5, host_burst=2, subnet_rate_limit=0)
+        limiter = HostRateLimiter.from_config(config)
+
+        self.assertEqual(limiter.reserve("http://10.0.0.1/"), 0.0)
+        self.assertEqual(limiter.reserve("http://10.0.0.1/"), 0.0)
+        self.assertAlmostEqual(limiter.reserve("http://10.0.0.1/"), 0.2)
+
+
+class HostRateLimiterIntegrationTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_orchestrator_waits_for_host_tokens(self) -> None:
+        limiter = HostRateLimiter(host_rate=50, host_burst=1)
+        validator = RecordingValidator()
+        orchestrator = ScanOrchestrator(
+            validator, max_concurrency=4, host_limiter=limiter
+        )
+        targets = [f"http://192.168.2.2:7788/rtp/239.3.1.{i}:8000" for i in range(5)]
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        results = [r async for r in orchestrator.execute_scan(ListStrategy(targets))]
+        elapsed = loop.time() - start
+
+        self.assertEqual(len(results), 5)
+        self.assertGreaterEqual(elapsed, 4 / 50 * 0.9)
+
+    async def test_smart_port_scanner_consults_host_limiter(self) -> None:
+        strategy = MulticastScanStrategy(
+            protocol="udp", ip_ranges=["239.3.1.1-239.3.1.2"], ports=[8000]
+        )
+        limiter = HostRateLimiter(subnet_rate=1000, subnet_burst=1)
+        validator = RecordingValidator()
+        scanner = SmartPortScanner(strategy, validator, host_limiter=limiter)
+
+        with patch.object(limiter, "acquire", wraps=limiter.acquire) as acquire:
+            results = [result async for result in scanner.scan()]
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(
+            [call.args[0] for call in acquire.call_args_list], validator.calls
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
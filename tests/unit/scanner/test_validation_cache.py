@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from iptv_sniffer.scanner.validation_cache import ValidationCache, normalize_url
+from iptv_sniffer.scanner.validator import (
+    ErrorCategory,
+    ProbeProfile,
+    StreamValidationResult,
+)
+
+
+def _valid(url: str) -> StreamValidationResult:
+    return StreamValidationResult(
+        url=url, is_valid=True, protocol="http", resolution="1920x1080"
+    )
+
+
+def _failed(url: str) -> StreamValidationResult:
+    return StreamValidationResult(
+        url=url,
+        is_valid=False,
+        protocol="http",
+        error_category=ErrorCategory.TIMEOUT,
+        error_message="Validation timed out.",
+    )
+
+
+class NormalizeURLTestCase(unittest.TestCase):
+    def test_scheme_host_and_default_port_are_normalized(self) -> None:
+        self.assertEqual(
+            normalize_url(" HTTP://Head.End:80/Live/CH1.ts?Token=A#top "),
+            "http://head.end/Live/CH1.ts?Token=A",
+        )
+        self.assertEqual(normalize_url("rtp://239.1.1.1:5000"), "rtp://239.1.1.1:5000/")
+        self.assertEqual(
+            normalize_url("https://user:pw@host:8443/a"), "https://user:pw@host:8443/a"
+        )
+
+
+class ValidationCacheTestCase(unittest.TestCase):
+    def test_hits_are_keyed_by_normalized_url_and_profile(self) -> None:
+        cache = ValidationCache()
+        cache.put(_valid("http://host/live.ts"), ProbeProfile.METADATA)
+
+        hit = cache.get("HTTP://HOST:80/live.ts", ProbeProfile.METADATA)
+
+        assert hit is not None
+        self.assertEqual(hit.url, "HTTP://HOST:80/live.ts")
+        self.assertEqual(hit.resolution, "1920x1080")
+        self.assertIsNone(cache.get("http://host/live.ts", ProbeProfile.DEEP))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_positive_and_negative_results_have_separate_ttls(self) -> None:
+        cache = ValidationCache(positive_ttl=600, negative_ttl=60)
+        with mock.patch(
+            "iptv_sniffer.scanner.validation_cache.time.time", return_value=1000.0
+        ):
+            cache.put(_valid("http://host/up"))
+            cache.put(_failed("http://host/down"))
+        with mock.patch(
+            "iptv_sniffer.scanner.validation_cache.time.time", return_value=1100.0
+        ):
+            self.assertIsNotNone(cache.get("http://host/up"))
+            self.assertIsNone(cache.get("http://host/down"))
+
+        self.assertEqual(len(cache), 1)
+
+    def test_zero_ttl_disables_caching(self) -> None:
+        cache = ValidationCache(negative_ttl=0)
+        cache.put(_failed("http://host/down"))
+
+        self.assertEqual(len(cache), 0)
+
+    def test_least_recently_used_entry_is_evicted(self) -> None:
+        cache = ValidationCache(max_entries=2)
+        cache.put(_valid("http://host/a"))
+        cache.put(_valid("http://host/b"))
+        cache.get("http://host/a")
+        cache.put(_valid("http://host/c"))
+
+        self.assertIsNotNone(cache.get("http://host/a"))
+        self.assertIsNone(cache.get("http://host/b"))
+        self.assertIsNotNone(cache.get("http://host/c"))
+
+    def test_entries_survive_save_and_load(self) -> None:
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "validation_cache.json"
+            cache = ValidationCache(path=path)
+            cache.put(_valid("http://host/up"), ProbeProfile.METADATA)
+            cache.put(_failed("http://host/down"))
+            cache.save()
+
+            restored = ValidationCache(path=path)
+            self.assertEqual(restored.load(), 2)
+
+            up = restored.get("http://host/up", ProbeProfile.METADATA)
+            down = restored.get("http://host/down")
+            assert up is not None and down is not None
+            self.assertEqual(up.resolution, "1920x1080")
+            self.assertEqual(down.error_category, ErrorCategory.TIMEOUT)
+
+    def test_expired_and_corrupt_files_are_ignored(self) -> None:
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "validation_cache.json"
+            path.write_text("{not json", "utf-8")
+            self.assertEqual(ValidationCache(path=path).load(), 0)
+
+            path.write_text(
+                json.dumps(
+                    {
+                        "version": 1,
+                        "entries": [
+                            {
+                                "key": "http://host/old",
+                                "profile": "default",
+                                "expires_at": 1.0,
+                                "result": {},
+                            }
+                        ],
+                    }
+                ),
+                "utf-8",
+            )
+            self.assertEqual(ValidationCache(path=path).load(), 0)
+
+
+class ValidationCachePersistenceTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_async_save_tolerates_concurrent_lookups(self) -> None:
+        with TemporaryDirectory() as tmp:
+            path = Path(tmp) / "validation_cache.json"
+            cache = ValidationCache(path=path)
+            for index in range(3):
+                cache.put(_valid(f"http://host/{index}"))
+            serializing = threading.Event()
+            resume = threading.Event()
+            serialize = ValidationCache._serialize
+
+            def slow_serialize(result: StreamValidationResult):
+                serializing.set()
+                resume.wait(1)
+                return serialize(result)
+
+            with mock.patch.object(
+                ValidationCache, "_serialize", side_effect=slow_serialize
+            ):
+                saving = asyncio.create_task(cache.save_async())
+                await asyncio.to_thread(serializing.wait, 1)
+                cache.get("http://host/0")
+                cache.put(_valid("http://host/late"))
+                resume.set()
+                await saving
+
+            restored = ValidationCache(path=path)
+            self.assertEqual(await restored.load_async(), 3)
+            self.assertIsNotNone(restored.get("http://host/0"))
+            self.assertIsNone(restored.get("http://host/late"))
+
+
+if __name__ == "__main__":
+    unittest.main()
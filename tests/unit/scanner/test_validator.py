@@ -1,10 +1,24 @@
 from __future__ import annotations
 
+import asyncio
 import unittest
 from typing import Any, Dict
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
-from iptv_sniffer.scanner.validator import ErrorCategory, StreamValidator
+from iptv_sniffer.scanner.ffprobe import FFprobeError
+from iptv_sniffer.scanner.hls import HLSFailure, HLSProbeResult
+from iptv_sniffer.scanner.mpegts import TSStreamInfo
+from iptv_sniffer.scanner.validator import (
+    ErrorCategory,
+    ProbeBackend,
+    ProbeProfile,
+    StreamValidator,
+)
+from iptv_sniffer.utils.ffmpeg import FFmpegCapabilities
+
+_FFMPEG = FFmpegCapabilities(
+    ffmpeg_path="/usr/bin/ffmpeg", ffprobe_path="/usr/bin/ffprobe"
+)
 
 
 class DummyFFmpegError(Exception):
@@ -41,7 +55,9 @@ class StreamValidatorTestCase(unittest.IsolatedAsyncioTestCase):
 
     def setUp(self) -> None:
         patcher = patch(
-            "iptv_sniffer.scanner.validator.check_ffmpeg_installed", return_value=True
+            "iptv_sniffer.scanner.validator.get_ffmpeg_capabilities_async",
+            new_callable=AsyncMock,
+            return_value=_FFMPEG,
         )
         self.addCleanup(patcher.stop)
         patcher.start()
@@ -121,7 +137,9 @@ class StreamValidatorTestCase(unittest.IsolatedAsyncioTestCase):
 
     async def test_validate_returns_error_when_ffmpeg_missing(self) -> None:
         with patch(
-            "iptv_sniffer.scanner.validator.check_ffmpeg_installed", return_value=False
+            "iptv_sniffer.scanner.validator.get_ffmpeg_capabilities_async",
+            new_callable=AsyncMock,
+            return_value=FFmpegCapabilities(),
         ):
             result = await self.validator.validate("http://example.com/stream")
 
@@ -129,6 +147,46 @@ class StreamValidatorTestCase(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(result.error_category, ErrorCategory.UNSUPPORTED_PROTOCOL)
         self.assertIn("ffmpeg is not installed", (result.error_message or "").lower())
 
+    async def test_validate_rejects_protocol_missing_from_ffmpeg(self) -> None:
+        capabilities = FFmpegCapabilities(
+            ffmpeg_path="/usr/bin/ffmpeg", protocols=frozenset({"http", "udp"})
+        )
+        with (
+            patch(
+                "iptv_sniffer.scanner.validator.get_ffmpeg_capabilities_async",
+                new_callable=AsyncMock,
+                return_value=capabilities,
+            ),
+            patch("iptv_sniffer.scanner.validator.ffmpeg.probe") as mock_probe,
+        ):
+            result = await self.validator.validate("rtsp://example.com/live")
+
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.error_category, ErrorCategory.UNSUPPORTED_PROTOCOL)
+        self.assertIn("tcp protocol", result.error_message or "")
+        mock_probe.assert_not_called()
+
+    async def test_validate_rejects_codec_without_decoder(self) -> None:
+        capabilities = FFmpegCapabilities(
+            ffmpeg_path="/usr/bin/ffmpeg", decoders=frozenset({"hevc", "aac"})
+        )
+        with (
+            patch(
+                "iptv_sniffer.scanner.validator.get_ffmpeg_capabilities_async",
+                new_callable=AsyncMock,
+                return_value=capabilities,
+            ),
+            patch(
+                "iptv_sniffer.scanner.validator.ffmpeg.probe",
+                return_value=_make_probe_streams(),
+            ),
+        ):
+            result = await self.validator.validate("http://example.com/stream")
+
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.error_category, ErrorCategory.UNSUPPORTED_CODEC)
+        self.assertEqual(result.codec_video, "h264")
+
     async def test_validate_rtsp_uses_tcp_transport(self) -> None:
         probe_result = _make_probe_streams()
         with patch(
@@ -183,5 +241,175 @@ class StreamValidatorTestCase(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(result.error_category, ErrorCategory.UNSUPPORTED_CODEC)
 
 
+class ProbeProfileTestCase(unittest.IsolatedAsyncioTestCase):
+    """Probe options selected by each ProbeProfile."""
+
+    def setUp(self) -> None:
+        patcher = patch(
+            "iptv_sniffer.scanner.validator.get_ffmpeg_capabilities_async",
+            new_callable=AsyncMock,
+            return_value=_FFMPEG,
+        )
+        self.addCleanup(patcher.stop)
+        patcher.start()
+        self.validator = StreamValidator(max_workers=2)
+
+    async def _probe_kwargs(self, url: str, **kwargs: Any) -> Dict[str, Any]:
+        with patch(
+            "iptv_sniffer.scanner.validator.ffmpeg.probe",
+            return_value=_make_probe_streams(),
+        ) as mock_probe:
+            await self.validator.validate(url, **kwargs)
+        return mock_probe.call_args.kwargs
+
+    async def test_liveness_profile_reads_minimal_data(self) -> None:
+        kwargs = await self._probe_kwargs(
+            "rtp://239.0.0.1:1234", timeout=5, profile=ProbeProfile.LIVENESS
+        )
+
+        self.assertEqual(kwargs["timeout"], 5)
+        self.assertEqual(kwargs["analyzeduration"], "500000")
+        self.assertEqual(kwargs["probesize"], "131072")
+
+    async def test_deep_profile_extends_analysis(self) -> None:
+        kwargs = await self._probe_kwargs(
+            "rtsp://camera/stream", timeout=5, profile=ProbeProfile.DEEP
+        )
+
+        self.assertGreaterEqual(kwargs["timeout"], 30)
+        self.assertEqual(kwargs["probesize"], "50M")
+        self.assertEqual(kwargs["rtsp_transport"], "tcp")
+
+    async def test_probe_timeout_covers_every_protocol(self) -> None:
+        for profile in ProbeProfile:
+            with self.subTest(profile=profile):
+                longest = StreamValidator.probe_timeout(profile, 5)
+                for url in ("rtp://239.0.0.1:1234", "http://example.com/live"):
+                    kwargs = await self._probe_kwargs(url, timeout=5, profile=profile)
+                    self.assertLessEqual(kwargs["timeout"], longest)
+
+    async def test_constructor_sets_default_profile(self) -> None:
+        self.validator = StreamValidator(max_workers=1, profile=ProbeProfile.LIVENESS)
+
+        kwargs = await self._probe_kwargs("udp://239.0.0.1:1234")
+
+        self.assertEqual(kwargs["probesize"], "131072")
+
+
+class NativeTransportStreamTestCase(unittest.IsolatedAsyncioTestCase):
+    """HTTP streams identified by the in-process MPEG-TS analyzer."""
+
+    def setUp(self) -> None:
+        patcher = patch(
+            "iptv_sniffer.scanner.validator.get_ffmpeg_capabilities_async",
+            new_callable=AsyncMock,
+            return_value=_FFMPEG,
+        )
+        self.addCleanup(patcher.stop)
+        patcher.start()
+        self.analyzer = AsyncMock()
+        self.validator = StreamValidator(max_workers=1, ts_analyzer=self.analyzer)
+
+    async def test_conclusive_analysis_skips_ffprobe(self) -> None:
+        self.analyzer.analyze.return_value = TSStreamInfo(
+            "h264", 1920, 1080, codec_audio="aac"
+        )
+        with patch("iptv_sniffer.scanner.validator.ffmpeg.probe") as mock_probe:
+            result = await self.validator.validate("http://example.com/live.ts")
+
+        mock_probe.assert_not_called()
+        self.assertTrue(result.is_valid)
+        self.assertEqual(result.resolution, "1920x1080")
+        self.assertEqual(result.codec_audio, "aac")
+
+    async def test_inconclusive_analysis_falls_back_to_ffprobe(self) -> None:
+        self.analyzer.analyze.return_value = None
+        with patch(
+            "iptv_sniffer.scanner.validator.ffmpeg.probe",
+            return_value=_make_probe_streams(),
+        ) as mock_probe:
+            result = await self.validator.validate("http://example.com/live.m3u8")
+
+        mock_probe.assert_called_once()
+        self.assertTrue(result.is_valid)
+
+    async def test_hls_urls_use_the_hls_validator(self) -> None:
+        hls_validator = AsyncMock()
+        hls_validator.check.return_value = HLSProbeResult(
+            is_valid=False,
+            failure=HLSFailure.UNREACHABLE,
+            error_message="HLS request failed",
+        )
+        validator = StreamValidator(
+            max_workers=1, ts_analyzer=self.analyzer, hls_validator=hls_validator
+        )
+
+        with patch("iptv_sniffer.scanner.validator.ffmpeg.probe") as mock_probe:
+            result = await validator.validate("https://cdn.example/live/index.m3u8")
+
+        mock_probe.assert_not_called()
+        self.analyzer.analyze.assert_not_called()
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.error_category, ErrorCategory.NETWORK_UNREACHABLE)
+
+    async def test_non_http_streams_are_not_analyzed(self) -> None:
+        with patch(
+            "iptv_sniffer.scanner.validator.ffmpeg.probe",
+            return_value=_make_probe_streams(),
+        ):
+            await self.validator.validate("udp://239.0.0.1:1234")
+
+        self.analyzer.analyze.assert_not_called()
+
+
+class AsyncBackendTestCase(unittest.IsolatedAsyncioTestCase):
+    """StreamValidator running ffprobe as an asyncio subprocess."""
+
+    def setUp(self) -> None:
+        patcher = patch(
+            "iptv_sniffer.scanner.validator.get_ffmpeg_capabilities_async",
+            new_callable=AsyncMock,
+            return_value=_FFMPEG,
+        )
+        self.addCleanup(patcher.stop)
+        patcher.start()
+        self.validator = StreamValidator(backend=ProbeBackend.ASYNC)
+
+    async def test_success_uses_protocol_options(self) -> None:
+        with patch(
+            "iptv_sniffer.scanner.validator.run_ffprobe",
+            new_callable=AsyncMock,
+            return_value=_make_probe_streams(),
+        ) as mock_probe:
+            result = await self.validator.validate("rtp://239.0.0.1:1234", timeout=5)
+
+        self.assertTrue(result.is_valid)
+        self.assertEqual(result.resolution, "1920x1080")
+        self.assertGreaterEqual(mock_probe.call_args.kwargs["timeout"], 20)
+        self.assertEqual(mock_probe.call_args.kwargs["options"]["probesize"], "10M")
+        self.assertEqual(mock_probe.call_args.kwargs["cmd"], "/usr/bin/ffprobe")
+
+    async def test_timeout_maps_to_timeout_category(self) -> None:
+        with patch(
+            "iptv_sniffer.scanner.validator.run_ffprobe",
+            new_callable=AsyncMock,
+            side_effect=asyncio.TimeoutError,
+        ):
+            result = await self.validator.validate("http://example.com/live")
+
+        self.assertEqual(result.error_category, ErrorCategory.TIMEOUT)
+
+    async def test_ffprobe_stderr_is_categorised(self) -> None:
+        with patch(
+            "iptv_sniffer.scanner.validator.run_ffprobe",
+            new_callable=AsyncMock,
+            side_effect=FFprobeError("failed", stderr=b"Connection refused"),
+        ):
+            result = await self.validator.validate("http://example.com/live")
+
+        self.assertEqual(result.error_category, ErrorCategory.NETWORK_UNREACHABLE)
+        self.assertIn("Connection refused", result.error_message or "")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import time
 import unittest
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from typing import List
+from unittest.mock import patch
 
 from iptv_sniffer.channel.models import Channel, ValidationStatus
-from iptv_sniffer.storage.json_repository import JSONChannelRepository
+from iptv_sniffer.storage.base import UpsertOutcome
+from iptv_sniffer.storage.json_repository import (
+    JSONChannelRepository,
+    StreamingJSONChannelRepository,
+)
 
 
 def _channel(name: str, url: str, **kwargs) -> Channel:
@@ -105,6 +112,53 @@ class TestJSONChannelRepository(unittest.IsolatedAsyncioTestCase):
         deleted_again = await self.repository.delete(channel.id)
         self.assertFalse(deleted_again)
 
+    async def test_add_many_inserts_and_merges_in_one_write(self) -> None:
+        existing = _channel("Existing", "http://example.com/a", group="News")
+        await self.repository.add(existing)
+
+        await self.repository.flush()
+
+        with patch.object(
+            self.repository,
+            "_write_channels_sync",
+            wraps=self.repository._write_channels_sync,
+        ) as write:
+            saved = await self.repository.add_many(
+                [
+                    _channel("Renamed", "HTTP://example.com/a", is_online=True),
+                    _channel("New", "http://example.com/b"),
+                ]
+            )
+            await self.repository.flush()
+
+        write.assert_called_once()
+        self.assertEqual([channel.name for channel in saved], ["Renamed", "New"])
+        self.assertEqual(saved[0].id, existing.id)
+        self.assertEqual(len(await self.repository.find_all()), 2)
+
+    async def test_add_many_merge_fields_preserve_other_metadata(self) -> None:
+        existing = _channel("Kept Name", "http://example.com/a", group="Sports")
+        await self.repository.add(existing)
+
+        await self.repository.add_many(
+            [
+                _channel(
+                    "example.com/a",
+                    "http://example.com/a",
+                    resolution="1920x1080",
+                    validation_status=ValidationStatus.ONLINE,
+                )
+            ],
+            merge_fields=("resolution", "validation_status"),
+        )
+
+        stored = await self.repository.get_by_id(existing.id)
+        assert stored is not None
+        self.assertEqual(stored.name, "Kept Name")
+        self.assertEqual(stored.group, "Sports")
+        self.assertEqual(stored.resolution, "1920x1080")
+        self.assertEqual(stored.validation_status, ValidationStatus.ONLINE)
+
     async def test_get_by_id_returns_none_for_missing(self) -> None:
         result = await self.repository.get_by_id("missing-id")
         self.assertIsNone(result)
@@ -122,6 +176,7 @@ class TestJSONChannelRepository(unittest.IsolatedAsyncioTestCase):
     async def test_repository_survives_recreation(self) -> None:
         channel = _channel("Persisted", "http://example.com/persist")
         await self.repository.add(channel)
+        await self.repository.flush()
 
         repo_again = JSONChannelRepository(self.storage_path)
         found = await repo_again.get_by_id(channel.id)
@@ -157,12 +212,276 @@ class TestJSONChannelRepository(unittest.IsolatedAsyncioTestCase):
             ensure_ascii=False,
         )
         self.storage_path.write_text(malformed_payload, encoding="utf-8")
+        repository = JSONChannelRepository(self.storage_path)
 
-        channels = await self.repository.find_all({"manually_edited": False})
+        channels = await repository.find_all({"manually_edited": False})
 
         self.assertEqual(len(channels), 1)
         self.assertEqual(channels[0].id, "custom-id")
 
+    async def test_file_is_parsed_once(self) -> None:
+        await self.repository.add(_channel("A", "http://example.com/a"))
+        repository = JSONChannelRepository(self.storage_path)
+        await self.repository.flush()
+
+        with patch.object(
+            repository,
+            "_read_channels_sync",
+            wraps=repository._read_channels_sync,
+        ) as read:
+            await repository.find_all()
+            await repository.get_by_url("http://example.com/a")
+            await repository.find_all({"group": "News"})
+
+        read.assert_called_once()
+
+    async def test_mutations_are_coalesced_into_one_write(self) -> None:
+        with patch.object(
+            self.repository,
+            "_write_channels_sync",
+            wraps=self.repository._write_channels_sync,
+        ) as write:
+            first = await self.repository.add(_channel("A", "http://example.com/a"))
+            await self.repository.add(_channel("B", "http://example.com/b"))
+            await self.repository.delete(first.id)
+            write.assert_not_called()
+            self.assertTrue(self.repository.has_pending_writes)
+
+            await self.repository.close()
+
+        write.assert_called_once()
+        self.assertFalse(self.repository.has_pending_writes)
+        payload = json.loads(self.storage_path.read_text(encoding="utf-8"))
+        self.assertEqual([entry["name"] for entry in payload], ["B"])
+
+    async def test_pending_writes_flush_after_delay(self) -> None:
+        repository = JSONChannelRepository(self.storage_path, flush_delay=0.01)
+        await repository.add(_channel("A", "http://example.com/a"))
+
+        for _ in range(100):
+            if not repository.has_pending_writes:
+                break
+            await asyncio.sleep(0.01)
+
+        payload = json.loads(self.storage_path.read_text(encoding="utf-8"))
+        self.assertEqual([entry["name"] for entry in payload], ["A"])
+
+    async def test_changes_during_a_scheduled_write_are_flushed(self) -> None:
+        repository = JSONChannelRepository(self.storage_path, flush_delay=0.01)
+        write = repository._write_channels_sync
+        writing = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def slow_write(*args, **kwargs):
+            loop.call_soon_threadsafe(writing.set)
+            time.sleep(0.05)
+            return write(*args, **kwargs)
+
+        with patch.object(repository, "_write_channels_sync", side_effect=slow_write):
+            await repository.add(_channel("A", "http://example.com/a"))
+            await asyncio.wait_for(writing.wait(), timeout=1)
+            await repository.add(_channel("B", "http://example.com/b"))
+
+            for _ in range(100):
+                if not repository.has_pending_writes:
+                    break
+                await asyncio.sleep(0.01)
+
+        self.assertFalse(repository.has_pending_writes)
+        payload = json.loads(self.storage_path.read_text(encoding="utf-8"))
+        self.assertEqual([entry["name"] for entry in payload], ["A", "B"])
+
+    async def test_zero_flush_delay_writes_through(self) -> None:
+        repository = JSONChannelRepository(self.storage_path, flush_delay=0)
+
+        await repository.add(_channel("A", "http://example.com/a"))
+
+        self.assertFalse(repository.has_pending_writes)
+        payload = json.loads(self.storage_path.read_text(encoding="utf-8"))
+        self.assertEqual(len(payload), 1)
+
+    async def test_indexed_filters_follow_updates_in_file_order(self) -> None:
+        first = await self.repository.add(
+            _channel("First", "http://example.com/1", group="Sports")
+        )
+        await self.repository.add(
+            _channel("Second", "http://example.com/2", group="News")
+        )
+        await self.repository.add(first.model_copy(update={"group": "News"}))
+
+        news = await self.repository.find_all({"group": "News"})
+        sports = await self.repository.find_all({"group": "Sports"})
+        online = await self.repository.find_all({"group": "News", "is_online": True})
+
+        self.assertEqual([c.name for c in news], ["First", "Second"])
+        self.assertEqual(sports, [])
+        self.assertEqual(online, [])
+
+    async def test_upsert_many_reports_per_item_outcomes(self) -> None:
+        existing = await self.repository.add(_channel("A", "http://example.com/a"))
+        clashing = _channel("Clash", "http://example.com/other", id=existing.id)
+
+        results = await self.repository.upsert_many(
+            [
+                _channel("A renamed", "HTTP://example.com/a"),
+                _channel("B", "http://example.com/b"),
+                _channel("B again", "http://example.com/b"),
+                clashing,
+            ]
+        )
+
+        self.assertEqual(
+            [result.outcome for result in results],
+            [
+                UpsertOutcome.UPDATED,
+                UpsertOutcome.CREATED,
+                UpsertOutcome.UPDATED,
+                UpsertOutcome.FAILED,
+            ],
+        )
+        self.assertEqual(results[0].channel.id, existing.id)
+        self.assertEqual(results[2].channel.id, results[1].channel.id)
+        self.assertIsNone(results[3].channel)
+        self.assertIn(existing.id, results[3].error)
+        stored = await self.repository.find_all()
+        self.assertEqual([c.name for c in stored], ["A renamed", "B again"])
+
+    async def test_update_where_changes_matching_channels(self) -> None:
+        await self.repository.add_many(
+            [
+                _channel("A", "http://example.com/a", group="News"),
+                _channel("B", "http://example.com/b", group="News", is_online=True),
+                _channel("C", "http://example.com/c", group="Sports"),
+            ]
+        )
+
+        updated = await self.repository.update_where(
+            {"group": "News", "is_online": False},
+            {"is_online": True, "validation_status": ValidationStatus.ONLINE},
+        )
+
+        self.assertEqual(updated, 1)
+        online = await self.repository.find_all({"is_online": True})
+        self.assertEqual([c.name for c in online], ["A", "B"])
+        a = await self.repository.get_by_url("http://example.com/a")
+        self.assertEqual(a.validation_status, ValidationStatus.ONLINE)
+        with self.assertRaises(ValueError):
+            await self.repository.update_where({}, {"url": "http://example.com/x"})
+
+    async def test_reassign_group_moves_all_sources(self) -> None:
+        await self.repository.add_many(
+            [
+                _channel("A", "http://example.com/a", group="Old"),
+                _channel("B", "http://example.com/b"),
+                _channel("C", "http://example.com/c", group="Other"),
+                _channel("D", "http://example.com/d", group="Keep"),
+            ]
+        )
+
+        moved = await self.repository.reassign_group(["Old", None, "Other"], "New")
+
+        self.assertEqual(moved, 3)
+        self.assertEqual(
+            [c.name for c in await self.repository.find_all({"group": "New"})],
+            ["A", "B", "C"],
+        )
+        self.assertEqual(await self.repository.find_all({"group": "Old"}), [])
+        self.assertEqual(await self.repository.reassign_group(["Missing"], None), 0)
+        uncategorized = await self.repository.reassign_group(["Keep"], None)
+        d = await self.repository.get_by_url("http://example.com/d")
+        self.assertEqual(uncategorized, 1)
+        self.assertIsNone(d.group)
+
+
+class TestStreamingJSONChannelRepository(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for the incrementally decoded JSON repository."""
+
+    def setUp(self) -> None:
+        self._temp_dir = TemporaryDirectory()
+        self.storage_path = Path(self._temp_dir.name) / "channels.json"
+        self.repository = StreamingJSONChannelRepository(self.storage_path)
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    async def test_crud_round_trip_is_written_immediately(self) -> None:
+        channel = await self.repository.add(
+            _channel("A", "http://example.com/a", group="News")
+        )
+        merged = await self.repository.add(_channel("A2", "HTTP://example.com/a"))
+
+        reopened = JSONChannelRepository(self.storage_path)
+        self.assertEqual(merged.id, channel.id)
+        self.assertEqual((await reopened.get_by_id(channel.id)).name, "A2")
+        self.assertEqual(
+            (await self.repository.get_by_url("http://EXAMPLE.com/a")).id, channel.id
+        )
+        self.assertTrue(await self.repository.delete(channel.id))
+        self.assertFalse(await self.repository.delete(channel.id))
+        self.assertEqual(await self.repository.find_all(), [])
+
+    async def test_upsert_many_reports_outcomes_in_one_pass(self) -> None:
+        existing = await self.repository.add(_channel("A", "http://example.com/a"))
+
+        with patch.object(
+            self.repository,
+            "_write_channels_sync",
+            wraps=self.repository._write_channels_sync,
+        ) as write:
+            results = await self.repository.upsert_many(
+                [
+                    _channel("B", "http://example.com/b"),
+                    _channel("A renamed", "http://example.com/a"),
+                    _channel("B again", "http://example.com/b"),
+                    _channel("Clash", "http://example.com/c", id=existing.id),
+                ]
+            )
+
+        write.assert_called_once()
+        self.assertEqual(
+            [result.outcome for result in results],
+            [
+                UpsertOutcome.CREATED,
+                UpsertOutcome.UPDATED,
+                UpsertOutcome.UPDATED,
+                UpsertOutcome.FAILED,
+            ],
+        )
+        stored = await self.repository.find_all()
+        self.assertEqual([c.name for c in stored], ["A renamed", "B again"])
+
+    async def test_filters_bulk_updates_and_lazy_iteration(self) -> None:
+        await self.repository.add_many(
+            [
+                _channel("A", "http://example.com/a", group="News"),
+                _channel("B", "http://example.com/b", group="Sports"),
+                _channel("C", "http://example.com/c", group="News", is_online=True),
+            ]
+        )
+
+        moved = await self.repository.reassign_group(["News"], "Info")
+        updated = await self.repository.update_where(
+            {"group": "Info", "is_online": False}, {"resolution": "720p"}
+        )
+        info = [c.name async for c in self.repository.iter_all({"group": "Info"})]
+        hd = await self.repository.find_all({"resolution": "720p"})
+
+        self.assertEqual((moved, updated), (2, 1))
+        self.assertEqual(info, ["A", "C"])
+        self.assertEqual([c.name for c in hd], ["A"])
+
+    async def test_unchanged_file_is_not_rewritten(self) -> None:
+        await self.repository.add(_channel("A", "http://example.com/a"))
+        before = self.storage_path.stat().st_mtime_ns
+
+        with patch.object(Path, "replace") as replace:
+            self.assertEqual(await self.repository.reassign_group(["None"], "X"), 0)
+            self.assertFalse(await self.repository.delete("missing"))
+
+        replace.assert_not_called()
+        self.assertEqual(self.storage_path.stat().st_mtime_ns, before)
+        self.assertEqual(list(Path(self._temp_dir.name).iterdir()), [self.storage_path])
+
 
 if __name__ == "__main__":
     unittest.main()
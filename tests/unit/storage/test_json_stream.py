@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import io
+import json
+import unittest
+
+from iptv_sniffer.storage.json_stream import iter_json_array, write_json_array
+
+_PAYLOAD = [
+    {"id": index, "name": "Kanal ü " * (index % 5), "tags": [], "ok": None}
+    for index in range(50)
+] + [12345678901234567890, 1.5e3, True, "tail", [1, [2, {}]]]
+
+
+class TestIterJSONArray(unittest.TestCase):
+    def test_yields_elements_across_chunk_boundaries(self) -> None:
+        for text in (json.dumps(_PAYLOAD), json.dumps(_PAYLOAD, indent=2)):
+            for chunk_size in (1, 3, 17, 4096):
+                with self.subTest(chunk_size=chunk_size):
+                    items = iter_json_array(io.StringIO(text), chunk_size=chunk_size)
+                    self.assertEqual(list(items), _PAYLOAD)
+
+    def test_empty_inputs(self) -> None:
+        self.assertEqual(list(iter_json_array(io.StringIO(""))), [])
+        self.assertEqual(list(iter_json_array(io.StringIO("  [ ]\n"))), [])
+
+    def test_elements_are_decoded_lazily(self) -> None:
+        stream = io.StringIO(json.dumps(_PAYLOAD))
+        items = iter_json_array(stream, chunk_size=64)
+
+        self.assertEqual(next(items), _PAYLOAD[0])
+        self.assertLess(stream.tell(), len(stream.getvalue()))
+
+    def test_malformed_input_raises_decode_error(self) -> None:
+        for text in ("{}", "not json", "[1,]", "[1 2]", "[1", "[1] x"):
+            with self.subTest(text=text):
+                with self.assertRaises(json.JSONDecodeError):
+                    list(iter_json_array(io.StringIO(text), chunk_size=2))
+
+    def test_corrupt_element_raises_without_reading_ahead(self) -> None:
+        for corrupt in ('{"a": 1 x}', '{"a": 1}x', '{"a": nope}'):
+            with self.subTest(corrupt=corrupt):
+                text = "[" + corrupt + ", " + ", ".join(['"padding"'] * 10000) + "]"
+                stream = io.StringIO(text)
+
+                with self.assertRaises(json.JSONDecodeError):
+                    list(iter_json_array(stream, chunk_size=64))
+                self.assertLessEqual(stream.tell(), 128)
+
+    def test_elements_before_an_error_are_yielded(self) -> None:
+        items = iter_json_array(io.StringIO('[{"a": 1}, {"b": '))
+
+        self.assertEqual(next(items), {"a": 1})
+        with self.assertRaises(json.JSONDecodeError):
+            next(items)
+
+
+class TestWriteJSONArray(unittest.TestCase):
+    def test_output_matches_json_dumps(self) -> None:
+        for items in ([], [{}], _PAYLOAD):
+            with self.subTest(count=len(items)):
+                stream = io.StringIO()
+
+                written = write_json_array(stream, iter(items))
+
+                self.assertEqual(written, len(items))
+                self.assertEqual(
+                    stream.getvalue(),
+                    json.dumps(items, ensure_ascii=False, indent=2),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from iptv_sniffer.channel.models import Channel, ValidationStatus
+from iptv_sniffer.scanner.validator import ErrorCategory, StreamValidationResult
+from iptv_sniffer.storage.json_repository import JSONChannelRepository
+from iptv_sniffer.storage.result_writer import ScanResultWriter
+
+
+def _valid(url: str) -> StreamValidationResult:
+    return StreamValidationResult(
+        url=url,
+        protocol="http",
+        is_valid=True,
+        resolution="1280x720",
+        codec_video="h264",
+        codec_audio="aac",
+    )
+
+
+class ScanResultWriterTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self._temp_dir = TemporaryDirectory()
+        self.repository = JSONChannelRepository(
+            Path(self._temp_dir.name) / "channels.json"
+        )
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    async def test_results_are_written_in_batches(self) -> None:
+        writer = ScanResultWriter(self.repository, batch_size=3, max_age=60)
+
+        with patch.object(
+            self.repository, "add_many", wraps=self.repository.add_many
+        ) as add_many:
+            for index in range(7):
+                await writer.add(_valid(f"http://10.0.0.{index}/live"))
+            self.assertEqual(add_many.await_count, 2)
+            await writer.flush()
+
+        self.assertEqual(add_many.await_count, 3)
+        self.assertEqual(writer.written, 7)
+        self.assertEqual(len(await self.repository.find_all()), 7)
+
+    async def test_stale_batch_is_flushed_on_next_result(self) -> None:
+        writer = ScanResultWriter(self.repository, batch_size=100, max_age=0)
+
+        await writer.add(_valid("http://10.0.0.1/live"))
+
+        self.assertEqual(writer.batches, 1)
+        self.assertEqual(len(await self.repository.find_all()), 1)
+
+    async def test_batch_age_is_checked_on_skipped_results(self) -> None:
+        writer = ScanResultWriter(self.repository, batch_size=100, max_age=5)
+        failed = StreamValidationResult(
+            url="http://10.0.0.9/live", protocol="http", is_valid=False
+        )
+
+        with patch(
+            "iptv_sniffer.storage.result_writer.time.monotonic", return_value=100.0
+        ):
+            await writer.add(_valid("http://10.0.0.1/live"))
+            await writer.add(failed)
+        self.assertEqual(writer.batches, 0)
+        with patch(
+            "iptv_sniffer.storage.result_writer.time.monotonic", return_value=106.0
+        ):
+            await writer.add(failed)
+
+        self.assertEqual(writer.batches, 1)
+        self.assertEqual(writer.written, 1)
+
+    async def test_durable_flush_reaches_the_file(self) -> None:
+        path = Path(self._temp_dir.name) / "delayed.json"
+        repository = JSONChannelRepository(path, flush_delay=60)
+        writer = ScanResultWriter(repository)
+
+        await writer.add(_valid("http://10.0.0.1/live"))
+        await writer.flush(durable=True)
+
+        self.assertFalse(repository.has_pending_writes)
+        reopened = JSONChannelRepository(path)
+        self.assertEqual(len(await reopened.find_all()), 1)
+        await repository.close()
+
+    async def test_channel_carries_validation_metadata(self) -> None:
+        writer = ScanResultWriter(self.repository)
+        result = _valid("http://10.0.0.1/live")
+
+        await writer.add(result)
+        await writer.flush()
+
+        stored = await self.repository.get_by_url(result.url)
+        assert stored is not None
+        self.assertEqual(stored.name, "10.0.0.1/live")
+        self.assertEqual(stored.resolution, "1280x720")
+        self.assertEqual(stored.codec_video, "h264")
+        self.assertEqual(stored.codec_audio, "aac")
+        self.assertTrue(stored.is_online)
+        self.assertEqual(stored.validation_status, ValidationStatus.ONLINE)
+        self.assertEqual(stored.last_validated, result.timestamp)
+
+    async def test_rescan_keeps_user_metadata(self) -> None:
+        edited = Channel(
+            name="My Channel",
+            url="http://10.0.0.1/live",
+            group="Favourites",
+            manually_edited=True,
+        )
+        await self.repository.add(edited)
+        writer = ScanResultWriter(self.repository)
+
+        await writer.add(_valid(edited.url))
+        await writer.flush()
+
+        stored = await self.repository.get_by_id(edited.id)
+        assert stored is not None
+        self.assertEqual(stored.name, "My Channel")
+        self.assertEqual(stored.group, "Favourites")
+        self.assertTrue(stored.is_online)
+
+    async def test_invalid_results_are_skipped_by_default(self) -> None:
+        writer = ScanResultWriter(self.repository)
+        failed = StreamValidationResult(
+            url="http://10.0.0.9/live",
+            protocol="http",
+            is_valid=False,
+            error_category=ErrorCategory.TIMEOUT,
+        )
+
+        await writer.add(failed)
+        await writer.flush()
+
+        self.assertEqual(await self.repository.find_all(), [])
+
+    async def test_invalid_results_only_update_status_fields(self) -> None:
+        await self.repository.add(
+            Channel(
+                name="Known",
+                url="http://10.0.0.1/live",
+                resolution="1920x1080",
+                is_online=True,
+                validation_status=ValidationStatus.ONLINE,
+            )
+        )
+        writer = ScanResultWriter(self.repository, include_invalid=True)
+
+        await writer.add(
+            StreamValidationResult(
+                url="http://10.0.0.1/live",
+                protocol="http",
+                is_valid=False,
+                error_category=ErrorCategory.TIMEOUT,
+            )
+        )
+        await writer.add(_valid("http://10.0.0.2/live"))
+        await writer.flush()
+
+        offline = await self.repository.get_by_url("http://10.0.0.1/live")
+        assert offline is not None
+        self.assertFalse(offline.is_online)
+        self.assertEqual(offline.validation_status, ValidationStatus.OFFLINE)
+        self.assertEqual(offline.resolution, "1920x1080")
+        self.assertEqual(writer.written, 2)
+        self.assertEqual(writer.batches, 1)
+
+    def test_invalid_batch_size_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            ScanResultWriter(self.repository, batch_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
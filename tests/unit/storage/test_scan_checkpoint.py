@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+import os
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from iptv_sniffer.scanner.validator import ErrorCategory, StreamValidationResult
+from iptv_sniffer.storage.scan_checkpoint import (
+    CheckpointNotFoundError,
+    ScanCheckpointStore,
+)
+
+
+def _result(url: str, is_valid: bool = True) -> StreamValidationResult:
+    return StreamValidationResult(
+        url=url,
+        protocol="udp",
+        is_valid=is_valid,
+        error_category=None if is_valid else ErrorCategory.TIMEOUT,
+    )
+
+
+class ScanCheckpointStoreTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self._temp_dir = TemporaryDirectory()
+        self.directory = Path(self._temp_dir.name) / "scans"
+        self.store = ScanCheckpointStore(self.directory, interval=0)
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    async def test_round_trip_restores_progress(self) -> None:
+        request = {"mode": "multicast", "preset": "beijing-unicom"}
+        writer = self.store.create("scan-1", request, total=3)
+        writer.record(_result("udp://239.3.1.1:8000"))
+        writer.record(_result("udp://239.3.1.2:8000", is_valid=False))
+        await writer.flush()
+
+        checkpoint = self.store.load("scan-1")
+
+        self.assertEqual(checkpoint.request, request)
+        self.assertEqual(checkpoint.total, 3)
+        self.assertEqual(
+            checkpoint.completed_urls,
+            {"udp://239.3.1.1:8000", "udp://239.3.1.2:8000"},
+        )
+        self.assertEqual((checkpoint.valid, checkpoint.invalid), (1, 1))
+        self.assertIsNone(checkpoint.status)
+
+    async def test_flush_appends_without_rewriting(self) -> None:
+        writer = self.store.create("scan-2", {}, total=2)
+        path = writer.path
+        header = path.read_text(encoding="utf-8")
+
+        writer.record(_result("udp://239.3.1.1:8000"))
+        await writer.flush()
+        writer.record(_result("udp://239.3.1.2:8000"))
+        writer.mark("completed")
+        await writer.flush()
+
+        contents = path.read_text(encoding="utf-8")
+        self.assertTrue(contents.startswith(header))
+        records = [json.loads(line) for line in contents.splitlines()]
+        self.assertEqual(
+            [record["type"] for record in records],
+            ["start", "result", "result", "status"],
+        )
+        self.assertEqual(self.store.load("scan-2").status, "completed")
+
+    async def test_flush_if_due_respects_interval(self) -> None:
+        store = ScanCheckpointStore(self.directory, interval=3600)
+        writer = store.create("scan-3", {}, total=1)
+        writer.record(_result("udp://239.3.1.1:8000"))
+
+        await writer.flush_if_due()
+
+        self.assertEqual(store.load("scan-3").completed, 0)
+        writer.flush_sync()
+        self.assertEqual(store.load("scan-3").completed, 1)
+
+    async def test_truncated_tail_and_resume_marker(self) -> None:
+        writer = self.store.create("scan-4", {}, total=2)
+        writer.record(_result("udp://239.3.1.1:8000"))
+        writer.mark("cancelled")
+        await writer.flush()
+        with writer.path.open("a", encoding="utf-8") as handle:
+            handle.write('{"type": "result", "url": "udp://239')
+
+        self.assertEqual(self.store.load("scan-4").status, "cancelled")
+
+        resumed = self.store.reopen("scan-4")
+        await resumed.flush()
+        checkpoint = self.store.load("scan-4")
+        self.assertIsNone(checkpoint.status)
+        self.assertEqual(checkpoint.completed, 1)
+
+    def test_discard_removes_the_checkpoint(self) -> None:
+        self.store.create("scan-5", {}, total=1)
+
+        self.store.discard("scan-5")
+        self.store.discard("scan-5")
+
+        with self.assertRaises(CheckpointNotFoundError):
+            self.store.load("scan-5")
+
+    def test_only_the_newest_checkpoints_are_kept(self) -> None:
+        store = ScanCheckpointStore(self.directory, interval=0, keep=2)
+        for index in range(4):
+            path = store.create(f"scan-{index}", {}, total=1).path
+            os.utime(path, (1000 + index, 1000 + index))
+
+        store.create("scan-4", {}, total=1)
+
+        self.assertEqual(
+            sorted(path.name for path in self.directory.iterdir()),
+            ["scan-3.jsonl", "scan-4.jsonl"],
+        )
+
+    def test_missing_or_unsafe_scan_ids_raise(self) -> None:
+        with self.assertRaises(CheckpointNotFoundError):
+            self.store.load("missing")
+        with self.assertRaises(CheckpointNotFoundError):
+            self.store.load("../etc/passwd")
+        with self.assertRaises(CheckpointNotFoundError):
+            self.store.reopen("missing")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,263 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from iptv_sniffer.channel.models import Channel, ValidationStatus
+from iptv_sniffer.storage.base import UpsertOutcome
+from iptv_sniffer.storage.sqlite_repository import SQLiteChannelRepository
+
+
+def _channel(name: str, url: str, **kwargs) -> Channel:
+    return Channel(name=name, url=url, **kwargs)
+
+
+class TestSQLiteChannelRepository(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for the SQLite-backed channel repository."""
+
+    def setUp(self) -> None:
+        self._temp_dir = TemporaryDirectory()
+        self.root = Path(self._temp_dir.name)
+        self.db_path = self.root / "channels.db"
+        self.repository = SQLiteChannelRepository(self.db_path)
+
+    def tearDown(self) -> None:
+        self.repository.close()
+        self._temp_dir.cleanup()
+
+    async def test_add_and_lookup_by_id_and_url(self) -> None:
+        channel = _channel("Test", "http://example.com/stream")
+
+        await self.repository.add(channel)
+
+        by_id = await self.repository.get_by_id(channel.id)
+        by_url = await self.repository.get_by_url(" HTTP://EXAMPLE.com/stream ")
+        self.assertEqual(by_id, channel)
+        self.assertEqual(by_url, channel)
+        self.assertIsNone(await self.repository.get_by_id("missing"))
+
+    async def test_add_merges_existing_url_and_keeps_manual_flag(self) -> None:
+        original = _channel("Original", "http://example.com/live", manually_edited=True)
+        updated = original.model_copy(
+            update={"name": "Updated", "group": "News", "manually_edited": False}
+        )
+        duplicate = _channel("Duplicate", "http://EXAMPLE.com/live")
+
+        await self.repository.add(original)
+        await self.repository.add(updated)
+        merged = await self.repository.add(duplicate)
+
+        self.assertEqual(merged.id, original.id)
+        self.assertEqual(merged.created_at, original.created_at)
+        self.assertTrue(merged.manually_edited)
+        self.assertEqual(len(await self.repository.find_all()), 1)
+
+    async def test_add_many_updates_only_merge_fields(self) -> None:
+        existing = _channel("Edited Name", "http://example.com/a", group="Mine")
+        await self.repository.add(existing)
+        rescanned = _channel(
+            "a",
+            "http://example.com/a",
+            resolution="1080p",
+            is_online=True,
+            validation_status=ValidationStatus.ONLINE,
+        )
+        fresh = _channel("b", "http://example.com/b")
+
+        saved = await self.repository.add_many(
+            [rescanned, fresh],
+            merge_fields=("resolution", "is_online", "validation_status"),
+        )
+
+        self.assertEqual(saved[0].id, existing.id)
+        self.assertEqual(saved[0].name, "Edited Name")
+        self.assertEqual(saved[0].group, "Mine")
+        self.assertEqual(saved[0].resolution, "1080p")
+        self.assertEqual(saved[1].id, fresh.id)
+        stored = await self.repository.find_all()
+        self.assertEqual([channel.url for channel in stored], [existing.url, fresh.url])
+
+    async def test_find_all_applies_indexed_filters(self) -> None:
+        await self.repository.add_many(
+            [
+                _channel(
+                    "HD News",
+                    "http://example.com/1",
+                    group="News",
+                    resolution="1080p",
+                    is_online=True,
+                    validation_status=ValidationStatus.ONLINE,
+                ),
+                _channel(
+                    "SD News",
+                    "http://example.com/2",
+                    group="News",
+                    resolution="576p",
+                    validation_status=ValidationStatus.OFFLINE,
+                ),
+                _channel("Sports", "http://example.com/3", group="Sports"),
+            ]
+        )
+
+        news = await self.repository.find_all({"group": "News"})
+        online = await self.repository.find_all({"is_online": True})
+        hd = await self.repository.find_all({"group": "News", "resolution": "1080p"})
+        offline = await self.repository.find_all(
+            {"validation_status": ValidationStatus.OFFLINE, "group": None}
+        )
+
+        self.assertEqual([c.name for c in news], ["HD News", "SD News"])
+        self.assertEqual([c.name for c in online], ["HD News"])
+        self.assertEqual([c.name for c in hd], ["HD News"])
+        self.assertEqual([c.name for c in offline], ["SD News"])
+
+    async def test_delete_removes_channel(self) -> None:
+        channel = await self.repository.add(_channel("A", "http://example.com/a"))
+
+        self.assertTrue(await self.repository.delete(channel.id))
+        self.assertFalse(await self.repository.delete(channel.id))
+        self.assertEqual(await self.repository.find_all(), [])
+
+    async def test_database_uses_wal_and_indexes(self) -> None:
+        await self.repository.find_all()
+
+        with sqlite3.connect(self.db_path) as connection:
+            mode = connection.execute("PRAGMA journal_mode").fetchone()[0]
+            indexes = {
+                row[1] for row in connection.execute("PRAGMA index_list(channels)")
+            }
+        self.assertEqual(mode, "wal")
+        self.assertTrue(
+            {
+                "idx_channels_group",
+                "idx_channels_online",
+                "idx_channels_resolution",
+            }.issubset(indexes)
+        )
+
+    async def test_migrates_json_repository_once(self) -> None:
+        json_path = self.root / "channels.json"
+        legacy = [
+            _channel("A", "http://example.com/a", group="News"),
+            _channel("B", "http://example.com/b"),
+        ]
+        json_path.write_text(
+            json.dumps([channel.model_dump(mode="json") for channel in legacy]),
+            encoding="utf-8",
+        )
+        migrated_path = self.root / "migrated.db"
+        repository = SQLiteChannelRepository(migrated_path, migrate_from=json_path)
+        try:
+            stored = await repository.find_all()
+            await repository.delete(legacy[0].id)
+        finally:
+            repository.close()
+
+        self.assertEqual([channel.id for channel in stored], [c.id for c in legacy])
+        self.assertTrue(json_path.exists())
+
+        reopened = SQLiteChannelRepository(migrated_path, migrate_from=json_path)
+        try:
+            remaining = await reopened.find_all()
+        finally:
+            reopened.close()
+        self.assertEqual([channel.id for channel in remaining], [legacy[1].id])
+
+    async def test_upsert_many_reports_per_item_outcomes(self) -> None:
+        existing = await self.repository.add(_channel("A", "http://example.com/a"))
+        clashing = _channel("Clash", "http://example.com/other", id=existing.id)
+
+        results = await self.repository.upsert_many(
+            [
+                _channel("A renamed", "HTTP://example.com/a"),
+                _channel("B", "http://example.com/b"),
+                _channel("B again", "http://example.com/b"),
+                clashing,
+            ]
+        )
+
+        self.assertEqual(
+            [result.outcome for result in results],
+            [
+                UpsertOutcome.UPDATED,
+                UpsertOutcome.CREATED,
+                UpsertOutcome.UPDATED,
+                UpsertOutcome.FAILED,
+            ],
+        )
+        self.assertEqual(results[0].channel.id, existing.id)
+        self.assertEqual(results[2].channel.id, results[1].channel.id)
+        self.assertIsNone(results[3].channel)
+        self.assertIn(existing.id, results[3].error)
+        stored = await self.repository.find_all()
+        self.assertEqual([c.name for c in stored], ["A renamed", "B again"])
+
+    async def test_update_where_changes_matching_channels(self) -> None:
+        await self.repository.add_many(
+            [
+                _channel("A", "http://example.com/a", group="News"),
+                _channel("B", "http://example.com/b", group="News", is_online=True),
+                _channel("C", "http://example.com/c", group="Sports"),
+            ]
+        )
+
+        updated = await self.repository.update_where(
+            {"group": "News", "is_online": False},
+            {"is_online": True, "validation_status": ValidationStatus.ONLINE},
+        )
+
+        self.assertEqual(updated, 1)
+        online = await self.repository.find_all({"is_online": True})
+        self.assertEqual([c.name for c in online], ["A", "B"])
+        a = await self.repository.get_by_url("http://example.com/a")
+        self.assertEqual(a.validation_status, ValidationStatus.ONLINE)
+        with self.assertRaises(ValueError):
+            await self.repository.update_where({}, {"url": "http://example.com/x"})
+
+    async def test_reassign_group_moves_all_sources(self) -> None:
+        await self.repository.add_many(
+            [
+                _channel("A", "http://example.com/a", group="Old"),
+                _channel("B", "http://example.com/b"),
+                _channel("C", "http://example.com/c", group="Other"),
+                _channel("D", "http://example.com/d", group="Keep"),
+            ]
+        )
+
+        moved = await self.repository.reassign_group(["Old", None, "Other"], "New")
+
+        self.assertEqual(moved, 3)
+        self.assertEqual(
+            [c.name for c in await self.repository.find_all({"group": "New"})],
+            ["A", "B", "C"],
+        )
+        self.assertEqual(await self.repository.find_all({"group": "Old"}), [])
+        self.assertEqual(await self.repository.reassign_group(["Missing"], None), 0)
+        uncategorized = await self.repository.reassign_group(["Keep"], None)
+        d = await self.repository.get_by_url("http://example.com/d")
+        self.assertEqual(uncategorized, 1)
+        self.assertIsNone(d.group)
+
+    async def test_iter_all_pages_through_matches(self) -> None:
+        await self.repository.add_many(
+            [
+                _channel(f"C{index}", f"http://example.com/{index}", group="G")
+                for index in range(5)
+            ]
+            + [_channel("Other", "http://example.com/other")]
+        )
+
+        with patch("iptv_sniffer.storage.sqlite_repository._PAGE_SIZE", 2):
+            names = [c.name async for c in self.repository.iter_all({"group": "G"})]
+            everything = [c async for c in self.repository.iter_all()]
+
+        self.assertEqual(names, [f"C{index}" for index in range(5)])
+        self.assertEqual(len(everything), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
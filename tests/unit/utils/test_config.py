@@ -154,6 +154,18 @@ class TestAppConfig(unittest.TestCase):
         with self.assertRaises(ValidationError):
             AppConfig(data_dir=5.5)  # type: ignore[arg-type]
 
+    def test_config_validates_host_rate_limits(self) -> None:
+        """Per-host and per-subnet rates are non-negative and bursts positive."""
+        config = AppConfig()
+        self.assertGreater(config.host_rate_limit, 0)
+        self.assertGreater(config.subnet_rate_limit, 0)
+
+        self.assertEqual(AppConfig(host_rate_limit=0).host_rate_limit, 0)
+        with self.assertRaises(ValidationError):
+            AppConfig(host_rate_limit=-1)
+        with self.assertRaises(ValidationError):
+            AppConfig(subnet_burst=0)
+
     def test_config_retry_backoff_must_be_positive(self) -> None:
         """Retry backoff must be strictly greater than zero."""
         with self.assertRaises(ValidationError):
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import subprocess
+import threading
+import time
 import unittest
 from unittest.mock import patch
 
@@ -122,5 +125,127 @@ class TestFFmpegUtils(unittest.TestCase):
             self.assertIn(instructions, str(excinfo.exception))
 
 
+_PROTOCOLS_OUTPUT = """Supported file protocols:
+Input:
+  http
+  rtp
+  udp
+Output:
+  file
+"""
+
+_DECODERS_OUTPUT = """Decoders:
+ V..... = Video
+ ------
+ V....D h264                 H.264 / AVC
+ A....D aac                  AAC (Advanced Audio Coding)
+"""
+
+
+class TestFFmpegCapabilities(unittest.TestCase):
+    """Cached FFmpeg capability detection."""
+
+    def setUp(self) -> None:
+        ffmpeg_utils.invalidate_ffmpeg_capabilities()
+        self.addCleanup(ffmpeg_utils.invalidate_ffmpeg_capabilities)
+
+    @staticmethod
+    def _fake_run(args, **_kwargs) -> subprocess.CompletedProcess:
+        outputs = {
+            "-version": "ffmpeg version 6.1\nbuilt with gcc\n",
+            "-protocols": _PROTOCOLS_OUTPUT,
+            "-decoders": _DECODERS_OUTPUT,
+        }
+        return subprocess.CompletedProcess(args, 0, stdout=outputs[args[-1]])
+
+    def test_detection_parses_version_protocols_and_decoders(self) -> None:
+        with (
+            patch("shutil.which", side_effect=lambda name: f"/usr/bin/{name}"),
+            patch("subprocess.run", side_effect=self._fake_run),
+        ):
+            capabilities = ffmpeg_utils.detect_ffmpeg_capabilities()
+
+        self.assertTrue(capabilities.available)
+        self.assertEqual(capabilities.ffprobe_path, "/usr/bin/ffprobe")
+        self.assertEqual(capabilities.version, "ffmpeg version 6.1")
+        self.assertEqual(capabilities.protocols, {"http", "rtp", "udp"})
+        self.assertEqual(capabilities.decoders, {"h264", "aac"})
+        self.assertTrue(capabilities.supports_protocol("UDP"))
+        self.assertFalse(capabilities.supports_protocol("file"))
+        self.assertFalse(capabilities.supports_decoder("hevc"))
+
+    def test_failed_queries_leave_support_permissive(self) -> None:
+        failed = subprocess.CompletedProcess(["ffmpeg"], 1, stdout="")
+        with (
+            patch("shutil.which", side_effect=lambda name: f"/usr/bin/{name}"),
+            patch("subprocess.run", return_value=failed),
+        ):
+            capabilities = ffmpeg_utils.detect_ffmpeg_capabilities()
+
+        self.assertIsNone(capabilities.version)
+        self.assertTrue(capabilities.supports_protocol("rtmp"))
+        self.assertTrue(capabilities.supports_decoder("hevc"))
+
+    def test_capabilities_are_cached_until_invalidated(self) -> None:
+        with patch("shutil.which", return_value=None) as mock_which:
+            first = ffmpeg_utils.get_ffmpeg_capabilities()
+            second = ffmpeg_utils.get_ffmpeg_capabilities()
+            self.assertIs(first, second)
+            self.assertEqual(mock_which.call_count, 2)
+
+            ffmpeg_utils.invalidate_ffmpeg_capabilities()
+            ffmpeg_utils.get_ffmpeg_capabilities()
+            self.assertEqual(mock_which.call_count, 4)
+
+        self.assertFalse(first.available)
+
+    def test_expired_capabilities_are_redetected(self) -> None:
+        with patch("shutil.which", return_value=None):
+            first = ffmpeg_utils.get_ffmpeg_capabilities()
+            refreshed = ffmpeg_utils.get_ffmpeg_capabilities(max_age=0.0)
+
+        self.assertIsNot(first, refreshed)
+
+
+class TestFFmpegCapabilitiesAsync(unittest.IsolatedAsyncioTestCase):
+    """Event-loop friendly capability lookups."""
+
+    def setUp(self) -> None:
+        ffmpeg_utils.invalidate_ffmpeg_capabilities()
+        self.addCleanup(ffmpeg_utils.invalidate_ffmpeg_capabilities)
+
+    async def test_stale_snapshot_is_served_while_refreshing(self) -> None:
+        with patch("shutil.which", return_value=None):
+            first = await ffmpeg_utils.get_ffmpeg_capabilities_async()
+
+        refreshed = threading.Event()
+        release = threading.Event()
+
+        def slow_detect() -> ffmpeg_utils.FFmpegCapabilities:
+            release.wait(5)
+            refreshed.set()
+            return ffmpeg_utils.FFmpegCapabilities(
+                ffmpeg_path="/usr/bin/ffmpeg", detected_at=time.monotonic()
+            )
+
+        with patch.object(
+            ffmpeg_utils, "detect_ffmpeg_capabilities", side_effect=slow_detect
+        ) as mock_detect:
+            stale = await ffmpeg_utils.get_ffmpeg_capabilities_async(max_age=0.0)
+            again = await ffmpeg_utils.get_ffmpeg_capabilities_async(max_age=0.0)
+            release.set()
+            await asyncio.to_thread(refreshed.wait, 5)
+            for _ in range(100):
+                current = await ffmpeg_utils.get_ffmpeg_capabilities_async()
+                if current.available:
+                    break
+                await asyncio.sleep(0.01)
+
+        self.assertIs(stale, first)
+        self.assertIs(again, first)
+        self.assertTrue(current.available)
+        mock_detect.assert_called_once()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import asyncio
+import socket
+import unittest
+from typing import List
+from unittest import mock
+
+import httpx
+
+from iptv_sniffer.utils.config import AppConfig
+from iptv_sniffer.utils.http_client import (
+    CachingDNSTransport,
+    DNSCache,
+    create_http_client,
+)
+
+
+class CountingDNSCache(DNSCache):
+    def __init__(self, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.lookups: List[str] = []
+
+    async def _lookup(self, host: str, port: int) -> str:
+        self.lookups.append(host)
+        await asyncio.sleep(0.01)
+        if host == "missing.invalid":
+            raise socket.gaierror("Name or service not known")
+        return "127.0.0.1"
+
+
+class DNSCacheTestCase(unittest.IsolatedAsyncioTestCase):
+    async def test_repeated_lookups_are_served_from_cache(self) -> None:
+        cache = CountingDNSCache(ttl=60)
+
+        addresses = await asyncio.gather(
+            *(cache.resolve("headend.local", 80) for _ in range(10))
+        )
+        addresses.append(await cache.resolve("headend.local", 8080))
+
+        self.assertEqual(set(addresses), {"127.0.0.1"})
+        self.assertEqual(cache.lookups, ["headend.local"])
+        self.assertEqual((cache.hits, cache.misses), (10, 1))
+
+    async def test_entries_expire_after_ttl(self) -> None:
+        cache = CountingDNSCache(ttl=0.05)
+
+        await cache.resolve("headend.local", 80)
+        await asyncio.sleep(0.06)
+        await cache.resolve("headend.local", 80)
+
+        self.assertEqual(cache.lookups, ["headend.local", "headend.local"])
+
+    async def test_ip_literals_and_failures_are_not_cached(self) -> None:
+        cache = CountingDNSCache(ttl=60)
+
+        self.assertEqual(await cache.resolve("192.168.1.10", 80), "192.168.1.10")
+        for _ in range(2):
+            with self.assertRaises(OSError):
+                await cache.resolve("missing.invalid", 80)
+
+        self.assertEqual(cache.lookups, ["missing.invalid", "missing.invalid"])
+
+
+class HTTPClientTestCase(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.connections = 0
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            self.connections += 1
+            try:
+                while await reader.readuntil(b"\r\n\r\n"):
+                    writer.write(
+                        b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n"
+                        b"Content-Type: video/mp2t\r\n\r\nok"
+                    )
+                    await writer.drain()
+            except (asyncio.IncompleteReadError, ConnectionError):
+                pass
+            finally:
+                writer.close()
+
+        self.server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def test_connections_and_lookups_are_reused(self) -> None:
+        client = create_http_client(AppConfig(http_dns_ttl=60))
+        transport = client._transport  # pylint: disable=protected-access
+        assert isinstance(transport, CachingDNSTransport)
+
+        async with client:
+            for path in ("/a.ts", "/b.ts", "/c.ts"):
+                response = await client.get(f"http://localhost:{self.port}{path}")
+                self.assertEqual(response.text, "ok")
+
+        # One keep-alive connection served every request: one lookup.
+        self.assertEqual(self.connections, 1)
+        self.assertEqual(transport.dns_cache.misses, 1)
+
+    async def test_unresolvable_host_is_a_transport_error(self) -> None:
+        client = create_http_client(AppConfig(http_dns_ttl=60))
+
+        async with client:
+            with self.assertRaises(httpx.ConnectError):
+                await client.get("http://missing.invalid/")
+
+    async def test_host_header_and_tls_name_keep_the_host_name(self) -> None:
+        sent: List[httpx.Request] = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            sent.append(request)
+            return httpx.Response(200)
+
+        transport = CachingDNSTransport(
+            httpx.MockTransport(handler), CountingDNSCache(ttl=60)
+        )
+        async with httpx.AsyncClient(transport=transport) as client:
+            await client.get("https://headend.local:8443/live.ts")
+            await client.get("http://10.0.0.5/live.ts")
+
+        self.assertEqual(str(sent[0].url), "https://127.0.0.1:8443/live.ts")
+        self.assertEqual(sent[0].headers["host"], "headend.local:8443")
+        self.assertEqual(sent[0].extensions["sni_hostname"], "headend.local")
+        self.assertEqual(str(sent[1].url), "http://10.0.0.5/live.ts")
+        self.assertNotIn("sni_hostname", sent[1].extensions)
+
+    def test_http2_requires_h2_package(self) -> None:
+        with mock.patch("iptv_sniffer.utils.http_client.find_spec", return_value=None):
+            client = create_http_client(AppConfig(http_dns_ttl=0))
+
+        self.assertNotIsInstance(client._transport, CachingDNSTransport)  # pylint: disable=protected-access
+        self.assertTrue(client.follow_redirects)
+
+
+if __name__ == "__main__":
+    unittest.main()
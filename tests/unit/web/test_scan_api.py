@@ -5,8 +5,16 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 from fastapi.testclient import TestClient
 
+from iptv_sniffer.scanner.adaptive_limiter import LimitAdjustment
+from iptv_sniffer.scanner.orchestrator import ResultOrdering, ScanProgress
 from iptv_sniffer.scanner.strategy import ScanMode
-from iptv_sniffer.web.api.scan import ScanNotFoundError, ScanSession, ScanStatus
+from iptv_sniffer.web.api.scan import (
+    ScanNotFoundError,
+    ScanNotResumableError,
+    ScanSession,
+    ScanStatus,
+)
+from iptv_sniffer.web.api.channels import get_repository
 from iptv_sniffer.web.app import app
 
 
@@ -57,6 +65,147 @@ class ScanApiTestCase(unittest.TestCase):
         response = self.client.get("/api/scan/missing")
         self.assertEqual(response.status_code, 404)
 
+    @patch("iptv_sniffer.web.api.scan.scan_manager.get_scan", new_callable=AsyncMock)
+    def test_get_scan_reports_concurrency_limit(self, mock_get: AsyncMock) -> None:
+        session = ScanSession(
+            scan_id="adaptive-id",
+            strategy=MagicMock(),
+            status=ScanStatus.RUNNING,
+            total=10,
+            metrics=ScanProgress(
+                total=10,
+                concurrency_limit=12,
+                retries=3,
+                concurrency_history=[
+                    LimitAdjustment(limit=10, reason="initial"),
+                    LimitAdjustment(limit=12, reason="latency_ok"),
+                ],
+            ),
+        )
+        mock_get.return_value = session
+
+        response = self.client.get("/api/scan/adaptive-id")
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(payload["concurrency_limit"], 12)
+        self.assertEqual(
+            [entry["limit"] for entry in payload["concurrency_history"]], [10, 12]
+        )
+        self.assertEqual(payload["concurrency_history"][-1]["reason"], "latency_ok")
+        self.assertEqual(payload["retries"], 3)
+
+    @patch("iptv_sniffer.web.api.scan.scan_manager.start_scan", new_callable=AsyncMock)
+    def test_start_scan_accepts_target_ordering(self, mock_start: AsyncMock) -> None:
+        mock_start.return_value = ScanSession(
+            scan_id="ordered-id", strategy=MagicMock(), total=3
+        )
+
+        response = self.client.post(
+            "/api/scan/start",
+            json={
+                "mode": ScanMode.TEMPLATE.value,
+                "base_url": "http://gateway/stream/{ip}",
+                "start_ip": "192.168.1.10",
+                "end_ip": "192.168.1.12",
+                "ordering": "target",
+            },
+        )
+
+        self.assertEqual(response.status_code, 202)
+        request = mock_start.await_args.args[0]
+        self.assertEqual(request.ordering, ResultOrdering.TARGET)
+
+    @patch("iptv_sniffer.web.api.scan.scan_manager.get_scan", new_callable=AsyncMock)
+    def test_get_scan_reports_reorder_buffer(self, mock_get: AsyncMock) -> None:
+        mock_get.return_value = ScanSession(
+            scan_id="ordered-id",
+            strategy=MagicMock(),
+            status=ScanStatus.RUNNING,
+            total=10,
+            ordering=ResultOrdering.TARGET,
+            metrics=ScanProgress(
+                total=10,
+                ordering=ResultOrdering.TARGET,
+                reorder_buffer_size=2,
+                reorder_buffer_peak=5,
+                head_of_line_stall_seconds=1.5,
+            ),
+        )
+
+        payload = self.client.get("/api/scan/ordered-id").json()
+
+        self.assertEqual(payload["ordering"], "target")
+        self.assertEqual(payload["reorder_buffer_size"], 2)
+        self.assertEqual(payload["reorder_buffer_peak"], 5)
+        self.assertEqual(payload["head_of_line_stall_seconds"], 1.5)
+
+    @patch("iptv_sniffer.web.api.scan.scan_manager.resume_scan", new_callable=AsyncMock)
+    def test_resume_scan(self, mock_resume: AsyncMock) -> None:
+        mock_resume.return_value = ScanSession(
+            scan_id="resume-id",
+            strategy=MagicMock(),
+            status=ScanStatus.PENDING,
+            total=1530,
+        )
+
+        response = self.client.post("/api/scan/resume-id/resume")
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()["scan_id"], "resume-id")
+        self.assertEqual(response.json()["total"], 1530)
+
+    @patch("iptv_sniffer.web.api.scan.scan_manager.resume_scan", new_callable=AsyncMock)
+    def test_resume_scan_errors(self, mock_resume: AsyncMock) -> None:
+        mock_resume.side_effect = ScanNotFoundError()
+        self.assertEqual(self.client.post("/api/scan/x/resume").status_code, 404)
+
+        mock_resume.side_effect = ScanNotResumableError("Scan already completed.")
+        response = self.client.post("/api/scan/x/resume")
+        self.assertEqual(response.status_code, 409)
+        self.assertIn("completed", response.json()["detail"])
+
+    @patch("iptv_sniffer.web.api.scan.scan_manager.start_scan", new_callable=AsyncMock)
+    def test_m3u_upload_imports_channels_and_starts_batch_scan(
+        self, mock_start: AsyncMock
+    ) -> None:
+        repository = MagicMock()
+        repository.add_many = AsyncMock(return_value=[])
+        app.dependency_overrides[get_repository] = lambda: repository
+        self.addCleanup(app.dependency_overrides.pop, get_repository, None)
+        mock_start.return_value = ScanSession(
+            scan_id="batch-id", strategy=MagicMock(), total=2
+        )
+        playlist = (
+            "#EXTM3U\n"
+            '#EXTINF:-1 group-title="News",One\nhttp://10.0.0.1/one\n'
+            "#EXTINF:-1,Two\nhttp://10.0.0.2/two\n"
+            "#EXTINF:-1,Broken\nftp://10.0.0.3/three\n"
+        )
+
+        response = self.client.post(
+            "/api/scan/m3u",
+            files={"file": ("nightly.m3u", playlist.encode(), "audio/x-mpegurl")},
+            data={"timeout": "5"},
+        )
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()["scan_id"], "batch-id")
+        imported = repository.add_many.await_args.args[0]
+        self.assertEqual([channel.name for channel in imported], ["One", "Two"])
+        request = mock_start.await_args.args[0]
+        self.assertEqual(request.mode, ScanMode.M3U_BATCH)
+        self.assertEqual(request.urls, ["http://10.0.0.1/one", "http://10.0.0.2/two"])
+        self.assertEqual(request.timeout, 5)
+
+    def test_m3u_upload_rejects_empty_file(self) -> None:
+        response = self.client.post(
+            "/api/scan/m3u",
+            files={"file": ("empty.m3u", b"", "audio/x-mpegurl")},
+        )
+
+        self.assertEqual(response.status_code, 400)
+
     @patch("iptv_sniffer.web.api.scan.scan_manager.cancel_scan", new_callable=AsyncMock)
     def test_cancel_scan(self, mock_cancel: AsyncMock) -> None:
         session = ScanSession(
@@ -2,12 +2,38 @@ from __future__ import annotations
 
 import asyncio
 import unittest
-from typing import AsyncIterator, List
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import AsyncIterator, List, Optional
 from unittest.mock import patch
 
+from iptv_sniffer.channel.models import Channel, ValidationStatus
+from iptv_sniffer.scanner.adaptive_limiter import AdaptiveRateLimiter
+from iptv_sniffer.scanner.orchestrator import ScanOrchestrator
+from iptv_sniffer.scanner.scheduler import ProbeScheduler, ScanPriority
 from iptv_sniffer.scanner.strategy import ScanMode, ScanStrategy
-from iptv_sniffer.scanner.validator import StreamValidationResult
-from iptv_sniffer.web.api.scan import ScanManager, ScanStartRequest, ScanStatus
+from iptv_sniffer.scanner.validation_cache import ValidationCache
+from iptv_sniffer.scanner.validator import (
+    ProbeProfile,
+    StreamValidationResult,
+    StreamValidator,
+)
+from iptv_sniffer.storage.json_repository import JSONChannelRepository
+from iptv_sniffer.storage.result_writer import ScanResultWriter
+from iptv_sniffer.storage.scan_checkpoint import (
+    CheckpointNotFoundError,
+    ScanCheckpointStore,
+)
+from iptv_sniffer.utils.config import AppConfig
+from iptv_sniffer.web.api.scan import (
+    ScanManager,
+    ScanNotFoundError,
+    ScanNotResumableError,
+    ScanSession,
+    ScanStartRequest,
+    ScanStatus,
+    _probe_deadline,
+)
 
 
 class DummyStrategy(ScanStrategy):
@@ -23,15 +49,46 @@ class DummyStrategy(ScanStrategy):
 
 
 class StubOrchestrator:
+    def __init__(self) -> None:
+        self.probed: List[str] = []
+
     async def execute_scan(
         self, strategy: ScanStrategy
     ) -> AsyncIterator[StreamValidationResult]:
         async for target in strategy.generate_targets():
+            self.probed.append(target)
             yield StreamValidationResult(
                 url=target, protocol="udp", is_valid="valid" in target
             )
 
 
+class StubValidator(StreamValidator):  # type: ignore[misc]
+    def __init__(self) -> None:
+        pass
+
+    async def validate(  # type: ignore[override]
+        self, url: str, timeout: int = 10, profile: Optional[ProbeProfile] = None
+    ) -> StreamValidationResult:
+        return StreamValidationResult(url=url, protocol="udp", is_valid=True)
+
+
+class ConcurrencyTrackingValidator:
+    def __init__(self) -> None:
+        self.active = 0
+        self.peak = 0
+
+    async def validate(
+        self, url: str, timeout: int = 10, profile: Optional[ProbeProfile] = None
+    ) -> StreamValidationResult:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.005)
+        finally:
+            self.active -= 1
+        return StreamValidationResult(url=url, protocol="udp", is_valid=True)
+
+
 class ScanManagerTestCase(unittest.IsolatedAsyncioTestCase):
     async def test_scan_manager_completes_scan(self) -> None:
         manager = ScanManager(
@@ -84,6 +141,387 @@ class ScanManagerTestCase(unittest.IsolatedAsyncioTestCase):
         updated = await manager.get_scan(session.scan_id)
         self.assertEqual(updated.status, ScanStatus.CANCELLED)
 
+    async def test_scan_manager_records_orchestrator_metrics(self) -> None:
+        limiter = AdaptiveRateLimiter(initial_limit=3, max_limit=8)
+        manager = ScanManager(
+            preset_loader=None,
+            orchestrator_factory=lambda: ScanOrchestrator(
+                StubValidator(), rate_limiter=limiter
+            ),
+        )
+        strategy = DummyStrategy([f"udp://239.1.1.{index}:8000" for index in range(4)])
+        request = ScanStartRequest(
+            mode=ScanMode.MULTICAST,
+            protocol="udp",
+            ip_ranges=["239.1.1.1-239.1.1.1"],
+            ports=[8000],
+        )
+
+        with patch.object(
+            manager, "_build_strategy_from_request", return_value=strategy
+        ):
+            session = await manager.start_scan(request, timeout=10)
+        if session.task:
+            await session.task
+
+        self.assertIsNotNone(session.metrics)
+        assert session.metrics is not None
+        self.assertEqual(session.metrics.completed, 4)
+        self.assertEqual(session.metrics.concurrency_limit, 3)
+        self.assertEqual(session.metrics.concurrency_history[0].reason, "initial")
+
+    async def test_adaptive_lane_may_grow_past_the_initial_limit(self) -> None:
+        manager = ScanManager(
+            preset_loader=None,
+            validator=StubValidator(),
+            scheduler=ProbeScheduler(40),
+        )
+        request = ScanStartRequest(
+            mode=ScanMode.MULTICAST,
+            protocol="udp",
+            ip_ranges=["239.1.1.1-239.1.1.1"],
+            ports=[8000],
+        )
+
+        with (
+            patch.object(
+                manager,
+                "_build_strategy_from_request",
+                return_value=DummyStrategy(["udp://239.1.1.1:8000"]),
+            ),
+            patch.object(
+                manager,
+                "_create_orchestrator",
+                wraps=manager._create_orchestrator,
+            ) as create,
+        ):
+            session = await manager.start_scan(request, timeout=10)
+            assert session.task is not None
+            await session.task
+
+        lane = create.call_args.args[0]
+        self.assertEqual(lane.limit, AppConfig().max_concurrency)
+        self.assertEqual(lane.max_concurrency, 40)
+
+    def test_probe_deadline_outlasts_the_slowest_profile(self) -> None:
+        default = ScanSession(scan_id="default", strategy=DummyStrategy([]))
+        deep = ScanSession(
+            scan_id="deep",
+            strategy=DummyStrategy([]),
+            reprobe_profile=ProbeProfile.DEEP,
+        )
+
+        self.assertGreater(
+            _probe_deadline(default),
+            StreamValidator.probe_timeout(ProbeProfile.METADATA),
+        )
+        self.assertGreater(
+            _probe_deadline(deep), StreamValidator.probe_timeout(ProbeProfile.DEEP)
+        )
+
+    async def test_scan_manager_persists_valid_results(self) -> None:
+        with TemporaryDirectory() as directory:
+            repository = JSONChannelRepository(Path(directory) / "channels.json")
+            manager = ScanManager(
+                preset_loader=None,
+                orchestrator_factory=lambda: StubOrchestrator(),
+                result_writer_factory=lambda **_: ScanResultWriter(
+                    repository, batch_size=2, max_age=60
+                ),
+            )
+            strategy = DummyStrategy(
+                [
+                    "udp://239.1.1.1:8000/valid",
+                    "udp://239.1.1.2:8000",
+                    "udp://239.1.1.3:8000/valid",
+                    "udp://239.1.1.4:8000/valid",
+                ]
+            )
+            request = ScanStartRequest(
+                mode=ScanMode.MULTICAST,
+                protocol="udp",
+                ip_ranges=["239.1.1.1-239.1.1.1"],
+                ports=[8000],
+            )
+
+            with patch.object(
+                manager, "_build_strategy_from_request", return_value=strategy
+            ):
+                session = await manager.start_scan(request, timeout=10)
+            if session.task:
+                await session.task
+
+            channels = await repository.find_all()
+            assert session.writer is not None
+            self.assertEqual(session.writer.batches, 2)
+
+        self.assertEqual(
+            sorted(channel.url for channel in channels),
+            [
+                "udp://239.1.1.1:8000/valid",
+                "udp://239.1.1.3:8000/valid",
+                "udp://239.1.1.4:8000/valid",
+            ],
+        )
+        self.assertTrue(all(channel.is_online for channel in channels))
+
+    async def test_m3u_batch_scan_updates_repository_statuses(self) -> None:
+        with TemporaryDirectory() as directory:
+            repository = JSONChannelRepository(Path(directory) / "channels.json")
+            await repository.add_many(
+                [
+                    Channel(name="Up", url="udp://239.1.1.1:8000/valid", group="A"),
+                    Channel(
+                        name="Down",
+                        url="udp://239.1.1.2:8000",
+                        group="A",
+                        is_online=True,
+                        validation_status=ValidationStatus.ONLINE,
+                    ),
+                    Channel(name="Other", url="udp://239.1.1.3:8000", group="B"),
+                ]
+            )
+            orchestrator = StubOrchestrator()
+            manager = ScanManager(
+                preset_loader=None,
+                orchestrator_factory=lambda: orchestrator,
+                repository_factory=lambda: repository,
+                result_writer_factory=lambda include_invalid: ScanResultWriter(
+                    repository, include_invalid=include_invalid
+                ),
+            )
+
+            session = await manager.start_scan(
+                ScanStartRequest(mode=ScanMode.M3U_BATCH, group="A"), timeout=10
+            )
+            if session.task:
+                await session.task
+            stored = {channel.name: channel for channel in await repository.find_all()}
+
+        self.assertEqual(session.status, ScanStatus.COMPLETED)
+        self.assertEqual(session.total, 2)
+        self.assertEqual(
+            orchestrator.probed, ["udp://239.1.1.1:8000/valid", "udp://239.1.1.2:8000"]
+        )
+        self.assertEqual(stored["Up"].validation_status, ValidationStatus.ONLINE)
+        self.assertTrue(stored["Up"].is_online)
+        self.assertEqual(stored["Down"].validation_status, ValidationStatus.OFFLINE)
+        self.assertFalse(stored["Down"].is_online)
+        self.assertEqual(stored["Other"].validation_status, ValidationStatus.UNKNOWN)
+
+    async def test_concurrent_scans_share_the_probe_pool(self) -> None:
+        validator = ConcurrencyTrackingValidator()
+        scheduler = ProbeScheduler(max_concurrency=3)
+        manager = ScanManager(
+            preset_loader=None, scheduler=scheduler, validator=validator
+        )
+        sessions = []
+        for priority in (ScanPriority.BACKGROUND, ScanPriority.INTERACTIVE):
+            strategy = DummyStrategy(
+                [f"udp://239.1.{len(sessions)}.{index}:8000" for index in range(12)]
+            )
+            request = ScanStartRequest(
+                mode=ScanMode.MULTICAST,
+                protocol="udp",
+                ip_ranges=["239.1.1.1-239.1.1.1"],
+                ports=[8000],
+                priority=priority,
+            )
+            with patch.object(
+                manager, "_build_strategy_from_request", return_value=strategy
+            ):
+                sessions.append(await manager.start_scan(request, timeout=10))
+
+        await asyncio.gather(*(session.task for session in sessions if session.task))
+
+        self.assertEqual(
+            [session.status for session in sessions], [ScanStatus.COMPLETED] * 2
+        )
+        self.assertEqual([session.valid for session in sessions], [12, 12])
+        self.assertEqual(sessions[1].priority, ScanPriority.INTERACTIVE)
+        self.assertLessEqual(validator.peak, 3)
+        self.assertEqual(scheduler.in_use, 0)
+
+    async def test_repeat_scans_are_answered_from_validation_cache(self) -> None:
+        with TemporaryDirectory() as tmp:
+            cache_path = Path(tmp) / "validation_cache.json"
+            validator = ConcurrencyTrackingValidator()
+            manager = ScanManager(
+                preset_loader=None,
+                validator=validator,
+                validation_cache=ValidationCache(path=cache_path),
+            )
+            targets = [f"udp://239.1.1.{index}:8000" for index in range(4)]
+
+            async def scan(force: bool = False):
+                request = ScanStartRequest(
+                    mode=ScanMode.MULTICAST,
+                    protocol="udp",
+                    ip_ranges=["239.1.1.0-239.1.1.3"],
+                    ports=[8000],
+                    force=force,
+                )
+                with patch.object(
+                    manager,
+                    "_build_strategy_from_request",
+                    return_value=DummyStrategy(targets),
+                ):
+                    session = await manager.start_scan(request, timeout=10)
+                assert session.task is not None
+                await session.task
+                assert session.metrics is not None
+                return session.metrics
+
+            first = await scan()
+            second = await scan()
+            forced = await scan(force=True)
+
+            self.assertEqual((first.cache_hits, first.cache_misses), (0, 4))
+            self.assertEqual((second.cache_hits, second.cache_misses), (4, 0))
+            self.assertEqual(forced.cache_hits, 0)
+            self.assertEqual(forced.valid, 4)
+            self.assertTrue(cache_path.exists())
+            self.assertEqual(ValidationCache(path=cache_path).load(), 4)
+
+
+class ScanResumeTestCase(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self._temp_dir = TemporaryDirectory()
+        self.store = ScanCheckpointStore(Path(self._temp_dir.name), interval=0)
+        self.request = ScanStartRequest(
+            mode=ScanMode.MULTICAST,
+            protocol="udp",
+            ip_ranges=["239.1.1.1-239.1.1.4"],
+            ports=[8000],
+        )
+
+    def tearDown(self) -> None:
+        self._temp_dir.cleanup()
+
+    async def test_resume_skips_completed_targets(self) -> None:
+        interrupted = ScanManager(
+            preset_loader=None,
+            orchestrator_factory=StubOrchestrator,
+            checkpoint_store=self.store,
+        )
+        session = await interrupted.start_scan(self.request, timeout=10)
+        assert session.checkpoint is not None
+        # Simulate a crash after two results were checkpointed.
+        assert session.task is not None
+        session.task.cancel()
+        writer = self.store.reopen(session.scan_id)
+        for url in ("udp://239.1.1.1:8000", "udp://239.1.1.2:8000"):
+            writer.record(
+                StreamValidationResult(url=url, protocol="udp", is_valid=True)
+            )
+        await writer.flush()
+
+        orchestrator = StubOrchestrator()
+        restarted = ScanManager(
+            preset_loader=None,
+            orchestrator_factory=lambda: orchestrator,
+            checkpoint_store=self.store,
+        )
+        resumed = await restarted.resume_scan(session.scan_id)
+        assert resumed.task is not None
+        await resumed.task
+
+        self.assertEqual(
+            orchestrator.probed, ["udp://239.1.1.3:8000", "udp://239.1.1.4:8000"]
+        )
+        self.assertEqual(resumed.status, ScanStatus.COMPLETED)
+        self.assertEqual(resumed.progress, 4)
+        self.assertEqual(resumed.total, 4)
+        self.assertEqual(resumed.valid, 2)
+        with self.assertRaises(CheckpointNotFoundError):
+            self.store.load(session.scan_id)
+
+    async def test_checkpointed_results_are_already_persisted(self) -> None:
+        class StallingOrchestrator(StubOrchestrator):
+            async def execute_scan(
+                self, strategy: ScanStrategy
+            ) -> AsyncIterator[StreamValidationResult]:
+                async for result in super().execute_scan(strategy):
+                    yield result
+                await asyncio.Event().wait()
+
+        path = Path(self._temp_dir.name) / "channels.json"
+        repository = JSONChannelRepository(path, flush_delay=60)
+        manager = ScanManager(
+            preset_loader=None,
+            orchestrator_factory=StallingOrchestrator,
+            checkpoint_store=self.store,
+            result_writer_factory=lambda **_: ScanResultWriter(
+                repository, batch_size=100, max_age=60
+            ),
+        )
+        strategy = DummyStrategy(["udp://239.1.1.1:8000/valid", "udp://239.1.1.2:8000"])
+
+        with patch.object(
+            manager, "_build_strategy_from_request", return_value=strategy
+        ):
+            session = await manager.start_scan(self.request, timeout=10)
+        for _ in range(50):
+            if session.progress == 2:
+                break
+            await asyncio.sleep(0.01)
+        # Simulate a crash: read what is on disk without letting the scan finish.
+        checkpoint = self.store.load(session.scan_id)
+        on_disk = await JSONChannelRepository(path).find_all()
+        assert session.task is not None
+        session.task.cancel()
+        await asyncio.gather(session.task, return_exceptions=True)
+        await repository.close()
+
+        self.assertEqual(checkpoint.completed, 2)
+        self.assertEqual(
+            [channel.url for channel in on_disk], ["udp://239.1.1.1:8000/valid"]
+        )
+
+    async def test_completed_scan_cannot_be_resumed(self) -> None:
+        manager = ScanManager(
+            preset_loader=None,
+            orchestrator_factory=StubOrchestrator,
+            checkpoint_store=self.store,
+        )
+        session = await manager.start_scan(self.request, timeout=10)
+        assert session.task is not None
+        await session.task
+
+        with self.assertRaises(ScanNotResumableError):
+            await manager.resume_scan(session.scan_id)
+        with self.assertRaises(ScanNotFoundError):
+            await manager.resume_scan("unknown-scan")
+        # The checkpoint is gone, so a restarted process cannot resume it either.
+        self.assertEqual(list(Path(self._temp_dir.name).iterdir()), [])
+
+    async def test_cancelled_scan_keeps_its_checkpoint(self) -> None:
+        class StallingOrchestrator(StubOrchestrator):
+            async def execute_scan(
+                self, strategy: ScanStrategy
+            ) -> AsyncIterator[StreamValidationResult]:
+                async for result in super().execute_scan(strategy):
+                    yield result
+                    await asyncio.Event().wait()
+
+        manager = ScanManager(
+            preset_loader=None,
+            orchestrator_factory=StallingOrchestrator,
+            checkpoint_store=self.store,
+        )
+        session = await manager.start_scan(self.request, timeout=10)
+        for _ in range(50):
+            if session.progress:
+                break
+            await asyncio.sleep(0.01)
+        await manager.cancel_scan(session.scan_id)
+        assert session.task is not None
+        await asyncio.gather(session.task, return_exceptions=True)
+
+        checkpoint = self.store.load(session.scan_id)
+        self.assertEqual(checkpoint.status, "cancelled")
+        self.assertEqual(checkpoint.completed, 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -4,6 +4,7 @@ import unittest
 
 from fastapi.testclient import TestClient
 
+from iptv_sniffer.utils.http_client import get_http_client
 from iptv_sniffer.web.app import app
 
 
@@ -28,6 +29,15 @@ class FastAPIAppTestCase(unittest.TestCase):
         self.assertEqual(response_json.status_code, 200)
         self.assertIn("paths", response_json.json())
 
+    def test_lifespan_installs_shared_http_client(self) -> None:
+        with TestClient(app):
+            client = get_http_client()
+            self.assertIsNotNone(client)
+
+        self.assertIsNone(get_http_client())
+        assert client is not None
+        self.assertTrue(client.is_closed)
+
 
 if __name__ == "__main__":
     unittest.main()